@@ -23,11 +23,12 @@ import logging
 
 from email.mime.message import MIMEMessage
 from email.mime.text import MIMEText
-from email.utils import parseaddr
+from email.utils import make_msgid, parseaddr
 from mailman.config import config
 from mailman.core.i18n import _
 from mailman.email.message import OwnerNotification, UserNotification
-from mailman.interfaces.bounce import UnrecognizedBounceDisposition
+from mailman.interfaces.bounce import (
+    BounceAction, IBounceProcessor, UnrecognizedBounceDisposition)
 from mailman.interfaces.listmanager import IListManager
 from mailman.interfaces.pending import IPendable, IPendings
 from mailman.interfaces.subscriptions import ISubscriptionService
@@ -234,6 +235,42 @@ def send_probe(member, msg):
     return token
 
 
+def _bounce_sample(member):
+    # The probe normally carries the bouncing message, but the scored bounce
+    # events only record the bounces' Message-IDs.  Attach a summary instead.
+    mlist = member.mailing_list
+    listname = mlist.display_name                       # noqa: F841
+    email = member.address.email                        # noqa: F841
+    date = str(member.last_bounce_received)             # noqa: F841
+    with _.using(member.preferred_language.code):
+        text = _('The $listname mailing list has registered bounces from '
+                 '$email, the last one on ${date}.')
+    sample = MIMEText(text, _charset=member.preferred_language.charset)
+    sample['Message-ID'] = make_msgid(domain=mlist.mail_host)
+    return sample
+
+
+@public
+def process_bounces():
+    """Score the registered bounce events and send out the probes.
+
+    :return: The actions taken, as returned by `IBounceProcessor.process()`.
+    :rtype: list
+    """
+    actions = getUtility(IBounceProcessor).process()
+    for member, action in actions:
+        if action is BounceAction.probe:
+            sample = _bounce_sample(member)
+            send_probe(member, sample)
+            blog.info('%s: sent probe to %s', member.list_id,
+                      member.address.email)
+        else:
+            assert action is BounceAction.disable, action
+            blog.info('%s: disabled %s, bounce score %s', member.list_id,
+                      member.address.email, member.bounce_score)
+    return actions
+
+
 @public
 def maybe_forward(mlist, msg):
     """Possibly forward bounce messages with no recognizable addresses.
@@ -18,8 +18,9 @@
 """Global events."""
 
 from mailman.app import domain, membership, moderator, subscriptions
-from mailman.core import i18n, switchboard
+from mailman.core import i18n, metrics, switchboard
 from mailman.languages import manager as language_manager
+from mailman.rest import cache
 from mailman.styles import manager as style_manager
 from mailman.utilities import passwords
 from public import public
@@ -30,10 +31,12 @@ from zope import event
 def initialize():
     """Initialize global event subscribers."""
     event.subscribers.extend([
+        cache.handle_event,
         domain.handle_DomainDeletingEvent,
         i18n.handle_ConfigurationUpdatedEvent,
         language_manager.handle_ConfigurationUpdatedEvent,
         membership.handle_SubscriptionEvent,
+        metrics.handle_ConfigurationUpdatedEvent,
         moderator.handle_ListDeletingEvent,
         passwords.handle_ConfigurationUpdatedEvent,
         style_manager.handle_ConfigurationUpdatedEvent,
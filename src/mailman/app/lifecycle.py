@@ -21,7 +21,7 @@ import re
 import shutil
 import logging
 
-from contextlib import suppress
+from contextlib import contextmanager, suppress
 from mailman.config import config
 from mailman.interfaces.address import IEmailValidator
 from mailman.interfaces.domain import (
@@ -40,6 +40,46 @@ log = logging.getLogger('mailman.error')
 # These are the only characters allowed in list names.  A more restrictive
 # class can be specified in config.mailman.listname_chars.
 _listname_chars = re.compile('[-_.+=!$*{}~0-9a-z]', re.IGNORECASE)
+# One flag per active deferred_mta_updates() block, telling whether any list
+# was created or removed in it.  This is process global state, so it is not
+# safe to use deferred_mta_updates() from more than one thread at a time.
+_deferred_mta_updates = []
+
+
+def _update_mta(mlist, action):
+    if len(_deferred_mta_updates) > 0:
+        _deferred_mta_updates[-1] = True
+    else:
+        getattr(call_name(config.mta.incoming), action)(mlist)
+
+
+@public
+@contextmanager
+def deferred_mta_updates():
+    """Coalesce the MTA updates for lists created or removed in this block.
+
+    Normally, the MTA is told about each list as it is created or removed,
+    which for some MTAs means regenerating all the alias maps every time.
+    Within this block the MTA isn't told anything; instead, if any list was
+    created or removed, the MTA's maps are regenerated once when the block
+    exits without an error.  Blocks may be nested, in which case only the
+    outermost block regenerates the maps.
+
+    The blocks are tracked in a module global stack, so this is not thread
+    safe: a block entered in one thread also defers the updates of lists
+    created or removed in any other thread.
+    """
+    _deferred_mta_updates.append(False)
+    try:
+        yield
+    finally:
+        changed = _deferred_mta_updates.pop()
+    if not changed:
+        return
+    if len(_deferred_mta_updates) > 0:
+        _deferred_mta_updates[-1] = True
+    else:
+        call_name(config.mta.incoming).regenerate()
 
 
 @public
@@ -97,7 +137,7 @@ def create_list(fqdn_listname, owners=None, style_name=None):
     if style is not None:
         style.apply(mlist)
     # Coordinate with the MTA, as defined in the configuration file.
-    call_name(config.mta.incoming).create(mlist)
+    _update_mta(mlist, 'create')
     # Create any owners that don't yet exist, and subscribe all addresses as
     # owners of the mailing list.
     user_manager = getUtility(IUserManager)
@@ -119,4 +159,4 @@ def remove_list(mlist):
     # Delete the mailing list from the database.
     getUtility(IListManager).delete(mlist)
     # Do the MTA-specific list deletion tasks
-    call_name(config.mta.incoming).delete(mlist)
+    _update_mta(mlist, 'delete')
@@ -17,21 +17,16 @@
 
 """Application support for membership management."""
 
-from email.utils import formataddr
 from mailman.app.notifications import (
-    send_admin_subscription_notice, send_goodbye_message,
-    send_welcome_message)
-from mailman.core.i18n import _
-from mailman.email.message import OwnerNotification
+    send_admin_subscription_notice, send_admin_unsubscription_notice,
+    send_goodbye_message, send_welcome_message)
 from mailman.interfaces.address import IAddress
 from mailman.interfaces.bans import IBanManager
 from mailman.interfaces.member import (
     AlreadySubscribedError, MemberRole, MembershipIsBannedError,
     NotAMemberError, SubscriptionEvent)
-from mailman.interfaces.template import ITemplateLoader
 from mailman.interfaces.user import IUser
 from mailman.interfaces.usermanager import IUserManager
-from mailman.utilities.string import expand
 from public import public
 from zope.component import getUtility
 
@@ -131,16 +126,7 @@ def delete_member(mlist, email, admin_notif=None, userack=None):
     # ...and to the administrator.
     if admin_notif:
         user = getUtility(IUserManager).get_user(email)
-        display_name = user.display_name
-        subject = _('$mlist.display_name unsubscription notification')
-        text = expand(getUtility(ITemplateLoader).get(
-            'list:admin:notice:unsubscribe', mlist),
-            mlist, dict(
-                member=formataddr((display_name, email)),
-                ))
-        msg = OwnerNotification(mlist, subject, text,
-                                roster=mlist.administrators)
-        msg.send(mlist)
+        send_admin_unsubscription_notice(mlist, email, user.display_name)
 
 
 @public
@@ -22,14 +22,18 @@ import logging
 
 from email.utils import formatdate, getaddresses, make_msgid
 from mailman.app.membership import delete_member
+from mailman.app.notifications import (
+    collect_admin_notices, send_admin_notices)
 from mailman.config import config
 from mailman.core.i18n import _
 from mailman.email.message import UserNotification
 from mailman.interfaces.action import Action
 from mailman.interfaces.listmanager import ListDeletingEvent
-from mailman.interfaces.member import NotAMemberError
+from mailman.interfaces.member import AlreadySubscribedError, NotAMemberError
 from mailman.interfaces.messages import IMessageStore
+from mailman.interfaces.pending import IPendings
 from mailman.interfaces.requests import IListRequests, RequestType
+from mailman.interfaces.subscriptions import ISubscriptionManager
 from mailman.interfaces.template import ITemplateLoader
 from mailman.utilities.datetime import now
 from mailman.utilities.string import expand, wrap
@@ -38,11 +42,52 @@ from zope.component import getUtility
 
 
 NL = '\n'
+SPACE = ' '
+# The number of characters of a held message's text shown in its summary.
+EXCERPT_LENGTH = 200
+# The number of requests handled in each transaction by the bulk moderation
+# functions.
+BATCH_SIZE = 100
 
 vlog = logging.getLogger('mailman.vette')
 slog = logging.getLogger('mailman.subscribe')
 
 
+def _excerpt(msg):
+    # Return the start of the message's first text/plain part, with its
+    # whitespace collapsed.
+    for part in msg.walk():
+        if part.get_content_type() != 'text/plain':
+            continue
+        if part.get_content_disposition() == 'attachment':
+            continue
+        payload = part.get_payload(decode=True)
+        if payload is None:
+            continue
+        charset = part.get_content_charset('us-ascii')
+        try:
+            text = payload.decode(charset, 'replace')
+        except LookupError:
+            text = payload.decode('us-ascii', 'replace')
+        return SPACE.join(text.split())[:EXCERPT_LENGTH]
+    return ''
+
+
+def _summarize(msg, msgdata):
+    # The summary lets the moderation interfaces list the held messages
+    # without loading them from the message store.
+    size = msgdata.get('original_size', getattr(msg, 'original_size', None))
+    return dict(
+        message_id=msgdata['_mod_message_id'],
+        sender=msgdata['_mod_sender'],
+        subject=msgdata['_mod_subject'],
+        reason=msgdata['_mod_reason'],
+        hold_date=msgdata['_mod_hold_date'],
+        size=len(msg.as_string()) if size is None else size,
+        excerpt=_excerpt(msg),
+        )
+
+
 @public
 def hold_message(mlist, msg, msgdata=None, reason=None):
     """Hold a message for moderator approval.
@@ -86,10 +131,37 @@ def hold_message(mlist, msg, msgdata=None, reason=None):
     # Now hold this request.  We'll use the message_id as the key.
     requestsdb = IListRequests(mlist)
     request_id = requestsdb.hold_request(
-        RequestType.held_message, message_id, msgdata)
+        RequestType.held_message, message_id, msgdata,
+        _summarize(msg, msgdata))
     return request_id
 
 
+@public
+def held_message_summary(mlist, request):
+    """Return the summary of a held message.
+
+    The summary of messages held before summaries were recorded is built
+    from the held message instead, so every summary has the same keys.
+
+    :param mlist: The mailing list.
+    :param request: The held message request, as returned by
+        `IListRequests.of_type()`.
+    :return: The summary, or None if the held message is missing.
+    :rtype: dict
+    """
+    summary = request.summary
+    if summary is not None:
+        return summary
+    results = IListRequests(mlist).get_request(request.id)
+    if results is None:
+        return None
+    key, data = results
+    msg = getUtility(IMessageStore).get_message_by_id(key)
+    if msg is None:
+        return None
+    return _summarize(msg, data)
+
+
 @public
 def handle_message(mlist, id, action, comment=None, forward=None):
     message_store = getUtility(IMessageStore)
@@ -180,6 +252,172 @@ def handle_message(mlist, id, action, comment=None, forward=None):
         vlog.info(note, mlist.fqdn_listname, rejection, sender, subject)
 
 
+@public
+def find_held_messages(mlist, sender=None, reason=None):
+    """Find the held messages of a mailing list.
+
+    :param mlist: The mailing list.
+    :param sender: If given, only the messages from this sender are found.
+        The addresses are compared case-insensitively.
+    :param reason: If given, only the messages held for this reason are
+        found.
+    :return: The ids of the held message requests.
+    :rtype: list of int
+    """
+    requestdb = IListRequests(mlist)
+    if sender is not None:
+        sender = sender.lower()
+    ids = []
+    for request in requestdb.of_type(RequestType.held_message):
+        summary = request.summary
+        if summary is None:
+            # The message was held before summaries were recorded.
+            results = requestdb.get_request(request.id)
+            if results is None:
+                continue
+            key, data = results
+            summary = dict(
+                sender=data['_mod_sender'], reason=data['_mod_reason'])
+        if sender is not None and summary['sender'].lower() != sender:
+            continue
+        if reason is not None and summary['reason'] != reason:
+            continue
+        ids.append(request.id)
+    return ids
+
+
+def _handle_in_batches(mlist, keys, handle, batch_size, progress):
+    # Handle the requests, committing every batch of them and then sending
+    # the administrators a single notice of the batch's membership changes.
+    keys = list(keys)
+    skipped = []
+    with collect_admin_notices(mlist) as notices:
+        for start in range(0, len(keys), batch_size):
+            for key in keys[start:start + batch_size]:
+                if not handle(key):
+                    skipped.append(key)
+            config.db.commit()
+            send_admin_notices(mlist, notices)
+            if progress is not None:
+                progress(min(start + batch_size, len(keys)), len(keys))
+    return skipped
+
+
+@public
+def handle_messages(mlist, ids, action, comment=None, forward=None,
+                    batch_size=BATCH_SIZE, progress=None):
+    """Handle a number of held messages with the same action.
+
+    The messages are handled like with `handle_message()`, and the
+    transaction is committed after every batch of them.
+
+    :param mlist: The mailing list.
+    :param ids: The ids of the held message requests.
+    :param action: The `Action` to take.
+    :param comment: The reason given to the senders of rejected messages.
+    :param forward: The addresses to forward the messages to.
+    :param batch_size: The number of messages handled in each transaction.
+    :param progress: If given, called after every batch with the number of
+        handled requests and the total number of requests.
+    :return: The ids which are not held messages of the mailing list.
+    :rtype: list of int
+    """
+    requestdb = IListRequests(mlist)
+
+    def handle(request_id):
+        if requestdb.get_request(
+                request_id, RequestType.held_message) is None:
+            return False
+        handle_message(mlist, request_id, action, comment, forward)
+        return True
+
+    return _handle_in_batches(mlist, ids, handle, batch_size, progress)
+
+
+@public
+def find_subscription_requests(mlist, email=None):
+    """Find the subscription requests of a mailing list.
+
+    :param mlist: The mailing list.
+    :param email: If given, only the requests of this address are found.  The
+        addresses are compared case-insensitively.
+    :return: The tokens of the subscription requests.
+    :rtype: list of str
+    """
+    if email is not None:
+        email = email.lower()
+    return [
+        token for token, pendable in getUtility(IPendings).find(
+            mlist=mlist, pend_type='subscription')
+        if email is None or pendable.get('email', '').lower() == email
+        ]
+
+
+@public
+def handle_subscription(mlist, token, action, comment=None):
+    """Handle a subscription request.
+
+    :param mlist: The mailing list.
+    :param token: The token of the subscription request.
+    :param action: The `Action` to take.
+    :param comment: The reason given to the subscriber if the request is
+        rejected.
+    :raises LookupError: if the token is not a pending subscription request
+        of the mailing list.
+    :raises AlreadySubscribedError: if the request is accepted and the address
+        is already subscribed.
+    """
+    pendings = getUtility(IPendings)
+    pendable = pendings.confirm(token, expunge=False)
+    if (pendable is None
+            or pendable.get('type') != 'subscription'
+            or pendable.get('list_id') != mlist.list_id):
+        raise LookupError(token)
+    if action in (Action.defer, Action.hold):
+        # Nothing to do.
+        pass
+    elif action is Action.accept:
+        ISubscriptionManager(mlist).confirm(token)
+    elif action in (Action.discard, Action.reject):
+        pendings.confirm(token, expunge=True)
+        if action is Action.reject:
+            send_rejection(
+                mlist, _('Subscription request'), pendable['email'],
+                comment or _('[No reason given]'))
+    else:
+        raise AssertionError('Unexpected action: {}'.format(action))
+
+
+@public
+def handle_subscriptions(mlist, tokens, action, comment=None,
+                         batch_size=BATCH_SIZE, progress=None):
+    """Handle a number of subscription requests with the same action.
+
+    The requests are handled like with `handle_subscription()`, and the
+    transaction is committed after every batch of them.  The administrators
+    get a single notice of the members subscribed by each batch.
+
+    :param mlist: The mailing list.
+    :param tokens: The tokens of the subscription requests.
+    :param action: The `Action` to take.
+    :param comment: The reason given to the subscribers of rejected requests.
+    :param batch_size: The number of requests handled in each transaction.
+    :param progress: If given, called after every batch with the number of
+        handled requests and the total number of requests.
+    :return: The tokens which are not pending subscription requests of the
+        mailing list, or whose address is already subscribed.
+    :rtype: list of str
+    """
+    def handle(token):
+        try:
+            handle_subscription(mlist, token, action, comment)
+        except (LookupError, AlreadySubscribedError):
+            return False
+        return True
+
+    return _handle_in_batches(mlist, tokens, handle, batch_size, progress)
+
+
 @public
 def hold_unsubscription(mlist, email):
     data = dict(email=email)
@@ -19,6 +19,7 @@
 
 import logging
 
+from contextlib import contextmanager
 from email.utils import formataddr
 from lazr.config import as_boolean
 from mailman.config import config
@@ -31,8 +32,24 @@ from public import public
 from zope.component import getUtility
 
 
+NL = '\n'
+
 log = logging.getLogger('mailman.error')
 
+# The administrator notices being collected, by list-id.  See
+# `collect_admin_notices()`.
+_collected_notices = {}
+
+
+def _send_admin_notice(mlist, subject, text):
+    notices = _collected_notices.get(mlist.list_id)
+    if notices is None:
+        msg = OwnerNotification(
+            mlist, subject, text, roster=mlist.administrators)
+        msg.send(mlist)
+    else:
+        notices.append((subject, text))
+
 
 @public
 def send_welcome_message(mlist, member, language, text=''):
@@ -115,5 +132,72 @@ def send_admin_subscription_notice(mlist, address, display_name):
         mlist, dict(
             member=formataddr((display_name, address)),
             ))
+    _send_admin_notice(mlist, subject, text)
+
+
+@public
+def send_admin_unsubscription_notice(mlist, address, display_name):
+    """Send the list administrators an unsubscription notice.
+
+    :param mlist: The mailing list.
+    :type mlist: IMailingList
+    :param address: The address being unsubscribed.
+    :type address: string
+    :param display_name: The name of the unsubscriber.
+    :type display_name: string
+    """
+    subject = _('$mlist.display_name unsubscription notification')
+    text = expand(
+        getUtility(ITemplateLoader).get(
+            'list:admin:notice:unsubscribe', mlist),
+        mlist, dict(
+            member=formataddr((display_name, address)),
+            ))
+    _send_admin_notice(mlist, subject, text)
+
+
+@public
+@contextmanager
+def collect_admin_notices(mlist):
+    """Collect the membership change notices of the list administrators.
+
+    While the context is active, the subscription and unsubscription notices
+    of the mailing list are collected in the yielded list instead of being
+    sent.  Pass the list to `send_admin_notices()` to send them.
+
+    :param mlist: The mailing list.
+    :type mlist: IMailingList
+    """
+    if mlist.list_id in _collected_notices:
+        # The notices are already being collected.
+        yield _collected_notices[mlist.list_id]
+        return
+    notices = _collected_notices[mlist.list_id] = []
+    try:
+        yield notices
+    finally:
+        del _collected_notices[mlist.list_id]
+
+
+@public
+def send_admin_notices(mlist, notices):
+    """Send the list administrators the collected notices as one message.
+
+    The notices are removed from the list.
+
+    :param mlist: The mailing list.
+    :type mlist: IMailingList
+    :param notices: The notices collected by `collect_admin_notices()`.
+    :type notices: list
+    """
+    if len(notices) == 0:
+        return
+    if len(notices) == 1:
+        subject, text = notices[0]
+    else:
+        with _.using(mlist.preferred_language.code):
+            subject = _('$mlist.display_name membership change notification')
+        text = NL.join(text for subject, text in notices)
+    del notices[:]
     msg = OwnerNotification(mlist, subject, text, roster=mlist.administrators)
     msg.send(mlist)
@@ -24,17 +24,19 @@ import tempfile
 import unittest
 
 from mailman.app.bounces import (
-    ProbeVERP, StandardVERP, bounce_message, maybe_forward, send_probe)
+    ProbeVERP, StandardVERP, bounce_message, maybe_forward, process_bounces,
+    send_probe)
 from mailman.app.lifecycle import create_list
 from mailman.config import config
-from mailman.interfaces.bounce import UnrecognizedBounceDisposition
+from mailman.interfaces.bounce import (
+    BounceAction, IBounceProcessor, UnrecognizedBounceDisposition)
 from mailman.interfaces.languages import ILanguageManager
-from mailman.interfaces.member import MemberRole
+from mailman.interfaces.member import DeliveryStatus, MemberRole
 from mailman.interfaces.pending import IPendings
 from mailman.interfaces.usermanager import IUserManager
 from mailman.testing.helpers import (
-    LogFileMark, get_queue_messages, specialized_message_from_string as mfs,
-    subscribe)
+    LogFileMark, configuration, get_queue_messages,
+    specialized_message_from_string as mfs, subscribe)
 from mailman.testing.layers import ConfigLayer
 from zope.component import getUtility
 
@@ -526,3 +528,50 @@ Subject: Ignore
         bounce_message(self._mlist, self._msg)
         # Nothing in the virgin queue means nothing's been bounced.
         get_queue_messages('virgin', expected_count=0)
+
+
+class TestProcessBounces(unittest.TestCase):
+    """Test the `mailman.app.bounces.process_bounces()` function."""
+
+    layer = ConfigLayer
+
+    def setUp(self):
+        self._mlist = create_list('test@example.com')
+        self._mlist.send_welcome_message = False
+        self._member = subscribe(self._mlist, 'Anne', email='anne@example.com')
+        msg = mfs("""\
+From: mail-daemon@example.com
+To: test-bounces+anne=example.com@example.com
+Message-ID: <first>
+
+""")
+        processor = getUtility(IBounceProcessor)
+        for i in range(5):
+            processor.register(self._mlist, 'anne@example.com', msg)
+
+    def test_disable(self):
+        mark = LogFileMark('mailman.bounce')
+        actions = process_bounces()
+        self.assertEqual(actions, [(self._member, BounceAction.disable)])
+        self.assertEqual(
+            self._member.delivery_status, DeliveryStatus.by_bounces)
+        self.assertEqual(
+            mark.readline()[-60:-1],
+            'test.example.com: disabled anne@example.com, bounce score 5')
+        get_queue_messages('virgin', expected_count=0)
+
+    @configuration('mta', verp_probes='yes')
+    def test_probe(self):
+        actions = process_bounces()
+        self.assertEqual(actions, [(self._member, BounceAction.probe)])
+        self.assertEqual(self._member.delivery_status, DeliveryStatus.enabled)
+        items = get_queue_messages('virgin', expected_count=1)
+        probe = items[0].msg
+        self.assertEqual(probe['to'], 'anne@example.com')
+        self.assertTrue(
+            items[0].msgdata['envsender'].startswith('test-bounces+'))
+        # The bounces are summarized in place of the bouncing message.
+        sample = probe.get_payload(1).get_payload(0)
+        self.assertEqual(sample.get_payload(), """\
+The Test mailing list has registered bounces from anne@example.com, \
+the last one on 2005-08-01 07:49:23.""")
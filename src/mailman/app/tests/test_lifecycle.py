@@ -22,7 +22,7 @@ import shutil
 import unittest
 
 from mailman.app.lifecycle import (
-    InvalidListNameError, create_list, remove_list)
+    InvalidListNameError, create_list, deferred_mta_updates, remove_list)
 from mailman.interfaces.address import InvalidEmailAddressError
 from mailman.interfaces.domain import BadDomainSpecificationError
 from mailman.interfaces.listmanager import IListManager
@@ -31,6 +31,21 @@ from mailman.testing.layers import ConfigLayer
 from zope.component import getUtility
 
 
+class RecordingMTA:
+    """Record the calls made to the MTA."""
+
+    calls = []
+
+    def create(self, mlist):
+        self.calls.append(('create', mlist.list_id))
+
+    def delete(self, mlist):
+        self.calls.append(('delete', mlist.list_id))
+
+    def regenerate(self, directory=None):
+        self.calls.append(('regenerate',))
+
+
 class TestLifecycle(unittest.TestCase):
     """Test the high level list lifecycle API."""
 
@@ -96,3 +111,62 @@ class TestLifecycle(unittest.TestCase):
         shutil.rmtree(mlist.data_path)
         remove_list(mlist)
         self.assertIsNone(getUtility(IListManager).get('ant@example.com'))
+
+
+class TestDeferredMTAUpdates(unittest.TestCase):
+    """Test coalescing the MTA updates."""
+
+    layer = ConfigLayer
+
+    def setUp(self):
+        RecordingMTA.calls = []
+
+    @configuration(
+        'mta', incoming='mailman.app.tests.test_lifecycle.RecordingMTA')
+    def test_immediate_updates(self):
+        mlist = create_list('ant@example.com')
+        remove_list(mlist)
+        self.assertEqual(RecordingMTA.calls, [
+            ('create', 'ant.example.com'),
+            ('delete', 'ant.example.com'),
+            ])
+
+    @configuration(
+        'mta', incoming='mailman.app.tests.test_lifecycle.RecordingMTA')
+    def test_deferred_updates(self):
+        # The MTA maps are regenerated once, at the end of the block.
+        with deferred_mta_updates():
+            create_list('ant@example.com')
+            mlist = create_list('bee@example.com')
+            remove_list(mlist)
+            self.assertEqual(RecordingMTA.calls, [])
+        self.assertEqual(RecordingMTA.calls, [('regenerate',)])
+
+    @configuration(
+        'mta', incoming='mailman.app.tests.test_lifecycle.RecordingMTA')
+    def test_nested_deferred_updates(self):
+        with deferred_mta_updates():
+            with deferred_mta_updates():
+                create_list('ant@example.com')
+            self.assertEqual(RecordingMTA.calls, [])
+        self.assertEqual(RecordingMTA.calls, [('regenerate',)])
+
+    @configuration(
+        'mta', incoming='mailman.app.tests.test_lifecycle.RecordingMTA')
+    def test_no_changes(self):
+        with deferred_mta_updates():
+            pass
+        self.assertEqual(RecordingMTA.calls, [])
+
+    @configuration(
+        'mta', incoming='mailman.app.tests.test_lifecycle.RecordingMTA')
+    def test_error(self):
+        # The maps aren't regenerated when the block fails.
+        with self.assertRaises(InvalidListNameError):
+            with deferred_mta_updates():
+                create_list('ant@example.com')
+                create_list('my/list@example.com')
+        self.assertEqual(RecordingMTA.calls, [])
+        # But later changes are passed on again.
+        create_list('bee@example.com')
+        self.assertEqual(RecordingMTA.calls, [('create', 'bee.example.com')])
@@ -19,13 +19,17 @@
 
 import unittest
 
+from base64 import b64encode
 from mailman.app.lifecycle import create_list
 from mailman.app.moderator import (
-    handle_message, handle_unsubscription, hold_message, hold_unsubscription)
+    find_held_messages, find_subscription_requests, handle_message,
+    handle_messages, handle_subscriptions, handle_unsubscription,
+    held_message_summary, hold_message, hold_unsubscription)
 from mailman.interfaces.action import Action
+from mailman.interfaces.mailinglist import SubscriptionPolicy
 from mailman.interfaces.member import MemberRole
 from mailman.interfaces.messages import IMessageStore
-from mailman.interfaces.requests import IListRequests
+from mailman.interfaces.requests import IListRequests, RequestType
 from mailman.interfaces.subscriptions import ISubscriptionManager
 from mailman.interfaces.usermanager import IUserManager
 from mailman.runners.incoming import IncomingRunner
@@ -146,6 +150,208 @@ Message-ID: <alpha>
         message = getUtility(IMessageStore).get_message_by_id('<alpha>')
         self.assertEqual(message['subject'], 'hold me')
 
+    def test_held_message_summary(self):
+        # A summary of the held message is recorded along with the request.
+        msg = mfs("""\
+From: anne@example.com
+To: test@example.com
+Subject: hold me
+Message-ID: <beta>
+MIME-Version: 1.0
+Content-Type: multipart/mixed; boundary="BOUNDARY"
+
+--BOUNDARY
+Content-Type: text/html
+
+<p>Not this one.</p>
+--BOUNDARY
+Content-Type: text/plain; charset="utf-8"
+Content-Transfer-Encoding: base64
+
+{}
+--BOUNDARY--
+""".format(b64encode(('caf\xe9\n\n  ' + 'x' * 300).encode('utf-8')).decode()))
+        request_id = hold_message(
+            self._mlist, msg, dict(original_size=4321), 'Because')
+        request = self._request_db.of_type(RequestType.held_message)[0]
+        self.assertEqual(request.id, request_id)
+        summary = request.summary
+        self.assertEqual(summary['excerpt'], 'caf\xe9 ' + 'x' * 195)
+        del summary['excerpt']
+        self.assertEqual(summary, dict(
+            message_id='<beta>',
+            sender='anne@example.com',
+            subject='hold me',
+            reason='Because',
+            hold_date=now().isoformat(),
+            size=4321,
+            ))
+
+    def test_held_message_summary_without_text(self):
+        request_id = hold_message(self._mlist, self._msg)
+        request = self._request_db.of_type(RequestType.held_message)[0]
+        self.assertEqual(request.id, request_id)
+        self.assertEqual(request.summary['excerpt'], '')
+        self.assertEqual(request.summary['size'], self._msg.original_size)
+
+    def test_held_message_summary_of_old_request(self):
+        # Messages held before summaries were recorded are summarized from
+        # their request data and the held message.
+        getUtility(IMessageStore).add(self._msg)
+        request_id = self._request_db.hold_request(
+            RequestType.held_message, '<alpha>', dict(
+                _mod_message_id='<alpha>',
+                _mod_sender='anne@example.com',
+                _mod_subject='hold me',
+                _mod_reason='Because',
+                _mod_hold_date='2005-08-01T07:49:23',
+                original_size=1234,
+                ))
+        request = self._request_db.of_type(RequestType.held_message)[0]
+        self.assertIsNone(request.summary)
+        self.assertEqual(held_message_summary(self._mlist, request), dict(
+            message_id='<alpha>',
+            sender='anne@example.com',
+            subject='hold me',
+            reason='Because',
+            hold_date='2005-08-01T07:49:23',
+            size=1234,
+            excerpt='',
+            ))
+        # The summary can't be built without the held message.
+        getUtility(IMessageStore).delete_message('<alpha>')
+        self.assertIsNone(held_message_summary(self._mlist, request))
+        self._request_db.delete_request(request_id)
+        self.assertIsNone(held_message_summary(self._mlist, request))
+
+    def _hold(self, message_id, sender, reason=None):
+        del self._msg['message-id']
+        self._msg['Message-ID'] = message_id
+        del self._msg['from']
+        self._msg['From'] = sender
+        return hold_message(self._mlist, self._msg, reason=reason)
+
+    def test_handle_messages(self):
+        # Many held messages are handled at once, in batches.
+        ids = [self._hold('<{}>'.format(index), 'anne@example.com')
+               for index in range(3)]
+        progress = []
+        skipped = handle_messages(
+            self._mlist, [ids[0], ids[1], 801, ids[2]], Action.discard,
+            batch_size=3,
+            progress=lambda done, total: progress.append((done, total)))
+        self.assertEqual(skipped, [801])
+        self.assertEqual(progress, [(3, 4), (4, 4)])
+        self.assertEqual(self._request_db.count, 0)
+
+    def test_handle_messages_defer(self):
+        request_id = self._hold('<beta>', 'anne@example.com')
+        skipped = handle_messages(self._mlist, [request_id], Action.defer)
+        self.assertEqual(skipped, [])
+        self.assertEqual(self._request_db.count, 1)
+
+    def test_handle_messages_of_another_list(self):
+        # Only the held messages of the mailing list are handled.
+        request_id = self._hold('<beta>', 'anne@example.com')
+        mlist = create_list('other@example.com')
+        skipped = handle_messages(mlist, [request_id], Action.discard)
+        self.assertEqual(skipped, [request_id])
+        self.assertEqual(self._request_db.count, 1)
+
+    def test_find_held_messages(self):
+        anne_spam = self._hold('<ant>', 'anne@example.com', 'Spam')
+        bart_spam = self._hold('<bee>', 'bart@example.com', 'Spam')
+        anne_post = self._hold('<cat>', 'anne@example.com', 'Too big')
+        self.assertEqual(find_held_messages(self._mlist),
+                         [anne_spam, bart_spam, anne_post])
+        self.assertEqual(find_held_messages(self._mlist, 'ANNE@example.com'),
+                         [anne_spam, anne_post])
+        self.assertEqual(find_held_messages(self._mlist, reason='Spam'),
+                         [anne_spam, bart_spam])
+        self.assertEqual(
+            find_held_messages(self._mlist, 'bart@example.com', 'Too big'),
+            [])
+
+
+class TestSubscriptionModeration(unittest.TestCase):
+    """Test the bulk moderation of subscription requests."""
+
+    layer = SMTPLayer
+
+    def setUp(self):
+        self._mlist = create_list('test@example.com')
+        self._mlist.subscription_policy = SubscriptionPolicy.moderate
+        self._mlist.admin_notify_mchanges = True
+        self._mlist.send_welcome_message = False
+        manager = ISubscriptionManager(self._mlist)
+        user_manager = getUtility(IUserManager)
+        self._tokens = []
+        for name in ('anne', 'bart', 'cris'):
+            address = user_manager.create_address(
+                '{}@example.com'.format(name))
+            token, token_owner, member = manager.register(
+                address, pre_verified=True, pre_confirmed=True)
+            self._tokens.append(token)
+        # Throw away the moderation requests sent to the owners.
+        get_queue_messages('virgin')
+
+    def test_accept(self):
+        # The owners get a single notice of the members subscribed by every
+        # batch.
+        skipped = handle_subscriptions(
+            self._mlist, self._tokens + ['bogus'], Action.accept,
+            batch_size=2)
+        self.assertEqual(skipped, ['bogus'])
+        self.assertEqual(
+            sorted(member.address.email
+                   for member in self._mlist.members.members),
+            ['anne@example.com', 'bart@example.com', 'cris@example.com'])
+        items = get_queue_messages('virgin', expected_count=2)
+        self.assertEqual(items[0].msg['subject'],
+                         'Test membership change notification')
+        self.assertEqual(items[0].msg.get_payload().splitlines(), [
+            'anne@example.com has been successfully subscribed to Test.',
+            '',
+            'bart@example.com has been successfully subscribed to Test.',
+            ])
+        self.assertEqual(items[1].msg['subject'],
+                         'Test subscription notification')
+        self.assertEqual(
+            items[1].msg.get_payload(),
+            'cris@example.com has been successfully subscribed to Test.\n')
+
+    def test_reject(self):
+        skipped = handle_subscriptions(
+            self._mlist, self._tokens[:2], Action.reject, 'No thanks')
+        self.assertEqual(skipped, [])
+        self.assertEqual(self._mlist.members.member_count, 0)
+        self.assertEqual(find_subscription_requests(self._mlist),
+                         [self._tokens[2]])
+        items = get_queue_messages('virgin', expected_count=2)
+        self.assertEqual(sorted(str(item.msg['to']) for item in items),
+                         ['anne@example.com', 'bart@example.com'])
+        self.assertIn('No thanks', items[0].msg.get_payload())
+
+    def test_accept_already_subscribed(self):
+        anne = getUtility(IUserManager).get_address('anne@example.com')
+        self._mlist.subscribe(anne)
+        get_queue_messages('virgin')
+        skipped = handle_subscriptions(
+            self._mlist, self._tokens[:1], Action.accept)
+        self.assertEqual(skipped, self._tokens[:1])
+
+    def test_other_list(self):
+        # The tokens of another mailing list's requests are skipped.
+        mlist = create_list('other@example.com')
+        skipped = handle_subscriptions(mlist, self._tokens, Action.discard)
+        self.assertEqual(skipped, self._tokens)
+        self.assertEqual(len(find_subscription_requests(self._mlist)), 3)
+
+    def test_find_by_email(self):
+        self.assertEqual(
+            find_subscription_requests(self._mlist, 'Bart@example.com'),
+            self._tokens[1:2])
+
 
 class TestUnsubscription(unittest.TestCase):
     """Test unsubscription requests."""
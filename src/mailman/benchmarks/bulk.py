@@ -0,0 +1,163 @@
+# Copyright (C) 2019 by the Free Software Foundation, Inc.
+#
+# This file is part of GNU Mailman.
+#
+# GNU Mailman is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free
+# Software Foundation, either version 3 of the License, or (at your option)
+# any later version.
+#
+# GNU Mailman is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General Public License for
+# more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# GNU Mailman.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Benchmark the bulk delivery recipient chunking strategies.
+
+Run this with `python -m mailman.benchmarks.bulk`.  For every recipient set
+size, a synthetic recipient set is generated where a few large providers hold
+most of the addresses, and each chunking strategy is timed.  Besides the time
+taken, the number of SMTP transactions and the number of (transaction,
+domain) pairs are reported.  The latter is the number of times the upstream
+MTA has to hand a message to a downstream destination, so lower is better.
+"""
+
+import json
+import time
+import click
+import random
+
+from bisect import bisect
+from itertools import accumulate
+from mailman.config import config
+from mailman.core.initialize import INHIBIT_CONFIG_FILE, initialize_1
+from mailman.mta.bulk import BulkDelivery, DomainBulkDelivery
+from public import public
+
+
+PROVIDERS = (
+    'gmail.com',
+    'yahoo.com',
+    'hotmail.com',
+    'outlook.com',
+    'aol.com',
+    'gmx.de',
+    'orange.fr',
+    'yandex.ru',
+    'comcast.net',
+    'web.de',
+    )
+
+
+@public
+def synthetic_recipients(count, domains=1000, seed=0):
+    """Generate a reproducible set of recipient addresses.
+
+    The domains follow a Zipf distribution, so that the first few providers
+    hold most of the recipients and there is a long tail of small domains.
+
+    :param count: The number of recipients.
+    :type count: int
+    :param domains: The number of distinct domains to draw from.
+    :type domains: int
+    :param seed: The random seed.
+    :type seed: int
+    :return: The recipient addresses.
+    :rtype: set of str
+    """
+    generator = random.Random(seed)
+    names = list(PROVIDERS[:domains])
+    tlds = ('com', 'org', 'net', 'de', 'fr', 'uk', 'jp', 'edu', 'io')
+    for index in range(len(names), domains):
+        names.append('example{}.{}'.format(index, tlds[index % len(tlds)]))
+    cumulative = list(accumulate(1 / rank for rank in range(1, domains + 1)))
+    recipients = set()
+    for index in range(count):
+        spot = generator.random() * cumulative[-1]
+        domain = names[min(bisect(cumulative, spot), domains - 1)]
+        recipients.add('user{}@{}'.format(index, domain))
+    return recipients
+
+
+@public
+def measure(agent, recipients, repeat=3):
+    """Time the chunking of a recipient set.
+
+    :param agent: The bulk deliverer to measure.
+    :type agent: `BulkDelivery`
+    :param recipients: The recipient addresses.
+    :type recipients: set of str
+    :param repeat: The number of timing runs; the fastest one is reported.
+    :type repeat: int
+    :return: The measurements.
+    :rtype: dict
+    """
+    timings = []
+    for attempt in range(repeat):
+        start = time.perf_counter()
+        chunks = list(agent.chunkify(recipients))
+        timings.append(time.perf_counter() - start)
+    deliveries = sum(
+        len(set(address.rpartition('@')[2] for address in chunk))
+        for chunk in chunks)
+    return dict(
+        seconds=min(timings),
+        transactions=len(chunks),
+        domain_deliveries=deliveries,
+        )
+
+
+@public
+def run(sizes, domains, max_recipients, repeat=3):
+    """Run the benchmark for every recipient set size and strategy.
+
+    :return: One result dictionary per size and strategy.
+    :rtype: list of dict
+    """
+    strategies = dict(
+        tld=BulkDelivery(max_recipients),
+        domain=DomainBulkDelivery(max_recipients, {}, {}),
+        )
+    results = []
+    for size in sizes:
+        recipients = synthetic_recipients(size, domains)
+        for name, agent in sorted(strategies.items()):
+            result = dict(
+                strategy=name,
+                recipients=size,
+                domains=domains,
+                max_recipients=max_recipients,
+                )
+            result.update(measure(agent, recipients, repeat))
+            results.append(result)
+    return results
+
+
+@click.command(help='Benchmark the bulk delivery chunking strategies.')
+@click.option(
+    '--size', '-s', 'sizes', type=int, multiple=True,
+    default=(1000, 10000, 100000),
+    help='The number of recipients.  May be given multiple times.')
+@click.option(
+    '--domains', '-d', type=int, default=1000,
+    help='The number of distinct recipient domains.')
+@click.option(
+    '--max-recipients', '-m', type=int, default=500,
+    help='The maximum number of recipients per SMTP transaction.')
+@click.option(
+    '--repeat', '-r', type=int, default=3,
+    help='The number of timing runs per measurement.')
+def main(sizes, domains, max_recipients, repeat):
+    # The deliverers only need the default configuration; don't create any
+    # run-time directories for it.
+    config.create_paths = False
+    initialize_1(INHIBIT_CONFIG_FILE)
+    results = run(sizes, domains, max_recipients, repeat)
+    print(json.dumps(results, indent=2, sort_keys=True))
+
+
+if __name__ == '__main__':                          # pragma: nocover
+    main()
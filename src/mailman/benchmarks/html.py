@@ -0,0 +1,171 @@
+# Copyright (C) 2019 by the Free Software Foundation, Inc.
+#
+# This file is part of GNU Mailman.
+#
+# GNU Mailman is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free
+# Software Foundation, either version 3 of the License, or (at your option)
+# any later version.
+#
+# GNU Mailman is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General Public License for
+# more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# GNU Mailman.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Benchmark the HTML to plain text converters.
+
+Run this with `python -m mailman.benchmarks.html`.  Synthetic text/html parts
+of a few sizes, from a short reply to a long newsletter, are converted by each
+converter, and the time of the first conversion and the mean time of the
+others are reported.  The command converter runs the configured
+`html_to_plain_text_command`, so pass a configuration file with `-C` to
+benchmark something other than lynx.
+"""
+
+import json
+import time
+import click
+import random
+
+from mailman.config import config
+from mailman.core.initialize import INHIBIT_CONFIG_FILE, initialize_1
+from mailman.interfaces.mime import HTMLConversionError
+from mailman.utilities.html import (
+    CommandConverter, PythonConverter, WorkerConverter)
+from public import public
+
+
+CONVERTERS = dict(
+    command=CommandConverter,
+    python=PythonConverter,
+    worker=WorkerConverter,
+    )
+
+WORDS = (
+    'mailing', 'list', 'archive', 'member', 'digest', 'message', 'reply',
+    'thread', 'subscribe', 'moderator', 'posting', 'address', 'delivery',
+    'the', 'a', 'of', 'to', 'and', 'in', 'is', 'for', 'with', 'on', 'this',
+    )
+
+
+@public
+def synthetic_html(paragraphs, seed=0):
+    """Generate a reproducible text/html part.
+
+    :param paragraphs: The number of paragraphs.
+    :type paragraphs: int
+    :param seed: The random seed.
+    :type seed: int
+    :return: The HTML.
+    :rtype: str
+    """
+    generator = random.Random(seed)
+
+    def sentence():
+        words = generator.choices(WORDS, k=generator.randint(6, 20))
+        return ' '.join(words).capitalize() + '.'
+
+    body = []
+    for index in range(paragraphs):
+        choice = index % 4
+        if choice == 0:
+            body.append('<p>{} <b>{}</b> {}</p>'.format(
+                sentence(), sentence(), sentence()))
+        elif choice == 1:
+            body.append('<ul>{}</ul>'.format(''.join(
+                '<li>{}</li>'.format(sentence()) for item in range(3))))
+        elif choice == 2:
+            body.append('<p><a href="https://example.com/{}">{}</a> {}</p>'
+                        .format(index, sentence(), sentence()))
+        else:
+            body.append('<blockquote><p>{}</p></blockquote>'.format(
+                sentence()))
+    return (
+        '<html><head><style>p {{ margin: 0; }}</style></head>'
+        '<body>{}</body></html>'.format('\n'.join(body)))
+
+
+@public
+def measure(converter, parts):
+    """Time the conversion of the parts.
+
+    The first conversion is timed separately, since it includes starting any
+    worker processes.
+
+    :param converter: The converter.
+    :type converter: `IHTMLConverter`
+    :param parts: The HTML parts.
+    :type parts: list of str
+    :return: The measurements, or the error which stopped the conversion.
+    :rtype: dict
+    """
+    first, *rest = parts
+    try:
+        start = time.perf_counter()
+        converter.convert(first)
+        first_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        for html in rest:
+            converter.convert(html)
+        seconds = time.perf_counter() - start
+    except HTMLConversionError as error:
+        return dict(error=str(error))
+    finally:
+        converter.close()
+    return dict(
+        first_ms=first_seconds * 1000,
+        ms_per_part=seconds * 1000 / max(len(rest), 1),
+        )
+
+
+@public
+def run(count, sizes, converters):
+    """Run the benchmark for every part size and converter.
+
+    :return: One result dictionary per size and converter.
+    :rtype: list of dict
+    """
+    results = []
+    for size in sizes:
+        parts = [synthetic_html(size, seed) for seed in range(count)]
+        for name in converters:
+            result = dict(
+                converter=name,
+                paragraphs=size,
+                parts=count,
+                bytes=sum(len(html) for html in parts) // count,
+                )
+            result.update(measure(CONVERTERS[name](), parts))
+            results.append(result)
+    return results
+
+
+@click.command(help='Benchmark the HTML to plain text converters.')
+@click.option(
+    '-C', '--config', 'config_file',
+    type=click.Path(exists=True, dir_okay=False, resolve_path=True),
+    help='The Mailman configuration file.')
+@click.option(
+    '--parts', '-n', type=int, default=200,
+    help='The number of parts to convert for every size.')
+@click.option(
+    '--size', '-s', 'sizes', type=int, multiple=True, default=(2, 20, 200),
+    help='The number of paragraphs per part.  May be given multiple times.')
+@click.option(
+    '--converter', '-c', 'converters', multiple=True,
+    type=click.Choice(sorted(CONVERTERS)), default=sorted(CONVERTERS),
+    help='The converter to benchmark.  May be given multiple times.')
+def main(config_file, parts, sizes, converters):
+    # The converters only need the configuration; don't create any run-time
+    # directories for it.
+    config.create_paths = False
+    initialize_1(INHIBIT_CONFIG_FILE if config_file is None else config_file)
+    results = run(parts, sizes, converters)
+    print(json.dumps(results, indent=2, sort_keys=True))
+
+
+if __name__ == '__main__':                          # pragma: nocover
+    main()
@@ -0,0 +1,418 @@
+# Copyright (C) 2019 by the Free Software Foundation, Inc.
+#
+# This file is part of GNU Mailman.
+#
+# GNU Mailman is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free
+# Software Foundation, either version 3 of the License, or (at your option)
+# any later version.
+#
+# GNU Mailman is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General Public License for
+# more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# GNU Mailman.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Benchmark the core message path.
+
+Run this with `python -m mailman.benchmarks.messages`.  It creates a
+throw-away installation in a temporary directory, with an SQLite database and
+local LMTP and SMTP servers which discard everything they receive, and
+measures:
+
+* the rate at which the LMTP server accepts messages;
+* the enqueue and dequeue throughput of a switchboard;
+* the time a posting spends in the incoming, pipeline and outgoing runners,
+  for lists of various sizes, with bulk and with personalized delivery;
+* the generation of a digest;
+* paging through a list's members in the REST API.
+
+The results are printed as JSON, so that runs can be compared.
+"""
+
+import json
+import time
+import click
+import shutil
+import socket
+import smtplib
+import tempfile
+
+from aiosmtpd.controller import Controller
+from aiosmtpd.handlers import Sink
+from base64 import b64encode
+from contextlib import contextmanager
+from mailman.app.digests import maybe_send_digest_now
+from mailman.app.lifecycle import create_list
+from mailman.config import config
+from mailman.core.initialize import (
+    INHIBIT_CONFIG_FILE, initialize_1, initialize_2, initialize_3)
+from mailman.core.switchboard import Switchboard
+from mailman.database.transaction import transaction
+from mailman.interfaces.domain import IDomainManager
+from mailman.interfaces.mailinglist import Personalization
+from mailman.interfaces.member import MemberRole
+from mailman.model.address import Address
+from mailman.model.member import Member
+from mailman.model.preferences import Preferences
+from mailman.runners.digest import DigestRunner
+from mailman.runners.incoming import IncomingRunner
+from mailman.runners.lmtp import LMTPController, LMTPHandler
+from mailman.runners.outgoing import OutgoingRunner
+from mailman.runners.pipeline import PipelineRunner
+from mailman.testing.helpers import (
+    configuration, make_testable_runner,
+    specialized_message_from_string as mfs)
+from public import public
+from wsgiref.util import setup_testing_defaults
+from zope.component import getUtility
+
+
+BENCHMARKS = ('switchboard', 'lmtp', 'delivery', 'digest', 'rest')
+
+BENCHMARK_CONFIG = """\
+[mailman]
+layout: testing
+site_owner: noreply@example.com
+[paths.testing]
+var_dir: {var_dir}
+[mta]
+incoming: mailman.testing.mta.FakeMTA
+"""
+
+MESSAGE = """\
+From: {sender}
+To: {posting_address}
+Subject: Benchmark message {index}
+Message-ID: <benchmark.{index}@example.org>
+
+This is message number {index}.
+"""
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(('localhost', 0))
+        return sock.getsockname()[1]
+
+
+def _member_email(mlist, index):
+    return '{}.member{}@example.org'.format(mlist.list_name, index)
+
+
+def _message(mlist, index):
+    # All messages are posted by the first member.
+    return MESSAGE.format(
+        sender=_member_email(mlist, 0),
+        posting_address=mlist.posting_address,
+        index=index)
+
+
+def _drain(*names):
+    for name in names:
+        switchboard = config.switchboards[name]
+        for filebase in switchboard.files:
+            switchboard.finish(filebase)
+
+
+def _run_runner(runner_class, name):
+    start = time.perf_counter()
+    make_testable_runner(runner_class, name).run()
+    return time.perf_counter() - start
+
+
+@contextmanager
+def _smtp_sink():
+    # A local SMTP server which accepts and discards everything.
+    port = _free_port()
+    controller = Controller(Sink(), hostname='localhost', port=port)
+    controller.start()
+    try:
+        with configuration('mta', smtp_host='localhost', smtp_port=port):
+            yield
+    finally:
+        controller.stop()
+
+
+@public
+@contextmanager
+def benchmark_environment():
+    """Set up a throw-away installation for the benchmarks.
+
+    Like the test suite, everything lives in a temporary directory, but
+    unlike the test suite, ids are not predictable and the log levels are
+    the configured ones.
+    """
+    config.create_paths = False
+    initialize_1(INHIBIT_CONFIG_FILE)
+    var_dir = tempfile.mkdtemp()
+    config.create_paths = True
+    config.push('benchmark', BENCHMARK_CONFIG.format(var_dir=var_dir))
+    try:
+        initialize_2()
+        initialize_3()
+        with transaction():
+            getUtility(IDomainManager).add('example.com')
+        yield
+    finally:
+        config.create_paths = False
+        config.pop('benchmark')
+        shutil.rmtree(var_dir)
+
+
+@public
+def populate(mlist, count, batch_size=1000):
+    """Subscribe addresses to a mailing list in bulk.
+
+    :param mlist: The mailing list.
+    :type mlist: IMailingList
+    :param count: The number of members to add.
+    :type count: int
+    :param batch_size: The number of members added per flush.
+    :type batch_size: int
+    """
+    store = config.db.store
+    for index in range(count):
+        address = Address(
+            _member_email(mlist, index), 'Member {}'.format(index))
+        address.preferences = Preferences()
+        member = Member(MemberRole.member, mlist.list_id, address)
+        member.preferences = Preferences()
+        store.add(address)
+        store.add(member)
+        if index % batch_size == batch_size - 1:
+            store.flush()
+    config.db.commit()
+
+
+@public
+def bench_switchboard(count):
+    """Measure the throughput of a switchboard.
+
+    :param count: The number of messages to enqueue and dequeue.
+    :type count: int
+    :return: The results.
+    :rtype: list of dict
+    """
+    msg = mfs(MESSAGE.format(
+        sender='anne@example.org', posting_address='ant@example.com',
+        index=0))
+    directory = tempfile.mkdtemp()
+    try:
+        switchboard = Switchboard('benchmark', directory)
+        start = time.perf_counter()
+        for index in range(count):
+            switchboard.enqueue(msg, listid='ant.example.com', index=index)
+        enqueued = time.perf_counter()
+        for filebase in switchboard.files:
+            switchboard.dequeue(filebase)
+            switchboard.finish(filebase)
+        dequeued = time.perf_counter()
+    finally:
+        shutil.rmtree(directory)
+    return [
+        dict(benchmark='switchboard', operation='enqueue', messages=count,
+             seconds=enqueued - start, rate=count / (enqueued - start)),
+        dict(benchmark='switchboard', operation='dequeue', messages=count,
+             seconds=dequeued - enqueued, rate=count / (dequeued - enqueued)),
+        ]
+
+
+@public
+def bench_lmtp(mlist, count):
+    """Measure the rate at which the LMTP server accepts postings.
+
+    :param mlist: The mailing list to post to.
+    :type mlist: IMailingList
+    :param count: The number of messages to send.
+    :type count: int
+    :return: The results.
+    :rtype: list of dict
+    """
+    sender = _member_email(mlist, 0)
+    recipients = [mlist.posting_address]
+    texts = [_message(mlist, index) for index in range(count)]
+    # The LMTP server runs in its own thread, and SQLite connections can't be
+    # shared between threads, so don't keep a transaction open in this one.
+    config.db.commit()
+    port = _free_port()
+    controller = LMTPController(
+        LMTPHandler(), hostname='localhost', port=port)
+    controller.start()
+    try:
+        client = smtplib.LMTP('localhost', port)
+        start = time.perf_counter()
+        for text in texts:
+            client.sendmail(sender, recipients, text)
+        seconds = time.perf_counter() - start
+        client.quit()
+    finally:
+        controller.stop()
+        _drain('in')
+    return [dict(benchmark='lmtp', messages=count, seconds=seconds,
+                 rate=count / seconds)]
+
+
+@public
+def bench_delivery(mlist, personalize=Personalization.none):
+    """Measure the time a posting spends in each runner.
+
+    :param mlist: The mailing list to post to.
+    :type mlist: IMailingList
+    :param personalize: The personalization of the delivery.
+    :type personalize: Personalization
+    :return: The results.
+    :rtype: list of dict
+    """
+    mlist.personalize = personalize
+    config.db.commit()
+    config.switchboards['in'].enqueue(
+        mfs(_message(mlist, 0)), listid=mlist.list_id)
+    timings = dict(
+        incoming=_run_runner(IncomingRunner, 'in'),
+        pipeline=_run_runner(PipelineRunner, 'pipeline'),
+        outgoing=_run_runner(OutgoingRunner, 'out'),
+        )
+    _drain('archive', 'virgin', 'shunt', 'bad', 'retry')
+    result = dict(benchmark='delivery', members=mlist.members.member_count,
+                  personalize=personalize.name,
+                  seconds=sum(timings.values()))
+    result.update(timings)
+    return [result]
+
+
+@public
+def bench_digest(mlist, count):
+    """Measure the generation of a digest.
+
+    :param mlist: The mailing list.
+    :type mlist: IMailingList
+    :param count: The number of messages in the digest.
+    :type count: int
+    :return: The results.
+    :rtype: list of dict
+    """
+    # Collect the messages without sending the digest early.
+    mlist.digest_size_threshold = 1e9
+    to_digest = config.handlers['to-digest']
+    for index in range(count):
+        to_digest.process(mlist, mfs(_message(mlist, index)), {})
+    start = time.perf_counter()
+    maybe_send_digest_now(mlist, force=True)
+    make_testable_runner(DigestRunner, 'digest').run()
+    seconds = time.perf_counter() - start
+    _drain('virgin')
+    return [dict(benchmark='digest', members=mlist.members.member_count,
+                 messages=count, seconds=seconds)]
+
+
+@public
+def bench_rest(mlist, count=50):
+    """Measure the paging through a mailing list's members.
+
+    The first, middle and last pages of the list's member roster are
+    requested from an in-process REST application.
+
+    :param mlist: The mailing list.
+    :type mlist: IMailingList
+    :param count: The page size.
+    :type count: int
+    :return: The results.
+    :rtype: list of dict
+    """
+    # The REST resources can only be imported after initialization.
+    from mailman.rest.wsgiapp import make_application
+    application = make_application()
+    credentials = '{}:{}'.format(
+        config.webservice.admin_user, config.webservice.admin_pass)
+    authorization = 'Basic {}'.format(
+        b64encode(credentials.encode('utf-8')).decode('ascii'))
+    members = mlist.members.member_count
+    last_page = max(1, -(-members // count))
+    results = []
+    for name, page in (('first', 1), ('middle', (last_page + 1) // 2),
+                       ('last', last_page)):
+        environ = dict(
+            PATH_INFO='/3.1/lists/{}/roster/member'.format(mlist.list_id),
+            QUERY_STRING='count={}&page={}'.format(count, page),
+            REQUEST_METHOD='GET',
+            HTTP_AUTHORIZATION=authorization,
+            )
+        setup_testing_defaults(environ)
+        start = time.perf_counter()
+        body = b''.join(application(environ, lambda *args: None))
+        seconds = time.perf_counter() - start
+        results.append(dict(
+            benchmark='rest', members=members, page=name, count=count,
+            seconds=seconds, bytes=len(body)))
+    return results
+
+
+@public
+def run(members, messages, benchmarks=BENCHMARKS, personalize_limit=None):
+    """Run the benchmarks.
+
+    :param members: The sizes of the mailing lists to run the list-size
+        dependent benchmarks for.
+    :type members: sequence of int
+    :param messages: The number of messages for the switchboard and LMTP
+        benchmarks, and a tenth of it for the digest benchmark.
+    :type messages: int
+    :param benchmarks: The names of the benchmarks to run.
+    :type benchmarks: sequence of str
+    :param personalize_limit: If given, personalized delivery is only
+        measured for lists with at most this many members.
+    :type personalize_limit: int
+    :return: One dictionary per measurement.
+    :rtype: list of dict
+    """
+    results = []
+    if 'switchboard' in benchmarks:
+        results.extend(bench_switchboard(messages))
+    with _smtp_sink():
+        for size in members:
+            with transaction():
+                mlist = create_list('bench{}@example.com'.format(size))
+            populate(mlist, size)
+            if 'lmtp' in benchmarks and size == min(members):
+                results.extend(bench_lmtp(mlist, messages))
+            if 'delivery' in benchmarks:
+                results.extend(bench_delivery(mlist))
+                if personalize_limit is None or size <= personalize_limit:
+                    results.extend(bench_delivery(
+                        mlist, Personalization.individual))
+            if 'digest' in benchmarks:
+                results.extend(bench_digest(mlist, max(1, messages // 10)))
+            if 'rest' in benchmarks:
+                results.extend(bench_rest(mlist))
+    return results
+
+
+@click.command(help='Benchmark the core message path.')
+@click.option(
+    '--members', '-m', type=int, multiple=True,
+    default=(10, 10000, 100000),
+    help='The number of list members.  May be given multiple times.')
+@click.option(
+    '--messages', '-n', type=int, default=1000,
+    help='The number of messages for the throughput benchmarks.')
+@click.option(
+    '--benchmark', '-b', 'benchmarks', multiple=True,
+    type=click.Choice(BENCHMARKS),
+    help='The benchmark to run; all of them by default.  May be given '
+         'multiple times.')
+@click.option(
+    '--personalize-limit', type=int, default=10000,
+    help='The size of the largest list for which personalized delivery, '
+         'which sends one message per member, is measured.')
+def main(members, messages, benchmarks, personalize_limit):
+    with benchmark_environment():
+        results = run(members, messages, benchmarks or BENCHMARKS,
+                      personalize_limit)
+    print(json.dumps(results, indent=2, sort_keys=True))
+
+
+if __name__ == '__main__':                          # pragma: nocover
+    main()
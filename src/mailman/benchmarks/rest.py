@@ -0,0 +1,155 @@
+# Copyright (C) 2019 by the Free Software Foundation, Inc.
+#
+# This file is part of GNU Mailman.
+#
+# GNU Mailman is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free
+# Software Foundation, either version 3 of the License, or (at your option)
+# any later version.
+#
+# GNU Mailman is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General Public License for
+# more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# GNU Mailman.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Benchmark the serialization of REST collections.
+
+Run this with `python -m mailman.benchmarks.rest`.  For every collection
+size, synthetic member representations are serialized the way the REST API
+used to do it (etags calculated from the `pprint.pformat()` of every entry
+and then of the whole collection, followed by a `json.dumps()` of the
+collection) and with `etag_collection()`.
+"""
+
+import json
+import time
+import click
+import hashlib
+
+from datetime import datetime
+from mailman.config import config
+from mailman.core.initialize import INHIBIT_CONFIG_FILE, initialize_1
+from mailman.interfaces.member import DeliveryMode, MemberRole
+from mailman.rest.helpers import ExtendedEncoder, etag_collection
+from pprint import pformat
+from public import public
+
+
+@public
+def synthetic_entries(count):
+    """Generate member-like resource representations.
+
+    :param count: The number of entries.
+    :type count: int
+    :return: The entries.
+    :rtype: list of dict
+    """
+    base = 'http://localhost:9001/3.1/'
+    entries = []
+    for index in range(count):
+        member_id = '{:032x}'.format(index)
+        entries.append(dict(
+            address='{}addresses/user{}@example.com'.format(base, index),
+            bounce_score=0,
+            delivery_mode=DeliveryMode.regular,
+            display_name='User {}'.format(index),
+            email='user{}@example.com'.format(index),
+            last_bounce_received=datetime(2019, 3, 1, 12, 0, index % 60),
+            list_id='ant.example.com',
+            member_id=member_id,
+            moderation_action=None,
+            role=MemberRole.member,
+            self_link='{}members/{}'.format(base, member_id),
+            subscription_mode='as_address',
+            user='{}users/{:032x}'.format(base, index),
+            ))
+    return entries
+
+
+def _pformat_etag(resource):
+    # The REST API's original etag() implementation.
+    hashfood = pformat(resource).encode('raw-unicode-escape')
+    etag = hashlib.sha1(hashfood).hexdigest()
+    resource['http_etag'] = '"{}"'.format(etag)
+    return json.dumps(resource, cls=ExtendedEncoder)
+
+
+def _pformat_collection(entries):
+    entries = [dict(entry) for entry in entries]
+    [_pformat_etag(entry) for entry in entries]
+    resource = dict(start=0, total_size=len(entries), entries=entries)
+    return _pformat_etag(resource).encode('utf-8')
+
+
+def _streamed_collection(entries):
+    chunks = etag_collection(
+        0, len(entries), (dict(entry) for entry in entries))
+    return b''.join(chunks)
+
+
+STRATEGIES = dict(
+    pformat=_pformat_collection,
+    canonical=_streamed_collection,
+    )
+
+
+@public
+def measure(strategy, entries, repeat=3):
+    """Time the serialization of a collection.
+
+    :param strategy: The serializer to measure.
+    :type strategy: callable
+    :param entries: The entries of the collection.
+    :type entries: list of dict
+    :param repeat: The number of timing runs; the fastest one is reported.
+    :type repeat: int
+    :return: The measurements.
+    :rtype: dict
+    """
+    timings = []
+    for attempt in range(repeat):
+        start = time.perf_counter()
+        body = strategy(entries)
+        timings.append(time.perf_counter() - start)
+    return dict(seconds=min(timings), bytes=len(body))
+
+
+@public
+def run(sizes, repeat=3):
+    """Run the benchmark for every collection size and strategy.
+
+    :return: One result dictionary per size and strategy.
+    :rtype: list of dict
+    """
+    results = []
+    for size in sizes:
+        entries = synthetic_entries(size)
+        for name, strategy in sorted(STRATEGIES.items()):
+            result = dict(strategy=name, entries=size)
+            result.update(measure(strategy, entries, repeat))
+            results.append(result)
+    return results
+
+
+@click.command(help='Benchmark the serialization of REST collections.')
+@click.option(
+    '--size', '-s', 'sizes', type=int, multiple=True,
+    default=(100, 1000, 10000),
+    help='The number of entries.  May be given multiple times.')
+@click.option(
+    '--repeat', '-r', type=int, default=3,
+    help='The number of timing runs per measurement.')
+def main(sizes, repeat):
+    # The serializers only need the default configuration; don't create any
+    # run-time directories for it.
+    config.create_paths = False
+    initialize_1(INHIBIT_CONFIG_FILE)
+    results = run(sizes, repeat)
+    print(json.dumps(results, indent=2, sort_keys=True))
+
+
+if __name__ == '__main__':                          # pragma: nocover
+    main()
@@ -0,0 +1,47 @@
+# Copyright (C) 2019 by the Free Software Foundation, Inc.
+#
+# This file is part of GNU Mailman.
+#
+# GNU Mailman is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free
+# Software Foundation, either version 3 of the License, or (at your option)
+# any later version.
+#
+# GNU Mailman is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General Public License for
+# more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# GNU Mailman.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Test the bulk delivery benchmark."""
+
+import unittest
+
+from mailman.benchmarks.bulk import run, synthetic_recipients
+from mailman.testing.layers import ConfigLayer
+
+
+class TestBulkBenchmark(unittest.TestCase):
+    layer = ConfigLayer
+
+    def test_synthetic_recipients(self):
+        # The recipient sets are reproducible and skewed towards the first
+        # few providers.
+        recipients = synthetic_recipients(1000, domains=50)
+        self.assertEqual(len(recipients), 1000)
+        self.assertEqual(recipients, synthetic_recipients(1000, domains=50))
+        gmail = [address for address in recipients
+                 if address.endswith('@gmail.com')]
+        self.assertGreater(len(gmail), 100)
+
+    def test_run(self):
+        results = run([200], domains=20, max_recipients=50, repeat=1)
+        self.assertEqual(
+            [(result['strategy'], result['recipients'])
+             for result in results],
+            [('domain', 200), ('tld', 200)])
+        domain, tld = results
+        self.assertLessEqual(domain['domain_deliveries'],
+                             tld['domain_deliveries'])
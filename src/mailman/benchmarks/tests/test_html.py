@@ -0,0 +1,47 @@
+# Copyright (C) 2019 by the Free Software Foundation, Inc.
+#
+# This file is part of GNU Mailman.
+#
+# GNU Mailman is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free
+# Software Foundation, either version 3 of the License, or (at your option)
+# any later version.
+#
+# GNU Mailman is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General Public License for
+# more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# GNU Mailman.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Test the HTML converter benchmark."""
+
+import unittest
+
+from mailman.benchmarks.html import run, synthetic_html
+from mailman.testing.helpers import configuration
+from mailman.testing.layers import ConfigLayer
+
+
+class TestHTMLBenchmark(unittest.TestCase):
+    layer = ConfigLayer
+
+    def test_synthetic_html(self):
+        self.assertEqual(synthetic_html(8), synthetic_html(8))
+        self.assertNotEqual(synthetic_html(8), synthetic_html(8, seed=1))
+        self.assertEqual(synthetic_html(8).count('<blockquote>'), 2)
+
+    @configuration('mailman', html_to_plain_text_command='false $filename')
+    def test_run(self):
+        results = run(3, [4], ['command', 'python', 'worker'])
+        self.assertEqual(
+            [(result['converter'], result['paragraphs'])
+             for result in results],
+            [('command', 4), ('python', 4), ('worker', 4)])
+        command, python, worker = results
+        # Failing converters are reported.
+        self.assertIn('error', command)
+        for result in (python, worker):
+            self.assertGreater(result['first_ms'], 0)
+            self.assertGreater(result['ms_per_part'], 0)
@@ -0,0 +1,69 @@
+# Copyright (C) 2019 by the Free Software Foundation, Inc.
+#
+# This file is part of GNU Mailman.
+#
+# GNU Mailman is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free
+# Software Foundation, either version 3 of the License, or (at your option)
+# any later version.
+#
+# GNU Mailman is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General Public License for
+# more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# GNU Mailman.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Test the message path benchmark."""
+
+import json
+import unittest
+
+from mailman.app.lifecycle import create_list
+from mailman.benchmarks.messages import populate, run
+from mailman.config import config
+from mailman.testing.layers import ConfigLayer
+
+
+class TestMessagesBenchmark(unittest.TestCase):
+    layer = ConfigLayer
+
+    def test_populate(self):
+        mlist = create_list('ant@example.com')
+        populate(mlist, 5, batch_size=2)
+        self.assertEqual(mlist.members.member_count, 5)
+        self.assertEqual(
+            mlist.members.get_member('ant.member4@example.org').list_id,
+            'ant.example.com')
+
+    def test_run(self):
+        results = run([3], 4)
+        # The results are serializable.
+        json.dumps(results)
+        self.assertEqual(
+            [(result['benchmark'], result.get('operation'),
+              result.get('personalize'), result.get('page'))
+             for result in results], [
+                ('switchboard', 'enqueue', None, None),
+                ('switchboard', 'dequeue', None, None),
+                ('lmtp', None, None, None),
+                ('delivery', None, 'none', None),
+                ('delivery', None, 'individual', None),
+                ('digest', None, None, None),
+                ('rest', None, None, 'first'),
+                ('rest', None, None, 'middle'),
+                ('rest', None, None, 'last'),
+                ])
+        for result in results:
+            self.assertGreater(result['seconds'], 0)
+        # The benchmarks clean up after themselves.
+        for name in ('in', 'pipeline', 'out', 'virgin', 'archive'):
+            self.assertEqual(config.switchboards[name].files, [], name)
+
+    def test_run_some(self):
+        results = run([3, 5], 2, ('delivery',), personalize_limit=4)
+        self.assertEqual(
+            [(result['members'], result['personalize'])
+             for result in results],
+            [(3, 'none'), (3, 'individual'), (5, 'none')])
@@ -0,0 +1,48 @@
+# Copyright (C) 2019 by the Free Software Foundation, Inc.
+#
+# This file is part of GNU Mailman.
+#
+# GNU Mailman is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free
+# Software Foundation, either version 3 of the License, or (at your option)
+# any later version.
+#
+# GNU Mailman is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General Public License for
+# more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# GNU Mailman.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Test the REST serialization benchmark."""
+
+import json
+import unittest
+
+from mailman.benchmarks.rest import STRATEGIES, run, synthetic_entries
+from mailman.testing.layers import ConfigLayer
+
+
+class TestRESTBenchmark(unittest.TestCase):
+    layer = ConfigLayer
+
+    def test_strategies_agree(self):
+        # Apart from the etags, both strategies serialize the same data.
+        entries = synthetic_entries(5)
+        results = []
+        for name, strategy in sorted(STRATEGIES.items()):
+            resource = json.loads(strategy(entries).decode('utf-8'))
+            del resource['http_etag']
+            for entry in resource['entries']:
+                del entry['http_etag']
+            results.append(resource)
+        self.assertEqual(results[0], results[1])
+        # The input entries are not modified.
+        self.assertNotIn('http_etag', entries[0])
+
+    def test_run(self):
+        results = run([10], repeat=1)
+        self.assertEqual(
+            [(result['strategy'], result['entries']) for result in results],
+            [('canonical', 10), ('pformat', 10)])
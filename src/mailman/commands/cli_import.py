@@ -22,6 +22,7 @@ import click
 import pickle
 
 from contextlib import ExitStack
+from mailman.app.lifecycle import deferred_mta_updates
 from mailman.core.i18n import _
 from mailman.database.transaction import transaction
 from mailman.interfaces.command import ICLISubCommand
@@ -57,6 +58,8 @@ def import21(ctx, listspec, pickle_file):
         ctx.fail(_('No such list: $listspec'))
     with ExitStack() as resources:
         resources.enter_context(hacked_sys_modules('Mailman.Bouncer', Bouncer))
+        # Regenerate the MTA's maps at most once, after the import commits.
+        resources.enter_context(deferred_mta_updates())
         resources.enter_context(transaction())
         while True:
             try:
@@ -20,7 +20,8 @@
 import sys
 import click
 
-from mailman.app.lifecycle import create_list, remove_list
+from mailman.app.lifecycle import (
+    create_list, deferred_mta_updates, remove_list)
 from mailman.core.constants import system_preferences
 from mailman.core.i18n import _
 from mailman.database.transaction import transaction
@@ -181,7 +182,8 @@ def create(ctx, language, owners, notify, quiet, create_domain, fqdn_listname):
             invalid = COMMASPACE.join(sorted(invalid_owners))  # noqa: F841
             ctx.fail(_('Illegal owner addresses: $invalid'))
     try:
-        mlist = create_list(fqdn_listname, owners)
+        with deferred_mta_updates():
+            mlist = create_list(fqdn_listname, owners)
     except InvalidEmailAddressError:
         ctx.fail(_('Illegal list name: $fqdn_listname'))
     except ListAlreadyExistsError:
@@ -236,7 +238,8 @@ def remove(quiet, listspec):
         if not quiet:
             print(_('No such list matching spec: $listspec'))
             sys.exit(0)
-    with transaction():
+    # Commit the removal before the MTA's maps are regenerated.
+    with deferred_mta_updates(), transaction():
         remove_list(mlist)
         if not quiet:
             print(_('Removed list: $listspec'))
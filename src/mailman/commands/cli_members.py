@@ -19,6 +19,7 @@
 
 import click
 
+from contextlib import ExitStack
 from email.utils import formataddr, parseaddr
 from mailman.app.membership import add_member
 from mailman.core.i18n import _
@@ -28,6 +29,8 @@ from mailman.interfaces.listmanager import IListManager
 from mailman.interfaces.member import (
     AlreadySubscribedError, DeliveryMode, DeliveryStatus, MemberRole)
 from mailman.interfaces.subscriptions import RequestRecord
+from mailman.model.member import uid_factory as member_uid_factory
+from mailman.model.user import uid_factory as user_uid_factory
 from mailman.utilities.options import I18nCommand
 from operator import attrgetter
 from public import public
@@ -105,25 +108,34 @@ def display_members(ctx, mlist, role, regular, digest, nomail, outfp):
 
 @transactional
 def add_members(mlist, infp):
-    for line in infp:
-        # Ignore blank lines and lines that start with a '#'.
-        if line.startswith('#') or len(line.strip()) == 0:
-            continue
-        # Parse the line and ensure that the values are unicodes.
-        display_name, email = parseaddr(line)
-        try:
-            add_member(mlist,
-                       RequestRecord(email, display_name,
-                                     DeliveryMode.regular,
-                                     mlist.preferred_language.code))
-        except AlreadySubscribedError:
-            # It's okay if the address is already subscribed, just print a
-            # warning and continue.
-            if not display_name:
-                print(_('Already subscribed (skipping): $email'))
-            else:
-                print(_('Already subscribed (skipping): '
-                        '$display_name <$email>'))
+    # Ignore blank lines and lines that start with a '#'.
+    lines = [line for line in infp
+             if not line.startswith('#') and len(line.strip()) > 0]
+    # Every line may create a user and a member, so reserve their uids in
+    # bulk.
+    with ExitStack() as resources:
+        resources.enter_context(user_uid_factory.reserved(len(lines)))
+        resources.enter_context(member_uid_factory.reserved(len(lines)))
+        for line in lines:
+            _add_member(mlist, line)
+
+
+def _add_member(mlist, line):
+    # Parse the line and ensure that the values are unicodes.
+    display_name, email = parseaddr(line)
+    try:
+        add_member(mlist,
+                   RequestRecord(email, display_name,
+                                 DeliveryMode.regular,
+                                 mlist.preferred_language.code))
+    except AlreadySubscribedError:
+        # It's okay if the address is already subscribed, just print a
+        # warning and continue.
+        if not display_name:
+            print(_('Already subscribed (skipping): $email'))
+        else:
+            print(_('Already subscribed (skipping): '
+                    '$display_name <$email>'))
 
 
 @click.command(
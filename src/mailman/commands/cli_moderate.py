@@ -0,0 +1,120 @@
+# Copyright (C) 2019 by the Free Software Foundation, Inc.
+#
+# This file is part of GNU Mailman.
+#
+# GNU Mailman is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free
+# Software Foundation, either version 3 of the License, or (at your option)
+# any later version.
+#
+# GNU Mailman is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General Public License for
+# more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# GNU Mailman.  If not, see <http://www.gnu.org/licenses/>.
+
+"""The `mailman moderate` subcommand."""
+
+import click
+
+from mailman.app.moderator import (
+    BATCH_SIZE, find_held_messages, find_subscription_requests,
+    handle_messages, handle_subscriptions)
+from mailman.core.i18n import _
+from mailman.interfaces.action import Action
+from mailman.interfaces.command import ICLISubCommand
+from mailman.interfaces.listmanager import IListManager
+from mailman.utilities.options import I18nCommand
+from public import public
+from zope.component import getUtility
+from zope.interface import implementer
+
+
+def _print_progress(done, total):
+    print(_('Handled $done of $total requests'))
+
+
+@click.command(
+    cls=I18nCommand,
+    help=_("""\
+    Moderate held messages or subscription requests in bulk.  Many requests
+    of a mailing list are moderated at once.  Select the requests by their
+    ids, with the filters, or all of them with --all.  The requests are
+    handled in batches, each committed on its own."""))
+@click.option(
+    '--action', '-a',
+    type=click.Choice([action.name for action in Action]), required=True,
+    help=_('The moderation action to take.'))
+@click.option(
+    '--subscriptions', '-s',
+    is_flag=True, default=False,
+    help=_("""\
+    Moderate the subscription requests instead of the held messages."""))
+@click.option(
+    '--request', '-r', 'keys',
+    multiple=True,
+    help=_("""\
+    The request id of a held message, or the token of a subscription request.
+    May be given multiple times."""))
+@click.option(
+    '--sender',
+    help=_("""\
+    Select the held messages from this address, or the subscription requests
+    of this address."""))
+@click.option(
+    '--reason',
+    help=_('Select the held messages which were held for this reason.'))
+@click.option(
+    '--all', 'select_all',
+    is_flag=True, default=False,
+    help=_('Select all the held messages or subscription requests.'))
+@click.option(
+    '--comment', '-c',
+    help=_('The reason given to the senders of rejected requests.'))
+@click.option(
+    '--batch-size', '-b',
+    type=int, default=BATCH_SIZE,
+    help=_('The number of requests handled in each transaction.'))
+@click.argument('listspec')
+@click.pass_context
+def moderate(ctx, action, subscriptions, keys, sender, reason, select_all,
+             comment, batch_size, listspec):
+    mlist = getUtility(IListManager).get(listspec)
+    if mlist is None:
+        ctx.fail(_('No such list: $listspec'))
+    if subscriptions and reason is not None:
+        ctx.fail(_('--reason selects only held messages'))
+    filtered = select_all or sender is not None or reason is not None
+    if len(keys) == 0 and not filtered:
+        ctx.fail(_('No requests selected'))
+    if len(keys) > 0 and filtered:
+        ctx.fail(_('--request cannot be combined with a filter'))
+    action = Action[action]
+    if subscriptions:
+        if len(keys) == 0:
+            keys = find_subscription_requests(mlist, sender)
+        skipped = handle_subscriptions(
+            mlist, keys, action, comment,
+            batch_size=batch_size, progress=_print_progress)
+    else:
+        if len(keys) == 0:
+            keys = find_held_messages(mlist, sender, reason)
+        else:
+            try:
+                keys = [int(key) for key in keys]
+            except ValueError:
+                ctx.fail(_('Held message request ids must be integers'))
+        skipped = handle_messages(
+            mlist, keys, action, comment,
+            batch_size=batch_size, progress=_print_progress)
+    for key in skipped:
+        print(_('Skipped request: $key'))
+
+
+@public
+@implementer(ICLISubCommand)
+class Moderate:
+    name = 'moderate'
+    command = moderate
@@ -0,0 +1,147 @@
+# Copyright (C) 2019 by the Free Software Foundation, Inc.
+#
+# This file is part of GNU Mailman.
+#
+# GNU Mailman is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free
+# Software Foundation, either version 3 of the License, or (at your option)
+# any later version.
+#
+# GNU Mailman is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General Public License for
+# more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# GNU Mailman.  If not, see <http://www.gnu.org/licenses/>.
+
+"""The `mailman pack-messages` subcommand."""
+
+import os
+import click
+
+from mailman.config import config
+from mailman.core.i18n import _
+from mailman.interfaces.command import ICLISubCommand
+from mailman.model.message import Message
+from mailman.model.messagestore import (
+    LOCATOR_RE, PackedStorage, PickleStorage, SEGMENTS_DIR)
+from mailman.utilities.options import I18nCommand
+from public import public
+from zope.interface import implementer
+
+
+def pack_messages(batch_size):
+    """Move the pickled messages into the packed storage.
+
+    The messages are moved in batches, each written to a segment at once and
+    committed before its pickle files are removed.
+
+    :param batch_size: The number of messages moved at a time.
+    :type batch_size: int
+    :return: The number of moved messages, and the Message-IDs of those whose
+        pickle file is missing.
+    :rtype: 2-tuple of int and list of str
+    """
+    pickle_storage = PickleStorage()
+    packed_storage = PackedStorage()
+    store = config.db.store
+    count = 0
+    missing = []
+    last_id = 0
+    while True:
+        rows = store.query(Message).filter(
+            Message.id > last_id).order_by(Message.id).limit(
+            batch_size).all()
+        if len(rows) == 0:
+            break
+        last_id = rows[-1].id
+        pickled = []
+        for row in rows:
+            if LOCATOR_RE.match(row.path):
+                continue
+            try:
+                message = pickle_storage.read(row.path)
+            except FileNotFoundError:
+                missing.append(row.message_id)
+                continue
+            pickled.append((row, message))
+        if len(pickled) == 0:
+            continue
+        paths = [row.path for row, message in pickled]
+        locators = packed_storage.write(
+            [(row.message_id_hash, message) for row, message in pickled])
+        for (row, message), locator in zip(pickled, locators):
+            row.path = locator
+        config.db.commit()
+        for path in paths:
+            pickle_storage.delete(path)
+        count += len(pickled)
+    return count, missing
+
+
+def compact_segments():
+    """Rewrite the segments which hold deleted messages.
+
+    The live records of every segment but the newest are copied to the
+    newest segment, and the old segment is removed.
+
+    :return: The number of compacted segments.
+    :rtype: int
+    """
+    storage = PackedStorage()
+    store = config.db.store
+    count = 0
+    # Never compact the segment which is being appended to.
+    for segment in storage.segments()[:-1]:
+        path = os.path.join(config.MESSAGES_DIR, SEGMENTS_DIR, segment)
+        rows = store.query(Message).filter(Message.path.startswith(
+            '{}/{}:'.format(SEGMENTS_DIR, segment))).all()
+        live = sum(int(LOCATOR_RE.match(row.path).group('size'))
+                   for row in rows)
+        if live >= os.stat(path).st_size:
+            continue
+        if len(rows) > 0:
+            locators = storage.copy([row.path for row in rows])
+            for row, locator in zip(rows, locators):
+                row.path = locator
+            config.db.commit()
+        os.remove(path)
+        count += 1
+    return count
+
+
+@click.command(
+    cls=I18nCommand,
+    help=_("""\
+    Move pickled messages to the packed storage.  The messages of the message
+    store which are pickled into their own files are moved to the packed
+    storage.  Set [messagestore]storage to
+    mailman.model.messagestore.PackedStorage before running this, so that no
+    new pickled messages are stored."""))
+@click.option(
+    '--batch-size', '-b',
+    type=int, default=1000,
+    help=_('The number of messages moved at a time.'))
+@click.option(
+    '--compact', '-c',
+    is_flag=True, default=False,
+    help=_("""\
+    Also reclaim the space of deleted messages by rewriting the segments
+    which hold any.  Readers of the rewritten messages may fail while this
+    runs, so it is best run while Mailman is stopped."""))
+def pack(batch_size, compact):
+    count, missing = pack_messages(batch_size)
+    print(_('Packed $count messages'))
+    for message_id in missing:
+        print(_('Skipping message with a missing file: $message_id'))
+    if compact:
+        segments = compact_segments()                       # noqa: F841
+        print(_('Compacted $segments segments'))
+
+
+@public
+@implementer(ICLISubCommand)
+class PackMessages:
+    name = 'pack-messages'
+    command = pack
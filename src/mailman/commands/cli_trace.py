@@ -0,0 +1,143 @@
+# Copyright (C) 2019 by the Free Software Foundation, Inc.
+#
+# This file is part of GNU Mailman.
+#
+# GNU Mailman is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free
+# Software Foundation, either version 3 of the License, or (at your option)
+# any later version.
+#
+# GNU Mailman is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General Public License for
+# more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# GNU Mailman.  If not, see <http://www.gnu.org/licenses/>.
+
+"""The `mailman trace` subcommand."""
+
+import json
+import click
+
+from collections import deque
+from mailman.core.i18n import _
+from mailman.core.tracing import trace_file
+from mailman.interfaces.command import ICLISubCommand
+from mailman.interfaces.listmanager import IListManager
+from mailman.utilities.options import I18nCommand
+from public import public
+from zope.component import getUtility
+from zope.interface import implementer
+
+
+def read_traces(path, count, list_id=None):
+    """Return the most recent traces.
+
+    :param path: The trace file.
+    :type path: str
+    :param count: The maximum number of traces to return.
+    :type count: int
+    :param list_id: If given, only return traces of this list's messages.
+    :type list_id: str
+    :return: The traces, oldest first.
+    :rtype: list of dict
+    """
+    traces = deque(maxlen=count)
+    with open(path, encoding='utf-8') as fp:
+        for line in fp:
+            try:
+                trace = json.loads(line)
+            except ValueError:
+                # Skip lines truncated by a crash.
+                continue
+            if list_id is None or trace['list_id'] == list_id:
+                traces.append(trace)
+    return list(traces)
+
+
+def summarize(traces):
+    """Aggregate the steps of all traces.
+
+    :return: 5-tuples of the step name, the number of times it was run, the
+        mean and maximum seconds it took, the mean number of queries, and the
+        mean memory it allocated, or None if that wasn't traced.  The slowest
+        steps on average come first.
+    :rtype: list of tuple
+    """
+    totals = {}
+    for trace in traces:
+        for step in trace['steps']:
+            name = '{}/{}'.format(trace['name'], step['step'])
+            total = totals.setdefault(name, dict(
+                count=0, seconds=0.0, max=0.0, queries=0, memory=None))
+            total['count'] += 1
+            total['seconds'] += step['seconds']
+            total['max'] = max(total['max'], step['seconds'])
+            total['queries'] += step['queries']
+            if 'memory' in step:
+                total['memory'] = (total['memory'] or 0) + step['memory']
+    summary = []
+    for name, total in totals.items():
+        count = total['count']
+        memory = total['memory']
+        summary.append((
+            name, count, total['seconds'] / count, total['max'],
+            total['queries'] / count,
+            None if memory is None else memory / count,
+            ))
+    summary.sort(key=lambda row: (-row[2], row[0]))
+    return summary
+
+
+@click.command(
+    cls=I18nCommand,
+    help=_("""\
+    Show the slowest pipeline handlers and chain rules of the most recently
+    traced messages.  See the [tracing] section of the configuration for
+    enabling tracing."""))
+@click.option(
+    '--messages', '-m',
+    type=int, default=100,
+    help=_("""\
+    The number of most recent traces to summarize.  Every pipeline or chain
+    a message went through is a separate trace."""))
+@click.option(
+    '--top', '-t',
+    type=int, default=10,
+    help=_('The number of steps to show.'))
+@click.option(
+    '--list', '-l', 'listspec',
+    help=_("Only summarize the traces of this mailing list's messages."))
+@click.pass_context
+def trace(ctx, messages, top, listspec):
+    list_id = None
+    if listspec is not None:
+        mlist = getUtility(IListManager).get(listspec)
+        if mlist is None:
+            ctx.fail(_('No such list: $listspec'))
+        list_id = mlist.list_id
+    path = trace_file()
+    try:
+        traces = read_traces(path, messages, list_id)
+    except FileNotFoundError:
+        traces = []
+    if len(traces) == 0:
+        print(_('No traces found in $path'))
+        return
+    print('{:>10} {:>10} {:>8} {:>10} {:>6}  {}'.format(
+        _('Mean ms'), _('Max ms'), _('Queries'), _('Memory'), _('Count'),
+        _('Step')))
+    for name, count, mean, maximum, queries, memory in (
+            summarize(traces)[:top]):
+        print('{:10.3f} {:10.3f} {:8.1f} {:>10} {:6d}  {}'.format(
+            mean * 1000, maximum * 1000, queries,
+            '-' if memory is None else '{:.0f}'.format(memory),
+            count, name))
+
+
+@public
+@implementer(ICLISubCommand)
+class Trace:
+    name = 'trace'
+    command = trace
@@ -21,8 +21,10 @@ import unittest
 
 from click.testing import CliRunner
 from mailman.app.lifecycle import create_list
+from mailman.app.tests.test_lifecycle import RecordingMTA
 from mailman.commands.cli_lists import create, remove
 from mailman.interfaces.domain import IDomainManager
+from mailman.testing.helpers import configuration
 from mailman.testing.layers import ConfigLayer
 from zope.component import getUtility
 
@@ -105,6 +107,15 @@ class TestCreate(unittest.TestCase):
             'Try "create --help" for help.\n\n'
             'Error: Undefined domain: example.org\n')
 
+    def test_create_regenerates_mta_maps(self):
+        RecordingMTA.calls = []
+        with configuration(
+                'mta',
+                incoming='mailman.app.tests.test_lifecycle.RecordingMTA'):
+            result = self._command.invoke(create, ('ant@example.com',))
+        self.assertEqual(result.exit_code, 0)
+        self.assertEqual(RecordingMTA.calls, [('regenerate',)])
+
 
 class TestRemove(unittest.TestCase):
     layer = ConfigLayer
@@ -119,3 +130,13 @@ class TestRemove(unittest.TestCase):
         self.assertEqual(
             results.output,
             'No such list matching spec: ant@example.com\n')
+
+    def test_remove_regenerates_mta_maps(self):
+        create_list('ant@example.com')
+        RecordingMTA.calls = []
+        with configuration(
+                'mta',
+                incoming='mailman.app.tests.test_lifecycle.RecordingMTA'):
+            result = self._command.invoke(remove, ('ant@example.com',))
+        self.assertEqual(result.exit_code, 0)
+        self.assertEqual(RecordingMTA.calls, [('regenerate',)])
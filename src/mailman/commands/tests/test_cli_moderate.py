@@ -0,0 +1,133 @@
+# Copyright (C) 2019 by the Free Software Foundation, Inc.
+#
+# This file is part of GNU Mailman.
+#
+# GNU Mailman is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free
+# Software Foundation, either version 3 of the License, or (at your option)
+# any later version.
+#
+# GNU Mailman is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General Public License for
+# more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# GNU Mailman.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Test the `mailman moderate` command."""
+
+import unittest
+
+from click.testing import CliRunner
+from mailman.app.lifecycle import create_list
+from mailman.app.moderator import hold_message
+from mailman.commands.cli_moderate import moderate
+from mailman.interfaces.mailinglist import SubscriptionPolicy
+from mailman.interfaces.requests import IListRequests, RequestType
+from mailman.interfaces.subscriptions import ISubscriptionManager
+from mailman.interfaces.usermanager import IUserManager
+from mailman.testing.helpers import (
+    get_queue_messages, specialized_message_from_string as mfs)
+from mailman.testing.layers import ConfigLayer
+from zope.component import getUtility
+
+
+class TestModerate(unittest.TestCase):
+    layer = ConfigLayer
+
+    def setUp(self):
+        self._command = CliRunner()
+        self._mlist = create_list('ant@example.com')
+        self._requests = IListRequests(self._mlist)
+        self._ids = []
+        for index, sender in enumerate(('anne', 'bart', 'anne')):
+            msg = mfs("""\
+From: {}@example.com
+To: ant@example.com
+Message-ID: <{}>
+
+Buy now.
+""".format(sender, index))
+            self._ids.append(hold_message(self._mlist, msg, reason='Spam'))
+
+    def _held(self):
+        return [request.id for request in
+                self._requests.of_type(RequestType.held_message)]
+
+    def test_discard_by_id(self):
+        result = self._command.invoke(moderate, (
+            '--action', 'discard', '-r', str(self._ids[1]), '-r', '801',
+            'ant.example.com'))
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertEqual(result.output.splitlines(), [
+            'Handled 2 of 2 requests',
+            'Skipped request: 801',
+            ])
+        self.assertEqual(self._held(), [self._ids[0], self._ids[2]])
+
+    def test_discard_by_sender(self):
+        result = self._command.invoke(moderate, (
+            '--action', 'discard', '--sender', 'anne@example.com',
+            '--batch-size', '1', 'ant.example.com'))
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertEqual(result.output.splitlines(), [
+            'Handled 1 of 2 requests',
+            'Handled 2 of 2 requests',
+            ])
+        self.assertEqual(self._held(), [self._ids[1]])
+
+    def test_reject_all(self):
+        result = self._command.invoke(moderate, (
+            '-a', 'reject', '--all', '-c', 'No spam', 'ant.example.com'))
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertEqual(self._held(), [])
+        items = get_queue_messages('virgin', expected_count=3)
+        self.assertIn('No spam', items[0].msg.get_payload())
+
+    def test_no_selection(self):
+        result = self._command.invoke(
+            moderate, ('-a', 'discard', 'ant.example.com'))
+        self.assertEqual(result.exit_code, 2)
+        self.assertIn('No requests selected', result.output)
+        self.assertEqual(len(self._held()), 3)
+
+    def test_ids_and_filter(self):
+        result = self._command.invoke(moderate, (
+            '-a', 'discard', '-r', '1', '--all', 'ant.example.com'))
+        self.assertEqual(result.exit_code, 2)
+        self.assertIn('--request cannot be combined with a filter',
+                      result.output)
+
+    def test_bad_id(self):
+        result = self._command.invoke(
+            moderate, ('-a', 'discard', '-r', 'bogus', 'ant.example.com'))
+        self.assertEqual(result.exit_code, 2)
+        self.assertIn('Held message request ids must be integers',
+                      result.output)
+
+    def test_no_such_list(self):
+        result = self._command.invoke(
+            moderate, ('-a', 'discard', '--all', 'bee.example.com'))
+        self.assertEqual(result.exit_code, 2)
+        self.assertIn('No such list: bee.example.com', result.output)
+
+    def test_subscriptions(self):
+        self._mlist.subscription_policy = SubscriptionPolicy.moderate
+        manager = ISubscriptionManager(self._mlist)
+        user_manager = getUtility(IUserManager)
+        for email in ('anne@example.com', 'bart@example.com'):
+            manager.register(
+                user_manager.create_address(email),
+                pre_verified=True, pre_confirmed=True)
+        result = self._command.invoke(moderate, (
+            '-a', 'accept', '--subscriptions', '--all', 'ant.example.com'))
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertEqual(result.output, 'Handled 2 of 2 requests\n')
+        self.assertEqual(self._mlist.members.member_count, 2)
+
+    def test_subscriptions_by_reason(self):
+        result = self._command.invoke(moderate, (
+            '-a', 'accept', '-s', '--reason', 'Spam', 'ant.example.com'))
+        self.assertEqual(result.exit_code, 2)
+        self.assertIn('--reason selects only held messages', result.output)
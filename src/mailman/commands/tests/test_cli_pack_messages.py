@@ -0,0 +1,108 @@
+# Copyright (C) 2019 by the Free Software Foundation, Inc.
+#
+# This file is part of GNU Mailman.
+#
+# GNU Mailman is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free
+# Software Foundation, either version 3 of the License, or (at your option)
+# any later version.
+#
+# GNU Mailman is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General Public License for
+# more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# GNU Mailman.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Test the `mailman pack-messages` command."""
+
+import os
+import unittest
+
+from click.testing import CliRunner
+from mailman.commands.cli_pack_messages import pack
+from mailman.config import config
+from mailman.interfaces.messages import IMessageStore
+from mailman.model.message import Message
+from mailman.model.messagestore import PackedStorage
+from mailman.testing.helpers import (
+    configuration, specialized_message_from_string as mfs)
+from mailman.testing.layers import ConfigLayer
+from zope.component import getUtility
+
+
+PACKED = 'mailman.model.messagestore.PackedStorage'
+
+
+def _message(message_id):
+    return mfs("""\
+From: anne@example.com
+Message-ID: <{}>
+
+A message.
+""".format(message_id))
+
+
+class TestPackMessages(unittest.TestCase):
+    layer = ConfigLayer
+
+    def setUp(self):
+        self._command = CliRunner()
+        self._store = getUtility(IMessageStore)
+
+    def _paths(self):
+        return {row.message_id: row.path
+                for row in config.db.store.query(Message)}
+
+    def test_pack(self):
+        for message_id in ('ant', 'bee', 'cat'):
+            self._store.add(_message(message_id))
+        pickles = self._paths()
+        os.remove(os.path.join(config.MESSAGES_DIR, pickles['<cat>']))
+        with configuration('messagestore', storage=PACKED):
+            result = self._command.invoke(pack, ('--batch-size', '2'))
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertEqual(result.output.splitlines(), [
+            'Packed 2 messages',
+            'Skipping message with a missing file: <cat>',
+            ])
+        paths = self._paths()
+        self.assertTrue(paths['<ant>'].startswith('segments/00000001:0:'))
+        self.assertTrue(paths['<bee>'].startswith('segments/00000001:'))
+        self.assertEqual(paths['<cat>'], pickles['<cat>'])
+        for message_id in ('<ant>', '<bee>'):
+            self.assertFalse(os.path.exists(
+                os.path.join(config.MESSAGES_DIR, pickles[message_id])))
+            self.assertEqual(
+                self._store.get_message_by_id(message_id)['message-id'],
+                message_id)
+        # Packing again doesn't move anything.
+        result = self._command.invoke(pack)
+        self.assertEqual(result.output.splitlines()[0], 'Packed 0 messages')
+
+    def test_compact(self):
+        with configuration('messagestore', storage=PACKED):
+            self._store.add(_message('ant'))
+            self._store.add(_message('bee'))
+            with configuration('messagestore', segment_size='1'):
+                self._store.add(_message('cat'))
+            self._store.delete_message('<bee>')
+            self.assertEqual(PackedStorage().segments(),
+                             ['00000001', '00000002'])
+            with configuration('messagestore', segment_size='1'):
+                result = self._command.invoke(pack, ('--compact',))
+        self.assertEqual(result.output.splitlines(), [
+            'Packed 0 messages',
+            'Compacted 1 segments',
+            ])
+        # Anne's message was copied to a new segment.
+        self.assertEqual(PackedStorage().segments(), ['00000002', '00000003'])
+        self.assertTrue(
+            self._paths()['<ant>'].startswith('segments/00000003:0:'))
+        self.assertEqual(
+            self._store.get_message_by_id('<ant>')['message-id'], '<ant>')
+        # Nothing is left to compact.
+        result = self._command.invoke(pack, ('--compact',))
+        self.assertEqual(result.output.splitlines()[1],
+                         'Compacted 0 segments')
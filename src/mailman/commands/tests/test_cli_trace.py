@@ -0,0 +1,110 @@
+# Copyright (C) 2019 by the Free Software Foundation, Inc.
+#
+# This file is part of GNU Mailman.
+#
+# GNU Mailman is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free
+# Software Foundation, either version 3 of the License, or (at your option)
+# any later version.
+#
+# GNU Mailman is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General Public License for
+# more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# GNU Mailman.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Test the `mailman trace` command."""
+
+import os
+import json
+import unittest
+
+from click.testing import CliRunner
+from contextlib import suppress
+from mailman.app.lifecycle import create_list
+from mailman.commands.cli_trace import trace
+from mailman.core.tracing import trace_file
+from mailman.testing.layers import ConfigLayer
+
+
+def _trace(list_id, name, *steps):
+    return dict(
+        list_id=list_id, name=name, engine='pipeline', message_id='<ant>',
+        when='2019-01-01T00:00:00',
+        steps=[dict(step=step, seconds=seconds, queries=queries)
+               for step, seconds, queries in steps])
+
+
+class TestTrace(unittest.TestCase):
+    layer = ConfigLayer
+    maxDiff = None
+
+    def setUp(self):
+        self._command = CliRunner()
+        create_list('ant@example.com')
+        self.addCleanup(self._remove_trace_file)
+
+    def _remove_trace_file(self):
+        with suppress(FileNotFoundError):
+            os.remove(trace_file())
+
+    def _write(self, *traces):
+        with open(trace_file(), 'w', encoding='utf-8') as fp:
+            for record in traces:
+                # Strings are written as is, e.g. to fake corrupt lines.
+                if not isinstance(record, str):
+                    record = json.dumps(record)
+                print(record, file=fp)
+
+    def test_no_traces(self):
+        result = self._command.invoke(trace)
+        self.assertEqual(
+            result.output, 'No traces found in {}\n'.format(trace_file()))
+
+    def test_summary(self):
+        self._write(
+            _trace('ant.example.com', 'virgin',
+                   ('cook-headers', 0.002, 0), ('to-outgoing', 0.010, 2)),
+            _trace('ant.example.com', 'virgin',
+                   ('cook-headers', 0.004, 0), ('to-outgoing', 0.020, 3)),
+            )
+        result = self._command.invoke(trace)
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertEqual(result.output.splitlines(), [
+            '   Mean ms     Max ms  Queries     Memory  Count  Step',
+            '    15.000     20.000      2.5          -      2  '
+            'virgin/to-outgoing',
+            '     3.000      4.000      0.0          -      2  '
+            'virgin/cook-headers',
+            ])
+
+    def test_top_and_messages(self):
+        self._write(
+            _trace('ant.example.com', 'virgin',
+                   ('cook-headers', 0.002, 0), ('to-outgoing', 0.010, 2)),
+            _trace('ant.example.com', 'virgin', ('to-outgoing', 0.020, 3)),
+            )
+        result = self._command.invoke(trace, ('--top', '1', '-m', '1'))
+        self.assertEqual(result.output.splitlines()[1:], [
+            '    20.000     20.000      3.0          -      1  '
+            'virgin/to-outgoing',
+            ])
+
+    def test_list(self):
+        self._write(
+            _trace('ant.example.com', 'virgin', ('cook-headers', 0.002, 0)),
+            _trace('bee.example.com', 'virgin', ('to-outgoing', 0.020, 3)),
+            '{"truncated',
+            )
+        result = self._command.invoke(trace, ('--list', 'ant@example.com'))
+        self.assertEqual(result.output.splitlines()[1:], [
+            '     2.000      2.000      0.0          -      1  '
+            'virgin/cook-headers',
+            ])
+
+    def test_no_such_list(self):
+        result = self._command.invoke(trace, ('--list', 'bee@example.com'))
+        self.assertEqual(result.exit_code, 2)
+        self.assertIn('No such list: bee@example.com', result.output)
@@ -18,6 +18,8 @@
 """Application support for chain processing."""
 
 from mailman.config import config
+from mailman.core.metrics import metrics
+from mailman.core.tracing import start_trace
 from mailman.interfaces.chain import IChain, LinkAction
 from mailman.utilities.modules import add_components
 from public import public
@@ -32,6 +34,14 @@ def process(mlist, msg, msgdata, start_chain='default-posting-chain'):
     :param msgdata: The message metadata dictionary.
     :param start_chain: The name of the chain to start the processing with.
     """
+    trace = start_trace(mlist, msg, msgdata, 'chain', start_chain)
+    try:
+        _process(mlist, msg, msgdata, start_chain, trace)
+    finally:
+        trace.finish()
+
+
+def _process(mlist, msg, msgdata, start_chain, trace):
     # Set up some bookkeeping.
     chain_stack = []
     msgdata['rule_hits'] = hits = []
@@ -54,7 +64,10 @@ def process(mlist, msg, msgdata, start_chain='default-posting-chain'):
                 return
             chain, chain_iter = chain_stack.pop()
             continue
-        if link.rule.check(mlist, msg, msgdata):
+        timer = metrics.timer('mailman_rule_seconds', rule=link.rule.name)
+        with timer, trace.step(link.rule.name):
+            matched = link.rule.check(mlist, msg, msgdata)
+        if matched:
             if link.rule.record:
                 hits.append(link.rule.name)
             # The rule matched so run its action.
@@ -22,8 +22,10 @@ import sys
 import stat
 import codecs
 import logging
+import threading
 
-from lazr.config import as_boolean, as_log_level
+from datetime import timedelta
+from lazr.config import as_boolean, as_log_level, as_timedelta
 from mailman.config import config
 from public import public
 
@@ -103,6 +105,112 @@ class ReopenableFileHandler(logging.Handler):
         self._stream = self._open()
 
 
+class _ReopenRequest:
+    """A request to reopen a `BatchedFileHandler`'s file."""
+
+    def __init__(self, filename):
+        self.filename = filename
+
+
+@public
+class BatchedFileHandler(ReopenableFileHandler):
+    """A reopenable file handler which writes records in batches.
+
+    Records are formatted as they are logged, but they are written by a
+    background thread, either when `batch_size` records are pending or at
+    least every `flush_interval` seconds.  Reopening, flushing and closing
+    the handler write all the pending records first.
+
+    Reopening only queues a request, which is carried out by whichever
+    thread writes the pending records next, normally the background thread.
+    This is because the runners reopen their log files from a signal
+    handler, which may interrupt this handler while it holds its locks.
+    """
+
+    def __init__(self, name, filename, batch_size, flush_interval):
+        super().__init__(name, filename)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        # The formatted records, interleaved with _ReopenRequest instances.
+        self._pending = []
+        self._closing = False
+        # The stream lock must always be acquired before the condition, and
+        # nothing that can run in a signal handler may acquire the stream
+        # lock.  The condition's lock is reentrant because a signal handler
+        # may interrupt emit() while it holds the lock.
+        self._stream_lock = threading.RLock()
+        self._condition = threading.Condition(threading.RLock())
+        self._writer = threading.Thread(
+            target=self._write_batches,
+            name='{} log writer'.format(name),
+            daemon=True)
+        self._writer.start()
+
+    def _write_batches(self):
+        while True:
+            with self._condition:
+                if (not self._closing and
+                        len(self._pending) < self.batch_size and
+                        not any(isinstance(msg, _ReopenRequest)
+                                for msg in self._pending)):
+                    self._condition.wait(self.flush_interval)
+                closing = self._closing
+            self.flush()
+            if closing:
+                return
+
+    def emit(self, record):
+        try:
+            msg = self.format(record)
+        except:                                  # noqa: E722 pragma: nocover
+            self.handleError(record)
+            return
+        if not msg.endswith('\n'):
+            msg += '\n'
+        with self._condition:
+            self._pending.append(msg)
+            if len(self._pending) == self.batch_size:
+                self._condition.notify()
+
+    def flush(self):
+        with self._stream_lock:
+            with self._condition:
+                pending, self._pending = self._pending, []
+            # It's possible for the stream to have been closed by the time we
+            # get here, due to the shut down semantics.
+            stream = (self._stream if self._stream else sys.stderr)
+            for msg in pending:
+                if isinstance(msg, _ReopenRequest):
+                    if self._stream:
+                        super().reopen(msg.filename)
+                        stream = self._stream
+                    continue
+                try:
+                    stream.write(msg)
+                except UnicodeError:                # pragma: nocover
+                    stream.write(msg.encode('unicode-escape').decode('ascii'))
+            stream.flush()
+
+    def close(self):
+        with self._condition:
+            self._closing = True
+            self._condition.notify()
+        if threading.current_thread() is not self._writer:
+            self._writer.join()
+        with self._stream_lock:
+            super().close()
+
+    def reopen(self, filename=None):
+        """See `ReopenableFileHandler`.
+
+        The records logged before this call are still written to the old
+        file.  Call `flush()` to reopen the file immediately.
+        """
+        with self._condition:
+            self._pending.append(_ReopenRequest(filename))
+            self._condition.notify()
+
+
 def _init_logger(propagate, sub_name, log, logger_config):
     # Get settings from log configuration file (or defaults).
     log_format = logger_config.format
@@ -118,7 +226,13 @@ def _init_logger(propagate, sub_name, log, logger_config):
     formatter = logging.Formatter(fmt=log_format, datefmt=log_datefmt)
     path_str = logger_config.path
     path_abs = os.path.normpath(os.path.join(config.LOG_DIR, path_str))
-    handler = ReopenableFileHandler(sub_name, path_abs)
+    flush_interval = as_timedelta(logger_config.flush_interval)
+    if flush_interval > timedelta():
+        handler = BatchedFileHandler(
+            sub_name, path_abs, int(logger_config.batch_size),
+            flush_interval.total_seconds())
+    else:
+        handler = ReopenableFileHandler(sub_name, path_abs)
     _handlers[sub_name] = handler
     handler.setFormatter(formatter)
     log.addHandler(handler)
@@ -182,6 +296,6 @@ def get_handler(sub_name):
     :param sub_name: The logger name, sans the 'mailman.' prefix.
     :type sub_name: string
     :return: The file handler associated with the named logger.
-    :rtype: `ReopenableFileHandler`
+    :rtype: `ReopenableFileHandler` or `BatchedFileHandler`
     """
     return _handlers[sub_name]
@@ -0,0 +1,308 @@
+# Copyright (C) 2019 by the Free Software Foundation, Inc.
+#
+# This file is part of GNU Mailman.
+#
+# GNU Mailman is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free
+# Software Foundation, either version 3 of the License, or (at your option)
+# any later version.
+#
+# GNU Mailman is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General Public License for
+# more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# GNU Mailman.  If not, see <http://www.gnu.org/licenses/>.
+
+"""In-process metrics.
+
+Every Mailman process keeps its own registry of counters and timers.  The
+runners are separate processes, so each one periodically dumps a snapshot of
+its registry to the metrics directory, from where the REST server's
+/system/metrics resource collects them.  Optionally, every sample is also sent
+to a statsd server.
+"""
+
+import os
+import json
+import time
+import socket
+import logging
+
+from contextlib import contextmanager, suppress
+from lazr.config import as_boolean, as_timedelta
+from mailman.config import config
+from mailman.interfaces.configuration import ConfigurationUpdatedEvent
+from public import public
+
+
+log = logging.getLogger('mailman.error')
+
+
+@contextmanager
+def _null_timer():
+    yield
+
+
+class _StatsdEmitter:
+    """Send samples to a statsd server over UDP."""
+
+    def __init__(self, host, port, prefix):
+        self._address = (host, port)
+        self._prefix = prefix
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._socket.setblocking(False)
+
+    def _name(self, name, labels):
+        parts = [self._prefix, name] if self._prefix else [name]
+        parts.extend(str(value).replace('.', '_') for key, value in labels)
+        return '.'.join(parts)
+
+    def send(self, name, labels, value, kind):
+        packet = '{}:{}|{}'.format(self._name(name, labels), value, kind)
+        # Metrics are never worth failing or blocking the real work for.
+        with suppress(OSError):
+            self._socket.sendto(packet.encode('utf-8'), self._address)
+
+    def close(self):
+        self._socket.close()
+
+
+@public
+class Metrics:
+    """A registry of counters and timers.
+
+    Samples are identified by a metric name and a set of labels, given as
+    keyword arguments.  When `[metrics]enabled` is false, nothing is
+    recorded.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self._counters = {}
+        self._timers = {}
+        self._statsd = None
+        self._last_dump = None
+
+    def configure(self):
+        """Read the `[metrics]` section of the configuration."""
+        section = config.metrics
+        self.enabled = as_boolean(section.enabled)
+        if self._statsd is not None:
+            self._statsd.close()
+            self._statsd = None
+        if self.enabled and section.statsd_host:
+            self._statsd = _StatsdEmitter(
+                section.statsd_host, int(section.statsd_port),
+                section.statsd_prefix)
+
+    def increment(self, name, value=1, **labels):
+        """Increment a counter.
+
+        :param name: The metric name.
+        :type name: str
+        :param value: The amount to increment the counter by.
+        :type value: int
+        :param labels: The labels of the sample.
+        """
+        if not self.enabled:
+            return
+        key = (name, tuple(sorted(labels.items())))
+        self._counters[key] = self._counters.get(key, 0) + value
+        if self._statsd is not None:
+            self._statsd.send(name, key[1], value, 'c')
+
+    def observe(self, name, seconds, **labels):
+        """Record a duration.
+
+        :param name: The metric name.
+        :type name: str
+        :param seconds: The duration in seconds.
+        :type seconds: float
+        :param labels: The labels of the sample.
+        """
+        if not self.enabled:
+            return
+        key = (name, tuple(sorted(labels.items())))
+        count, total = self._timers.get(key, (0, 0.0))
+        self._timers[key] = (count + 1, total + seconds)
+        if self._statsd is not None:
+            self._statsd.send(
+                name, key[1], '{:.3f}'.format(seconds * 1000), 'ms')
+
+    def timer(self, name, **labels):
+        """Return a context manager which records the duration of its body.
+
+        The duration is recorded even if the body raises an exception.
+        """
+        if not self.enabled:
+            return _null_timer()
+        return self._timer(name, labels)
+
+    @contextmanager
+    def _timer(self, name, labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def value(self, name, **labels):
+        """Return the current value of a counter."""
+        return self._counters.get((name, tuple(sorted(labels.items()))), 0)
+
+    def snapshot(self):
+        """Return the recorded samples.
+
+        :return: A JSON-serializable dictionary with `counters` and `timers`
+            keys.  Every counter is a 3-list of the name, the labels and the
+            value, and every timer is a 4-list of the name, the labels, the
+            number of observations and their sum.
+        :rtype: dict
+        """
+        return dict(
+            counters=[[name, dict(labels), value]
+                      for (name, labels), value
+                      in sorted(self._counters.items())],
+            timers=[[name, dict(labels), count, total]
+                    for (name, labels), (count, total)
+                    in sorted(self._timers.items())],
+            )
+
+    def dump(self, process, force=False):
+        """Write a snapshot to the metrics directory.
+
+        Snapshots are written at most once per `[metrics]dump_interval`
+        unless `force` is true.
+
+        :param process: The name of this process, e.g. the runner name and
+            slice.  It names the snapshot file.
+        :type process: str
+        :param force: Write the snapshot regardless of when the last one was
+            written.
+        :type force: bool
+        """
+        if not self.enabled:
+            return
+        current = time.monotonic()
+        interval = as_timedelta(config.metrics.dump_interval).total_seconds()
+        if (not force and self._last_dump is not None
+                and current - self._last_dump < interval):
+            return
+        self._last_dump = current
+        directory = metrics_directory()
+        path = os.path.join(directory, process + '.json')
+        tmp_path = path + '.tmp'
+        try:
+            os.makedirs(directory, exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as fp:
+                json.dump(self.snapshot(), fp)
+            # Rename the file into place so that readers never see a partial
+            # snapshot.
+            os.rename(tmp_path, path)
+        except OSError as error:
+            log.error('Cannot write metrics snapshot %s: %s', path, error)
+
+    def clear(self):
+        """Forget all recorded samples."""
+        self._counters.clear()
+        self._timers.clear()
+        self._last_dump = None
+
+
+metrics = Metrics()
+public(metrics=metrics)
+
+
+@public
+def metrics_directory():
+    """The directory holding the snapshots of all processes."""
+    return os.path.join(config.CACHE_DIR, 'metrics')
+
+
+@public
+def read_snapshots():
+    """Read the snapshots dumped by all processes.
+
+    :return: A dictionary mapping process names to their snapshots.
+    :rtype: dict
+    """
+    snapshots = {}
+    directory = metrics_directory()
+    try:
+        filenames = os.listdir(directory)
+    except FileNotFoundError:
+        return snapshots
+    for filename in sorted(filenames):
+        process, extension = os.path.splitext(filename)
+        if extension != '.json':
+            continue
+        path = os.path.join(directory, filename)
+        try:
+            with open(path, encoding='utf-8') as fp:
+                snapshots[process] = json.load(fp)
+        except (OSError, ValueError) as error:
+            log.error('Cannot read metrics snapshot %s: %s', path, error)
+    return snapshots
+
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    return '{{{}}}'.format(','.join(
+        '{}="{}"'.format(
+            key, str(value).replace('\\', r'\\').replace('"', r'\"'))
+        for key, value in sorted(labels.items())))
+
+
+@public
+def render(snapshots, gauges=()):
+    """Render snapshots in the Prometheus text exposition format.
+
+    Every sample gets a `process` label naming the process it came from.
+
+    :param snapshots: A dictionary mapping process names to snapshots.
+    :type snapshots: dict
+    :param gauges: Additional gauge samples, as 3-tuples of the name, labels
+        and value.
+    :type gauges: sequence of tuples
+    :return: The exposition text.
+    :rtype: str
+    """
+    # Group the samples by metric name; each metric's samples must be
+    # contiguous and preceded by its TYPE line.
+    counters = {}
+    timers = {}
+    for process, snapshot in sorted(snapshots.items()):
+        for name, labels, value in snapshot.get('counters', []):
+            labels = dict(labels, process=process)
+            counters.setdefault(name, []).append((labels, value))
+        for name, labels, count, total in snapshot.get('timers', []):
+            labels = dict(labels, process=process)
+            timers.setdefault(name, []).append((labels, count, total))
+    lines = []
+    for name in sorted(counters):
+        lines.append('# TYPE {} counter'.format(name))
+        for labels, value in counters[name]:
+            lines.append('{}{} {}'.format(
+                name, _format_labels(labels), value))
+    for name in sorted(timers):
+        lines.append('# TYPE {} summary'.format(name))
+        for labels, count, total in timers[name]:
+            formatted = _format_labels(labels)
+            lines.append('{}_count{} {}'.format(name, formatted, count))
+            lines.append('{}_sum{} {!r}'.format(name, formatted, total))
+    gauge_names = []
+    for name, labels, value in gauges:
+        if name not in gauge_names:
+            gauge_names.append(name)
+            lines.append('# TYPE {} gauge'.format(name))
+        lines.append('{}{} {}'.format(name, _format_labels(labels), value))
+    return '\n'.join(lines) + '\n'
+
+
+@public
+def handle_ConfigurationUpdatedEvent(event):
+    if isinstance(event, ConfigurationUpdatedEvent):
+        metrics.configure()
@@ -21,6 +21,8 @@ import logging
 
 from mailman.app.bounces import bounce_message
 from mailman.config import config
+from mailman.core.metrics import metrics
+from mailman.core.tracing import start_trace
 from mailman.interfaces.handler import IHandler
 from mailman.interfaces.pipeline import (
     DiscardMessage, IPipeline, RejectMessage)
@@ -43,20 +45,28 @@ def process(mlist, msg, msgdata, pipeline_name='built-in'):
     """
     message_id = msg.get('message-id', 'n/a')
     pipeline = config.pipelines[pipeline_name]
-    for handler in pipeline:
-        dlog.debug('{} pipeline {} processing: {}'.format(
-            message_id, pipeline_name, handler.name))
-        try:
-            handler.process(mlist, msg, msgdata)
-        except DiscardMessage as error:
-            vlog.info(
-                '{} discarded by "{}" pipeline handler "{}": {}'.format(
-                    message_id, pipeline_name, handler.name, error.message))
-        except RejectMessage as error:
-            vlog.info(
-                '{} rejected by "{}" pipeline handler "{}": {}'.format(
-                    message_id, pipeline_name, handler.name, str(error)))
-            bounce_message(mlist, msg, error)
+    trace = start_trace(mlist, msg, msgdata, 'pipeline', pipeline_name)
+    try:
+        for handler in pipeline:
+            dlog.debug('%s pipeline %s processing: %s',
+                       message_id, pipeline_name, handler.name)
+            timer = metrics.timer(
+                'mailman_handler_seconds', handler=handler.name)
+            try:
+                with timer, trace.step(handler.name):
+                    handler.process(mlist, msg, msgdata)
+            except DiscardMessage as error:
+                vlog.info(
+                    '{} discarded by "{}" pipeline handler "{}": {}'.format(
+                        message_id, pipeline_name, handler.name,
+                        error.message))
+            except RejectMessage as error:
+                vlog.info(
+                    '{} rejected by "{}" pipeline handler "{}": {}'.format(
+                        message_id, pipeline_name, handler.name, str(error)))
+                bounce_message(mlist, msg, error)
+    finally:
+        trace.finish()
 
 
 @public
@@ -28,6 +28,7 @@ from lazr.config import as_boolean, as_timedelta
 from mailman.config import config
 from mailman.core.i18n import _
 from mailman.core.logging import reopen
+from mailman.core.metrics import metrics
 from mailman.core.switchboard import Switchboard
 from mailman.interfaces.languages import ILanguageManager
 from mailman.interfaces.listmanager import IListManager
@@ -60,6 +61,9 @@ class Runner:
         """
         # Grab the configuration section.
         self.name = name
+        # The name under which this process dumps its metrics.
+        self.process_name = (name if slice is None
+                             else '{}-{}'.format(name, slice))
         section = getattr(config, 'runner.' + name)
         substitutions = config.paths
         substitutions['name'] = name
@@ -134,6 +138,7 @@ class Runner:
                 filecnt = self._one_iteration()
                 # Do the periodic work for the subclass.
                 self._do_periodic()
+                metrics.dump(self.process_name)
                 # If the stop flag is set, we're done.
                 if self._stop:
                     break
@@ -141,6 +146,7 @@ class Runner:
                 # pass it the file count so it can decide whether to do more
                 # work now or not.
                 self._snooze(filecnt)
+        metrics.dump(self.process_name, force=True)
         self._clean_up()
 
     def _one_iteration(self):
@@ -168,9 +174,17 @@ class Runner:
                 self.switchboard.finish(filebase, preserve=True)
                 config.db.abort()
                 continue
+            # The file name starts with the time the message was enqueued.
+            metrics.observe(
+                'mailman_runner_dequeue_latency_seconds',
+                max(0.0, time.time() - float(filebase.split('+')[0])),
+                runner=self.name)
+            queries = config.db.query_count
             try:
                 dlog.debug('[%s] processing onefile', me)
-                self._process_one_file(msg, msgdata)
+                with metrics.timer('mailman_runner_process_seconds',
+                                   runner=self.name):
+                    self._process_one_file(msg, msgdata)
                 dlog.debug('[%s] finishing filebase: %s', me, filebase)
                 self.switchboard.finish(filebase)
             except Exception as error:
@@ -206,6 +220,12 @@ class Runner:
             self._do_periodic()
             dlog.debug('[%s] committing transaction', me)
             config.db.commit()
+            metrics.increment(
+                'mailman_runner_messages_total', runner=self.name)
+            metrics.increment(
+                'mailman_runner_db_queries_total',
+                config.db.query_count - queries,
+                runner=self.name)
             dlog.debug('[%s] checking short circuit', me)
             if self._short_circuit():
                 dlog.debug('[%s] short circuiting', me)
@@ -104,8 +104,10 @@ class Switchboard:
         data = _metadata.copy()
         data.update(_kws)
         list_id = data.get('listid', '--nolist--')
-        # Get some data for the input to the sha hash.
-        now = repr(time.time())
+        # Get some data for the input to the sha hash.  The caller can ask
+        # for the entry to be sorted as if it was queued at a different time,
+        # e.g. to interleave it with other entries.
+        now = repr(data.get('_when', time.time()))
         if data.get('_plaintext'):
             protocol = 0
             msgsave = pickle.dumps(str(_msg), protocol)
@@ -17,9 +17,14 @@
 
 """Test logging behavior."""
 
+import os
+import time
+import logging
 import unittest
+import threading
 
-from mailman.core.logging import ReopenableFileHandler
+from mailman.core.logging import BatchedFileHandler, ReopenableFileHandler
+from tempfile import TemporaryDirectory
 
 
 class TestRunner(unittest.TestCase):
@@ -28,3 +33,108 @@ class TestRunner(unittest.TestCase):
         handler = ReopenableFileHandler('test', '/dev/stdout')
 
         handler.close()
+
+
+class TestBatchedFileHandler(unittest.TestCase):
+
+    def setUp(self):
+        tempdir = TemporaryDirectory()
+        self.addCleanup(tempdir.cleanup)
+        self._path = os.path.join(tempdir.name, 'test.log')
+        self._log = logging.getLogger('mailman.test-batched')
+        self._log.propagate = False
+        self._log.setLevel(logging.INFO)
+
+    def _handler(self, batch_size=3, flush_interval=60):
+        handler = BatchedFileHandler(
+            'test', self._path, batch_size, flush_interval)
+        self._log.addHandler(handler)
+        self.addCleanup(self._log.removeHandler, handler)
+        return handler
+
+    def _contents(self):
+        with open(self._path, encoding='utf-8') as fp:
+            return fp.read()
+
+    def _wait_for(self, contents):
+        # Give the writer thread some time to catch up.
+        until = time.time() + 10
+        while self._contents() != contents and time.time() < until:
+            time.sleep(0.01)
+        self.assertEqual(self._contents(), contents)
+
+    def test_batch_size(self):
+        handler = self._handler()
+        self.addCleanup(handler.close)
+        self._log.info('one')
+        self._log.info('two')
+        self.assertEqual(self._contents(), '')
+        self._log.info('three')
+        # The third record wakes up the writer thread.
+        self._wait_for('one\ntwo\nthree\n')
+
+    def test_flush_interval(self):
+        handler = self._handler(flush_interval=0.01)
+        self.addCleanup(handler.close)
+        self._log.info('one')
+        self._wait_for('one\n')
+
+    def test_flush(self):
+        handler = self._handler()
+        self.addCleanup(handler.close)
+        self._log.info('one')
+        handler.flush()
+        self.assertEqual(self._contents(), 'one\n')
+
+    def test_close(self):
+        handler = self._handler()
+        self._log.info('one')
+        handler.close()
+        self.assertFalse(handler._writer.is_alive())
+        self.assertEqual(self._contents(), 'one\n')
+
+    def test_reopen(self):
+        # Pending records are written to the old file before it is reopened,
+        # e.g. after log rotation.
+        handler = self._handler()
+        self.addCleanup(handler.close)
+        self._log.info('one')
+        rotated = self._path + '.1'
+        os.rename(self._path, rotated)
+        handler.reopen()
+        self._log.info('two')
+        handler.flush()
+        with open(rotated, encoding='utf-8') as fp:
+            self.assertEqual(fp.read(), 'one\n')
+        self.assertEqual(self._contents(), 'two\n')
+
+    def test_reopen_while_flushing(self):
+        # SIGHUP handlers reopen the log files, possibly interrupting emit()
+        # while the writer thread is flushing.  Reopening must not wait for
+        # the writer thread in that case.
+        handler = self._handler()
+        self.addCleanup(handler.close)
+        self._log.info('one')
+        held = threading.Event()
+        release = threading.Event()
+
+        def flushing():
+            with handler._stream_lock:
+                held.set()
+                release.wait(10)
+
+        writer = threading.Thread(target=flushing)
+        writer.start()
+        held.wait(10)
+        rotated = self._path + '.1'
+        os.rename(self._path, rotated)
+        with handler._condition:
+            handler.reopen()
+            self.assertTrue(writer.is_alive())
+        release.set()
+        writer.join()
+        self._log.info('two')
+        handler.flush()
+        with open(rotated, encoding='utf-8') as fp:
+            self.assertEqual(fp.read(), 'one\n')
+        self.assertEqual(self._contents(), 'two\n')
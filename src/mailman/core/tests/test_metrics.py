@@ -0,0 +1,178 @@
+# Copyright (C) 2019 by the Free Software Foundation, Inc.
+#
+# This file is part of GNU Mailman.
+#
+# GNU Mailman is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free
+# Software Foundation, either version 3 of the License, or (at your option)
+# any later version.
+#
+# GNU Mailman is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General Public License for
+# more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# GNU Mailman.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Test the metrics registry and instrumentation."""
+
+import os
+import shutil
+import socket
+import unittest
+
+from mailman.app.lifecycle import create_list
+from mailman.config import config
+from mailman.core.chains import process as process_chain
+from mailman.core.metrics import (
+    metrics, metrics_directory, read_snapshots, render)
+from mailman.core.pipelines import process as process_pipeline
+from mailman.runners.virgin import VirginRunner
+from mailman.testing.helpers import (
+    configuration, make_testable_runner,
+    specialized_message_from_string as mfs)
+from mailman.testing.layers import ConfigLayer
+
+
+class TestMetrics(unittest.TestCase):
+    layer = ConfigLayer
+
+    def setUp(self):
+        self.addCleanup(metrics.clear)
+        self.addCleanup(shutil.rmtree, metrics_directory(), True)
+
+    def test_disabled_by_default(self):
+        self.assertFalse(metrics.enabled)
+        metrics.increment('anything')
+        metrics.observe('anything_seconds', 1.0)
+        with metrics.timer('anything_else_seconds'):
+            pass
+        self.assertEqual(metrics.snapshot(), dict(counters=[], timers=[]))
+        metrics.dump('test', force=True)
+        self.assertEqual(read_snapshots(), {})
+
+    @configuration('metrics', enabled='yes')
+    def test_counters_and_timers(self):
+        metrics.increment('widgets_total', kind='a')
+        metrics.increment('widgets_total', 2, kind='a')
+        metrics.increment('widgets_total', kind='b')
+        metrics.observe('work_seconds', 0.5)
+        metrics.observe('work_seconds', 1.5)
+        with self.assertRaises(RuntimeError):
+            with metrics.timer('failing_seconds'):
+                raise RuntimeError
+        self.assertEqual(metrics.value('widgets_total', kind='a'), 3)
+        self.assertEqual(metrics.value('widgets_total'), 0)
+        snapshot = metrics.snapshot()
+        self.assertEqual(snapshot['counters'], [
+            ['widgets_total', dict(kind='a'), 3],
+            ['widgets_total', dict(kind='b'), 1],
+            ])
+        self.assertEqual(snapshot['timers'][1], ['work_seconds', {}, 2, 2.0])
+        # The timer records durations even when its body fails.
+        self.assertEqual(snapshot['timers'][0][:3], ['failing_seconds', {}, 1])
+
+    @configuration('metrics', enabled='yes')
+    def test_dump(self):
+        metrics.increment('widgets_total')
+        metrics.dump('in-0')
+        self.assertEqual(read_snapshots(), {'in-0': metrics.snapshot()})
+        # Dumps are rate limited.
+        metrics.increment('widgets_total')
+        metrics.dump('in-0')
+        self.assertEqual(
+            read_snapshots()['in-0']['counters'],
+            [['widgets_total', {}, 1]])
+        metrics.dump('in-0', force=True)
+        self.assertEqual(
+            read_snapshots()['in-0']['counters'],
+            [['widgets_total', {}, 2]])
+        self.assertEqual(os.listdir(metrics_directory()), ['in-0.json'])
+
+    def test_render(self):
+        snapshots = {
+            'in-0': dict(
+                counters=[['widgets_total', dict(kind='a"b'), 3]],
+                timers=[['work_seconds', {}, 2, 0.25]]),
+            'out': dict(
+                counters=[['widgets_total', {}, 1]],
+                timers=[]),
+            }
+        gauges = [('queue_depth', dict(queue='in'), 7)]
+        self.assertMultiLineEqual(render(snapshots, gauges), """\
+# TYPE widgets_total counter
+widgets_total{kind="a\\"b",process="in-0"} 3
+widgets_total{process="out"} 1
+# TYPE work_seconds summary
+work_seconds_count{process="in-0"} 2
+work_seconds_sum{process="in-0"} 0.25
+# TYPE queue_depth gauge
+queue_depth{queue="in"} 7
+""")
+
+    def test_statsd(self):
+        server = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.addCleanup(server.close)
+        server.bind(('127.0.0.1', 0))
+        server.settimeout(5)
+        host, port = server.getsockname()
+        with configuration('metrics', enabled='yes', statsd_host=host,
+                           statsd_port=str(port)):
+            metrics.increment('widgets_total', kind='a.b')
+            metrics.observe('work_seconds', 0.25)
+        self.assertEqual(server.recv(1024), b'mailman.widgets_total.a_b:1|c')
+        self.assertEqual(server.recv(1024), b'mailman.work_seconds:250.000|ms')
+
+
+class TestInstrumentation(unittest.TestCase):
+    layer = ConfigLayer
+
+    def setUp(self):
+        self._mlist = create_list('ant@example.com')
+        self._msg = mfs("""\
+From: anne@example.com
+To: ant@example.com
+Message-ID: <ant>
+
+""")
+        self.addCleanup(metrics.clear)
+        self.addCleanup(shutil.rmtree, metrics_directory(), True)
+
+    def _timers(self):
+        return {(name, tuple(sorted(labels.values()))): count
+                for name, labels, count, total
+                in metrics.snapshot()['timers']}
+
+    @configuration('metrics', enabled='yes')
+    def test_pipeline_and_chain(self):
+        process_pipeline(self._mlist, self._msg, {}, 'virgin')
+        process_chain(self._mlist, self._msg, {}, 'default-owner-chain')
+        timers = self._timers()
+        for handler in config.pipelines['virgin']:
+            self.assertEqual(
+                timers[('mailman_handler_seconds', (handler.name,))], 1)
+        self.assertIn(('mailman_rule_seconds', ('truth',)), timers)
+
+    @configuration('metrics', enabled='yes')
+    def test_runner(self):
+        runner = make_testable_runner(VirginRunner, 'virgin')
+        config.switchboards['virgin'].enqueue(
+            self._msg, listid=self._mlist.list_id)
+        runner.run()
+        self.assertEqual(
+            metrics.value('mailman_runner_messages_total', runner='virgin'),
+            1)
+        # Looking up the mailing list alone takes a query.
+        self.assertGreater(
+            metrics.value('mailman_runner_db_queries_total',
+                          runner='virgin'),
+            0)
+        timers = self._timers()
+        self.assertEqual(
+            timers[('mailman_runner_dequeue_latency_seconds', ('virgin',))],
+            1)
+        self.assertEqual(
+            timers[('mailman_runner_process_seconds', ('virgin',))], 1)
+        # The runner dumped its metrics when it stopped.
+        self.assertEqual(read_snapshots(), {'virgin': metrics.snapshot()})
@@ -18,6 +18,7 @@
 """Switchboard tests."""
 
 import os
+import time
 import unittest
 
 from mailman.config import config
@@ -71,3 +72,21 @@ Message-ID: <ant>
         bad_dir = config.switchboards['bad'].queue_directory
         psvfile = os.path.join(bad_dir, filebase + '.psv')
         self.assertTrue(os.path.isfile(psvfile))
+
+    def test_enqueue_when(self):
+        # An entry can be queued as if it arrived at a different time, which
+        # controls where it sorts in the FIFO order.
+        msg = mfs("""\
+From: anne@example.com
+To: test@example.com
+Message-ID: <ant>
+
+""")
+        switchboard = config.switchboards['shunt']
+        later = switchboard.enqueue(msg, _when=time.time() + 60)
+        sooner = switchboard.enqueue(msg)
+        self.assertEqual(switchboard.files, [sooner, later])
+        for filebase in (sooner, later):
+            msg, data = switchboard.dequeue(filebase)
+            switchboard.finish(filebase)
+            self.assertNotIn('_when', data)
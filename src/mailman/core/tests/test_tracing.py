@@ -0,0 +1,122 @@
+# Copyright (C) 2019 by the Free Software Foundation, Inc.
+#
+# This file is part of GNU Mailman.
+#
+# GNU Mailman is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free
+# Software Foundation, either version 3 of the License, or (at your option)
+# any later version.
+#
+# GNU Mailman is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General Public License for
+# more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# GNU Mailman.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Test the tracing of messages through pipelines and chains."""
+
+import os
+import json
+import unittest
+
+from contextlib import suppress
+from mailman.app.lifecycle import create_list
+from mailman.config import config
+from mailman.core.chains import process as process_chain
+from mailman.core.pipelines import process as process_pipeline
+from mailman.core.tracing import start_trace, trace_file
+from mailman.testing.helpers import (
+    configuration, specialized_message_from_string as mfs)
+from mailman.testing.layers import ConfigLayer
+
+
+class TestTracing(unittest.TestCase):
+    layer = ConfigLayer
+
+    def setUp(self):
+        self._mlist = create_list('ant@example.com')
+        self._msg = mfs("""\
+From: anne@example.com
+To: ant@example.com
+Message-ID: <ant>
+
+""")
+        self.addCleanup(self._remove_trace_file)
+
+    def _remove_trace_file(self):
+        with suppress(FileNotFoundError):
+            os.remove(trace_file())
+
+    def _traces(self):
+        with open(trace_file(), encoding='utf-8') as fp:
+            return [json.loads(line) for line in fp]
+
+    def test_disabled_by_default(self):
+        msgdata = {}
+        process_pipeline(self._mlist, self._msg, msgdata, 'virgin')
+        self.assertFalse(os.path.exists(trace_file()))
+        # The metadata isn't touched.
+        self.assertNotIn('traced', msgdata)
+
+    @configuration('tracing', lists='bee.example.com ant.example.com')
+    def test_traced_list(self):
+        msgdata = {}
+        process_pipeline(self._mlist, self._msg, msgdata, 'virgin')
+        process_chain(self._mlist, self._msg, msgdata, 'default-owner-chain')
+        self.assertTrue(msgdata['traced'])
+        pipeline, chain = self._traces()
+        self.assertEqual(pipeline['engine'], 'pipeline')
+        self.assertEqual(pipeline['name'], 'virgin')
+        self.assertEqual(pipeline['list_id'], 'ant.example.com')
+        self.assertEqual(pipeline['message_id'], '<ant>')
+        self.assertEqual(
+            [step['step'] for step in pipeline['steps']],
+            [handler.name for handler in config.pipelines['virgin']])
+        for step in pipeline['steps']:
+            self.assertGreaterEqual(step['seconds'], 0)
+            self.assertGreaterEqual(step['queries'], 0)
+            self.assertNotIn('memory', step)
+        self.assertEqual(chain['engine'], 'chain')
+        self.assertEqual(chain['name'], 'default-owner-chain')
+        self.assertIn('truth', [step['step'] for step in chain['steps']])
+
+    @configuration('tracing', lists='bee.example.com')
+    def test_untraced_list(self):
+        msgdata = {}
+        process_pipeline(self._mlist, self._msg, msgdata, 'virgin')
+        self.assertFalse(msgdata['traced'])
+        self.assertFalse(os.path.exists(trace_file()))
+
+    @configuration('tracing', sample_rate='1')
+    def test_sampled(self):
+        process_pipeline(self._mlist, self._msg, {}, 'virgin')
+        self.assertEqual(len(self._traces()), 1)
+
+    @configuration('tracing', sample_rate='1')
+    def test_decision_is_remembered(self):
+        # Once a message isn't traced, it isn't traced through any engine.
+        msgdata = dict(traced=False)
+        process_pipeline(self._mlist, self._msg, msgdata, 'virgin')
+        self.assertFalse(os.path.exists(trace_file()))
+
+    @configuration('tracing', lists='ant.example.com', trace_memory='yes')
+    def test_memory(self):
+        trace = start_trace(self._mlist, self._msg, {}, 'pipeline', 'test')
+        with trace.step('allocate'):
+            data = [object() for i in range(1000)]          # noqa: F841
+        trace.finish()
+        step = self._traces()[0]['steps'][0]
+        self.assertGreater(step['memory'], 0)
+
+    @configuration('tracing', lists='ant.example.com')
+    def test_failing_step(self):
+        # Steps are recorded even when they fail.
+        trace = start_trace(self._mlist, self._msg, {}, 'pipeline', 'test')
+        with self.assertRaises(RuntimeError):
+            with trace.step('fail'):
+                raise RuntimeError
+        trace.finish()
+        steps = self._traces()[0]['steps']
+        self.assertEqual([step['step'] for step in steps], ['fail'])
@@ -0,0 +1,158 @@
+# Copyright (C) 2019 by the Free Software Foundation, Inc.
+#
+# This file is part of GNU Mailman.
+#
+# GNU Mailman is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free
+# Software Foundation, either version 3 of the License, or (at your option)
+# any later version.
+#
+# GNU Mailman is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General Public License for
+# more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# GNU Mailman.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Per-message tracing of the pipeline and chain engines.
+
+A traced message has the wall time, the number of database queries and the
+net memory allocated by each pipeline handler and chain rule recorded in the
+trace file, one JSON object per line and per engine run.  Which messages are
+traced is controlled by the `[tracing]` section.
+"""
+
+import os
+import json
+import time
+import random
+import logging
+import tracemalloc
+
+from contextlib import contextmanager
+from lazr.config import as_boolean
+from mailman.config import config
+from mailman.utilities.datetime import now
+from public import public
+
+
+log = logging.getLogger('mailman.error')
+
+
+class _NullStep:
+    def __enter__(self):
+        pass
+
+    def __exit__(self, *exc_info):
+        pass
+
+
+class _NullTrace:
+    """The trace of a message which isn't traced."""
+
+    _step = _NullStep()
+
+    def step(self, name):
+        return self._step
+
+    def finish(self):
+        pass
+
+
+_null_trace = _NullTrace()
+
+
+@public
+class Trace:
+    """The trace of one message through one pipeline or chain."""
+
+    def __init__(self, mlist, msg, engine, name):
+        self.record = dict(
+            when=now().isoformat(),
+            list_id=mlist.list_id,
+            message_id=msg.get('message-id', 'n/a'),
+            engine=engine,
+            name=name,
+            steps=[],
+            )
+        self._memory = as_boolean(config.tracing.trace_memory)
+        # Tracing memory allocations slows everything down, so only do it
+        # while a traced message is processed.
+        self._stop_tracemalloc = (
+            self._memory and not tracemalloc.is_tracing())
+        if self._stop_tracemalloc:
+            tracemalloc.start()
+
+    @contextmanager
+    def step(self, name):
+        """Record the cost of a handler or rule."""
+        queries = config.db.query_count
+        if self._memory:
+            memory = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            step = dict(
+                step=name,
+                seconds=time.perf_counter() - start,
+                queries=config.db.query_count - queries,
+                )
+            if self._memory:
+                step['memory'] = tracemalloc.get_traced_memory()[0] - memory
+            self.record['steps'].append(step)
+
+    def finish(self):
+        """Append the trace to the trace file."""
+        if self._stop_tracemalloc:
+            tracemalloc.stop()
+        path = trace_file()
+        try:
+            with open(path, 'a', encoding='utf-8') as fp:
+                # Write the record with a single call, so that the lines of
+                # concurrent runners don't get interleaved.
+                fp.write(json.dumps(self.record, sort_keys=True) + '\n')
+        except OSError as error:
+            log.error('Cannot write trace file %s: %s', path, error)
+
+
+@public
+def trace_file():
+    """The path to the trace file."""
+    return os.path.join(config.LOG_DIR, config.tracing.path)
+
+
+@public
+def start_trace(mlist, msg, msgdata, engine, name):
+    """Start tracing a message through a pipeline or chain.
+
+    Whether a message is traced is decided the first time it enters an
+    engine, and remembered in its metadata so that the message is traced
+    through all the engines it passes.
+
+    :param mlist: The mailing list.
+    :type mlist: IMailingList
+    :param msg: The message.
+    :param msgdata: The message metadata.
+    :type msgdata: dict
+    :param engine: 'pipeline' or 'chain'.
+    :type engine: str
+    :param name: The name of the pipeline or chain.
+    :type name: str
+    :return: An object whose `step()` method returns a context manager
+        recording the cost of each step, and whose `finish()` method must be
+        called when the engine is done.
+    """
+    traced = msgdata.get('traced')
+    if traced is None:
+        section = config.tracing
+        lists = section.lists.split()
+        sample_rate = float(section.sample_rate)
+        if len(lists) == 0 and sample_rate <= 0:
+            return _null_trace
+        traced = mlist.list_id in lists or random.random() < sample_rate
+        msgdata['traced'] = traced
+    if not traced:
+        return _null_trace
+    return Trace(mlist, msg, engine, name)
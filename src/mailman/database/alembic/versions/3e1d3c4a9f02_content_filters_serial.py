@@ -0,0 +1,44 @@
+"""content_filters_serial
+
+Add a serial number to the mailing list table which is incremented whenever
+the list's content filters change, so that the filter policy cached by every
+process can be invalidated.
+
+Revision ID: 3e1d3c4a9f02
+Revises: e2a3c5f6d7b8
+Create Date: 2019-03-09 14:05:51.830417
+
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+from mailman.database.helpers import exists_in_db, is_sqlite
+
+
+# Revision identifiers, used by Alembic.
+revision = '3e1d3c4a9f02'
+down_revision = 'e2a3c5f6d7b8'
+
+
+def upgrade():
+    if not exists_in_db(
+            op.get_bind(), 'mailinglist', 'content_filters_serial'):
+        # SQLite may not have removed it when downgrading.
+        op.add_column(
+            'mailinglist',
+            sa.Column('content_filters_serial', sa.Integer(), nullable=True))
+    mailinglist = sa.sql.table(
+        'mailinglist',
+        sa.sql.column('content_filters_serial', sa.Integer),
+        )
+    op.execute(mailinglist.update().values(dict(
+        content_filters_serial=op.inline_literal(0),
+        )))
+
+
+def downgrade():
+    if not is_sqlite(op.get_bind()):
+        # SQLite does not support dropping columns.
+        op.drop_column(                                     # pragma: nocover
+            'mailinglist', 'content_filters_serial')
@@ -0,0 +1,50 @@
+"""member_bounce_info
+
+Add the bounce score columns to the member table, and index the bounce events
+by their processed flag.
+
+Revision ID: 8c7739f6046e
+Revises: 15401063d4e3
+Create Date: 2019-03-04 10:12:31.408115
+
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+from mailman.database.helpers import exists_in_db, is_sqlite
+
+
+# revision identifiers, used by Alembic.
+revision = '8c7739f6046e'
+down_revision = '15401063d4e3'
+
+
+def upgrade():
+    if not exists_in_db(op.get_bind(), 'member', 'bounce_score'):
+        # SQLite may not have removed it when downgrading.  It should be OK
+        # to just test one.
+        op.add_column(
+            'member', sa.Column('bounce_score', sa.Integer(), nullable=True))
+        op.add_column(
+            'member',
+            sa.Column('last_bounce_received', sa.DateTime(), nullable=True))
+    # Existing members haven't had any bounces scored.
+    member = sa.sql.table(
+        'member',
+        sa.sql.column('bounce_score', sa.Integer),
+        )
+    op.execute(member.update().values(dict(
+        bounce_score=op.inline_literal(0),
+        )))
+    op.create_index(
+        op.f('ix_bounceevent_processed'), 'bounceevent', ['processed'],
+        unique=False)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_bounceevent_processed'), table_name='bounceevent')
+    if not is_sqlite(op.get_bind()):
+        # SQLite does not support dropping columns.
+        op.drop_column('member', 'last_bounce_received')    # pragma: nocover
+        op.drop_column('member', 'bounce_score')            # pragma: nocover
@@ -0,0 +1,34 @@
+"""request summary
+
+Add a summary of the held request, such as the subject and sender of a held
+message, so that the held requests can be listed without loading their data.
+
+Revision ID: a9d5e3f7c2b8
+Revises: f2c6b8e4a1d3
+Create Date: 2019-03-30 09:51:03.118264
+
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+from mailman.database.helpers import exists_in_db, is_sqlite
+from mailman.database.types import SAUnicodeXL
+
+
+# Revision identifiers, used by Alembic.
+revision = 'a9d5e3f7c2b8'
+down_revision = 'f2c6b8e4a1d3'
+
+
+def upgrade():
+    if not exists_in_db(op.get_bind(), '_request', 'summary'):
+        # SQLite may not have removed it when downgrading.
+        op.add_column(
+            '_request', sa.Column('summary', SAUnicodeXL, nullable=True))
+
+
+def downgrade():
+    if not is_sqlite(op.get_bind()):
+        # SQLite does not support dropping columns.
+        op.drop_column('_request', 'summary')               # pragma: nocover
@@ -0,0 +1,92 @@
+"""pended list-id and type
+
+Copy the list-id and the type of the pendings from their key/value pairs to
+indexed columns of the pended table, so that the pendings of a mailing list
+can be found and paged without joining the key/value pairs.
+
+Revision ID: b7e2f4a8c1d5
+Revises: a9d5e3f7c2b8
+Create Date: 2019-04-06 14:12:45.660132
+
+"""
+
+import json
+import sqlalchemy as sa
+
+from alembic import op
+from mailman.database.helpers import exists_in_db, is_sqlite
+from mailman.database.types import SAUnicode
+
+
+# Revision identifiers, used by Alembic.
+revision = 'b7e2f4a8c1d5'
+down_revision = 'a9d5e3f7c2b8'
+
+
+pended_table = sa.sql.table(
+    'pended',
+    sa.sql.column('id', sa.Integer),
+    sa.sql.column('list_id', SAUnicode),
+    sa.sql.column('pend_type', SAUnicode),
+    )
+
+keyvalue_table = sa.sql.table(
+    'pendedkeyvalue',
+    sa.sql.column('key', SAUnicode),
+    sa.sql.column('value', SAUnicode),
+    sa.sql.column('pended_id', sa.Integer),
+    )
+
+
+def _list_id(value):
+    # The list-id is stored as JSON in the key/value pairs.
+    try:
+        list_id = json.loads(value)
+    except ValueError:
+        return None
+    return list_id if isinstance(list_id, str) else None
+
+
+def upgrade():
+    for column in ('list_id', 'pend_type'):
+        if not exists_in_db(op.get_bind(), 'pended', column):
+            # SQLite may not have removed it when downgrading.
+            op.add_column(
+                'pended', sa.Column(column, SAUnicode, nullable=True))
+    op.create_index(
+        'ix_pended_list_id_pend_type', 'pended', ['list_id', 'pend_type'],
+        unique=False)
+    op.create_index(
+        op.f('ix_pended_pend_type'), 'pended', ['pend_type'], unique=False)
+    # Data migration.
+    connection = op.get_bind()
+    values = {}
+    for pended_id, key, value in connection.execute(sa.select([
+            keyvalue_table.c.pended_id,
+            keyvalue_table.c.key,
+            keyvalue_table.c.value,
+            ]).where(keyvalue_table.c.key.in_(('list_id', 'type')))):
+        entry = values.setdefault(
+            pended_id, dict(pended=pended_id, list_id=None, pend_type=None))
+        if key == 'type':
+            entry['pend_type'] = value
+        else:
+            entry['list_id'] = _list_id(value)
+    if len(values) > 0:
+        connection.execute(
+            pended_table.update().where(
+                pended_table.c.id == sa.bindparam('pended')
+                ).values(
+                list_id=sa.bindparam('list_id'),
+                pend_type=sa.bindparam('pend_type'),
+                ),
+            list(values.values()))
+
+
+def downgrade():
+    op.drop_index(op.f('ix_pended_pend_type'), table_name='pended')
+    op.drop_index('ix_pended_list_id_pend_type', table_name='pended')
+    if not is_sqlite(op.get_bind()):
+        # SQLite does not support dropping columns.
+        op.drop_column('pended', 'pend_type')               # pragma: nocover
+        op.drop_column('pended', 'list_id')                 # pragma: nocover
@@ -0,0 +1,27 @@
+"""File cache indexes
+
+Index the expiration date of the cache entries, so that the expired ones can
+be evicted without scanning the whole table.
+
+Revision ID: ba0f517dc832
+Revises: 8c7739f6046e
+Create Date: 2019-03-06 15:27:08.612044
+
+"""
+
+from alembic import op
+
+
+# Revision identifiers, used by Alembic.
+revision = 'ba0f517dc832'
+down_revision = '8c7739f6046e'
+
+
+def upgrade():
+    op.create_index(
+        op.f('ix_file_cache_expires_on'), 'file_cache', ['expires_on'],
+        unique=False)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_file_cache_expires_on'), table_name='file_cache')
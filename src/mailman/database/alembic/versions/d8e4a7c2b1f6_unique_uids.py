@@ -0,0 +1,50 @@
+"""unique uids
+
+Make the index of the recorded uids unique, so that new uids can be recorded
+with a single insert, after deleting all but the first row of any uid which
+was recorded more than once.  Also index the member ids so that orphaned uids
+can be found without scanning the member table.
+
+Revision ID: d8e4a7c2b1f6
+Revises: 3e1d3c4a9f02
+Create Date: 2019-03-16 10:42:17.204518
+
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+from mailman.database.types import UUID
+
+
+# Revision identifiers, used by Alembic.
+revision = 'd8e4a7c2b1f6'
+down_revision = '3e1d3c4a9f02'
+
+
+uid_table = sa.sql.table(
+    'uid',
+    sa.sql.column('id', sa.Integer),
+    sa.sql.column('uid', UUID),
+    )
+
+
+def upgrade():
+    # The unique index can't be created while there are duplicate uids.
+    # MySQL doesn't allow a subquery of the table being deleted from, unless
+    # the subquery's results are materialized in a derived table.
+    first_ids = sa.select([
+        sa.func.min(uid_table.c.id).label('id'),
+        ]).group_by(uid_table.c.uid).alias('first_ids')
+    op.get_bind().execute(uid_table.delete().where(
+        uid_table.c.id.notin_(sa.select([first_ids.c.id]))))
+    op.drop_index('ix_uid_uid', table_name='uid')
+    op.create_index(op.f('ix_uid_uid'), 'uid', ['uid'], unique=True)
+    op.create_index(
+        op.f('ix_member__member_id'), 'member', ['_member_id'], unique=False)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_member__member_id'), table_name='member')
+    op.drop_index(op.f('ix_uid_uid'), table_name='uid')
+    op.create_index('ix_uid_uid', 'uid', ['uid'], unique=False)
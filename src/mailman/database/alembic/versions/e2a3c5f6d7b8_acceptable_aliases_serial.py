@@ -0,0 +1,45 @@
+"""acceptable_aliases_serial
+
+Add a serial number to the mailing list table which is incremented whenever
+the list's acceptable aliases change, so that the compiled aliases cached by
+every process can be invalidated.
+
+Revision ID: e2a3c5f6d7b8
+Revises: ba0f517dc832
+Create Date: 2019-03-08 11:42:17.305921
+
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+from mailman.database.helpers import exists_in_db, is_sqlite
+
+
+# Revision identifiers, used by Alembic.
+revision = 'e2a3c5f6d7b8'
+down_revision = 'ba0f517dc832'
+
+
+def upgrade():
+    if not exists_in_db(
+            op.get_bind(), 'mailinglist', 'acceptable_aliases_serial'):
+        # SQLite may not have removed it when downgrading.
+        op.add_column(
+            'mailinglist',
+            sa.Column('acceptable_aliases_serial', sa.Integer(),
+                      nullable=True))
+    mailinglist = sa.sql.table(
+        'mailinglist',
+        sa.sql.column('acceptable_aliases_serial', sa.Integer),
+        )
+    op.execute(mailinglist.update().values(dict(
+        acceptable_aliases_serial=op.inline_literal(0),
+        )))
+
+
+def downgrade():
+    if not is_sqlite(op.get_bind()):
+        # SQLite does not support dropping columns.
+        op.drop_column(                                     # pragma: nocover
+            'mailinglist', 'acceptable_aliases_serial')
@@ -0,0 +1,31 @@
+"""message indexes
+
+Index the Message-ID and Message-ID-Hash of the stored messages, which the
+message store looks them up by.
+
+Revision ID: f2c6b8e4a1d3
+Revises: d8e4a7c2b1f6
+Create Date: 2019-03-23 11:18:40.562931
+
+"""
+
+from alembic import op
+
+
+# Revision identifiers, used by Alembic.
+revision = 'f2c6b8e4a1d3'
+down_revision = 'd8e4a7c2b1f6'
+
+
+def upgrade():
+    op.create_index(
+        op.f('ix_message_message_id'), 'message', ['message_id'],
+        unique=False)
+    op.create_index(
+        op.f('ix_message_message_id_hash'), 'message', ['message_id_hash'],
+        unique=False)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_message_message_id_hash'), table_name='message')
+    op.drop_index(op.f('ix_message_message_id'), table_name='message')
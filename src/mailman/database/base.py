@@ -20,10 +20,11 @@
 import logging
 
 from mailman.config import config
+from mailman.core.metrics import metrics
 from mailman.interfaces.database import IDatabase
 from mailman.utilities.string import expand
 from public import public
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 from zope.interface import implementer
 
@@ -41,6 +42,12 @@ class SABaseDatabase:
     def __init__(self):
         self.url = None
         self.store = None
+        self.query_count = 0
+
+    def _count_query(self, connection, cursor, statement, parameters,
+                     context, executemany):
+        self.query_count += 1
+        metrics.increment('mailman_db_queries_total')
 
     def begin(self):
         """See `IDatabase`."""
@@ -105,6 +112,8 @@ class SABaseDatabase:
         self.url = url
         self.engine = create_engine(
             url, isolation_level='READ UNCOMMITTED', pool_pre_ping=True)
+        event.listen(
+            self.engine, 'before_cursor_execute', self._count_query)
         session = sessionmaker(bind=self.engine)
         self.store = session()
         self.store.commit()
@@ -28,13 +28,14 @@ from mailman.database.alembic import alembic_cfg
 from mailman.database.helpers import exists_in_db
 from mailman.database.model import Model
 from mailman.database.transaction import transaction
-from mailman.database.types import Enum, SAUnicode
+from mailman.database.types import Enum, SAUnicode, UUID
 from mailman.interfaces.action import Action
 from mailman.interfaces.cache import ICacheManager
 from mailman.interfaces.member import MemberRole
 from mailman.interfaces.template import ITemplateManager
 from mailman.interfaces.usermanager import IUserManager
 from mailman.testing.layers import ConfigLayer
+from uuid import uuid4
 from warnings import catch_warnings, simplefilter
 from zope.component import getUtility
 
@@ -511,3 +512,64 @@ class TestMigrations(unittest.TestCase):
         # Test that if the database already has member_roster_visibility filed,
         # then make sure that we can ugprade.
         alembic.command.upgrade(alembic_cfg, '15401063d4e3')
+
+    def test_d8e4a7c2b1f6_duplicate_uids(self):
+        uid_table = sa.sql.table(
+            'uid',
+            sa.sql.column('id', sa.Integer),
+            sa.sql.column('uid', UUID),
+            )
+        ant, bee = uuid4(), uuid4()
+        with transaction():
+            # Start at the previous revision.
+            alembic.command.downgrade(alembic_cfg, '3e1d3c4a9f02')
+            config.db.store.execute(uid_table.insert().values([
+                {'id': 1, 'uid': ant},
+                {'id': 2, 'uid': bee},
+                {'id': 3, 'uid': ant},
+                {'id': 4, 'uid': ant},
+                {'id': 5, 'uid': bee},
+                ]))
+        with transaction():
+            alembic.command.upgrade(alembic_cfg, 'd8e4a7c2b1f6')
+        results = config.db.store.execute(
+            sa.select([uid_table.c.id, uid_table.c.uid]).order_by(
+                uid_table.c.id)).fetchall()
+        self.assertEqual([tuple(row) for row in results],
+                         [(1, ant), (2, bee)])
+
+    def test_b7e2f4a8c1d5_pended_list_id_type(self):
+        pended_table = sa.sql.table(
+            'pended',
+            sa.sql.column('id', sa.Integer),
+            sa.sql.column('token', SAUnicode),
+            )
+        keyvalue_table = sa.sql.table(
+            'pendedkeyvalue',
+            sa.sql.column('key', SAUnicode),
+            sa.sql.column('value', SAUnicode),
+            sa.sql.column('pended_id', sa.Integer),
+            )
+        with transaction():
+            # Start at the previous revision.
+            alembic.command.downgrade(alembic_cfg, 'a9d5e3f7c2b8')
+            for i in range(1, 4):
+                config.db.store.execute(pended_table.insert().values(
+                    id=i, token='token-{}'.format(i)))
+            config.db.store.execute(keyvalue_table.insert().values([
+                {'pended_id': 1, 'key': 'type', 'value': 'subscription'},
+                {'pended_id': 1, 'key': 'list_id',
+                 'value': '"ant.example.com"'},
+                {'pended_id': 2, 'key': 'type', 'value': 'data'},
+                {'pended_id': 3, 'key': 'list_id', 'value': 'not json'},
+                ]))
+        with transaction():
+            alembic.command.upgrade(alembic_cfg, 'b7e2f4a8c1d5')
+        results = config.db.store.execute(
+            'SELECT id, list_id, pend_type FROM pended ORDER BY id'
+            ).fetchall()
+        self.assertEqual([tuple(row) for row in results], [
+            (1, 'ant.example.com', 'subscription'),
+            (2, None, 'data'),
+            (3, None, None),
+            ])
@@ -21,14 +21,25 @@ This is a subclass of email.message.Message but provides a slightly extended
 interface which is more convenient for use inside Mailman.  It also supports
 safe pickle deserialization, even if the email package adds additional Message
 attributes.
+
+Flattening a message is relatively expensive, and most messages are flattened
+more than once before they are delivered, so the flattened message, and the
+flattened bodies of its non-multipart parts, are cached.  The caches are
+cleared when the headers or the payload are changed through the Message API.
 """
 
 import email
 import email.message
 import email.utils
 
+from email.errors import MultipartInvariantViolationDefect
+from email.feedparser import FeedParser
+from email.generator import BytesGenerator, Generator
 from email.header import Header
 from email.mime.multipart import MIMEMultipart
+from email.parser import BytesHeaderParser
+from email.policy import Compat32
+from io import BytesIO, StringIO
 from mailman.config import config
 from mailman.interfaces.address import IEmailValidator
 from public import public
@@ -38,25 +49,146 @@ from zope.component import getUtility
 COMMASPACE = ', '
 
 
+class _BodyCachingMixin:
+    """Reuse the flattened bodies of the unchanged non-multipart parts."""
+
+    def _dispatch(self, msg):
+        if (self._mangle_from_ or not isinstance(msg, Message) or
+                msg.is_multipart()):
+            super()._dispatch(msg)
+            return
+        key = (self.kind, self._NL, self.policy.cte_type)
+        body = msg._flattened_body.get(key)
+        if body is not None:
+            self._fp.write(body)
+            return
+        super()._dispatch(msg)
+        # When the body could only be written by changing the headers of the
+        # part, it must be written the same way the next time.
+        if self._munge_cte is None:
+            msg._cache('_flattened_body', key, self._fp.getvalue())
+
+
+class _Generator(_BodyCachingMixin, Generator):
+    kind = 'str'
+    buffer_class = StringIO
+
+
+class _BytesGenerator(_BodyCachingMixin, BytesGenerator):
+    kind = 'bytes'
+    buffer_class = BytesIO
+
+
 @public
 class Message(email.message.Message):
+    # The flattened message, and the flattened body of the message if it is
+    # not multipart, keyed by how they were flattened.
+    _flattened = {}
+    _flattened_body = {}
+
     # BAW: For debugging w/ bin/dumpdb.  Apparently pprint uses repr.
     def __repr__(self):
         return self.__str__()
 
+    def __getstate__(self):
+        # The flattened forms are only a cache, and can be a lot bigger than
+        # the message itself, so don't pickle them.
+        values = self.__dict__.copy()
+        values.pop('_flattened', None)
+        values.pop('_flattened_body', None)
+        return values
+
     def __setstate__(self, values):
         self.__dict__ = values
 
+    def _cache(self, name, key, value):
+        self.__dict__.setdefault(name, {})[key] = value
+
+    def _changed(self, payload=False):
+        self.__dict__.pop('_flattened', None)
+        if payload:
+            self.__dict__.pop('_flattened_body', None)
+
+    def _flatten(self, generator_class, unixfrom, policy):
+        # The subparts of a multipart message can be changed without the
+        # message knowing about it, so only the flattened bodies of those
+        # subparts are reused.
+        key = None
+        if isinstance(policy, Compat32) and not self.is_multipart():
+            key = (generator_class.kind, unixfrom, policy.linesep,
+                   policy.max_line_length, policy.cte_type)
+            flattened = self._flattened.get(key)
+            if flattened is not None:
+                return flattened
+        fp = generator_class.buffer_class()
+        generator = generator_class(fp, mangle_from_=False, policy=policy)
+        generator.flatten(self, unixfrom=unixfrom)
+        flattened = fp.getvalue()
+        if key is not None:
+            self._cache('_flattened', key, flattened)
+        return flattened
+
     def as_string(self):
         # Work around for https://bugs.python.org/issue27321 and
         # https://bugs.python.org/issue32330.
         try:
-            value = email.message.Message.as_string(self)
+            value = self._flatten(
+                _Generator, False, self.policy.clone(max_line_length=0))
         except (KeyError, LookupError, UnicodeEncodeError):
-            value = email.message.Message.as_bytes(self).decode(
-                'ascii', 'replace')
+            value = self.as_bytes().decode('ascii', 'replace')
         return value
 
+    def as_bytes(self, unixfrom=False, policy=None):
+        return self._flatten(
+            _BytesGenerator, unixfrom,
+            self.policy if policy is None else policy)
+
+    # Changing the headers or the payload clears the caches.
+
+    def __setitem__(self, name, value):
+        super().__setitem__(name, value)
+        self._changed()
+
+    def __delitem__(self, name):
+        super().__delitem__(name)
+        self._changed()
+
+    def add_header(self, name, value, **params):
+        super().add_header(name, value, **params)
+        self._changed()
+
+    def replace_header(self, name, value):
+        super().replace_header(name, value)
+        self._changed()
+
+    def set_raw(self, name, value):
+        super().set_raw(name, value)
+        self._changed()
+
+    def set_boundary(self, boundary):
+        super().set_boundary(boundary)
+        self._changed()
+
+    def set_default_type(self, ctype):
+        super().set_default_type(ctype)
+        self._changed()
+
+    def set_unixfrom(self, unixfrom):
+        super().set_unixfrom(unixfrom)
+        self._changed()
+
+    def set_payload(self, payload, charset=None):
+        super().set_payload(payload, charset)
+        self._changed(payload=True)
+
+    def set_charset(self, charset):
+        super().set_charset(charset)
+        self._changed(payload=True)
+
+    def attach(self, payload):
+        super().attach(payload)
+        self._changed(payload=True)
+
     @property
     def sender(self):
         """The address considered to be the author of the email.
@@ -123,6 +255,86 @@ class Message(email.message.Message):
         return clean_senders
 
 
+def _parsed(name):
+    # An attribute which is only set once the body is parsed.
+    def getter(self):
+        self.parse()
+        return self.__dict__.get(name)
+    def setter(self, value):                                # noqa: E306
+        self.__dict__[name] = value
+    return property(getter, setter)
+
+
+@public
+class LazyMessage(Message):
+    """A message whose body is parsed when it is first used.
+
+    Most rules only look at the headers of a message, so `from_bytes()` only
+    parses the headers.  The body of a multipart or message/* message is
+    kept unparsed until its payload, preamble or epilogue is first used, and
+    until then `defects` only holds the defects of the headers.  The bodies
+    of other messages are the same whether they are parsed or not.
+    """
+
+    # Whether the payload is the unparsed body.
+    _unparsed = False
+
+    @classmethod
+    def from_bytes(cls, data):
+        """Parse the headers of a message.
+
+        :param data: The message.
+        :type data: bytes
+        :return: The message.
+        :rtype: `LazyMessage`
+        """
+        msg = BytesHeaderParser(cls).parsebytes(data)
+        if msg.get_content_maintype() in ('multipart', 'message'):
+            # The parser complains that the unparsed body of a multipart
+            # message is not a list of parts.  This is checked again when the
+            # body is parsed.
+            msg.defects = [
+                defect for defect in msg.defects
+                if not isinstance(defect, MultipartInvariantViolationDefect)
+                ]
+            msg._unparsed = True
+        return msg
+
+    def parse(self):
+        """Parse the body of the message, if it has not been parsed yet."""
+        if not self._unparsed:
+            return
+        self._unparsed = False
+        # The structure of the body only depends on these headers.
+        parser = FeedParser(Message, policy=self.policy)
+        for name, value in self._headers:
+            if name.lower() in ('content-type', 'content-transfer-encoding'):
+                parser.feed('{}: {}\n'.format(name, value))
+        parser.feed('\n')
+        parser.feed(self.__dict__['_payload'])
+        body = parser.close()
+        self.__dict__.update(
+            _payload=body._payload,
+            preamble=body.preamble,
+            epilogue=body.epilogue,
+            )
+        self.defects.extend(body.defects)
+
+    @property
+    def _payload(self):
+        self.parse()
+        return self.__dict__['_payload']
+
+    @_payload.setter
+    def _payload(self, payload):
+        # A new payload replaces the unparsed body.
+        self.__dict__['_payload'] = payload
+        self._unparsed = False
+
+    preamble = _parsed('preamble')
+    epilogue = _parsed('epilogue')
+
+
 @public
 class MultipartDigestMessage(MIMEMultipart, Message):
     """Mix-in class for MIME digest messages."""
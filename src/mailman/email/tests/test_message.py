@@ -17,16 +17,23 @@
 
 """Test the message API."""
 
+import copy
+import email
+import pickle
 import unittest
 
 from email import message_from_binary_file
+from email.errors import NoBoundaryInMultipartDefect
+from email.generator import BytesGenerator
 from email.header import Header
 from email.parser import FeedParser
 from importlib_resources import path
 from mailman.app.lifecycle import create_list
-from mailman.email.message import Message, UserNotification
-from mailman.testing.helpers import get_queue_messages
+from mailman.email.message import LazyMessage, Message, UserNotification
+from mailman.testing.helpers import (
+    get_queue_messages, specialized_message_from_string as mfs)
 from mailman.testing.layers import ConfigLayer
+from unittest import mock
 
 
 class TestMessage(unittest.TestCase):
@@ -122,3 +129,196 @@ Test content
                 fp.seek(0)
                 text = fp.read().decode('ascii', 'replace')
         self.assertEqual(msg.as_string(), text)
+
+
+class TestFlattening(unittest.TestCase):
+    layer = ConfigLayer
+
+    def setUp(self):
+        self._msg = email.message_from_bytes(b"""\
+From: anne@example.com
+To: test@example.com
+Subject: A short subject, a long subject, a very long subject which is folded
+Content-Type: text/plain; charset="utf-8"
+Content-Transfer-Encoding: 8bit
+
+caf\xc3\xa9
+""", Message)
+        self._handle_text = mock.patch.object(
+            BytesGenerator, '_handle_text', autospec=True,
+            side_effect=BytesGenerator._handle_text)
+
+    def test_same_as_email_package(self):
+        # The flattened message is the same as the email package's.
+        self.assertEqual(self._msg.as_bytes(),
+                         email.message.Message.as_bytes(self._msg))
+        self.assertEqual(self._msg.as_bytes(unixfrom=True),
+                         email.message.Message.as_bytes(
+                             self._msg, unixfrom=True))
+        msg = mfs("""\
+From: anne@example.com
+Subject: A short subject, a long subject, a very long subject which is folded
+
+Hello
+""")
+        self.assertEqual(msg.as_string(),
+                         email.message.Message.as_string(msg))
+
+    def test_cached(self):
+        with self._handle_text as handle_text:
+            flattened = self._msg.as_bytes()
+            self.assertIs(self._msg.as_bytes(), flattened)
+        self.assertEqual(handle_text.call_count, 1)
+
+    def test_header_changed(self):
+        # The body is not flattened again when only the headers change.
+        with self._handle_text as handle_text:
+            self._msg.as_bytes()
+            self._msg['X-Hello'] = 'World'
+            del self._msg['to']
+            flattened = self._msg.as_bytes()
+        self.assertEqual(handle_text.call_count, 1)
+        self.assertIn(b'\nX-Hello: World\n', flattened)
+        self.assertNotIn(b'\nTo:', flattened)
+        self.assertTrue(flattened.endswith(b'\n\ncaf\xc3\xa9\n'))
+
+    def test_payload_changed(self):
+        with self._handle_text as handle_text:
+            self._msg.as_bytes()
+            self._msg.set_payload('Bonjour\n')
+            flattened = self._msg.as_bytes()
+        self.assertEqual(handle_text.call_count, 2)
+        self.assertTrue(flattened.endswith(b'\n\nBonjour\n'))
+
+    def test_copy(self):
+        # A copy of the message can be changed independently.
+        self._msg.as_bytes()
+        message_copy = copy.deepcopy(self._msg)
+        message_copy.set_payload('Bonjour\n')
+        self.assertTrue(message_copy.as_bytes().endswith(b'\n\nBonjour\n'))
+        self.assertTrue(self._msg.as_bytes().endswith(b'\n\ncaf\xc3\xa9\n'))
+
+    def test_pickle(self):
+        # The flattened forms are not pickled along with the message.
+        unflattened = pickle.dumps(self._msg)
+        flattened = self._msg.as_bytes()
+        self.assertEqual(pickle.dumps(self._msg), unflattened)
+        self.assertIn('_flattened', vars(self._msg))
+        self.assertIn('_flattened_body', vars(self._msg))
+        msg = pickle.loads(pickle.dumps(self._msg))
+        self.assertNotIn('_flattened', vars(msg))
+        self.assertNotIn('_flattened_body', vars(msg))
+        self.assertEqual(msg.as_bytes(), flattened)
+
+    def test_subpart_changed(self):
+        # The subparts of a multipart message may be changed without the
+        # message knowing about it.
+        msg = mfs("""\
+From: anne@example.com
+Content-Type: multipart/mixed; boundary="BOUNDARY"
+
+--BOUNDARY
+Content-Type: text/plain
+
+Hello
+--BOUNDARY--
+""")
+        self.assertIn('\nHello\n', msg.as_string())
+        msg.get_payload(0).set_payload('Goodbye')
+        self.assertIn('\nGoodbye\n', msg.as_string())
+        msg.get_payload().append(mfs('Content-Type: text/plain\n\nAgain\n'))
+        self.assertIn('\nAgain\n', msg.as_string())
+
+
+MULTIPART = b"""\
+From: anne@example.com
+To: test@example.com
+Subject: Parts
+Content-Type: multipart/mixed; boundary="BOUNDARY"
+
+A preamble
+--BOUNDARY
+Content-Type: text/plain
+
+Hello
+--BOUNDARY
+Content-Type: message/rfc822
+
+Subject: Inner
+
+Hi
+--BOUNDARY--
+An epilogue
+"""
+
+
+class TestLazyMessage(unittest.TestCase):
+    layer = ConfigLayer
+
+    def test_headers_only(self):
+        msg = LazyMessage.from_bytes(MULTIPART)
+        self.assertEqual(msg['subject'], 'Parts')
+        self.assertTrue(msg._unparsed)
+        self.assertEqual(msg.defects, [])
+        # Using the payload parses the body.
+        self.assertTrue(msg.is_multipart())
+        self.assertFalse(msg._unparsed)
+        self.assertEqual([part.get_content_type() for part in msg.walk()], [
+            'multipart/mixed',
+            'text/plain',
+            'message/rfc822',
+            'text/plain',
+            ])
+
+    def test_same_as_parsed(self):
+        full = email.message_from_bytes(MULTIPART, Message)
+        for attribute in ('preamble', 'epilogue'):
+            msg = LazyMessage.from_bytes(MULTIPART)
+            self.assertEqual(getattr(msg, attribute),
+                             getattr(full, attribute))
+            self.assertFalse(msg._unparsed)
+        msg = LazyMessage.from_bytes(MULTIPART)
+        self.assertEqual(msg.as_bytes(), full.as_bytes())
+        self.assertEqual(msg.as_string(), full.as_string())
+
+    def test_header_changes_kept(self):
+        msg = LazyMessage.from_bytes(MULTIPART)
+        msg['X-Hello'] = 'World'
+        msg.parse()
+        self.assertEqual(msg['x-hello'], 'World')
+        self.assertEqual(msg.get_payload(0).get_payload(), 'Hello')
+
+    def test_body_defects(self):
+        msg = LazyMessage.from_bytes(b"""\
+From: anne@example.com
+Content-Type: multipart/mixed
+
+Hello
+""")
+        self.assertEqual(msg.defects, [])
+        msg.parse()
+        self.assertIn(NoBoundaryInMultipartDefect,
+                      [type(defect) for defect in msg.defects])
+
+    def test_not_multipart(self):
+        # Other bodies are the same whether they are parsed or not.
+        msg = LazyMessage.from_bytes(b"""\
+From: anne@example.com
+
+Hello
+""")
+        self.assertFalse(msg._unparsed)
+        self.assertEqual(msg.get_payload(), 'Hello\n')
+
+    def test_set_payload(self):
+        # A new payload replaces the unparsed body.
+        msg = LazyMessage.from_bytes(MULTIPART)
+        msg.set_payload([Message()])
+        self.assertFalse(msg._unparsed)
+        self.assertEqual(len(msg.get_payload()), 1)
+
+    def test_pickle(self):
+        # The body is still unparsed after the message is unpickled.
+        msg = pickle.loads(pickle.dumps(LazyMessage.from_bytes(MULTIPART)))
+        self.assertTrue(msg._unparsed)
+        self.assertEqual(msg.epilogue, 'An epilogue\n')
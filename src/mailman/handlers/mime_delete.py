@@ -25,27 +25,22 @@ contents.
 """
 
 import os
-import shutil
 import logging
-import tempfile
 
-from contextlib import ExitStack, suppress
-from email.iterators import typed_subpart_iterator
 from email.mime.message import MIMEMessage
 from email.mime.text import MIMEText
-from itertools import count
 from lazr.config import as_boolean
 from mailman.config import config
 from mailman.core.i18n import _
 from mailman.email.message import OwnerNotification
 from mailman.interfaces.action import FilterAction
 from mailman.interfaces.handler import IHandler
+from mailman.interfaces.mime import FilterType, HTMLConversionError
 from mailman.interfaces.pipeline import DiscardMessage, RejectMessage
+from mailman.utilities.html import get_converter
 from mailman.utilities.string import oneline
 from mailman.version import VERSION
 from public import public
-from string import Template
-from subprocess import CalledProcessError, check_output
 from zope.interface import implementer
 
 
@@ -88,69 +83,198 @@ message.
     raise DiscardMessage(why)
 
 
+class _ContentPolicy:
+    """The compiled content filters of a mailing list."""
+
+    def __init__(self, mlist):
+        self.filter_types = frozenset(mlist.filter_types)
+        self.pass_types = frozenset(mlist.pass_types)
+        self.filter_extensions = frozenset(mlist.filter_extensions)
+        self.pass_extensions = frozenset(mlist.pass_extensions)
+
+    def check(self, part):
+        """Return the type of the filter the part fails, or None."""
+        ctype = part.get_content_type()
+        mtype = part.get_content_maintype()
+        if ctype in self.filter_types or mtype in self.filter_types:
+            return FilterType.filter_mime
+        if self.pass_types and not (
+                ctype in self.pass_types or mtype in self.pass_types):
+            return FilterType.pass_mime
+        if not (self.filter_extensions or self.pass_extensions):
+            return None
+        fext = get_file_ext(part)
+        if fext:
+            if fext in self.filter_extensions:
+                return FilterType.filter_extension
+            if self.pass_extensions and fext not in self.pass_extensions:
+                return FilterType.pass_extension
+        return None
+
+
+# Map list ids to the key the policy was compiled for and the policy.  The key
+# changes whenever the list's content filters change, or the list is deleted
+# and created again.
+_policies = {}
+
+
+def get_policy(mlist):
+    key = (mlist.id, mlist.created_at, mlist.content_filters_serial)
+    cached_key, policy = _policies.get(mlist.list_id, (None, None))
+    if cached_key != key:
+        policy = _ContentPolicy(mlist)
+        _policies[mlist.list_id] = (key, policy)
+    return policy
+
+
+def _replace(parts, old, new):
+    # reset_payload() moves the payload of a part into another one.
+    return [new if part is old else part for part in parts]
+
+
+class _MIMEFilter:
+    """Filter the parts of a message in a single bottom up pass.
+
+    Subparts matching the content filters are removed, multipart/alternative
+    subparts are replaced by their first alternative, and multipart subparts
+    left with a single subpart are replaced by it.  The text/html parts that
+    are left are collected for converting them to text/plain.
+    """
+
+    def __init__(self, policy, collapse, convert):
+        self.policy = policy
+        self.collapse = collapse
+        self.convert = convert
+        self.changed = False
+
+    def html_parts(self, part):
+        if self.convert and part.get_content_type() == 'text/html':
+            return [part]
+        return []
+
+    def walk(self, part, recast=True):
+        """Filter the subparts of a multipart part.
+
+        :return: The remaining subparts of the part, each paired with the
+            text/html parts left in it, or None if all of them were filtered
+            out.
+        """
+        # If this is a multipart/signed part, don't recast anything in it, as
+        # the signature may still be valid and recasting may break it.
+        # (LP: #1551075)
+        recast = recast and part.get_content_type() != 'multipart/signed'
+        payload = part.get_payload()
+        kept = []
+        for subpart in payload:
+            if subpart.is_multipart():
+                subparts = self.walk(subpart, recast)
+                if subparts is None:
+                    # We threw away everything in the subpart.
+                    self.changed = True
+                    continue
+            else:
+                subparts = None
+            if self.policy.check(subpart) is not None:
+                self.changed = True
+                continue
+            if subparts is None:
+                html = self.html_parts(subpart)
+            elif (self.collapse and
+                    subpart.get_content_type() == 'multipart/alternative'):
+                self.changed = True
+                if len(subparts) == 0:
+                    continue
+                firstalt, html = subparts[0]
+                if part.get_content_type() == 'message/rfc822':
+                    # This is a multipart/alternative message in a
+                    # message/rfc822 part.  We treat it specially so as not to
+                    # lose the headers.
+                    reset_payload(subpart, firstalt)
+                    html = _replace(html, firstalt, subpart)
+                else:
+                    subpart = firstalt
+            else:
+                html = [html_part for child, child_html in subparts
+                        for html_part in child_html]
+            if recast:
+                html = self.recast(subpart, html)
+            kept.append((subpart, html))
+        part.set_payload([subpart for subpart, html in kept])
+        if len(kept) == 0 and len(payload) > 0:
+            return None
+        return kept
+
+    def recast(self, part, html):
+        """Replace a multipart part with only one subpart by the subpart.
+
+        message/rfc822 and multipart/signed parts are not recast, so as not to
+        lose the headers or break the signature.
+
+        :return: The text/html parts left in the part.
+        """
+        while (part.is_multipart() and
+               len(part.get_payload()) == 1 and
+               part.get_content_type() not in (
+                   'message/rfc822', 'multipart/signed')):
+            subpart = part.get_payload(0)
+            reset_payload(part, subpart)
+            html = _replace(html, subpart, part)
+            self.changed = True
+        return html
+
+
 def process(mlist, msg, msgdata):
     # We also don't care about our own digests or plaintext
     ctype = msg.get_content_type()
-    mtype = msg.get_content_maintype()
-    # Check to see if the outer type matches one of the filter types
-    filtertypes = set(mlist.filter_types)
-    passtypes = set(mlist.pass_types)
-    if ctype in filtertypes or mtype in filtertypes:
+    policy = get_policy(mlist)
+    # Check to see if the outer type matches one of the filter types, or
+    # there are pass types and the outer type doesn't match one of them, and
+    # the same for the file extensions.
+    failed = policy.check(msg)
+    if failed is FilterType.filter_mime:
         dispose(mlist, msg, msgdata,
                 _("The message's content type was explicitly disallowed"))
-    # Check to see if there is a pass types and the outer type doesn't match
-    # one of these types
-    if passtypes and not (ctype in passtypes or mtype in passtypes):
+    elif failed is FilterType.pass_mime:
         dispose(mlist, msg, msgdata,
                 _("The message's content type was not explicitly allowed"))
-    # Filter by file extensions
-    filterexts = set(mlist.filter_extensions)
-    passexts = set(mlist.pass_extensions)
-    fext = get_file_ext(msg)
-    if fext:
-        if fext in filterexts:
-            dispose(
-                mlist, msg, msgdata,
+    elif failed is FilterType.filter_extension:
+        dispose(mlist, msg, msgdata,
                 _("The message's file extension was explicitly disallowed"))
-        if passexts and not (fext in passexts):
-            dispose(
-                mlist, msg, msgdata,
+    elif failed is FilterType.pass_extension:
+        dispose(mlist, msg, msgdata,
                 _("The message's file extension was not explicitly allowed"))
-    numparts = len([subpart for subpart in msg.walk()])
-    # If the message is a multipart, filter out matching subparts
+    walker = _MIMEFilter(
+        policy, mlist.collapse_alternatives, mlist.convert_html_to_plaintext)
     if msg.is_multipart():
-        # Recursively filter out any subparts that match the filter list
-        prelen = len(msg.get_payload())
-        filter_parts(msg, filtertypes, passtypes, filterexts, passexts)
+        # Filter out matching subparts, replace all multipart/alternatives
+        # with just the first non-empty alternative, and recast any multipart
+        # parts with only one subpart as just the subpart.
+        kept = walker.walk(msg)
         # If the outer message is now an empty multipart (and it wasn't
         # before!) then, again it gets discarded.
-        postlen = len(msg.get_payload())
-        if postlen == 0 and prelen > 0:
+        if kept is None:
             dispose(mlist, msg, msgdata,
                     _("After content filtering, the message was empty"))
-    # Now replace all multipart/alternatives with just the first non-empty
-    # alternative.  BAW: We have to special case when the outer part is a
-    # multipart/alternative because we need to retain most of the outer part's
-    # headers.  For now we'll move the subpart's payload into the outer part,
-    # and then copy over its Content-Type: and Content-Transfer-Encoding:
-    # headers (any others?).
-    if mlist.collapse_alternatives:
-        collapse_multipart_alternatives(msg)
-        if ctype == 'multipart/alternative':
-            firstalt = msg.get_payload(0)
+        html = [html_part for subpart, subpart_html in kept
+                for html_part in subpart_html]
+        # BAW: We have to special case when the outer part is a
+        # multipart/alternative because we need to retain most of the outer
+        # part's headers.  For now we'll move the subpart's payload into the
+        # outer part, and then copy over its Content-Type: and
+        # Content-Transfer-Encoding: headers (any others?).
+        if mlist.collapse_alternatives and ctype == 'multipart/alternative':
+            firstalt, html = kept[0]
             reset_payload(msg, firstalt)
-    # Now that we've collapsed the MPA parts, go through the message
-    # and recast any multipart parts with only one sub-part as just
-    # the sub-part.
-    if msg.is_multipart():
-        recast_multipart(msg)
+            html = _replace(html, firstalt, msg)
+            walker.changed = True
+        html = walker.recast(msg, html)
+    else:
+        html = walker.html_parts(msg)
     # If we removed some parts, make note of this
-    changedp = 0
-    if numparts != len([subpart for subpart in msg.walk()]):
-        changedp = 1
+    changedp = 1 if walker.changed else 0
     # Now perhaps convert all text/html to text/plain.
-    if mlist.convert_html_to_plaintext:
-        changedp += to_plaintext(msg)
+    if len(html) > 0:
+        changedp += to_plaintext(html)
     # If we're left with only two parts, an empty body and one attachment,
     # recast the message to one of just that part
     if msg.is_multipart() and len(msg.get_payload()) == 2:
@@ -182,111 +306,21 @@ def reset_payload(msg, subpart):
         msg['Content-Description'] = cdesc
 
 
-def filter_parts(msg, filtertypes, passtypes, filterexts, passexts):
-    # Look at all the message's subparts, and recursively filter
-    if not msg.is_multipart():
-        return True
-    payload = msg.get_payload()
-    prelen = len(payload)
-    newpayload = []
-    for subpart in payload:
-        keep = filter_parts(subpart, filtertypes, passtypes,
-                            filterexts, passexts)
-        if not keep:
-            continue
-        ctype = subpart.get_content_type()
-        mtype = subpart.get_content_maintype()
-        if ctype in filtertypes or mtype in filtertypes:
-            # Throw this subpart away
-            continue
-        if passtypes and not (ctype in passtypes or mtype in passtypes):
-            # Throw this subpart away
-            continue
-        # check file extension
-        fext = get_file_ext(subpart)
-        if fext:
-            if fext in filterexts:
-                continue
-            if passexts and not (fext in passexts):
-                continue
-        newpayload.append(subpart)
-    # Check to see if we discarded all the subparts
-    postlen = len(newpayload)
-    msg.set_payload(newpayload)
-    if postlen == 0 and prelen > 0:
-        # We threw away everything
-        return False
-    return True
-
-
-def collapse_multipart_alternatives(msg):
-    if not msg.is_multipart():
-        return
-    newpayload = []
-    for subpart in msg.get_payload():
-        if subpart.get_content_type() == 'multipart/alternative':
-            with suppress(IndexError):
-                firstalt = subpart.get_payload(0)
-                if msg.get_content_type() == 'message/rfc822':
-                    # This is a multipart/alternative message in a
-                    # message/rfc822 part. We treat it specially so as not to
-                    # lose the headers.
-                    reset_payload(subpart, firstalt)
-                    newpayload.append(subpart)
-                else:
-                    newpayload.append(firstalt)
-        elif subpart.is_multipart():
-            collapse_multipart_alternatives(subpart)
-            newpayload.append(subpart)
-        else:
-            newpayload.append(subpart)
-    msg.set_payload(newpayload)
-
-
-def recast_multipart(msg):
-    # If we're left with a multipart message with only one sub-part, recast
-    # the message to just the sub-part, but not if the part is message/rfc822
-    # because we don't want to lose the headers.
-    # Also, if this is a multipart/signed part, stop now as the original part
-    # may have had a multipart sub-part with only one sub-sub-part, the sig
-    # may still be valid and going further may break it.  (LP: #1551075)
-    if msg.get_content_type() == 'multipart/signed':
-        return
-    if msg.is_multipart():
-        if (len(msg.get_payload()) == 1 and
-                msg.get_content_type() != 'message/rfc822'):
-            reset_payload(msg, msg.get_payload(0))
-            # now that we've recast this part, check the subordinate parts
-            recast_multipart(msg)
-        else:
-            # This part's OK but check deeper.
-            for part in msg.get_payload():
-                recast_multipart(part)
-
-
-def to_plaintext(msg):
+def to_plaintext(parts):
     changedp = 0
-    counter = count()
-    with ExitStack() as resources:
-        tempdir = tempfile.mkdtemp()
-        resources.callback(shutil.rmtree, tempdir)
-        for subpart in typed_subpart_iterator(msg, 'text', 'html'):
-            filename = os.path.join(tempdir, '{}.html'.format(next(counter)))
-            with open(filename, 'w', encoding='utf-8') as fp:
-                fp.write(subpart.get_payload())
-            template = Template(config.mailman.html_to_plain_text_command)
-            command = template.safe_substitute(filename=filename).split()
-            try:
-                stdout = check_output(command, universal_newlines=True)
-            except (CalledProcessError, FileNotFoundError, PermissionError):
-                log.exception('HTML -> text/plain command error')
-            else:
-                # Replace the payload of the subpart with the converted text
-                # and tweak the content type.
-                del subpart['content-transfer-encoding']
-                subpart.set_payload(stdout)
-                subpart.set_type('text/plain')
-                changedp += 1
+    converter = get_converter()
+    for subpart in parts:
+        try:
+            text = converter.convert(subpart.get_payload())
+        except HTMLConversionError:
+            log.exception('HTML -> text/plain command error')
+        else:
+            # Replace the payload of the subpart with the converted text and
+            # tweak the content type.
+            del subpart['content-transfer-encoding']
+            subpart.set_payload(text)
+            subpart.set_type('text/plain')
+            changedp += 1
     return changedp
 
 
@@ -321,3 +355,7 @@ class MIMEDelete:
         if msgdata.get('isdigest'):
             return
         process(mlist, msg, msgdata)
+
+    def flush(self):
+        """Forget the content filters of all mailing lists."""
+        _policies.clear()
@@ -296,6 +296,22 @@ MIME-Version: 1.0
         payload_lines = msg.get_payload().splitlines()
         self.assertEqual(payload_lines[0], '<html><head></head>')
 
+    @configuration('mailman', html_to_plain_text_converter=(
+        'mailman.utilities.html.PythonConverter'))
+    def test_convert_html_in_process(self):
+        msg = mfs("""\
+From: aperson@example.com
+Content-Type: text/html
+MIME-Version: 1.0
+
+<html><head></head>
+<body><p>Hello <b>world</b></p></body></html>
+""")
+        process = config.handlers['mime-delete'].process
+        process(self._mlist, msg, {})
+        self.assertEqual(msg.get_content_type(), 'text/plain')
+        self.assertEqual(msg.get_payload(), 'Hello world\n')
+
 
 class TestMiscellaneous(unittest.TestCase):
     """Test various miscellaneous filtering actions."""
@@ -367,3 +383,94 @@ spreadsheet
         self.assertEqual(msg.get_payload(), """\
 Plain text
 """)
+
+
+class TestContentPolicy(unittest.TestCase):
+    """Test the caching of the content filters."""
+
+    layer = ConfigLayer
+
+    def setUp(self):
+        self._mlist = create_list('test@example.com')
+        self._mlist.filter_content = True
+        self._mlist.filter_types = ['image']
+
+    def _process(self):
+        msg = mfs("""\
+From: anne@example.com
+To: test@example.com
+Message-ID: <ant>
+MIME-Version: 1.0
+Content-Type: multipart/mixed; boundary="AAAA"
+
+--AAAA
+Content-Type: text/plain
+
+Plain text
+
+--AAAA
+Content-Type: image/png
+
+image
+
+--AAAA
+Content-Type: application/pdf
+
+pdf
+--AAAA--
+""")
+        mime_delete.process(self._mlist, msg, {})
+        return [part.get_content_type() for part in msg.get_payload()]
+
+    def test_policy_is_cached(self):
+        policy = mime_delete.get_policy(self._mlist)
+        self.assertEqual(policy.filter_types, {'image'})
+        self.assertIs(mime_delete.get_policy(self._mlist), policy)
+        self.assertEqual(self._process(), ['text/plain', 'application/pdf'])
+
+    def test_policy_is_invalidated(self):
+        self.assertEqual(self._process(), ['text/plain', 'application/pdf'])
+        self._mlist.filter_types = ['application/pdf']
+        self.assertEqual(self._process(), ['text/plain', 'image/png'])
+        self._mlist.filter_types = []
+        self._mlist.pass_types = ['multipart', 'text', 'image']
+        self.assertEqual(self._process(), ['text/plain', 'image/png'])
+
+    def test_only_kept_html_is_converted(self):
+        # Alternatives thrown away by collapsing them aren't converted.
+        self._mlist.collapse_alternatives = True
+        self._mlist.convert_html_to_plaintext = True
+        msg = mfs("""\
+From: anne@example.com
+To: test@example.com
+Message-ID: <ant>
+MIME-Version: 1.0
+Content-Type: multipart/mixed; boundary="AAAA"
+
+--AAAA
+Content-Type: multipart/alternative; boundary="BBBB"
+
+--BBBB
+Content-Type: text/html
+
+<p>First</p>
+--BBBB
+Content-Type: text/html
+
+<p>Second</p>
+--BBBB--
+
+--AAAA
+Content-Type: image/png
+
+image
+--AAAA--
+""")
+        with patch('mailman.handlers.mime_delete.to_plaintext',
+                   return_value=1) as to_plaintext:
+            mime_delete.process(self._mlist, msg, {})
+        # The image was filtered, the alternative collapsed and the
+        # multipart/mixed recast, which leaves the first alternative.
+        self.assertEqual(msg.get_content_type(), 'text/html')
+        self.assertEqual(msg.get_payload(), '<p>First</p>')
+        to_plaintext.assert_called_once_with([msg])
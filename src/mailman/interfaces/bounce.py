@@ -35,6 +35,18 @@ class BounceContext(Enum):
     probe = 2
 
 
+@public
+class BounceAction(Enum):
+    """What to do with a member whose bounce score reached the threshold."""
+
+    # Send the member a probe message.  The member is disabled only if the
+    # probe bounces too.
+    probe = 1
+
+    # The member's delivery has been disabled.
+    disable = 2
+
+
 @public
 class UnrecognizedBounceDisposition(Enum):
     # Just throw the message away.
@@ -95,3 +107,25 @@ class IBounceProcessor(Interface):
 
     unprocessed = Attribute(
         """An iterator over all unprocessed bounce events.""")
+
+    def process(batch_size=None):
+        """Score all unprocessed bounce events.
+
+        The events are counted per mailing list and email address in the
+        database, and the bounce scores of the corresponding members are
+        updated in batches.  A member's score is reset first if their bounce
+        information went stale.  When the score reaches the mailing list's
+        threshold, the member is either sent a probe (if VERP probes are
+        enabled) or their delivery is disabled.  A bouncing probe always
+        disables delivery.  Afterward, all the events are marked as
+        processed, including those for mailing lists which don't process
+        bounces and for addresses which are not members.
+
+        :param batch_size: The number of members to score at a time.  The
+            default is the `[bounces]process_batch_size` setting.
+        :type batch_size: int
+        :return: The actions to take, as a list of 2-tuples of the member
+            and the `BounceAction`.  Disabling has already been done, but
+            the probes must still be sent.
+        :rtype: list
+        """
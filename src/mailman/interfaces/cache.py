@@ -66,8 +66,15 @@ class ICacheManager(Interface):
         :type key: str
         """
 
-    def evict_expired():
-        """Evict all files which have expired."""
+    def evict_expired(limit=None):
+        """Evict all files which have expired.
+
+        :param limit: The maximum number of files to evict, or None to evict
+            all the expired files.
+        :type limit: int or None
+        :return: The number of files evicted.
+        :rtype: int
+        """
 
     def clear():
         """Clear the entire cache of files."""
@@ -52,6 +52,9 @@ class IDatabase(Interface):
     store = Attribute(
         """The underlying database object on which you can do queries.""")
 
+    query_count = Attribute(
+        """The number of statements executed by this process so far.""")
+
 
 @public
 class IDatabaseFactory(Interface):
@@ -166,3 +166,17 @@ class IListManager(Interface):
         :return: The list of filtered mailing lists.
         :rtype: list of `IMailingList`
         """
+
+    def member_counts(list_ids):
+        """Count the regular members of several mailing lists at once.
+
+        This is equivalent to asking each list's `members` roster for its
+        `member_count`, but it only issues a single query.
+
+        :param list_ids: The list ids of the mailing lists to count.
+        :type list_ids: iterable of str
+        :return: A mapping from list id to the number of members with the
+            `MemberRole.member` role.  Every requested list id is present,
+            including those of lists without any members.
+        :rtype: dict
+        """
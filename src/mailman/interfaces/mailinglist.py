@@ -625,6 +625,13 @@ class IMailingList(Interface):
         `pass_extensions` is non-empty.
         """)
 
+    content_filters_serial = Attribute(
+        """A number which changes whenever the content filters change.
+
+        The content filters are the filter and pass types and extensions.
+        This lets them be cached, even across processes.
+        """)
+
     # Moderation.
 
     default_member_action = Attribute(
@@ -727,6 +734,12 @@ class IAcceptableAliasSet(Interface):
     aliases = Attribute(
         """An iterator over all the acceptable aliases.""")
 
+    serial = Attribute(
+        """A number which changes whenever the acceptable aliases change.
+
+        This lets the aliases be cached, even across processes.
+        """)
+
 
 @public
 class IListArchiver(Interface):
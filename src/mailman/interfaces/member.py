@@ -193,6 +193,17 @@ class IMember(Interface):
     moderation_action = Attribute(
         """The moderation action for this member as an `Action`.""")
 
+    bounce_score = Attribute(
+        """The member's current bounce score.
+
+        This is the number of bounces registered for the member since the
+        bounce information last went stale.""")
+
+    last_bounce_received = Attribute(
+        """The date and time of the last bounce registered for the member.
+
+        This is None if no bounce has ever been processed for the member.""")
+
     def unsubscribe():
         """Unsubscribe (and delete) this member from the mailing list."""
 
@@ -18,6 +18,7 @@
 """MIME content filtering."""
 
 from enum import Enum
+from mailman.interfaces.errors import MailmanError
 from public import public
 from zope.interface import Attribute, Interface
 
@@ -58,3 +59,33 @@ class IContentFilter(Interface):
 
     filter_type = Attribute(
         """Type of filter.""")
+
+
+@public
+class HTMLConversionError(MailmanError):
+    """The conversion of text/html to text/plain failed."""
+
+
+@public
+class IHTMLConverter(Interface):
+    """A converter of text/html parts to text/plain.
+
+    The converter is named by `[mailman]html_to_plain_text_converter`, and
+    one instance is created in every process which converts messages.
+    """
+
+    def convert(html):
+        """Convert HTML to plain text.
+
+        :param html: The HTML.
+        :type html: str
+        :return: The plain text.
+        :rtype: str
+        :raises HTMLConversionError: when the HTML could not be converted.
+        """
+
+    def close():
+        """Release any resources held by the converter.
+
+        The converter is not used afterward.
+        """
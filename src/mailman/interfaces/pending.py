@@ -93,8 +93,15 @@ class IPendings(Interface):
         :return: The matching IPendable or None if no match was found.
         """
 
-    def evict():
-        """Remove all pended items whose lifetime has expired."""
+    def evict(limit=None):
+        """Remove all pended items whose lifetime has expired.
+
+        :param limit: The maximum number of pended items to remove, or None
+            to remove all the expired items.
+        :type limit: int or None
+        :return: The number of pended items removed.
+        :rtype: int
+        """
 
     def find(mlist=None, pend_type=None, confirm=True):
         """Search for the pendables matching the given criteria.
@@ -108,8 +115,10 @@ class IPendings(Interface):
             returns all pending types.
         :param confirm: A flag indicating whether the found pendings should be
             "confirmed" or not.  See ``confirm()`` for details.
-        :return: An iterator over 2-tuples of the form (token, pendable).
-            When ``confirm`` is False, ``pendable`` is None.
+        :return: A sequence of 2-tuples of the form (token, pendable), in the
+            order the pendables were added.  When ``confirm`` is False,
+            ``pendable`` is None.  The sequence is sliced by the database, and
+            the pendables of a slice are loaded together.
         """
 
     def __iter__():
@@ -50,13 +50,16 @@ class IListRequests(Interface):
         :return: An integer.
         """
 
-    def hold_request(request_type, key, data=None):
+    def hold_request(request_type, key, data=None, summary=None):
         """Hold some data for moderator approval.
 
         :param request_type: A `RequestType` enum value.
         :param key: The key piece of request data being held.
         :param data: Additional optional data in the form of a dictionary that
             is associated with the held request.
+        :param summary: Optional JSON serializable dictionary which summarizes
+            the request, and which is returned along with the held requests
+            without loading their data.
         :return: A unique id for this held request.
         """
 
@@ -69,11 +72,12 @@ class IListRequests(Interface):
         """)
 
     def of_type(request_type):
-        """An iterator over the held requests of the given type.
+        """A sequence of the held requests of the given type.
 
-        Returned items have two  attributes:
+        Returned items have three attributes:
          * `id` is the held request's unique id;
-         * `type` is a `RequestType` enum value.
+         * `type` is a `RequestType` enum value;
+         * `summary` is the summary given when the request was held, or None.
 
          Only items with a matching `type' are returned.
          """
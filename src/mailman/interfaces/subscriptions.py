@@ -111,14 +111,31 @@ class ISubscriptionService(Interface):
     def get_members():
         """Return a sequence of all members of all mailing lists.
 
-        The members are sorted first by fully-qualified mailing list name,
-        then by subscribed email address, then by role.  Because the user may
-        be a member of the list under multiple roles (e.g. as an owner and as
-        a digest member), the member can appear multiple times in this list.
-        Roles are sorted by: owner, moderator, member.
-
-        :return: The list of all members.
-        :rtype: list of `IMember`
+        The members are sorted first by list-id, then by role, then by
+        subscribed email address.  Because the user may be a member of the
+        list under multiple roles (e.g. as an owner and as a digest member),
+        the member can appear multiple times in this list.  Roles are sorted
+        by: owner, moderator, member.  Nonmembers are not included.
+
+        The length and slices of the sequence are calculated by the database,
+        and iterating over it is like iterating over `iter_members()`.
+
+        :return: The sequence of all members.
+        :rtype: A `QuerySequence` of `IMember`
+        """
+
+    def iter_members(batch_size=1000):
+        """Iterate over all members of all mailing lists.
+
+        The members are in the same order as in `get_members()`.  They are
+        read from the database in batches, each batch starting after the
+        last member of the previous one, so that even huge sites can be
+        iterated over in constant memory and time per member.
+
+        :param batch_size: The number of members read at a time.
+        :type batch_size: int
+        :return: The members.
+        :rtype: iterator of `IMember`
         """
 
     def get_member(member_id):
@@ -174,7 +191,7 @@ class ISubscriptionService(Interface):
         """
 
     def __iter__():
-        """See `get_members()`."""
+        """See `iter_members()`."""
 
     def leave(list_id, email):
         """Unsubscribe from a mailing list.
@@ -42,6 +42,10 @@ class ISwitchboard(Interface):
         keyword arguments are added to the metadata dictonary, with precedence
         given to the keyword arguments.
 
+        Keys starting with an underscore are not stored.  If the `_when` key
+        is given, it is the time.time() value the entry is sorted by, instead
+        of the current time.
+
         The base name of the message file is returned.
         """
 
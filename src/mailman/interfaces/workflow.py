@@ -64,4 +64,17 @@ class IWorkflowStateManager(Interface):
         :type token: str
         """
 
+    def evict(limit=None):
+        """Throw away the saved states of abandoned workflows.
+
+        Workflows are saved under their pending token, so a workflow is
+        abandoned once its pended item was confirmed or evicted.
+
+        :param limit: The maximum number of workflow states to throw away,
+            or None to throw away all the abandoned workflow states.
+        :type limit: int or None
+        :return: The number of workflow states thrown away.
+        :rtype: int
+        """
+
     count = Attribute('The number of saved workflows in the database.')
@@ -17,14 +17,21 @@
 
 """Bounce support."""
 
+from collections import defaultdict
+from lazr.config import as_boolean
+from mailman.config import config
 from mailman.database.model import Model
 from mailman.database.transaction import dbconnection
 from mailman.database.types import Enum, SAUnicode
 from mailman.interfaces.bounce import (
-    BounceContext, IBounceEvent, IBounceProcessor)
+    BounceAction, BounceContext, IBounceEvent, IBounceProcessor)
+from mailman.interfaces.listmanager import IListManager
+from mailman.interfaces.member import DeliveryStatus, MemberRole
 from mailman.utilities.datetime import now
 from public import public
-from sqlalchemy import Boolean, Column, DateTime, Integer
+from sqlalchemy import Boolean, Column, DateTime, Integer, case, func
+from sqlalchemy.orm import aliased
+from zope.component import getUtility
 from zope.interface import implementer
 
 
@@ -41,7 +48,7 @@ class BounceEvent(Model):
     timestamp = Column(DateTime)
     message_id = Column(SAUnicode)
     context = Column(Enum(BounceContext))
-    processed = Column(Boolean)
+    processed = Column(Boolean, index=True)
 
     def __init__(self, list_id, email, msg, context=None):
         self.list_id = list_id
@@ -76,3 +83,101 @@ class BounceProcessor:
     def unprocessed(self, store):
         """See `IBounceProcessor`."""
         yield from store.query(BounceEvent).filter_by(processed=False)
+
+    @dbconnection
+    def process(self, store, batch_size=None):
+        """See `IBounceProcessor`."""
+        if batch_size is None:
+            batch_size = int(config.bounces.process_batch_size)
+        # Only handle the events which are already registered, so that the
+        # ones arriving while we're working are left for the next run.
+        last_id = store.query(func.max(BounceEvent.id)).filter(
+            BounceEvent.processed == False).scalar()        # noqa: E712
+        if last_id is None:
+            return []
+        pending = (BounceEvent.processed == False,          # noqa: E712
+                   BounceEvent.id <= last_id)
+        probes = func.max(case(
+            [(BounceEvent.context == BounceContext.probe, 1)], else_=0))
+        summary = store.query(
+            BounceEvent.list_id, BounceEvent.email,
+            func.count(BounceEvent.id), func.min(BounceEvent.timestamp),
+            func.max(BounceEvent.timestamp), probes,
+            ).filter(*pending).group_by(
+                BounceEvent.list_id, BounceEvent.email)
+        bounces = defaultdict(dict)
+        for list_id, email, count, first, last, probed in summary:
+            totals = bounces[list_id].setdefault(
+                email.lower(), [0, first, last, False])
+            totals[0] += count
+            totals[1] = min(totals[1], first)
+            totals[2] = max(totals[2], last)
+            totals[3] = totals[3] or bool(probed)
+        actions = []
+        list_manager = getUtility(IListManager)
+        for list_id in sorted(bounces):
+            mlist = list_manager.get_by_list_id(list_id)
+            if mlist is None or not mlist.process_bounces:
+                continue
+            emails = sorted(bounces[list_id])
+            for start in range(0, len(emails), batch_size):
+                batch = emails[start:start + batch_size]
+                for email, member in self._members(mlist, batch):
+                    action = self._score(
+                        mlist, member, *bounces[list_id][email])
+                    if action is not None:
+                        actions.append((member, action))
+        store.query(BounceEvent).filter(*pending).update(
+            dict(processed=True), synchronize_session=False)
+        return actions
+
+    @dbconnection
+    def _members(self, store, mlist, emails):
+        """Find the regular members subscribed with the given addresses.
+
+        Members subscribed through their user's preferred address are found
+        too.
+
+        :return: 2-tuples of the subscribed email address and the member.
+        """
+        # Avoid circular imports.
+        from mailman.model.address import Address
+        from mailman.model.member import Member
+        from mailman.model.user import User
+        member_user = aliased(User)
+        query = store.query(Address.email, Member).outerjoin(
+            member_user, Member.user_id == member_user.id,
+            ).join(
+                Address, Address.id == func.coalesce(
+                    Member.address_id, member_user._preferred_address_id),
+            ).filter(
+                Member.list_id == mlist.list_id,
+                Member.role == MemberRole.member,
+                Address.email.in_(emails))
+        yield from query
+
+    def _score(self, mlist, member, count, first, last, probed):
+        """Add bounces to the member's score and decide what to do next.
+
+        :return: The `BounceAction` to take, or None.
+        """
+        stale_after = mlist.bounce_info_stale_after
+        if (member.bounce_score is None or
+                member.last_bounce_received is None or
+                member.last_bounce_received + stale_after < first):
+            member.bounce_score = 0
+        member.bounce_score += count
+        if (member.last_bounce_received is None or
+                member.last_bounce_received < last):
+            member.last_bounce_received = last
+        if not probed and member.bounce_score < mlist.bounce_score_threshold:
+            return None
+        if member.delivery_status is not DeliveryStatus.enabled:
+            # Don't probe or disable members who don't get any messages.
+            return None
+        if not probed and as_boolean(config.mta.verp_probes):
+            # Start over, in case the probe gets through.
+            member.bounce_score = 0
+            return BounceAction.probe
+        member.preferences.delivery_status = DeliveryStatus.by_bounces
+        return BounceAction.disable
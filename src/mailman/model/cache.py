@@ -20,7 +20,7 @@
 import os
 import hashlib
 
-from contextlib import ExitStack
+from contextlib import ExitStack, suppress
 from lazr.config import as_timedelta
 from mailman.config import config
 from mailman.database.model import Model
@@ -41,7 +41,7 @@ class CacheEntry(Model):
     file_id = Column(SAUnicode)
     is_bytes = Column(Boolean)
     created_on = Column(DateTime)
-    expires_on = Column(DateTime)
+    expires_on = Column(DateTime, index=True)
 
     @dbconnection
     def __init__(self, store, key, file_id, is_bytes, lifetime):
@@ -151,16 +151,25 @@ class CacheManager:
         store.delete(entry)
 
     @dbconnection
-    def evict_expired(self, store):
+    def evict_expired(self, store, limit=None):
         """See `ICacheManager`."""
-        # Find all the cache entries which have expired.  We can probably do
-        # this more efficiently, but for now there probably aren't that many
-        # cached files.
-        for entry in store.query(CacheEntry):
-            if entry.is_expired:
-                file_path, dir_path = self._id_to_path(entry.file_id)
+        # Find the cache entries which have expired through the index.
+        query = store.query(CacheEntry.id, CacheEntry.file_id).filter(
+            CacheEntry.expires_on <= now())
+        if limit is not None:
+            query = query.limit(limit)
+        entry_ids = []
+        for entry_id, file_id in query:
+            file_path, dir_path = self._id_to_path(file_id)
+            # Don't choke on files which were removed by hand.
+            with suppress(FileNotFoundError):
                 os.remove(file_path)
-                store.delete(entry)
+            entry_ids.append(entry_id)
+        if len(entry_ids) == 0:
+            return 0
+        store.query(CacheEntry).filter(CacheEntry.id.in_(entry_ids)).delete(
+            synchronize_session=False)
+        return len(entry_ids)
 
     @dbconnection
     def clear(self, store):
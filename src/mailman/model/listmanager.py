@@ -22,15 +22,18 @@ from mailman.interfaces.address import InvalidEmailAddressError
 from mailman.interfaces.listmanager import (
     IListManager, ListAlreadyExistsError, ListCreatedEvent, ListCreatingEvent,
     ListDeletedEvent, ListDeletingEvent)
+from mailman.interfaces.member import MemberRole
 from mailman.interfaces.requests import IListRequests
 from mailman.model.autorespond import AutoResponseRecord
 from mailman.model.bans import Ban
 from mailman.model.mailinglist import (
     IAcceptableAliasSet, ListArchiver, MailingList)
+from mailman.model.member import Member
 from mailman.model.mime import ContentFilter
 from mailman.utilities.datetime import now
 from mailman.utilities.queries import QuerySequence
 from public import public
+from sqlalchemy import func
 from zope.event import notify
 from zope.interface import implementer
 
@@ -141,3 +144,16 @@ class ListManager:
             query = query.filter_by(mail_host=mail_host)
         query = query.order_by(MailingList._list_id)
         return QuerySequence(query)
+
+    @dbconnection
+    def member_counts(self, store, list_ids):
+        """See `IListManager`."""
+        list_ids = list(list_ids)
+        counts = dict.fromkeys(list_ids, 0)
+        if len(list_ids) == 0:
+            return counts
+        query = store.query(Member.list_id, func.count(Member.id)).filter(
+            Member.list_id.in_(list_ids),
+            Member.role == MemberRole.member).group_by(Member.list_id)
+        counts.update(query)
+        return counts
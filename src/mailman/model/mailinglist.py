@@ -51,7 +51,7 @@ from mailman.utilities.string import expand
 from public import public
 from sqlalchemy import (
     Boolean, Column, DateTime, Float, ForeignKey, Integer, Interval,
-    LargeBinary, PickleType)
+    LargeBinary, PickleType, func)
 from sqlalchemy.event import listen
 from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import relationship
@@ -65,6 +65,17 @@ SPACE = ' '
 UNDERSCORE = '_'
 
 
+def _increment_serial(store, mlist, name):
+    # Increment the serial in the database rather than in Python, so that
+    # concurrent changes from different processes can't be lost.
+    column = getattr(MailingList, name)
+    # A new mailing list may not have been flushed yet.
+    store.flush()
+    store.query(MailingList).filter(MailingList.id == mlist.id).update(
+        {column: func.coalesce(column, 0) + 1}, synchronize_session=False)
+    store.expire(mlist, [name])
+
+
 @public
 @implementer(IMailingList)
 class MailingList(Model):
@@ -81,6 +92,12 @@ class MailingList(Model):
     list_name = Column(SAUnicode, index=True)
     mail_host = Column(SAUnicode, index=True)
     _list_id = Column('list_id', SAUnicode, index=True, unique=True)
+    # Incremented whenever the acceptable aliases change.
+    _acceptable_aliases_serial = Column(
+        'acceptable_aliases_serial', Integer, default=0)
+    # Incremented whenever the content filters change.
+    _content_filters_serial = Column(
+        'content_filters_serial', Integer, default=0)
     allow_list_posts = Column(Boolean)
     include_rfc2369_headers = Column(Boolean)
     advertised = Column(Boolean)
@@ -333,6 +350,11 @@ class MailingList(Model):
         results.delete()
         return recipients
 
+    @property
+    def content_filters_serial(self):
+        """See `IMailingList`."""
+        return self._content_filters_serial or 0
+
     @property
     @dbconnection
     def filter_types(self, store):
@@ -357,6 +379,7 @@ class MailingList(Model):
             content_filter = ContentFilter(
                 self, mime_type, FilterType.filter_mime)
             store.add(content_filter)
+        _increment_serial(store, self, '_content_filters_serial')
 
     @property
     @dbconnection
@@ -382,6 +405,7 @@ class MailingList(Model):
             content_filter = ContentFilter(
                 self, mime_type, FilterType.pass_mime)
             store.add(content_filter)
+        _increment_serial(store, self, '_content_filters_serial')
 
     @property
     @dbconnection
@@ -407,6 +431,7 @@ class MailingList(Model):
             content_filter = ContentFilter(
                 self, mime_type, FilterType.filter_extension)
             store.add(content_filter)
+        _increment_serial(store, self, '_content_filters_serial')
 
     @property
     @dbconnection
@@ -432,6 +457,7 @@ class MailingList(Model):
             content_filter = ContentFilter(
                 self, mime_type, FilterType.pass_extension)
             store.add(content_filter)
+        _increment_serial(store, self, '_content_filters_serial')
 
     def get_roster(self, role):
         """See `IMailingList`."""
@@ -524,11 +550,21 @@ class AcceptableAliasSet:
     def __init__(self, mailing_list):
         self._mailing_list = mailing_list
 
+    @property
+    def serial(self):
+        """See `IAcceptableAliasSet`."""
+        return self._mailing_list._acceptable_aliases_serial or 0
+
+    def _changed(self, store):
+        _increment_serial(
+            store, self._mailing_list, '_acceptable_aliases_serial')
+
     @dbconnection
     def clear(self, store):
         """See `IAcceptableAliasSet`."""
         store.query(AcceptableAlias).filter(
             AcceptableAlias.mailing_list == self._mailing_list).delete()
+        self._changed(store)
 
     @dbconnection
     def add(self, store, alias):
@@ -536,12 +572,14 @@ class AcceptableAliasSet:
             raise ValueError(alias)
         alias = AcceptableAlias(self._mailing_list, alias.lower())
         store.add(alias)
+        self._changed(store)
 
     @dbconnection
     def remove(self, store, alias):
         store.query(AcceptableAlias).filter(
             AcceptableAlias.mailing_list == self._mailing_list,
             AcceptableAlias.alias == alias.lower()).delete()
+        self._changed(store)
 
     @property
     @dbconnection
@@ -30,7 +30,7 @@ from mailman.interfaces.user import IUser, UnverifiedAddressError
 from mailman.interfaces.usermanager import IUserManager
 from mailman.utilities.uid import UIDFactory
 from public import public
-from sqlalchemy import Column, ForeignKey, Integer
+from sqlalchemy import Column, DateTime, ForeignKey, Integer
 from sqlalchemy.orm import relationship
 from zope.component import getUtility
 from zope.event import notify
@@ -48,10 +48,12 @@ class Member(Model):
     __tablename__ = 'member'
 
     id = Column(Integer, primary_key=True)
-    _member_id = Column(UUID)
+    _member_id = Column(UUID, index=True)
     role = Column(Enum(MemberRole), index=True)
     list_id = Column(SAUnicode, index=True)
     moderation_action = Column(Enum(Action))
+    bounce_score = Column(Integer)
+    last_bounce_received = Column(DateTime)
 
     address_id = Column(Integer, ForeignKey('address.id'), index=True)
     _address = relationship('Address')
@@ -80,6 +82,8 @@ class Member(Model):
             assert role in (MemberRole.member, MemberRole.nonmember), (
                 'Invalid MemberRole: {}'.format(role))
             self.moderation_action = None
+        self.bounce_score = 0
+        self.last_bounce_received = None
 
     def __repr__(self):
         return '<Member: {} on {} as {}>'.format(
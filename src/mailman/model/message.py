@@ -35,8 +35,8 @@ class Message(Model):
 
     id = Column(Integer, primary_key=True)
     # This is a Messge-ID field representation, not a database row id.
-    message_id = Column(SAUnicode)
-    message_id_hash = Column(SAUnicode)
+    message_id = Column(SAUnicode, index=True)
+    message_id_hash = Column(SAUnicode, index=True)
     path = Column(SAUnicode)
 
     @dbconnection
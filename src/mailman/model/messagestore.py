@@ -15,18 +15,34 @@
 # You should have received a copy of the GNU General Public License along with
 # GNU Mailman.  If not, see <http://www.gnu.org/licenses/>.
 
-"""Model for message stores."""
+"""Model for message stores.
+
+The database's `message` table indexes the stored messages, and the contents
+of every message are kept by a storage class.  The `PickleStorage` pickles
+each message into its own file in a two-level hash directory.  The
+`PackedStorage` appends the raw, optionally compressed, bytes of the messages
+to large segment files, and parses them only when they are read.  New
+messages are written by the storage configured in `[messagestore]storage`,
+but the messages of either storage can always be read, so that the existing
+messages can be moved to the packed storage with `mailman pack-messages`.
+"""
 
 import os
+import re
+import zlib
 import errno
+import fcntl
 import pickle
 
+from email import message_from_bytes
 from mailman.config import config
 from mailman.database.transaction import dbconnection
+from mailman.email.message import Message as EmailMessage
 from mailman.interfaces.messages import IMessageStore
 from mailman.model.message import Message
-from mailman.utilities.email import add_message_hash
+from mailman.utilities.email import add_message_hash, message_id_hash
 from mailman.utilities.filesystem import makedirs, safe_remove
+from mailman.utilities.modules import call_name
 from public import public
 from zope.interface import implementer
 
@@ -35,6 +51,201 @@ from zope.interface import implementer
 # value.  We'd need a script to reshuffle and resplit.
 MAX_SPLITS = 2
 EMPTYSTRING = ''
+# The packed storage's locators are <segment>:<offset>:<size>, which can't be
+# confused with the relative paths of pickled messages.
+LOCATOR_RE = re.compile(r'^(?P<segment>[^:]+):(?P<offset>\d+):(?P<size>\d+)$')
+SEGMENTS_DIR = 'segments'
+
+
+def _compress_zstd(data):
+    import zstandard
+    return zstandard.ZstdCompressor().compress(data)
+
+
+def _decompress_zstd(data):
+    import zstandard
+    return zstandard.ZstdDecompressor().decompress(data)
+
+
+# Compression name -> (compress function, decompress function).  The zstd
+# compression requires the optional zstandard package.
+COMPRESSIONS = dict(
+    none=(bytes, bytes),
+    zlib=(zlib.compress, zlib.decompress),
+    zstd=(_compress_zstd, _decompress_zstd),
+    )
+
+
+@public
+class PickleStorage:
+    """Store every message in its own pickle file."""
+
+    def write(self, messages):
+        """Store the messages.
+
+        :param messages: The Message-ID-Hash of each message, and the message.
+        :type messages: sequence of 2-tuples
+        :return: The path of each message, relative to the messages
+            directory.
+        :rtype: list of str
+        """
+        paths = []
+        for hash32, message in messages:
+            # Calculate the path on disk where we're going to store this
+            # message object, in pickled format.
+            parts = []
+            split = list(hash32)
+            while split and len(parts) < MAX_SPLITS:
+                parts.append(split.pop(0) + split.pop(0))
+            parts.append(hash32)
+            relpath = os.path.join(*parts)
+            path = os.path.join(config.MESSAGES_DIR, relpath)
+            # Write the file to the path, but catch the appropriate exception
+            # in case the parent directories don't yet exist.  In that case,
+            # create them and try again.
+            while True:
+                try:
+                    with open(path, 'wb') as fp:
+                        # -1 says to use the highest protocol available.
+                        pickle.dump(message, fp, -1)
+                        break
+                except IOError as error:
+                    if error.errno != errno.ENOENT:
+                        raise
+                makedirs(os.path.dirname(path))
+            paths.append(relpath)
+        return paths
+
+    def read(self, path):
+        """Return the message stored at the relative path."""
+        with open(os.path.join(config.MESSAGES_DIR, path), 'rb') as fp:
+            return pickle.load(fp)
+
+    def delete(self, path):
+        """Delete the message stored at the relative path."""
+        # It's possible that a race condition caused the file system path to
+        # already be deleted.
+        safe_remove(os.path.join(config.MESSAGES_DIR, path))
+
+
+@public
+class PackedStorage:
+    """Append the raw bytes of the messages to segment files.
+
+    Each record in a segment starts with a header line holding the
+    Message-ID-Hash, the compression and the length of the message's bytes.
+    The records are located by `<segment>:<offset>:<size>` in the message
+    table.  A new segment is started when the newest one reaches
+    `[messagestore]segment_size` bytes.  The space of deleted messages is
+    only reclaimed by `mailman pack-messages --compact`.
+    """
+
+    def __init__(self):
+        section = config.messagestore
+        self._compression = section.compression
+        if self._compression not in COMPRESSIONS:
+            raise ValueError(
+                'Unknown message compression: {}'.format(self._compression))
+        self._segment_size = int(section.segment_size)
+
+    @property
+    def _directory(self):
+        return os.path.join(config.MESSAGES_DIR, SEGMENTS_DIR)
+
+    def segments(self):
+        """Return the names of the segments, oldest first."""
+        try:
+            return sorted(os.listdir(self._directory))
+        except FileNotFoundError:
+            return []
+
+    def _append(self, records):
+        # Append the records to the newest segment with a single write, and
+        # return where each of them starts.  The segment is locked so that
+        # the records of different processes don't interleave.
+        segments = self.segments()
+        if len(segments) == 0:
+            makedirs(self._directory)
+            segment = '{:08d}'.format(1)
+        else:
+            segment = segments[-1]
+            path = os.path.join(self._directory, segment)
+            if os.stat(path).st_size >= self._segment_size:
+                segment = '{:08d}'.format(int(segment) + 1)
+        path = os.path.join(self._directory, segment)
+        fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o660)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            offset = os.lseek(fd, 0, os.SEEK_END)
+            data = b''.join(records)
+            while len(data) > 0:
+                data = data[os.write(fd, data):]
+        finally:
+            os.close(fd)
+        locators = []
+        for record in records:
+            locators.append('{}/{}:{}:{}'.format(
+                SEGMENTS_DIR, segment, offset, len(record)))
+            offset += len(record)
+        return locators
+
+    def write(self, messages):
+        """See `PickleStorage`.
+
+        :return: The locator of each message.
+        """
+        compress = COMPRESSIONS[self._compression][0]
+        records = []
+        for hash32, message in messages:
+            # Keep the envelope sender, which a pickle would also keep.
+            data = compress(message.as_bytes(unixfrom=True))
+            records.append(b'%s %s %d\n' % (
+                hash32.encode('ascii'), self._compression.encode('ascii'),
+                len(data)) + data)
+        return self._append(records)
+
+    def read_record(self, locator):
+        """Return the raw record at the locator."""
+        parts = LOCATOR_RE.match(locator)
+        path = os.path.join(config.MESSAGES_DIR, parts.group('segment'))
+        with open(path, 'rb') as fp:
+            fp.seek(int(parts.group('offset')))
+            record = fp.read(int(parts.group('size')))
+        if len(record) != int(parts.group('size')):
+            raise ValueError('Truncated message record: {}'.format(locator))
+        return record
+
+    def read_bytes(self, locator):
+        """Return the bytes of the message at the locator."""
+        header, newline, data = self.read_record(locator).partition(b'\n')
+        hash32, compression, size = header.decode('ascii').split()
+        if len(data) != int(size):
+            raise ValueError('Corrupt message record: {}'.format(locator))
+        return COMPRESSIONS[compression][1](data)
+
+    def read(self, locator):
+        """Return the message at the locator, parsed from its bytes."""
+        return message_from_bytes(self.read_bytes(locator), EmailMessage)
+
+    def delete(self, locator):
+        """The record stays in its segment until it is compacted."""
+        pass
+
+    def copy(self, locators):
+        """Copy the records to the newest segment.
+
+        :return: The new locators of the records.
+        :rtype: list of str
+        """
+        return self._append([self.read_record(locator)
+                             for locator in locators])
+
+
+def _storage_for(path):
+    # The messages can be read no matter which storage is configured.
+    if LOCATOR_RE.match(path):
+        return PackedStorage()
+    return PickleStorage()
 
 
 @public
@@ -52,48 +263,23 @@ class MessageStore:
         message_id = message_ids[0]
         if isinstance(message_id, bytes):
             message_id = message_id.decode('ascii')
-        # If the Message-ID already exists in the store, don't store it again.
-        existing = store.query(Message).filter(
-            Message.message_id == message_id).first()
+        hash32 = message_id_hash(message_id)
+        # If the Message-ID-Hash already exists in the store, don't store it
+        # again, and leave the message alone.
+        existing = store.query(Message.id).filter(
+            Message.message_id_hash == hash32).first()
         if existing is not None:
             return None
-        hash32 = add_message_hash(message)
-        # Calculate the path on disk where we're going to store this message
-        # object, in pickled format.
-        parts = []
-        split = list(hash32)
-        while split and len(parts) < MAX_SPLITS:
-            parts.append(split.pop(0) + split.pop(0))
-        parts.append(hash32)
-        relpath = os.path.join(*parts)
-        # Store the message in the database.  This relies on the database
-        # providing a unique serial number, but to get this information, we
-        # have to use a straight insert instead of relying on Elixir to create
-        # the object.
+        add_message_hash(message)
+        storage = call_name(config.messagestore.storage)
+        path = storage.write([(hash32, message)])[0]
         Message(message_id=message_id,
                 message_id_hash=hash32,
-                path=relpath)
-        # Now calculate the full file system path.
-        path = os.path.join(config.MESSAGES_DIR, relpath)
-        # Write the file to the path, but catch the appropriate exception in
-        # case the parent directories don't yet exist.  In that case, create
-        # them and try again.
-        while True:
-            try:
-                with open(path, 'wb') as fp:
-                    # -1 says to use the highest protocol available.
-                    pickle.dump(message, fp, -1)
-                    break
-            except IOError as error:
-                if error.errno != errno.ENOENT:
-                    raise
-            makedirs(os.path.dirname(path))
+                path=path)
         return hash32
 
     def _get_message(self, row):
-        path = os.path.join(config.MESSAGES_DIR, row.path)
-        with open(path, 'rb') as fp:
-            return pickle.load(fp)
+        return _storage_for(row.path).read(row.path)
 
     @dbconnection
     def get_message_by_id(self, store, message_id):
@@ -120,8 +306,5 @@ class MessageStore:
     def delete_message(self, store, message_id):
         row = store.query(Message).filter_by(message_id=message_id).first()
         if row is not None:
-            path = os.path.join(config.MESSAGES_DIR, row.path)
-            # It's possible that a race condition caused the file system path
-            # to already be deleted.
-            safe_remove(path)
+            _storage_for(row.path).delete(row.path)
             store.delete(row)
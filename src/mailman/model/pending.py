@@ -27,15 +27,18 @@ from mailman.database.types import SAUnicode, SAUnicodeXL
 from mailman.interfaces.pending import (
     IPendable, IPended, IPendedKeyValue, IPendings)
 from mailman.utilities.datetime import now
+from mailman.utilities.queries import QuerySequence
 from mailman.utilities.uid import TokenFactory
 from public import public
-from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, and_
-from sqlalchemy.orm import aliased, relationship
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer
+from sqlalchemy.orm import relationship
 from zope.interface import implementer
 from zope.interface.verify import verifyObject
 
 
 token_factory = TokenFactory()
+# The number of pendings whose key/value pairs are loaded at a time.
+BATCH_SIZE = 500
 
 
 @public
@@ -63,19 +66,83 @@ class Pended(Model):
     """A pended event, tied to a token."""
 
     __tablename__ = 'pended'
+    __table_args__ = (Index('ix_pended_list_id_pend_type',
+                            'list_id', 'pend_type'), )
 
     id = Column(Integer, primary_key=True)
     token = Column(SAUnicode, index=True)
     expiration_date = Column(DateTime, index=True)
+    # Copies of the pendable's list_id and type keys, so that the pendings
+    # can be searched without joining their key/value pairs.
+    list_id = Column(SAUnicode)
+    pend_type = Column(SAUnicode, index=True)
     key_values = relationship('PendedKeyValue', cascade='all, delete-orphan')
 
 
+def _unpend(key_values):
+    # Turn the pended key/value pairs back into a pendable.
+    pendable = UnpendedPendable()
+    for keyvalue in key_values:
+        # The `type` key is special and reserved.  It is not JSONified.  See
+        # the IPendable interface for details.
+        if keyvalue.key == 'type':
+            value = keyvalue.value
+        else:
+            value = json.loads(keyvalue.value)
+        if isinstance(value, dict) and '__encoding__' in value:
+            value = value['value'].encode(value['__encoding__'])
+        pendable[keyvalue.key] = value
+    return pendable
+
+
 @public
 @implementer(IPendable)
 class UnpendedPendable(dict):
     PEND_TYPE = 'unpended'
 
 
+class _FoundPendings(QuerySequence):
+    """The found pendings, ordered by their creation.
+
+    The pendings are sliced by the database, and the key/value pairs of a
+    slice are loaded with a single query.
+    """
+
+    def __init__(self, store, query, confirm):
+        super().__init__(query)
+        self._store = store
+        self._confirm = confirm
+
+    def _with_pendables(self, rows):
+        if not self._confirm:
+            return [(token, None) for pended_id, token in rows]
+        key_values = {pended_id: [] for pended_id, token in rows}
+        if len(key_values) > 0:
+            for keyvalue in self._store.query(PendedKeyValue).filter(
+                    PendedKeyValue.pended_id.in_(key_values)).order_by(
+                    PendedKeyValue.id):
+                key_values[keyvalue.pended_id].append(keyvalue)
+        return [(token, _unpend(key_values[pended_id]))
+                for pended_id, token in rows]
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self._with_pendables(self._query[index])
+        return self._with_pendables([self._query[index]])[0]
+
+    def __iter__(self):
+        last_id = None
+        while True:
+            query = self._query
+            if last_id is not None:
+                query = query.filter(Pended.id > last_id)
+            rows = query.limit(BATCH_SIZE).all()
+            if len(rows) == 0:
+                break
+            yield from self._with_pendables(rows)
+            last_id = rows[-1][0]
+
+
 @public
 @implementer(IPendings)
 class Pendings:
@@ -91,15 +158,18 @@ class Pendings:
             token = token_factory.new()
             # In practice, we'll never get a duplicate, but we'll be anal
             # about checking anyway.
-            if store.query(Pended).filter_by(token=token).count() == 0:
+            if store.query(Pended.id).filter_by(token=token).first() is None:
                 break
         else:
             raise RuntimeError('Could not find a valid pendings token')
         # Create the record, and then the individual key/value pairs.
+        pendable_type = pendable.get('type', pendable.PEND_TYPE)
+        list_id = pendable.get('list_id')
         pending = Pended(
             token=token,
-            expiration_date=now() + lifetime)
-        pendable_type = pendable.get('type', pendable.PEND_TYPE)
+            expiration_date=now() + lifetime,
+            list_id=list_id if isinstance(list_id, str) else None,
+            pend_type=pendable_type)
         pending.key_values.append(
             PendedKeyValue(key='type', value=pendable_type))
         for key, value in pendable.items():
@@ -128,54 +198,40 @@ class Pendings:
         assert pendings.count() == 1, (
             'Unexpected token count: {}'.format(pendings.count()))
         pending = pendings[0]
-        pendable = UnpendedPendable()
-        # Iterate on PendedKeyValue entries that are associated with the
-        # pending object's ID.  Watch out for type conversions.
-        for keyvalue in pending.key_values:
-            # The `type` key is special and reserved.  It is not JSONified.
-            # See the IPendable interface for details.
-            if keyvalue.key == 'type':
-                value = keyvalue.value
-            else:
-                value = json.loads(keyvalue.value)
-            if isinstance(value, dict) and '__encoding__' in value:
-                value = value['value'].encode(value['__encoding__'])
-            pendable[keyvalue.key] = value
+        pendable = _unpend(pending.key_values)
         if expunge:
             store.delete(pending)
         return pendable
 
     @dbconnection
-    def evict(self, store):
-        right_now = now()
-        for pending in store.query(Pended).all():
-            if pending.expiration_date < right_now:
-                store.delete(pending)
+    def evict(self, store, limit=None):
+        # Delete the expired rows with set-based DELETEs on the indexed
+        # columns, instead of loading every pending into the session.
+        query = store.query(Pended.id).filter(
+            Pended.expiration_date < now())
+        if limit is not None:
+            query = query.limit(limit)
+        pended_ids = [pended_id for (pended_id,) in query]
+        if len(pended_ids) == 0:
+            return 0
+        store.query(PendedKeyValue).filter(
+            PendedKeyValue.pended_id.in_(pended_ids)).delete(
+                synchronize_session=False)
+        store.query(Pended).filter(Pended.id.in_(pended_ids)).delete(
+            synchronize_session=False)
+        return len(pended_ids)
 
     @dbconnection
     def find(self, store, mlist=None, pend_type=None, confirm=True):
-        query = store.query(Pended)
+        query = store.query(Pended.id, Pended.token)
         if mlist is not None:
-            pkv_alias_mlist = aliased(PendedKeyValue)
-            query = query.join(pkv_alias_mlist).filter(and_(
-                pkv_alias_mlist.key == 'list_id',
-                pkv_alias_mlist.value == json.dumps(mlist.list_id)
-                ))
+            query = query.filter(Pended.list_id == mlist.list_id)
         if pend_type is not None:
-            pkv_alias_type = aliased(PendedKeyValue)
-            query = query.join(pkv_alias_type).filter(and_(
-                pkv_alias_type.key == 'type',
-                pkv_alias_type.value == pend_type
-                ))
-        for pending in query:
-            pendable = (self.confirm(pending.token, expunge=False)
-                        if confirm else None)
-            yield pending.token, pendable
+            query = query.filter(Pended.pend_type == pend_type)
+        return _FoundPendings(store, query.order_by(Pended.id), confirm)
 
-    @dbconnection
-    def __iter__(self, store):
-        for pending in store.query(Pended).all():
-            yield pending.token, self.confirm(pending.token, expunge=False)
+    def __iter__(self):
+        yield from self.find()
 
     @property
     @dbconnection
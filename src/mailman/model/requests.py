@@ -17,10 +17,12 @@
 
 """Implementations of the pending requests interfaces."""
 
+import json
+
 from datetime import timedelta
 from mailman.database.model import Model
 from mailman.database.transaction import dbconnection
-from mailman.database.types import Enum, SAUnicode
+from mailman.database.types import Enum, SAUnicode, SAUnicodeXL
 from mailman.interfaces.pending import IPendable, IPendings
 from mailman.interfaces.requests import IListRequests, RequestType
 from mailman.model.pending import Pended, PendedKeyValue
@@ -89,7 +91,8 @@ class ListRequests:
                 ).order_by(_Request.id))
 
     @dbconnection
-    def hold_request(self, store, request_type, key, data=None):
+    def hold_request(self, store, request_type, key, data=None,
+                     summary=None):
         if request_type not in RequestType:
             raise TypeError(request_type)
         if data is None:
@@ -99,7 +102,8 @@ class ListRequests:
             pendable.update(data)
             token = getUtility(IPendings).add(pendable, timedelta(days=5000))
             data_hash = token
-        request = _Request(key, request_type, self.mailing_list, data_hash)
+        request = _Request(
+            key, request_type, self.mailing_list, data_hash, summary)
         store.add(request)
         # XXX The caller needs a valid id immediately, so flush the changes
         # now to the SA transaction context.  Otherwise .id would not be
@@ -160,12 +164,22 @@ class _Request(Model):
     request_type = Column(Enum(RequestType))
     data_hash = Column(SAUnicode)
 
+    # The JSON encoded summary of the request, if any.
+    _summary = Column('summary', SAUnicodeXL)
+
     mailing_list_id = Column(Integer, ForeignKey('mailinglist.id'), index=True)
     mailing_list = relationship('MailingList')
 
-    def __init__(self, key, request_type, mailing_list, data_hash):
+    def __init__(self, key, request_type, mailing_list, data_hash,
+                 summary=None):
         super().__init__()
         self.key = key
         self.request_type = request_type
         self.mailing_list = mailing_list
         self.data_hash = data_hash
+        if summary is not None:
+            self._summary = json.dumps(summary)
+
+    @property
+    def summary(self):
+        return None if self._summary is None else json.loads(self._summary)
@@ -23,13 +23,17 @@ moderator, and administrator roster filters.
 """
 
 from enum import Enum
+from mailman.core.constants import system_preferences
 from mailman.database.transaction import dbconnection
-from mailman.interfaces.member import DeliveryMode, MemberRole
+from mailman.database.types import Enum as SAEnum
+from mailman.interfaces.member import DeliveryMode, DeliveryStatus, MemberRole
 from mailman.interfaces.roster import IRoster
 from mailman.model.address import Address
 from mailman.model.member import Member
+from mailman.model.preferences import Preferences
 from public import public
-from sqlalchemy import or_
+from sqlalchemy import func, literal, or_
+from sqlalchemy.orm import aliased
 from zope.interface import implementer
 
 
@@ -205,26 +209,83 @@ class DeliveryMemberRoster(AbstractRoster):
     @property
     def member_count(self):
         """See `IRoster`."""
-        # XXX 2012-03-15 BAW: It would be nice to make this more efficient.
-        # The problem is that you'd have to change the loop in _get_members()
-        # checking the delivery mode to a query parameter.
-        return len(tuple(self.members))
+        return self._delivery_query().count()
+
+    def _preference(self, name, *preferences):
+        # The effective value of a preference is the first non-NULL value
+        # found by walking the member, address, and user preferences, falling
+        # back to the system default.  This mirrors `Member._lookup()` but
+        # lets the database do the work for the whole roster at once.
+        default = getattr(system_preferences, name)
+        columns = [getattr(prefs, name) for prefs in preferences]
+        columns.append(literal(default, SAEnum(type(default))))
+        return func.coalesce(*columns)
 
     @dbconnection
-    def _get_members(self, store, *delivery_modes):
-        """The set of members for a mailing list, filter by delivery mode.
+    def _delivery_query(self, store, *columns, statuses=None):
+        """Query the members filtered by their effective delivery mode.
+
+        :param columns: The columns to select, to which the effective delivery
+            mode is appended.  Without any columns, select the `Member`s.
+        :param statuses: If given, only members with one of these effective
+            delivery statuses are included.
+        :type statuses: sequence of `DeliveryStatus`.
+        :return: The query.
+        """
+        # Avoid circular imports.
+        from mailman.model.user import User
+        member_prefs = aliased(Preferences)
+        address_prefs = aliased(Preferences)
+        user_prefs = aliased(Preferences)
+        member_user = aliased(User)
+        address_user = aliased(User)
+        all_prefs = (member_prefs, address_prefs, user_prefs)
+        delivery_mode = self._preference('delivery_mode', *all_prefs)
+        entities = ((Member,) if len(columns) == 0
+                    else columns + (delivery_mode,))
+        query = store.query(*entities).select_from(Member).outerjoin(
+            member_prefs, Member.preferences_id == member_prefs.id
+            ).outerjoin(
+                member_user, Member.user_id == member_user.id
+            ).join(
+                # Members subscribed via their user are delivered to the
+                # user's preferred address.
+                Address, Address.id == func.coalesce(
+                    Member.address_id, member_user._preferred_address_id)
+            ).outerjoin(
+                address_prefs, Address.preferences_id == address_prefs.id
+            ).outerjoin(
+                address_user, Address.user_id == address_user.id
+            ).outerjoin(
+                user_prefs, address_user.preferences_id == user_prefs.id
+            ).filter(
+                Member.list_id == self._mlist.list_id,
+                Member.role == MemberRole.member,
+                delivery_mode.in_(self.delivery_modes))
+        if statuses is not None:
+            delivery_status = self._preference('delivery_status', *all_prefs)
+            query = query.filter(delivery_status.in_(statuses))
+        return query
+
+    @property
+    def members(self):
+        """See `IRoster`."""
+        yield from self._delivery_query()
+
+    @property
+    def recipients(self):
+        """The enabled recipients of this roster, with their delivery mode.
 
-        :param delivery_modes: The modes to filter on.
-        :type delivery_modes: sequence of `DeliveryMode`.
-        :return: A generator of members.
-        :rtype: generator
+        This resolves the effective delivery mode and status of every member
+        in a single query, instead of walking each member's preferences.
+
+        :return: An iterator over 2-tuples of the case-preserved email
+            address and the effective `DeliveryMode`.
         """
-        results = store.query(Member).filter_by(
-            list_id=self._mlist.list_id,
-            role=MemberRole.member)
-        for member in results:
-            if member.delivery_mode in delivery_modes:
-                yield member
+        query = self._delivery_query(
+            func.coalesce(Address._original, Address.email),
+            statuses=(DeliveryStatus.enabled,))
+        yield from query
 
 
 @public
@@ -232,11 +293,7 @@ class RegularMemberRoster(DeliveryMemberRoster):
     """Return all the regular delivery members of a list."""
 
     name = 'regular_members'
-
-    @property
-    def members(self):
-        """See `IRoster`."""
-        yield from self._get_members(DeliveryMode.regular)
+    delivery_modes = (DeliveryMode.regular,)
 
 
 @public
@@ -244,14 +301,11 @@ class DigestMemberRoster(DeliveryMemberRoster):
     """Return all the regular delivery members of a list."""
 
     name = 'digest_members'
-
-    @property
-    def members(self):
-        """See `IRoster`."""
-        yield from self._get_members(
-            DeliveryMode.plaintext_digests,
-            DeliveryMode.mime_digests,
-            DeliveryMode.summary_digests)
+    delivery_modes = (
+        DeliveryMode.plaintext_digests,
+        DeliveryMode.mime_digests,
+        DeliveryMode.summary_digests,
+        )
 
 
 @public
@@ -23,18 +23,45 @@ from mailman.interfaces.listmanager import IListManager, NoSuchListError
 from mailman.interfaces.member import MemberRole
 from mailman.interfaces.subscriptions import (
     ISubscriptionService, TooManyMembersError)
-from mailman.interfaces.usermanager import IUserManager
 from mailman.model.address import Address
 from mailman.model.member import Member
 from mailman.model.user import User
 from mailman.utilities.queries import QuerySequence
-from operator import attrgetter
 from public import public
+from sqlalchemy import and_, case, func, or_
+from sqlalchemy.orm import aliased
 from sqlalchemy.orm.exc import MultipleResultsFound, NoResultFound
 from zope.component import getUtility
 from zope.interface import implementer
 
 
+# The roles in the order they are listed in, within each mailing list.
+ROLE_ORDER = (MemberRole.owner, MemberRole.moderator, MemberRole.member)
+
+
+def _after(columns, values):
+    # The keyset condition selecting the rows sorted after the given values,
+    # spelled out since not all databases support comparing row values.
+    clauses = []
+    for index, column in enumerate(columns):
+        clauses.append(and_(
+            *(previous == value
+              for previous, value in zip(columns[:index], values)),
+            column > values[index]))
+    return or_(*clauses)
+
+
+class _AllMembers(QuerySequence):
+    """The sequence of all members, iterated over in batches."""
+
+    def __init__(self, service, query):
+        super().__init__(query)
+        self._service = service
+
+    def __iter__(self):
+        yield from self._service.iter_members()
+
+
 @public
 @implementer(ISubscriptionService)
 class SubscriptionService:
@@ -42,27 +69,50 @@ class SubscriptionService:
 
     __name__ = 'members'
 
-    def get_members(self):
+    def _all_members(self, store):
+        # Return the query of all members in the order documented in
+        # `ISubscriptionService`, along with the columns it is sorted on.
+        # Members subscribed with their user's preferred address don't have
+        # an address of their own.  That user may no longer have a preferred
+        # address either; the email must still not be NULL, since NULLs
+        # compare neither equal to nor greater than anything in `_after()`.
+        address = aliased(Address)
+        preferred_address = aliased(Address)
+        email = func.coalesce(address.email, preferred_address.email, '')
+        rank = case([(Member.role == role, index)
+                     for index, role in enumerate(ROLE_ORDER)])
+        order = (Member.list_id, rank, email, Member.id)
+        query = store.query(Member, rank, email).outerjoin(
+            address, Member.address_id == address.id).outerjoin(
+            User, Member.user_id == User.id).outerjoin(
+            preferred_address,
+            User._preferred_address_id == preferred_address.id).filter(
+            Member.role.in_(ROLE_ORDER)).order_by(*order)
+        return query, order
+
+    @dbconnection
+    def get_members(self, store):
+        """See `ISubscriptionService`."""
+        query, order = self._all_members(store)
+        return _AllMembers(self, query.with_entities(Member))
+
+    @dbconnection
+    def _members_after(self, store, key, count):
+        query, order = self._all_members(store)
+        if key is not None:
+            query = query.filter(_after(order, key))
+        return query.limit(count).all()
+
+    def iter_members(self, batch_size=1000):
         """See `ISubscriptionService`."""
-        # {list_id -> {role -> [members]}}
-        by_list = {}
-        user_manager = getUtility(IUserManager)
-        for member in user_manager.members:
-            by_role = by_list.setdefault(member.list_id, {})
-            members = by_role.setdefault(member.role.name, [])
-            members.append(member)
-        # Flatten into single list sorted as per the interface.
-        all_members = []
-        address_of_member = attrgetter('address.email')
-        for list_id in sorted(by_list):
-            by_role = by_list[list_id]
-            all_members.extend(
-                sorted(by_role.get('owner', []), key=address_of_member))
-            all_members.extend(
-                sorted(by_role.get('moderator', []), key=address_of_member))
-            all_members.extend(
-                sorted(by_role.get('member', []), key=address_of_member))
-        return all_members
+        key = None
+        while True:
+            rows = self._members_after(key, batch_size)
+            for member, rank, email in rows:
+                yield member
+            if len(rows) < batch_size:
+                break
+            key = (member.list_id, rank, email, member.id)
 
     @dbconnection
     def get_member(self, store, member_id):
@@ -139,7 +189,7 @@ class SubscriptionService:
             raise TooManyMembersError(subscriber, list_id, role)
 
     def __iter__(self):
-        yield from self.get_members()
+        yield from self.iter_members()
 
     def leave(self, list_id, email):
         """See `ISubscriptionService`."""
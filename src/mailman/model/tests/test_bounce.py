@@ -22,10 +22,15 @@ import unittest
 from datetime import datetime
 from mailman.app.lifecycle import create_list
 from mailman.database.transaction import transaction
-from mailman.interfaces.bounce import BounceContext, IBounceProcessor
+from mailman.interfaces.bounce import (
+    BounceAction, BounceContext, IBounceProcessor)
+from mailman.interfaces.member import DeliveryStatus
+from mailman.interfaces.usermanager import IUserManager
 from mailman.testing.helpers import (
-    specialized_message_from_string as message_from_string)
+    configuration, specialized_message_from_string as message_from_string,
+    subscribe)
 from mailman.testing.layers import ConfigLayer
+from mailman.utilities.datetime import factory
 from zope.component import getUtility
 
 
@@ -89,3 +94,148 @@ Message-Id: <first>
         # Now there will be no unprocessed events.
         unprocessed = list(self._processor.unprocessed)
         self.assertEqual(len(unprocessed), 0)
+
+
+class TestBounceProcessing(unittest.TestCase):
+    layer = ConfigLayer
+
+    def setUp(self):
+        self._processor = getUtility(IBounceProcessor)
+        self._mlist = create_list('test@example.com')
+        self._mlist.send_welcome_message = False
+        self._anne = subscribe(self._mlist, 'Anne')
+        self._msg = message_from_string("""\
+From: mail-daemon@example.com
+To: test-bounces@example.com
+Message-Id: <first>
+
+""")
+
+    def _register(self, email, count=1, context=None):
+        with transaction():
+            for i in range(count):
+                self._processor.register(
+                    self._mlist, email, self._msg, context)
+
+    def test_no_events(self):
+        self.assertEqual(self._processor.process(), [])
+
+    def test_score(self):
+        # Each bounce adds one to the member's score.
+        self._register('aperson@example.com', 2)
+        self._register('APerson@example.com')
+        actions = self._processor.process()
+        self.assertEqual(actions, [])
+        self.assertEqual(self._anne.bounce_score, 3)
+        self.assertEqual(self._anne.last_bounce_received,
+                         datetime(2005, 8, 1, 7, 49, 23))
+        self.assertEqual(self._anne.delivery_status, DeliveryStatus.enabled)
+        self.assertEqual(list(self._processor.unprocessed), [])
+        # The events are only scored once.
+        self.assertEqual(self._processor.process(), [])
+        self.assertEqual(self._anne.bounce_score, 3)
+
+    def test_disable(self):
+        # Reaching the threshold disables the member's delivery.
+        self._register('aperson@example.com', 5)
+        actions = self._processor.process()
+        self.assertEqual(actions, [(self._anne, BounceAction.disable)])
+        self.assertEqual(self._anne.bounce_score, 5)
+        self.assertEqual(
+            self._anne.delivery_status, DeliveryStatus.by_bounces)
+
+    def test_disabled_member(self):
+        # Members who don't get any messages are scored but left alone.
+        self._anne.preferences.delivery_status = DeliveryStatus.by_user
+        self._register('aperson@example.com', 5)
+        self.assertEqual(self._processor.process(), [])
+        self.assertEqual(self._anne.bounce_score, 5)
+        self.assertEqual(self._anne.delivery_status, DeliveryStatus.by_user)
+
+    @configuration('mta', verp_probes='yes')
+    def test_probe(self):
+        # With VERP probes, the member is probed instead of being disabled,
+        # and the score starts over.
+        self._register('aperson@example.com', 5)
+        actions = self._processor.process()
+        self.assertEqual(actions, [(self._anne, BounceAction.probe)])
+        self.assertEqual(self._anne.bounce_score, 0)
+        self.assertEqual(self._anne.delivery_status, DeliveryStatus.enabled)
+
+    @configuration('mta', verp_probes='yes')
+    def test_bouncing_probe(self):
+        # A bouncing probe disables the member, whatever their score.
+        self._register('aperson@example.com', context=BounceContext.probe)
+        actions = self._processor.process()
+        self.assertEqual(actions, [(self._anne, BounceAction.disable)])
+        self.assertEqual(
+            self._anne.delivery_status, DeliveryStatus.by_bounces)
+
+    def test_stale_score(self):
+        # The score starts over when the bounce information is stale.
+        self._register('aperson@example.com', 4)
+        self._processor.process()
+        self.assertEqual(self._anne.bounce_score, 4)
+        factory.fast_forward(days=8)
+        self.addCleanup(factory.reset)
+        self._register('aperson@example.com')
+        self.assertEqual(self._processor.process(), [])
+        self.assertEqual(self._anne.bounce_score, 1)
+        self.assertEqual(self._anne.last_bounce_received,
+                         datetime(2005, 8, 9, 7, 49, 23))
+
+    def test_fresh_score(self):
+        # Bounces within the staleness period add up.
+        self._register('aperson@example.com', 4)
+        self._processor.process()
+        factory.fast_forward(days=6)
+        self.addCleanup(factory.reset)
+        self._register('aperson@example.com')
+        actions = self._processor.process()
+        self.assertEqual(actions, [(self._anne, BounceAction.disable)])
+        self.assertEqual(self._anne.bounce_score, 5)
+
+    def test_preferred_address_member(self):
+        # Members subscribed through their user's preferred address are
+        # scored by that address.
+        user = getUtility(IUserManager).create_user('bart@example.com')
+        address = list(user.addresses)[0]
+        address.verified_on = datetime(2005, 8, 1, 7, 49, 23)
+        user.preferred_address = address
+        bart = self._mlist.subscribe(user)
+        self._register('bart@example.com', 2)
+        self._processor.process()
+        self.assertEqual(bart.bounce_score, 2)
+        self.assertEqual(self._anne.bounce_score, 0)
+
+    def test_batches(self):
+        # Members are scored in batches.
+        bart = subscribe(self._mlist, 'Bart')
+        cris = subscribe(self._mlist, 'Cris')
+        self._register('aperson@example.com', 5)
+        self._register('bperson@example.com', 2)
+        self._register('cperson@example.com', 5)
+        actions = self._processor.process(batch_size=1)
+        self.assertEqual(actions, [
+            (self._anne, BounceAction.disable),
+            (cris, BounceAction.disable),
+            ])
+        self.assertEqual(bart.bounce_score, 2)
+
+    def test_nonmembers_and_other_lists(self):
+        # Events for non-members, lists which don't process bounces, and
+        # deleted lists are marked processed without scoring anything.
+        mlist = create_list('other@example.com')
+        mlist.process_bounces = False
+        subscribe(mlist, 'Anne')
+        with transaction():
+            self._processor.register(
+                mlist, 'aperson@example.com', self._msg)
+            self._processor.register(
+                self._mlist, 'zperson@example.com', self._msg)
+            event = self._processor.register(
+                self._mlist, 'aperson@example.com', self._msg)
+            event.list_id = 'gone.example.com'
+        self.assertEqual(self._processor.process(), [])
+        self.assertEqual(self._anne.bounce_score, 0)
+        self.assertEqual(list(self._processor.unprocessed), [])
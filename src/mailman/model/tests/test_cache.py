@@ -94,10 +94,21 @@ class TestCache(unittest.TestCase):
         self.assertEqual(self._cachemgr.get('abc'), 'xyz')
         self.assertEqual(self._cachemgr.get('def'), 'uvw')
         factory.fast_forward(days=1)
-        self._cachemgr.evict_expired()
+        self.assertEqual(self._cachemgr.evict_expired(), 1)
         self.assertIsNone(self._cachemgr.get('abc'))
         self.assertEqual(self._cachemgr.get('def'), 'uvw')
 
+    def test_evict_expired_limit(self):
+        # The number of evicted cache entries can be limited.
+        self._cachemgr.add('abc', 'xyz', lifetime=timedelta(hours=3))
+        self._cachemgr.add('def', 'uvw', lifetime=timedelta(hours=3))
+        factory.fast_forward(days=1)
+        self.assertEqual(self._cachemgr.evict_expired(limit=1), 1)
+        self.assertEqual(self._cachemgr.evict_expired(limit=1), 1)
+        self.assertEqual(self._cachemgr.evict_expired(limit=1), 0)
+        self.assertIsNone(self._cachemgr.get('abc'))
+        self.assertIsNone(self._cachemgr.get('def'))
+
     def test_evict(self):
         # Evicting a single cached file makes them inaccessible.
         self._cachemgr.add('abc', 'xyz', lifetime=timedelta(hours=2))
@@ -29,6 +29,7 @@ from mailman.interfaces.listmanager import (
     IListManager, ListAlreadyExistsError, ListCreatedEvent, ListCreatingEvent,
     ListDeletedEvent, ListDeletingEvent)
 from mailman.interfaces.mailinglist import IListArchiverSet
+from mailman.interfaces.member import MemberRole
 from mailman.interfaces.messages import IMessageStore
 from mailman.interfaces.pending import IPendable, IPendings
 from mailman.interfaces.requests import IListRequests
@@ -162,6 +163,26 @@ class TestListManager(unittest.TestCase):
         self.assertEqual(list_manager.get_by_fqdn('renamed@example.com'), ant)
         self.assertIsNone(list_manager.get_by_fqdn('ant@example.com'))
 
+    def test_member_counts(self):
+        ant = create_list('ant@example.com')
+        bee = create_list('bee@example.com')
+        user_manager = getUtility(IUserManager)
+        anne = user_manager.create_address('anne@example.com')
+        bart = user_manager.create_address('bart@example.com')
+        ant.subscribe(anne)
+        ant.subscribe(bart)
+        # Owners and moderators aren't counted.
+        bee.subscribe(anne, MemberRole.owner)
+        counts = getUtility(IListManager).member_counts(
+            ['ant.example.com', 'bee.example.com'])
+        self.assertEqual(counts, {
+            'ant.example.com': 2,
+            'bee.example.com': 0,
+            })
+
+    def test_member_counts_no_lists(self):
+        self.assertEqual(getUtility(IListManager).member_counts([]), {})
+
 
 class TestListLifecycleEvents(unittest.TestCase):
     layer = ConfigLayer
@@ -70,6 +70,15 @@ class TestMailingList(unittest.TestCase):
         self.assertEqual(list(self._mlist.pass_extensions),
                          ['foo', 'bar', 'baz'])
 
+    def test_content_filters_serial(self):
+        # The serial changes whenever any of the content filters change.
+        self.assertEqual(self._mlist.content_filters_serial, 0)
+        self._mlist.filter_types = ['image']
+        self._mlist.pass_types = ['text/plain']
+        self._mlist.filter_extensions = ['exe']
+        self._mlist.pass_extensions = ['txt']
+        self.assertEqual(self._mlist.content_filters_serial, 4)
+
     def test_get_roster_argument(self):
         self.assertRaises(ValueError, self._mlist.get_roster, 'members')
 
@@ -191,6 +200,19 @@ class TestAcceptableAliases(unittest.TestCase):
         getUtility(IListManager).delete(self._mlist)
         self.assertEqual(len(list(alias_set.aliases)), 0)
 
+    def test_serial(self):
+        # The serial changes whenever the set of aliases changes.
+        alias_set = IAcceptableAliasSet(self._mlist)
+        self.assertEqual(alias_set.serial, 0)
+        alias_set.add('bee@example.com')
+        self.assertEqual(alias_set.serial, 1)
+        alias_set.remove('bee@example.com')
+        self.assertEqual(alias_set.serial, 2)
+        alias_set.clear()
+        self.assertEqual(alias_set.serial, 3)
+        # The change is visible through another adapter too.
+        self.assertEqual(IAcceptableAliasSet(self._mlist).serial, 3)
+
 
 class TestHeaderMatch(unittest.TestCase):
     layer = ConfigLayer
@@ -20,11 +20,14 @@
 import os
 import unittest
 
+from contextlib import ExitStack
 from mailman.config import config
+from mailman.email.message import Message as EmailMessage
 from mailman.interfaces.messages import IMessageStore
 from mailman.model.message import Message
+from mailman.model.messagestore import PackedStorage
 from mailman.testing.helpers import (
-    specialized_message_from_string as mfs)
+    configuration, specialized_message_from_string as mfs)
 from mailman.testing.layers import ConfigLayer
 from mailman.utilities.email import add_message_hash
 from zope.component import getUtility
@@ -150,3 +153,111 @@ Message-ID: <ant>
         stored_msg = self._store.get_message_by_id('<ant>')
         self.assertNotEqual(msg['subject'], stored_msg['subject'])
         self.assertIsNone(hash32)
+
+    def test_duplicate_not_changed(self):
+        # The headers of a message which is already stored are left alone.
+        self._store.add(mfs('Message-ID: <ant>\n\n'))
+        msg = mfs("""\
+Message-ID: <ant>
+Message-ID-Hash: abc
+X-Message-ID-Hash: abc
+
+""")
+        self.assertIsNone(self._store.add(msg))
+        self.assertEqual(msg.get_all('message-id-hash'), ['abc'])
+        self.assertEqual(msg.get_all('x-message-id-hash'), ['abc'])
+
+
+class TestPackedStorage(unittest.TestCase):
+    layer = ConfigLayer
+
+    def setUp(self):
+        self._store = getUtility(IMessageStore)
+        resources = ExitStack()
+        self.addCleanup(resources.close)
+        resources.enter_context(configuration(
+            'messagestore',
+            storage='mailman.model.messagestore.PackedStorage'))
+        self._msg = mfs("""\
+From anne@example.com Wed Jul  4 16:49:58 2007
+From: anne@example.com
+Subject: An important message
+Message-ID: <ant>
+
+This message is very important.
+""")
+
+    def _path(self, message_id='<ant>'):
+        return config.db.store.query(Message).filter_by(
+            message_id=message_id).one().path
+
+    def test_add_and_get(self):
+        # The message's bytes are appended to a segment, and parsed when they
+        # are read.
+        self.assertEqual(self._store.add(self._msg),
+                         'MS6QLWERIJLGCRF44J7USBFDELMNT2BW')
+        self.assertEqual(self._path(), 'segments/00000001:0:{}'.format(
+            os.path.getsize(os.path.join(
+                config.MESSAGES_DIR, 'segments', '00000001'))))
+        found = self._store.get_message_by_hash(
+            'MS6QLWERIJLGCRF44J7USBFDELMNT2BW')
+        self.assertIsInstance(found, EmailMessage)
+        self.assertEqual(found.as_string(), self._msg.as_string())
+        self.assertEqual(found.get_unixfrom(),
+                         'From anne@example.com Wed Jul  4 16:49:58 2007')
+        self.assertEqual(len(list(self._store.messages)), 1)
+
+    def test_dedupe(self):
+        self._store.add(self._msg)
+        self.assertIsNone(self._store.add(self._msg))
+        self.assertEqual(config.db.store.query(Message).count(), 1)
+
+    @configuration('messagestore', compression='none')
+    def test_no_compression(self):
+        self._store.add(self._msg)
+        segment = os.path.join(config.MESSAGES_DIR, 'segments', '00000001')
+        with open(segment, 'rb') as fp:
+            self.assertIn(b'This message is very important.', fp.read())
+
+    @configuration('messagestore', compression='lz4')
+    def test_unknown_compression(self):
+        self.assertRaises(ValueError, self._store.add, self._msg)
+
+    @configuration('messagestore', segment_size='1')
+    def test_new_segment(self):
+        # A new segment is started when the newest one is full.
+        self._store.add(self._msg)
+        del self._msg['message-id']
+        self._msg['Message-ID'] = '<bee>'
+        self._store.add(self._msg)
+        self.assertTrue(self._path('<bee>').startswith('segments/00000002:0:'))
+        self.assertEqual(
+            self._store.get_message_by_id('<bee>')['message-id'], '<bee>')
+
+    def test_read_pickled_messages(self):
+        # Messages pickled before the packed storage was configured can still
+        # be read and deleted.
+        with configuration('messagestore', storage=(
+                'mailman.model.messagestore.PickleStorage')):
+            self._store.add(self._msg)
+        path = os.path.join(config.MESSAGES_DIR, self._path())
+        self.assertTrue(os.path.exists(path))
+        self.assertEqual(
+            self._store.get_message_by_id('<ant>')['subject'],
+            'An important message')
+        self._store.delete_message('<ant>')
+        self.assertFalse(os.path.exists(path))
+
+    def test_delete(self):
+        # Deleted messages stay in the segment until it is compacted.
+        self._store.add(self._msg)
+        self._store.delete_message('<ant>')
+        self.assertIsNone(self._store.get_message_by_id('<ant>'))
+        self.assertEqual(len(PackedStorage().segments()), 1)
+
+    def test_truncated_record(self):
+        self._store.add(self._msg)
+        segment = os.path.join(config.MESSAGES_DIR, 'segments', '00000001')
+        with open(segment, 'r+b') as fp:
+            fp.truncate(10)
+        self.assertRaises(ValueError, self._store.get_message_by_id, '<ant>')
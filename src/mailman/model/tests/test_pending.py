@@ -19,11 +19,13 @@
 
 import unittest
 
+from datetime import timedelta
 from mailman.app.lifecycle import create_list
 from mailman.config import config
 from mailman.interfaces.pending import IPendable, IPendings
-from mailman.model.pending import PendedKeyValue
+from mailman.model.pending import Pended, PendedKeyValue
 from mailman.testing.layers import ConfigLayer
+from unittest.mock import patch
 from zope.component import getUtility
 from zope.interface import implementer
 
@@ -94,3 +96,78 @@ class TestPendings(unittest.TestCase):
             {(token_1, 'list1.example.com', 'subscription'),
              (token_3, 'list1.example.com', 'hold request')}
             )
+
+    def test_find_pages(self):
+        # The found pendings are sliced by the database, in the order they
+        # were added.
+        mlist = create_list('ant@example.com')
+        pendingdb = getUtility(IPendings)
+        tokens = [
+            pendingdb.add(SimplePendable(
+                type='subscription', list_id='ant.example.com', number=i,
+                data=b'bytes'))
+            for i in range(5)
+            ]
+        pendingdb.add(SimplePendable(
+            type='subscription', list_id='bee.example.com'))
+        pendings = pendingdb.find(mlist=mlist, pend_type='subscription')
+        self.assertEqual(len(pendings), 5)
+        page = pendings[1:3]
+        self.assertEqual([token for token, pendable in page], tokens[1:3])
+        self.assertEqual([pendable['number'] for token, pendable in page],
+                         [1, 2])
+        self.assertEqual(page[0][1]['data'], b'bytes')
+        self.assertEqual(page[0][1]['type'], 'subscription')
+        self.assertEqual(pendings[4][0], tokens[4])
+        self.assertEqual(pendings[4][1]['number'], 4)
+        with self.assertRaises(IndexError):
+            pendings[5]
+
+    def test_find_in_batches(self):
+        # The pendables are loaded in batches while iterating.
+        pendingdb = getUtility(IPendings)
+        tokens = [pendingdb.add(SimplePendable(number=i)) for i in range(5)]
+        with patch('mailman.model.pending.BATCH_SIZE', 2):
+            pendings = list(pendingdb.find(pend_type='simple'))
+            self.assertEqual(pendings, list(pendingdb))
+        self.assertEqual([token for token, pendable in pendings], tokens)
+        self.assertEqual([pendable['number'] for token, pendable in pendings],
+                         list(range(5)))
+
+    def test_find_without_confirm(self):
+        pendingdb = getUtility(IPendings)
+        token = pendingdb.add(SimplePendable(number=1))
+        self.assertEqual(list(pendingdb.find(confirm=False)), [(token, None)])
+        self.assertEqual(pendingdb.find(confirm=False)[:1], [(token, None)])
+
+    def test_list_id_and_type_columns(self):
+        # The list-id and type are copied to the pended row.
+        pendingdb = getUtility(IPendings)
+        token = pendingdb.add(SimplePendable(list_id='ant.example.com'))
+        pended = config.db.store.query(Pended).filter_by(token=token).one()
+        self.assertEqual(pended.list_id, 'ant.example.com')
+        self.assertEqual(pended.pend_type, 'simple')
+
+    def test_evict(self):
+        # Evicting removes the expired pendings and their key-values.
+        pendingdb = getUtility(IPendings)
+        for i in range(3):
+            pendingdb.add(SimplePendable(number=i), timedelta(days=-1))
+        token = pendingdb.add(SimplePendable(number=4))
+        self.assertEqual(pendingdb.count, 4)
+        self.assertEqual(pendingdb.evict(), 3)
+        self.assertEqual(pendingdb.count, 1)
+        self.assertEqual(config.db.store.query(PendedKeyValue).count(), 2)
+        self.assertEqual(pendingdb.confirm(token)['number'], 4)
+
+    def test_evict_limit(self):
+        # The number of evicted pendings can be limited.
+        pendingdb = getUtility(IPendings)
+        for i in range(3):
+            pendingdb.add(SimplePendable(number=i), timedelta(days=-1))
+        self.assertEqual(pendingdb.evict(limit=2), 2)
+        self.assertEqual(pendingdb.count, 1)
+        self.assertEqual(pendingdb.evict(limit=2), 1)
+        self.assertEqual(pendingdb.evict(limit=2), 0)
+        self.assertEqual(pendingdb.count, 0)
+        self.assertEqual(config.db.store.query(PendedKeyValue).count(), 0)
@@ -21,7 +21,8 @@ import unittest
 
 from mailman.app.lifecycle import create_list
 from mailman.interfaces.address import IAddress
-from mailman.interfaces.member import DeliveryMode, MemberRole
+from mailman.interfaces.member import (
+    DeliveryMode, DeliveryStatus, MemberRole)
 from mailman.interfaces.user import IUser
 from mailman.interfaces.usermanager import IUserManager
 from mailman.testing.helpers import set_preferred
@@ -120,6 +121,50 @@ class TestMailingListRoster(unittest.TestCase):
         self.assertEqual(self._mlist.digest_members.member_count, 1)
         self.assertEqual(self._mlist.subscribers.member_count, 4)
 
+    def test_delivery_mode_inherited_from_address(self):
+        # The effective delivery mode is found by walking the member's,
+        # address's, and user's preferences.
+        self._mlist.subscribe(self._anne, role=MemberRole.member)
+        self._anne.preferences.delivery_mode = DeliveryMode.mime_digests
+        self.assertEqual(self._mlist.regular_members.member_count, 0)
+        self.assertEqual(self._mlist.digest_members.member_count, 1)
+        member = self._mlist.members.get_member('anne@example.com')
+        member.preferences.delivery_mode = DeliveryMode.regular
+        self.assertEqual(self._mlist.regular_members.member_count, 1)
+        self.assertEqual(self._mlist.digest_members.member_count, 0)
+
+    def test_delivery_mode_inherited_from_user(self):
+        # A user subscribed through their preferred address gets the
+        # delivery mode from their user preferences.
+        user_manager = getUtility(IUserManager)
+        dave = user_manager.create_user('dave@example.com')
+        set_preferred(dave)
+        dave.preferences.delivery_mode = DeliveryMode.plaintext_digests
+        self._mlist.subscribe(dave, role=MemberRole.member)
+        self.assertEqual(
+            [member.address.email
+             for member in self._mlist.digest_members.members],
+            ['dave@example.com'])
+        self.assertEqual(list(self._mlist.regular_members.members), [])
+
+    def test_digest_recipients(self):
+        # The digest recipients are the enabled digest members, with their
+        # case-preserved address and effective delivery mode.
+        user_manager = getUtility(IUserManager)
+        dave = user_manager.create_address('Dave@example.com')
+        self._mlist.subscribe(self._anne, role=MemberRole.member)
+        for address, mode in ((self._bart, DeliveryMode.mime_digests),
+                              (self._cris, DeliveryMode.summary_digests),
+                              (dave, DeliveryMode.plaintext_digests)):
+            member = self._mlist.subscribe(address, role=MemberRole.member)
+            member.preferences.delivery_mode = mode
+        self._cris.preferences.delivery_status = DeliveryStatus.by_user
+        self.assertEqual(
+            sorted(self._mlist.digest_members.recipients),
+            [('Dave@example.com', DeliveryMode.plaintext_digests),
+             ('bart@example.com', DeliveryMode.mime_digests),
+             ])
+
 
 class TestMembershipsRoster(unittest.TestCase):
     """Test the memberships roster."""
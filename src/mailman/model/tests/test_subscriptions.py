@@ -512,3 +512,71 @@ class TestSubscriptionService(unittest.TestCase):
         # Search for the user.
         members = self._service.find_members(anne.user_id)
         self.assertEqual(len(members), 2)
+
+    def test_get_members_sorting(self):
+        # All members are sorted by list-id, then by role, then by email
+        # address, including the members subscribed through their user.
+        # Nonmembers are not included.
+        bee = create_list('bee@example.com')
+        anne = self._user_manager.create_user('anne@example.com')
+        set_preferred(anne)
+        cris = self._user_manager.create_address('cris@example.com')
+        bart = self._user_manager.create_address('bart@example.com')
+        self._mlist.subscribe(cris, MemberRole.member)
+        self._mlist.subscribe(anne, MemberRole.member)
+        self._mlist.subscribe(bart, MemberRole.owner)
+        self._mlist.subscribe(cris, MemberRole.nonmember)
+        self._mlist.subscribe(bart, MemberRole.moderator)
+        bee.subscribe(cris, MemberRole.owner)
+        bee.subscribe(bart, MemberRole.member)
+        expected = [
+            ('bee.example.com', MemberRole.owner, 'cris@example.com'),
+            ('bee.example.com', MemberRole.member, 'bart@example.com'),
+            ('test.example.com', MemberRole.owner, 'bart@example.com'),
+            ('test.example.com', MemberRole.moderator, 'bart@example.com'),
+            ('test.example.com', MemberRole.member, 'anne@example.com'),
+            ('test.example.com', MemberRole.member, 'cris@example.com'),
+            ]
+        members = self._service.get_members()
+        self.assertEqual(len(members), 6)
+        self.assertEqual(
+            [(m.list_id, m.role, m.address.email) for m in members],
+            expected)
+        self.assertEqual(
+            [(m.list_id, m.role, m.address.email) for m in members[2:4]],
+            expected[2:4])
+        self.assertEqual(members[4].address.email, 'anne@example.com')
+
+    def test_iter_members_batches(self):
+        # Iterating over the members in batches continues each batch after
+        # the last member of the previous one, even when it ends in the
+        # middle of a run of equal email addresses.
+        for email in ('cris', 'anne', 'bart', 'dave', 'elly'):
+            address = self._user_manager.create_address(
+                '{}@example.com'.format(email))
+            self._mlist.subscribe(address, MemberRole.member)
+            self._mlist.subscribe(address, MemberRole.owner)
+        expected = list(self._service.get_members())
+        self.assertEqual(len(expected), 10)
+        for batch_size in range(1, 12):
+            self.assertEqual(
+                list(self._service.iter_members(batch_size)), expected)
+        self.assertEqual(list(self._service), expected)
+
+    def test_iter_members_without_email(self):
+        # A member whose user no longer has a preferred address has no email
+        # address, but is still included in every batch size.
+        anne = self._user_manager.create_user('anne@example.com')
+        set_preferred(anne)
+        self._mlist.subscribe(anne, MemberRole.member)
+        for email in ('bart', 'cris'):
+            address = self._user_manager.create_address(
+                '{}@example.com'.format(email))
+            self._mlist.subscribe(address, MemberRole.member)
+        del anne.preferred_address
+        expected = list(self._service.get_members())
+        self.assertEqual(len(expected), 3)
+        self.assertIsNone(expected[0].address)
+        for batch_size in range(1, 5):
+            self.assertEqual(
+                list(self._service.iter_members(batch_size)), expected)
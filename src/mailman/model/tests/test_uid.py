@@ -20,6 +20,7 @@
 import uuid
 import unittest
 
+from mailman.app.lifecycle import create_list
 from mailman.config import config
 from mailman.interfaces.usermanager import IUserManager
 from mailman.model.uid import UID
@@ -64,7 +65,7 @@ class TestUID(unittest.TestCase):
         orphans = set()
         for i in range(100, 113):
             uid = UID.record(uuid.UUID(int=i))
-            orphans.add(uid.uid)
+            orphans.add(uid)
         self.assertEqual(len(orphans), 13)
         # Normally we wouldn't do a query in a test, since we'd want the model
         # object to expose this, but we actually don't support exposing all
@@ -80,6 +81,39 @@ class TestUID(unittest.TestCase):
         non_orphans = set(user.user_id for user in manager.users)
         self.assertEqual(uids, non_orphans)
 
+    def test_record_many(self):
+        # Several uids can be recorded at once, but only if none of them has
+        # been recorded before.
+        UID.record_many([uuid.UUID(int=1), uuid.UUID(int=2)])
+        UID.record_many([])
+        self.assertEqual(UID.get_total_uid_count(), 2)
+        self.assertRaises(ValueError, UID.record_many,
+                          [uuid.UUID(int=3), uuid.UUID(int=2)])
+        self.assertRaises(ValueError, UID.record, uuid.UUID(int=1))
+
+    def test_cull_orphans_keeps_member_uids(self):
+        # The uids of members aren't orphans either.
+        mlist = create_list('ant@example.com')
+        address = getUtility(IUserManager).create_address('anne@example.com')
+        member = mlist.subscribe(address)
+        UID.record(member.member_id)
+        UID.record(uuid.UUID(int=100))
+        self.assertEqual(UID.cull_orphans(), 1)
+        self.assertEqual(
+            [row[0] for row in config.db.store.query(UID.uid)],
+            [member.member_id])
+
+    def test_cull_orphans_limit(self):
+        # Orphans can be culled in batches.
+        for i in range(5):
+            UID.record(uuid.UUID(int=i))
+        self.assertEqual(UID.cull_orphans(limit=2), 2)
+        self.assertEqual(UID.get_total_uid_count(), 3)
+        self.assertEqual(UID.cull_orphans(limit=2), 2)
+        self.assertEqual(UID.cull_orphans(limit=2), 1)
+        self.assertEqual(UID.cull_orphans(limit=2), 0)
+        self.assertEqual(UID.get_total_uid_count(), 0)
+
     def test_repr(self):
         uid = UID(uuid.UUID(int=1))
         self.assertTrue(repr(uid).startswith(
@@ -19,9 +19,16 @@
 
 import unittest
 
+from mailman.interfaces.pending import IPendable, IPendings
 from mailman.interfaces.workflow import IWorkflowStateManager
 from mailman.testing.layers import ConfigLayer
 from zope.component import getUtility
+from zope.interface import implementer
+
+
+@implementer(IPendable)
+class SimplePendable(dict):
+    PEND_TYPE = 'simple'
 
 
 class TestWorkflow(unittest.TestCase):
@@ -117,3 +124,17 @@ class TestWorkflow(unittest.TestCase):
     def test_discard_missing_workflow(self):
         self._manager.discard('bogus-token')
         self.assertEqual(self._manager.count, 0)
+
+    def test_evict_abandoned_workflows(self):
+        # Workflow states without a pended token are evicted.
+        pendings = getUtility(IPendings)
+        token = pendings.add(SimplePendable())
+        self._manager.save(token, 'one')
+        self._manager.save('token2', 'two')
+        self._manager.save('token3', 'three')
+        self.assertEqual(self._manager.evict(limit=1), 1)
+        self.assertEqual(self._manager.count, 2)
+        self.assertEqual(self._manager.evict(), 1)
+        self.assertEqual(self._manager.count, 1)
+        self.assertEqual(self._manager.evict(), 0)
+        self.assertEqual(self._manager.restore(token).step, 'one')
@@ -17,11 +17,29 @@
 
 """Unique IDs."""
 
+from mailman.database.helpers import is_mysql, is_sqlite
 from mailman.database.model import Model
 from mailman.database.transaction import dbconnection
 from mailman.database.types import UUID
 from public import public
-from sqlalchemy import Column, Integer
+from sqlalchemy import Column, Integer, exists
+from sqlalchemy.dialects import postgresql
+
+
+def _insert_new_uids(store):
+    # Return an INSERT statement which skips the uids which have already been
+    # recorded, instead of failing on the unique index.  Only the number of
+    # inserted rows tells whether there were any conflicts.
+    bind = store.get_bind()
+    if bind.dialect.name == 'postgresql':
+        return postgresql.insert(UID.__table__).on_conflict_do_nothing(
+            index_elements=['uid'])
+    insert = UID.__table__.insert()
+    if is_sqlite(bind):
+        return insert.prefix_with('OR IGNORE')
+    if is_mysql(bind):
+        return insert.prefix_with('IGNORE')
+    return insert                                       # pragma: nocover
 
 
 @public
@@ -41,7 +59,7 @@ class UID(Model):
     __tablename__ = 'uid'
 
     id = Column(Integer, primary_key=True)
-    uid = Column(UUID, index=True)
+    uid = Column(UUID, index=True, unique=True)
 
     @dbconnection
     def __init__(self, store, uid):
@@ -63,12 +81,30 @@ class UID(Model):
 
         :param uid: The unique id.
         :type uid: unicode
+        :return: The unique id.
         :raises ValueError: if the id is not unique.
         """
-        existing = store.query(UID).filter_by(uid=uid)
-        if existing.count() != 0:
+        result = store.execute(_insert_new_uids(store).values(uid=uid))
+        if result.rowcount != 1:
             raise ValueError(uid)
-        return UID(uid)
+        return uid
+
+    @staticmethod
+    @dbconnection
+    def record_many(uids, store):
+        """Record several uids in the database with a single insert.
+
+        :param uids: The unique ids.
+        :type uids: sequence of unicode
+        :raises ValueError: if any of the ids is not unique.  The other ids
+            may have been recorded anyway.
+        """
+        if len(uids) == 0:
+            return
+        result = store.execute(_insert_new_uids(store).values(
+            [dict(uid=uid) for uid in uids]))
+        if result.rowcount != len(uids):
+            raise ValueError(uids)
 
     @staticmethod
     @dbconnection
@@ -77,12 +113,29 @@ class UID(Model):
 
     @staticmethod
     @dbconnection
-    def cull_orphans(store):
+    def cull_orphans(store, limit=None):
+        """Delete the uids which are not used by any user or member.
+
+        :param limit: The maximum number of uids to delete, or None to delete
+            all of them.
+        :type limit: int
+        :return: The number of deleted uids.
+        :rtype: int
+        """
         # Avoid circular imports.
+        from mailman.model.member import Member
         from mailman.model.user import User
-        # Delete all uids in this table that are not associated with user
-        # rows.
-        results = store.query(UID).filter(
-            ~UID.uid.in_(store.query(User._user_id)))
-        for uid in results.all():
-            store.delete(uid)
+        # Both anti-joins use the indexes of the user and member ids.
+        orphaned = (
+            ~exists().where(User._user_id == UID.uid),
+            ~exists().where(Member._member_id == UID.uid),
+            )
+        if limit is None:
+            return store.query(UID).filter(*orphaned).delete(
+                synchronize_session=False)
+        uid_ids = [uid_id for (uid_id,) in store.query(UID.id).filter(
+            *orphaned).order_by(UID.id).limit(limit)]
+        if len(uid_ids) > 0:
+            store.query(UID).filter(UID.id.in_(uid_ids)).delete(
+                synchronize_session=False)
+        return len(uid_ids)
@@ -21,6 +21,7 @@ from mailman.database.model import Model
 from mailman.database.transaction import dbconnection
 from mailman.database.types import SAUnicode
 from mailman.interfaces.workflow import IWorkflowState, IWorkflowStateManager
+from mailman.model.pending import Pended
 from public import public
 from sqlalchemy import Column
 from zope.interface import implementer
@@ -64,6 +65,22 @@ class WorkflowStateManager:
         if state is not None:
             store.delete(state)
 
+    @dbconnection
+    def evict(self, store, limit=None):
+        """See `IWorkflowStateManager`."""
+        query = store.query(WorkflowState.token).outerjoin(
+            Pended, Pended.token == WorkflowState.token).filter(
+                Pended.id.is_(None))
+        if limit is not None:
+            query = query.limit(limit)
+        tokens = [token for (token,) in query]
+        if len(tokens) == 0:
+            return 0
+        store.query(WorkflowState).filter(
+            WorkflowState.token.in_(tokens)).delete(
+                synchronize_session=False)
+        return len(tokens)
+
     @property
     @dbconnection
     def count(self, store):
@@ -22,6 +22,7 @@ import socket
 import logging
 import smtplib
 
+from email.policy import compat32
 from mailman.config import config
 from mailman.interfaces.mta import IMailTransportAgentDelivery
 from mailman.mta.connection import Connection
@@ -31,6 +32,11 @@ from zope.interface import implementer
 
 log = logging.getLogger('mailman.smtp')
 
+# Like Message.as_string(), don't refold the headers of delivered messages.
+DELIVERY_POLICY = compat32.clone(max_line_length=0)
+# For SMTP servers which don't accept 8-bit data.
+DELIVERY_POLICY_7BIT = DELIVERY_POLICY.clone(cte_type='7bit')
+
 
 @public
 @implementer(IMailTransportAgentDelivery)
@@ -64,10 +70,18 @@ class BaseDelivery:
         sender = self._get_sender(mlist, msg, msgdata)
         message_id = msg['message-id']
         # Since the recipients can be a set or a list, sort the recipients by
-        # email address for predictability and testability.
+        # email address for predictability and testability.  The message is
+        # sent as bytes, so that its flattened form, which is cached until
+        # it is changed, needs no encoding.  Only when it contains 8-bit data
+        # which the server doesn't accept, are the 8-bit parts encoded with
+        # their charset's transfer encoding.
         try:
+            msgtext = msg.as_bytes(policy=DELIVERY_POLICY)
+            if (not msgtext.isascii() and
+                    not self._connection.supports_8bitmime()):
+                msgtext = msg.as_bytes(policy=DELIVERY_POLICY_7BIT)
             refused = self._connection.sendmail(
-                sender, sorted(recipients), msg.as_string())
+                sender, sorted(recipients), msgtext)
         except smtplib.SMTPRecipientsRefused as error:
             log.error('%s recipients refused: %s', message_id, error)
             refused = error.recipients
@@ -17,6 +17,9 @@
 
 """Bulk message delivery."""
 
+import logging
+
+from mailman.config import config
 from mailman.mta.base import BaseDelivery
 from mailman.mta.decorating import DecoratingMixin
 from public import public
@@ -34,6 +37,17 @@ CHUNKMAP = dict(
     ca=3,
     )
 
+log = logging.getLogger('mailman.error')
+
+
+def _pairs(value, option):
+    """Parse a configuration value of whitespace separated pairs."""
+    words = value.split()
+    if len(words) % 2 != 0:
+        # There are an odd number of words; ignore the last one.
+        log.error('Ignoring odd [mta]{}: {}'.format(option, words.pop()))
+    return dict(zip(words[::2], words[1::2]))
+
 
 @public
 class BulkDelivery(BaseDelivery, DecoratingMixin):
@@ -106,3 +120,87 @@ class BulkDelivery(BaseDelivery, DecoratingMixin):
                 mlist, msg, msgdata, recipients)
             refused.update(chunk_refused)
         return refused
+
+
+@public
+class DomainBulkDelivery(BulkDelivery):
+    """Bulk delivery which keeps recipients at the same destination together.
+
+    Recipients are grouped by their full domain or, for domains listed in the
+    relay map, by the downstream relay that domain is mapped to.  Each
+    destination can have its own limit on the number of recipients per SMTP
+    transaction.  Because all the recipients for a destination are handed to
+    the MTA in as few, consecutive transactions as possible, the MTA has the
+    best chance to reuse its downstream connections.
+    """
+
+    def __init__(self, max_recipients=None, relay_map=None,
+                 destination_limits=None):
+        """See `BulkDelivery`.
+
+        :param relay_map: A mapping of lower cased recipient domains to the
+            destination they are delivered through.  Domains not in this
+            mapping are their own destination.  Defaults to the mapping in
+            the `[mta]relay_map` configuration variable.
+        :type relay_map: dict
+        :param destination_limits: A mapping of destinations to the maximum
+            number of recipients per delivery chunk for that destination.
+            Destinations not in this mapping use `max_recipients`.  Defaults
+            to `[mta]destination_max_recipients`.
+        :type destination_limits: dict
+        """
+        super().__init__(max_recipients)
+        if relay_map is None:
+            relay_map = _pairs(config.mta.relay_map, 'relay_map')
+        if destination_limits is None:
+            destination_limits = {
+                destination: int(limit)
+                for destination, limit in _pairs(
+                    config.mta.destination_max_recipients,
+                    'destination_max_recipients').items()
+                }
+        self._relay_map = {
+            domain.lower(): destination
+            for domain, destination in relay_map.items()
+            }
+        self._destination_limits = destination_limits
+
+    def destination(self, address):
+        """Return the destination for a recipient address."""
+        domain = address.rpartition('@')[2].lower()
+        return self._relay_map.get(domain, domain)
+
+    def chunkify(self, recipients):
+        """See `BulkDelivery`.
+
+        Destinations get chunks of their own for as long as they can fill
+        them.  The remaining recipients of every destination are then packed
+        into shared chunks, keeping each destination's recipients adjacent.
+        """
+        by_destination = {}
+        for address in recipients:
+            by_destination.setdefault(
+                self.destination(address), set()).add(address)
+        leftovers = []
+        # Start with the largest destinations, then alphabetically for
+        # predictability.
+        for destination in sorted(
+                by_destination,
+                key=lambda key: (-len(by_destination[key]), key)):
+            addresses = sorted(by_destination[destination])
+            limit = self._destination_limits.get(
+                destination, self._max_recipients)
+            while 0 < limit <= len(addresses):
+                yield set(addresses[:limit])
+                addresses = addresses[limit:]
+            if len(addresses) > 0:
+                leftovers.append(addresses)
+        chunk = set()
+        for addresses in leftovers:
+            for address in addresses:
+                chunk.add(address)
+                if len(chunk) == self._max_recipients:
+                    yield chunk
+                    chunk = set()
+        if len(chunk) > 0:
+            yield chunk
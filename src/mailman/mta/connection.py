@@ -17,17 +17,22 @@
 
 """MTA connections."""
 
+import re
 import logging
 import smtplib
 
 from contextlib import suppress
 from lazr.config import as_boolean
 from mailman.config import config
+from mailman.core.metrics import metrics
 from public import public
 
 
 log = logging.getLogger('mailman.smtp')
 
+# Like smtplib, convert all line endings to CRLF.
+EOL_RE = re.compile(br'\r\n|\n|\r(?!\n)')
+
 
 @public
 class Connection:
@@ -64,33 +69,69 @@ class Connection:
         """Open a new connection."""
         self._connection = smtplib.SMTP()
         log.debug('Connecting to %s:%s', self._host, self._port)
-        self._connection.connect(self._host, self._port)
-        if self._username is not None and self._password is not None:
-            log.debug('Logging in')
-            self._connection.login(self._username, self._password)
+        with metrics.timer('mailman_smtp_connect_seconds'):
+            self._connection.connect(self._host, self._port)
+            if self._username is not None and self._password is not None:
+                log.debug('Logging in')
+                self._connection.login(self._username, self._password)
         self._session_count = self._sessions_per_connection
 
+    def supports_8bitmime(self):
+        """Return whether the SMTP server accepts 8-bit message data.
+
+        This opens the connection if it isn't open yet.
+        """
+        if self._connection is None:
+            self._connect()
+        try:
+            self._connection.ehlo_or_helo_if_needed()
+        except smtplib.SMTPException:
+            self.quit()
+            raise
+        return self._connection.has_extn('8bitmime')
+
     def sendmail(self, envsender, recipients, msgtext):
-        """Mimic `smtplib.SMTP.sendmail`."""
+        """Mimic `smtplib.SMTP.sendmail`.
+
+        The message may be str or bytes.  Bytes are sent as they are, except
+        that their line endings are converted to CRLF, and they are declared
+        as 8-bit data if they aren't ASCII.  If the server doesn't accept
+        8-bit data, the non-ASCII bytes are replaced, like for strings.
+        """
         if as_boolean(config.devmode.enabled):
             # Force the recipients to the specified address, but still deliver
             # to the same number of recipients.
             recipients = [config.devmode.recipient] * len(recipients)
         if self._connection is None:
             self._connect()
-        # smtplib.SMTP.sendmail requires the message string to be pure ascii.
-        # We have seen malformed messages with non-ascii unicodes, so ensure
-        # we have pure ascii.
-        msgtext = msgtext.encode('ascii', 'replace').decode('ascii')
+        mail_options = []
+        if isinstance(msgtext, bytes):
+            # smtplib only converts the line endings of strings.
+            msgtext = EOL_RE.sub(b'\r\n', msgtext)
+            if not msgtext.isascii():
+                if self.supports_8bitmime():
+                    mail_options.append('BODY=8BITMIME')
+                else:
+                    msgtext = msgtext.decode('ascii', 'replace').encode(
+                        'ascii', 'replace')
+        else:
+            # smtplib.SMTP.sendmail requires the message string to be pure
+            # ascii.  We have seen malformed messages with non-ascii unicodes,
+            # so ensure we have pure ascii.
+            msgtext = msgtext.encode('ascii', 'replace').decode('ascii')
         try:
             log.debug('envsender: %s, recipients: %s, size(msgtext): %s',
                       envsender, recipients, len(msgtext))
-            results = self._connection.sendmail(envsender, recipients, msgtext)
+            with metrics.timer('mailman_smtp_transaction_seconds'):
+                results = self._connection.sendmail(
+                    envsender, recipients, msgtext, mail_options)
         except smtplib.SMTPException:
             # For safety, close this connection.  The next send attempt will
             # automatically re-open it.  Pass the exception on up.
+            metrics.increment('mailman_smtp_failures_total')
             self.quit()
             raise
+        metrics.increment('mailman_smtp_recipients_total', len(recipients))
         # This session has been successfully completed.
         self._session_count -= 1
         # By testing exactly for equality to 0, we automatically handle the
@@ -23,11 +23,11 @@ import logging
 from mailman.config import config
 from mailman.interfaces.mailinglist import Personalization
 from mailman.interfaces.mta import SomeRecipientsFailed
-from mailman.mta.base import IndividualDelivery
-from mailman.mta.bulk import BulkDelivery
+from mailman.mta.base import DELIVERY_POLICY, IndividualDelivery
 from mailman.mta.decorating import DecoratingMixin
 from mailman.mta.personalized import PersonalizedMixin
 from mailman.mta.verp import VERPMixin
+from mailman.utilities.modules import find_name
 from mailman.utilities.string import expand
 from public import public
 
@@ -36,6 +36,19 @@ COMMA = ','
 log = logging.getLogger('mailman.smtp')
 
 
+class _Expansion:
+    """A log message template which is only expanded when it's logged."""
+
+    def __init__(self, template, mlist, substitutions):
+        self._template = template
+        self._mlist = mlist
+        # The substitutions are updated for the next log message.
+        self._substitutions = substitutions.copy()
+
+    def __str__(self):
+        return expand(self._template, self._mlist, self._substitutions)
+
+
 @public
 class Deliver(VERPMixin, DecoratingMixin, PersonalizedMixin,
               IndividualDelivery):
@@ -74,7 +87,8 @@ def deliver(mlist, msg, msgdata):
     elif mlist.personalize != Personalization.none:
         agent = Deliver()
     else:
-        agent = BulkDelivery(int(config.mta.max_recipients))
+        agent = find_name(config.mta.bulk_delivery)(
+            int(config.mta.max_recipients))
     log.debug('Using agent: %s', agent)
     # Keep track of the original recipients and the original sender for
     # logging purposes.
@@ -97,7 +111,8 @@ def deliver(mlist, msg, msgdata):
     # Log this posting.
     size = getattr(msg, 'original_size', msgdata.get('original_size'))
     if size is None:
-        size = len(msg.as_string())
+        # This is the message as it was just flattened for delivery.
+        size = len(msg.as_bytes(policy=DELIVERY_POLICY))
     substitutions = dict(
         msgid       = msg.get('message-id', 'n/a'),   # noqa: E221,E251
         listname    = mlist.fqdn_listname,            # noqa: E221,E251
@@ -111,11 +126,11 @@ def deliver(mlist, msg, msgdata):
         )
     template = config.logging.smtp.every
     if template.lower() != 'no':
-        log.info('%s', expand(template, mlist, substitutions))
+        log.info('%s', _Expansion(template, mlist, substitutions))
     if refused:
         template = config.logging.smtp.refused
         if template.lower() != 'no':
-            log.info('%s', expand(template, mlist, substitutions))
+            log.info('%s', _Expansion(template, mlist, substitutions))
     else:
         # Log the successful post, but if it was not destined to the mailing
         # list (e.g. to the owner or admin), print the actual recipients
@@ -126,7 +141,7 @@ def deliver(mlist, msg, msgdata):
             substitutions['recips'] = COMMA.join(recips)
         template = config.logging.smtp.success
         if template.lower() != 'no':
-            log.info('%s', expand(template, mlist, substitutions))
+            log.info('%s', _Expansion(template, mlist, substitutions))
     # Process any failed deliveries.
     temporary_failures = []
     permanent_failures = []
@@ -154,7 +169,7 @@ def deliver(mlist, msg, msgdata):
                 smtpcode    = code,                 # noqa: E221,E251
                 smtpmsg     = smtp_message,         # noqa: E221,E251
                 )
-            log.info('%s', expand(template, mlist, substitutions))
+            log.info('%s', _Expansion(template, mlist, substitutions))
     # Return the results
     if temporary_failures or permanent_failures:
         raise SomeRecipientsFailed(temporary_failures, permanent_failures)
@@ -19,6 +19,7 @@
 
 import os
 import logging
+import sqlite3
 
 from collections import defaultdict
 from contextlib import contextmanager
@@ -41,6 +42,28 @@ ALIASTMPL = '{0:{2}}lmtp:[{1.mta.lmtp_host}]:{1.mta.lmtp_port}'
 VMAPTMPL = '{0:{1}}{2}'
 NL = '\n'
 
+# With the `sqlite` transport file type, the maps live in this database,
+# which Postfix queries through the *.cf files written next to it.
+SQLITE_DATABASE = 'postfix_maps.sqlite'
+SQLITE_SCHEMA = (
+    'CREATE TABLE IF NOT EXISTS lmtp '
+    '(address TEXT PRIMARY KEY, list TEXT, transport TEXT)',
+    'CREATE INDEX IF NOT EXISTS ix_lmtp_list ON lmtp (list)',
+    'CREATE TABLE IF NOT EXISTS domains '
+    '(list TEXT PRIMARY KEY, alias_domain TEXT, domain TEXT)',
+    'CREATE INDEX IF NOT EXISTS ix_domains_alias_domain '
+    'ON domains (alias_domain)',
+    'CREATE TABLE IF NOT EXISTS vmap '
+    '(address TEXT PRIMARY KEY, list TEXT, destination TEXT)',
+    'CREATE INDEX IF NOT EXISTS ix_vmap_list ON vmap (list)',
+    )
+SQLITE_QUERIES = dict(
+    postfix_lmtp="SELECT transport FROM lmtp WHERE address='%s'",
+    postfix_domains=(
+        "SELECT domain FROM domains WHERE alias_domain='%s' LIMIT 1"),
+    postfix_vmap="SELECT destination FROM vmap WHERE address='%s'",
+    )
+
 
 @contextmanager
 def atomic(path):
@@ -88,11 +111,20 @@ class LMTP:
 
     def create(self, mlist):
         """See `IMailTransportAgentLifecycle`."""
-        # We can ignore the mlist argument because for LMTP delivery, we just
-        # generate the entire file every time.
-        self.regenerate()
+        # For the text maps, we can ignore the mlist argument because we just
+        # generate the entire file every time.  The SQLite maps are updated
+        # for just this mailing list.
+        if self.transport_file_type == 'sqlite':
+            self._update_sqlite(add=[(mlist.list_name, mlist.mail_host)])
+        else:
+            self.regenerate()
 
-    delete = create
+    def delete(self, mlist):
+        """See `IMailTransportAgentLifecycle`."""
+        if self.transport_file_type == 'sqlite':
+            self._update_sqlite(remove=[(mlist.list_name, mlist.mail_host)])
+        else:
+            self.regenerate()
 
     def regenerate(self, directory=None):
         """See `IMailTransportAgentLifecycle`."""
@@ -101,6 +133,9 @@ class LMTP:
             directory = config.DATA_DIR
         lock_file = os.path.join(config.LOCK_DIR, 'mta')
         with Lock(lock_file):
+            if self.transport_file_type == 'sqlite':
+                self._generate_sqlite(directory)
+                return
             lmtp_path = os.path.join(directory, 'postfix_lmtp')
             with atomic(lmtp_path) as fp:
                 self._generate_lmtp_file(fp)
@@ -132,6 +167,72 @@ class LMTP:
                 if errors:
                     raise RuntimeError(NL.join(errors))
 
+    def _generate_sqlite(self, directory):
+        # Point Postfix at the database, then rebuild all the maps in one
+        # transaction.
+        database_path = os.path.join(directory, SQLITE_DATABASE)
+        for name, query in sorted(SQLITE_QUERIES.items()):
+            with atomic(os.path.join(directory, name + '.cf')) as fp:
+                print("""\
+# AUTOMATICALLY GENERATED BY MAILMAN ON {}
+dbpath = {}
+query = {}""".format(now().replace(microsecond=0), database_path, query),
+                      file=fp)
+        lists = getUtility(IListManager).name_components
+        self._update_sqlite(directory, add=lists, clear=True)
+
+    def _sqlite_rows(self, list_name, mail_host):
+        # Return the rows of each map table for the given mailing list.
+        utility = getUtility(IMailTransportAgentAliases)
+        mlist = _FakeList(list_name, mail_host)
+        key = '{}@{}'.format(list_name, mail_host)
+        transport = 'lmtp:[{0.lmtp_host}]:{0.lmtp_port}'.format(config.mta)
+        rows = dict(
+            lmtp=[(alias, key, transport)
+                  for alias in utility.aliases(mlist)],
+            domains=[(key, mlist.mail_host, mail_host)],
+            vmap=[],
+            )
+        if mlist.mail_host != mail_host:
+            for alias in utility.destinations(mlist):
+                rows['vmap'].append((
+                    '{}@{}'.format(alias, mail_host), key,
+                    '{}@{}'.format(alias, mlist.mail_host)))
+        return rows
+
+    def _update_sqlite(self, directory=None, add=(), remove=(),
+                       clear=False):
+        # Apply the changes for the given (list_name, mail_host) pairs in a
+        # single SQLite transaction.  SQLite does its own locking, so unlike
+        # the text maps, Postfix never sees a half written map.
+        if directory is None:
+            directory = config.DATA_DIR
+        database_path = os.path.join(directory, SQLITE_DATABASE)
+        if not clear and not os.path.exists(database_path):
+            # Nothing has been generated yet, so do it all now.
+            self.regenerate(directory)
+            return
+        connection = sqlite3.connect(database_path)
+        try:
+            for statement in SQLITE_SCHEMA:
+                connection.execute(statement)
+            with connection:
+                for table in ('lmtp', 'domains', 'vmap'):
+                    if clear:
+                        connection.execute('DELETE FROM ' + table)
+                    for list_name, mail_host in remove:
+                        connection.execute(
+                            'DELETE FROM {} WHERE list = ?'.format(table),
+                            ('{}@{}'.format(list_name, mail_host),))
+                for list_name, mail_host in add:
+                    rows = self._sqlite_rows(list_name, mail_host)
+                    for table, table_rows in rows.items():
+                        connection.executemany(
+                            'INSERT OR REPLACE INTO {} '
+                            'VALUES (?, ?, ?)'.format(table), table_rows)
+        finally:
+            connection.close()
+
     def _generate_lmtp_file(self, fp):
         # The format for Postfix's LMTP transport map is defined here:
         # http://www.postfix.org/transport.5.html
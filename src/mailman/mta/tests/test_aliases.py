@@ -19,10 +19,12 @@
 
 import os
 import shutil
+import sqlite3
 import tempfile
 import unittest
 
-from mailman.app.lifecycle import create_list
+from mailman.app.lifecycle import create_list, remove_list
+from mailman.config import config
 from mailman.interfaces.domain import IDomainManager
 from mailman.interfaces.mta import IMailTransportAgentAliases
 from mailman.mta.postfix import LMTP
@@ -476,3 +478,92 @@ third-unsubscribe@example.org          third-unsubscribe@x.example.org
 /^other-subscribe@example\\.org$/       other-subscribe@x.example.org
 /^other-unsubscribe@example\\.org$/     other-unsubscribe@x.example.org
 """)
+
+
+class TestPostfixSQLite(unittest.TestCase):
+    """Test the Postfix LMTP SQLite maps."""
+
+    layer = ConfigLayer
+
+    def setUp(self):
+        self.tempdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tempdir)
+        self.mlist = create_list('test@example.com')
+        self.postfix = LMTP()
+        self.postfix.transport_file_type = 'sqlite'
+
+    def _rows(self, table, directory=None):
+        path = os.path.join(
+            self.tempdir if directory is None else directory,
+            'postfix_maps.sqlite')
+        connection = sqlite3.connect(path)
+        self.addCleanup(connection.close)
+        return connection.execute(
+            'SELECT * FROM {} ORDER BY 1'.format(table)).fetchall()
+
+    def test_regenerate(self):
+        self.postfix.regenerate(self.tempdir)
+        self.assertEqual(sorted(os.listdir(self.tempdir)), [
+            'postfix_domains.cf', 'postfix_lmtp.cf', 'postfix_maps.sqlite',
+            'postfix_vmap.cf',
+            ])
+        # The lookup table definitions point Postfix at the database.
+        with open(os.path.join(self.tempdir, 'postfix_lmtp.cf')) as fp:
+            contents = fp.read().splitlines()
+        self.assertEqual(contents[1:], [
+            'dbpath = {}'.format(
+                os.path.join(self.tempdir, 'postfix_maps.sqlite')),
+            "query = SELECT transport FROM lmtp WHERE address='%s'",
+            ])
+        self.assertEqual(self._rows('lmtp')[:2], [
+            ('test-bounces@example.com', 'test@example.com',
+             'lmtp:[127.0.0.1]:9024'),
+            ('test-confirm@example.com', 'test@example.com',
+             'lmtp:[127.0.0.1]:9024'),
+            ])
+        self.assertEqual(len(self._rows('lmtp')), 9)
+        self.assertEqual(self._rows('domains'), [
+            ('test@example.com', 'example.com', 'example.com'),
+            ])
+        self.assertEqual(self._rows('vmap'), [])
+
+    def test_alias_domain(self):
+        getUtility(IDomainManager).add(
+            'example.org', alias_domain='x.example.org')
+        create_list('other@example.org')
+        self.postfix.regenerate(self.tempdir)
+        self.assertEqual(self._rows('domains'), [
+            ('other@example.org', 'x.example.org', 'example.org'),
+            ('test@example.com', 'example.com', 'example.com'),
+            ])
+        self.assertEqual(self._rows('vmap')[0], (
+            'other-bounces@example.org', 'other@example.org',
+            'other-bounces@x.example.org'))
+        self.assertEqual(len(self._rows('vmap')), 9)
+        self.assertIn(
+            ('other@x.example.org', 'other@example.org',
+             'lmtp:[127.0.0.1]:9024'),
+            self._rows('lmtp'))
+
+    def test_create_and_delete(self):
+        # Creating and deleting lists only changes their own rows.
+        for name in ('postfix_domains.cf', 'postfix_lmtp.cf',
+                     'postfix_maps.sqlite', 'postfix_vmap.cf'):
+            self.addCleanup(os.remove, os.path.join(config.DATA_DIR, name))
+        self.postfix.create(self.mlist)
+        # The first change generates all the maps.
+        self.assertTrue(os.path.exists(
+            os.path.join(config.DATA_DIR, 'postfix_lmtp.cf')))
+        self.assertEqual(len(self._rows('lmtp', config.DATA_DIR)), 9)
+        ant = create_list('ant@example.com')
+        self.postfix.create(ant)
+        self.assertEqual(len(self._rows('lmtp', config.DATA_DIR)), 18)
+        self.assertEqual(len(self._rows('domains', config.DATA_DIR)), 2)
+        remove_list(self.mlist)
+        self.postfix.delete(self.mlist)
+        rows = self._rows('lmtp', config.DATA_DIR)
+        self.assertEqual(len(rows), 9)
+        self.assertEqual(set(row[1] for row in rows), {'ant@example.com'})
+        self.assertEqual(self._rows('domains', config.DATA_DIR), [
+            ('ant@example.com', 'example.com', 'example.com'),
+            ])
@@ -23,6 +23,19 @@ from mailman.config import config
 from mailman.mta.connection import Connection
 from mailman.testing.layers import SMTPLayer
 from smtplib import SMTP, SMTPAuthenticationError
+from unittest.mock import patch
+
+
+EIGHT_BIT_MESSAGE = b"""\
+From: anne@example.com
+To: bart@example.com
+Subject: aardvarks
+Content-Type: text/plain; charset="utf-8"
+Content-Transfer-Encoding: 8bit
+
+caf\xc3\xa9
+.
+"""
 
 
 class TestConnection(unittest.TestCase):
@@ -58,6 +71,51 @@ Subject: aardvarks
         self.assertEqual(self.layer.smtpd.get_authentication_credentials(),
                          'AHRlc3R1c2VyAHRlc3RwYXNz')
 
+    def test_send_bytes(self):
+        # Bytes are sent as they are, with CRLF line endings, and declared
+        # as 8-bit data if they aren't ASCII.
+        connection = Connection(
+            config.mta.smtp_host, int(config.mta.smtp_port), 0)
+        with patch.object(SMTP, 'sendmail', autospec=True,
+                          side_effect=SMTP.sendmail) as sendmail:
+            connection.sendmail('anne@example.com', ['bart@example.com'],
+                                EIGHT_BIT_MESSAGE)
+        connection.quit()
+        self.assertEqual(sendmail.call_args[0][4], ['BODY=8BITMIME'])
+        messages = list(self.layer.smtpd.messages)
+        self.assertEqual(len(messages), 1)
+        self.assertEqual(messages[0]['subject'], 'aardvarks')
+        self.assertEqual(messages[0].get_payload(decode=True),
+                         b'caf\xc3\xa9\r\n.\r\n')
+
+    def test_send_ascii_bytes(self):
+        # ASCII bytes are not declared as 8-bit data.
+        connection = Connection(
+            config.mta.smtp_host, int(config.mta.smtp_port), 0)
+        with patch.object(SMTP, 'sendmail', autospec=True,
+                          side_effect=SMTP.sendmail) as sendmail:
+            connection.sendmail('anne@example.com', ['bart@example.com'],
+                                b'From: anne@example.com\n\nHello\n')
+        connection.quit()
+        self.assertEqual(sendmail.call_args[0][4], [])
+
+    def test_send_bytes_without_8bitmime(self):
+        # The non-ASCII bytes are replaced when the server doesn't accept
+        # 8-bit data.
+        connection = Connection(
+            config.mta.smtp_host, int(config.mta.smtp_port), 0)
+        with patch.object(SMTP, 'has_extn', return_value=False), \
+                patch.object(SMTP, 'sendmail', autospec=True,
+                             side_effect=SMTP.sendmail) as sendmail:
+            connection.sendmail('anne@example.com', ['bart@example.com'],
+                                EIGHT_BIT_MESSAGE)
+        connection.quit()
+        self.assertEqual(sendmail.call_args[0][4], [])
+        messages = list(self.layer.smtpd.messages)
+        self.assertEqual(len(messages), 1)
+        self.assertEqual(messages[0].get_payload(decode=True),
+                         b'caf??\r\n.\r\n')
+
 
 class TestConnectionCount(unittest.TestCase):
     layer = SMTPLayer
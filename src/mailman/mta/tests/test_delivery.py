@@ -22,16 +22,21 @@ import shutil
 import tempfile
 import unittest
 
+from email import message_from_bytes
 from mailman.app.lifecycle import create_list
 from mailman.config import config
+from mailman.email.message import Message
 from mailman.interfaces.mailinglist import Personalization
 from mailman.interfaces.template import ITemplateManager
-from mailman.mta.bulk import BulkDelivery
+from mailman.mta.bulk import BulkDelivery, DomainBulkDelivery
+from mailman.mta.connection import Connection
 from mailman.mta.deliver import Deliver
 from mailman.testing.helpers import (
-    specialized_message_from_string as mfs, subscribe)
+    LogFileMark, configuration, specialized_message_from_string as mfs,
+    subscribe)
 from mailman.testing.layers import ConfigLayer, SMTPLayer
 from mailman.utilities.modules import find_name
+from unittest.mock import patch
 from zope.component import getUtility
 
 
@@ -259,3 +264,94 @@ Subject: test
         # Since max_sessions_per_connection is 3, sending 4 personalized
         # messages creates 2 connections.
         self.assertEqual(SMTPLayer.smtpd.get_connection_count(), 2)
+
+
+class TestEightBitDelivery(unittest.TestCase):
+    """Test the delivery of messages with 8-bit data."""
+
+    layer = SMTPLayer
+
+    def setUp(self):
+        self._mlist = create_list('test@example.com')
+        self._msg = message_from_bytes(b"""\
+From: anne@example.org
+To: test@example.com
+Subject: test
+Content-Type: text/plain; charset="utf-8"
+Content-Transfer-Encoding: 8bit
+
+caf\xc3\xa9
+""", Message)
+        self._deliverer = find_name(config.mta.outgoing)
+
+    def test_8bitmime(self):
+        # The message is sent as it is to servers which accept 8-bit data.
+        self._deliverer(self._mlist, self._msg, dict(
+            recipients=['bart@example.org'], nodecorate=True))
+        messages = list(SMTPLayer.smtpd.messages)
+        self.assertEqual(len(messages), 1)
+        self.assertEqual(messages[0]['content-transfer-encoding'], '8bit')
+        self.assertEqual(messages[0].get_payload(decode=True).strip(),
+                         b'caf\xc3\xa9')
+
+    def test_no_8bitmime(self):
+        # For other servers, the 8-bit parts of the message are encoded.
+        with patch.object(Connection, 'supports_8bitmime', return_value=False):
+            self._deliverer(self._mlist, self._msg, dict(
+                recipients=['bart@example.org'], nodecorate=True))
+        messages = list(SMTPLayer.smtpd.messages)
+        self.assertEqual(len(messages), 1)
+        self.assertEqual(messages[0]['content-transfer-encoding'], 'base64')
+        self.assertEqual(messages[0].get_payload(decode=True).strip(),
+                         b'caf\xc3\xa9')
+
+
+class TestDomainBulkDelivery(unittest.TestCase):
+    """Test the configuration of domain grouped bulk delivery."""
+
+    layer = SMTPLayer
+
+    def setUp(self):
+        self._mlist = create_list('test@example.com')
+        self._msg = mfs("""\
+From: anne@example.org
+To: test@example.com
+Subject: test
+Message-ID: <ant>
+
+""")
+
+    @configuration('mta', relay_map="""
+        example.net relay.example.com
+        example.org relay.example.com
+        """, destination_max_recipients="""
+        relay.example.com 2
+        example.com
+        """)
+    def test_configuration(self):
+        # The relay map and destination limits come from the configuration.
+        # Odd entries are logged and ignored.
+        mark = LogFileMark('mailman.error')
+        agent = DomainBulkDelivery(10)
+        self.assertEqual(
+            [sorted(chunk) for chunk in agent.chunkify([
+                'anne@example.net', 'bart@example.org', 'cris@Example.NET',
+                'dave@example.com'])],
+            [['anne@example.net', 'bart@example.org'],
+             ['cris@Example.NET', 'dave@example.com']])
+        self.assertEqual(
+            mark.read()[-58:],
+            'Ignoring odd [mta]destination_max_recipients: example.com\n')
+
+    @configuration('mta', max_recipients=2,
+                   bulk_delivery='mailman.mta.bulk.DomainBulkDelivery')
+    def test_deliver(self):
+        # The bulk delivery class is configurable.
+        deliver = find_name(config.mta.outgoing)
+        msgdata = dict(recipients=['anne@example.net', 'bart@example.org',
+                                   'cris@example.net'])
+        deliver(self._mlist, self._msg, msgdata)
+        messages = list(SMTPLayer.smtpd.messages)
+        self.assertEqual(
+            sorted(message['x-rcptto'] for message in messages),
+            ['anne@example.net, cris@example.net', 'bart@example.org'])
@@ -21,7 +21,7 @@ from mailman.interfaces.address import (
     ExistingAddressError, InvalidEmailAddressError)
 from mailman.interfaces.usermanager import IUserManager
 from mailman.rest.helpers import (
-    BadRequest, CollectionMixin, NotFound, bad_request, child, created, etag,
+    BadRequest, CollectionMixin, NotFound, bad_request, child, created,
     no_content, not_found, okay)
 from mailman.rest.members import MemberCollection
 from mailman.rest.preferences import Preferences
@@ -68,8 +68,7 @@ class AllAddresses(_AddressBase):
 
     def on_get(self, request, response):
         """/addresses"""
-        resource = self._make_collection(request)
-        okay(response, etag(resource))
+        self._send_collection(request, response)
 
 
 class _VerifyResource:
@@ -182,7 +181,7 @@ class UserAddresses(_AddressBase):
     def on_get(self, request, response):
         """/addresses"""
         assert self._user is not None
-        okay(response, etag(self._make_collection(request)))
+        self._send_collection(request, response)
 
     def on_post(self, request, response):
         """POST to /addresses
@@ -0,0 +1,117 @@
+# Copyright (C) 2019 by the Free Software Foundation, Inc.
+#
+# This file is part of GNU Mailman.
+#
+# GNU Mailman is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free
+# Software Foundation, either version 3 of the License, or (at your option)
+# any later version.
+#
+# GNU Mailman is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General Public License for
+# more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# GNU Mailman.  If not, see <http://www.gnu.org/licenses/>.
+
+"""An in-process cache of REST responses."""
+
+from datetime import timedelta
+from lazr.config import as_timedelta
+from mailman.config import config
+from mailman.interfaces.configuration import ConfigurationUpdatedEvent
+from mailman.interfaces.domain import DomainCreatedEvent, DomainDeletedEvent
+from mailman.interfaces.listmanager import ListCreatedEvent, ListDeletedEvent
+from mailman.interfaces.member import MembershipChangeEvent
+from mailman.utilities.datetime import now
+from public import public
+
+
+# The events which invalidate all cached responses.
+INVALIDATING_EVENTS = (
+    ConfigurationUpdatedEvent,
+    DomainCreatedEvent,
+    DomainDeletedEvent,
+    ListCreatedEvent,
+    ListDeletedEvent,
+    MembershipChangeEvent,
+    )
+
+
+@public
+class ResponseCache:
+    """A cache of the bodies and etags of successful GET responses.
+
+    Cached responses expire after `[webservice]response_cache_lifetime`.  A
+    lifetime of zero disables the cache.
+    """
+
+    def __init__(self):
+        self._entries = {}
+
+    @property
+    def lifetime(self):
+        return as_timedelta(config.webservice.response_cache_lifetime)
+
+    @property
+    def enabled(self):
+        return self.lifetime > timedelta()
+
+    def get(self, key):
+        """Return the cached response.
+
+        :param key: The cache key, usually the request's path and query
+            string.
+        :type key: str
+        :return: The 2-tuple of the response body and etag, or None if there
+            is no unexpired response cached under the key.
+        :rtype: tuple of (bytes, str)
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_on, body, etag = entry
+        if expires_on <= now():
+            del self._entries[key]
+            return None
+        return body, etag
+
+    def put(self, key, body, etag):
+        """Cache a response.
+
+        When the cache is full, the oldest response is evicted.
+
+        :param key: The cache key.
+        :type key: str
+        :param body: The response body.
+        :type body: bytes
+        :param etag: The response's etag.
+        :type etag: str
+        """
+        if not self.enabled:
+            return
+        # Remove and re-add the key so that it becomes the newest entry.
+        self._entries.pop(key, None)
+        size = int(config.webservice.response_cache_size)
+        while len(self._entries) >= size > 0:
+            del self._entries[next(iter(self._entries))]
+        self._entries[key] = (now() + self.lifetime, body, etag)
+
+    def clear(self):
+        """Forget all cached responses."""
+        self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+response_cache = ResponseCache()
+public(response_cache=response_cache)
+
+
+@public
+def handle_event(event):
+    """Invalidate the cached responses when the model changes."""
+    if isinstance(event, INVALIDATING_EVENTS):
+        response_cache.clear()
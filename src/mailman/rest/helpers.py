@@ -26,9 +26,6 @@ from datetime import datetime, timedelta
 from email.header import Header
 from email.message import Message
 from enum import Enum
-from lazr.config import as_boolean
-from mailman.config import config
-from pprint import pformat
 from public import public
 
 
@@ -67,16 +64,30 @@ def bytes_to_str(value):
             return value.decode(encoding)
 
 
+# The JSON representations of etag()'d resources and collections start with
+# this, followed by the hexdigest of the etag.
+ETAG_PREFIX = '{"http_etag":"\\"'
+ETAG_LENGTH = 40
+
+
+def _canonical_json(resource):
+    # A compact, key-sorted and thus predictable JSON representation of the
+    # resource.  This is used both to calculate etags and as the response
+    # body, so that resources only have to be serialized once.
+    return json.dumps(resource, cls=ExtendedEncoder,
+                      sort_keys=True, separators=(',', ':'))
+
+
 @public
 def etag(resource):
     """Calculate the etag and return a JSON representation.
 
     The input is a dictionary representing the resource.  This
     dictionary must not contain an `http_etag` key.  This function
-    calculates the etag by using the sha1 hexdigest of the
-    pretty-printed (and thus key-sorted and predictable) representation
-    of the dictionary.  It then inserts this value under the `http_etag`
-    key, and returns the JSON representation of the modified dictionary.
+    calculates the etag by using the sha1 hexdigest of the canonical
+    (i.e. compact and key-sorted) JSON representation of the
+    dictionary.  It then inserts this value under the `http_etag` key,
+    and returns the JSON representation of the modified dictionary.
 
     :param resource: The original resource representation.
     :type resource: dictionary
@@ -84,15 +95,63 @@ def etag(resource):
     :rtype string
     """
     assert 'http_etag' not in resource, 'Resource already etagged'
-    # Calculate the tag from a predictable (i.e. sorted) representation of the
-    # dictionary.  The actual details aren't so important.  pformat() is
-    # guaranteed to sort the keys, however it returns a str and the hash
-    # library requires a bytes.  Use the safest possible encoding.
-    hashfood = pformat(resource).encode('raw-unicode-escape')
-    etag = hashlib.sha1(hashfood).hexdigest()
+    # The canonical representation is ASCII-only, since the JSON encoder
+    # escapes all non-ASCII characters.
+    body = _canonical_json(resource)
+    etag = hashlib.sha1(body.encode('ascii')).hexdigest()
     resource['http_etag'] = '"{}"'.format(etag)
-    return json.dumps(resource, cls=ExtendedEncoder,
-                      sort_keys=as_boolean(config.devmode.enabled))
+    # Splice the etag into the already serialized representation instead of
+    # serializing the whole resource again.
+    tag = ETAG_PREFIX + etag + '\\""'
+    if body == '{}':
+        return tag + '}'
+    return tag + ',' + body[1:]
+
+
+@public
+def etag_collection(start, total_size, entries):
+    """Calculate the etag and JSON representation of a collection.
+
+    The result is equivalent to calling `etag()` on a dictionary with the
+    keys `start`, `total_size` and (if there are any) `entries`, but each
+    entry is serialized only once and as soon as it is produced, so
+    `entries` can be an iterator and the whole list of entries never needs
+    to exist.  The collection's etag is calculated from the etags of the
+    entries instead of from their contents.
+
+    :param start: The index of the first entry in the collection.
+    :type start: int
+    :param total_size: The total size of the collection.
+    :type total_size: int
+    :param entries: The representations of the entries.
+    :type entries: iterable of dictionaries
+    :return: The chunks of the JSON representation of the collection.
+    :rtype: list of bytes
+    """
+    digest = hashlib.sha1('{}:{}'.format(start, total_size).encode('ascii'))
+    # The first chunk holds the collection's etag, which is only known after
+    # all the entries have been serialized.
+    chunks = [None]
+    for entry in entries:
+        chunks.append(b',' if len(chunks) > 1 else b'"entries":[')
+        chunks.append(etag(entry).encode('ascii'))
+        digest.update(entry['http_etag'].encode('ascii'))
+    tail = _canonical_json(dict(start=start, total_size=total_size))
+    if len(chunks) > 1:
+        tail = ']' + tail.replace('{', ',', 1)
+    else:
+        tail = tail[1:]
+    chunks[0] = (ETAG_PREFIX + digest.hexdigest() + '\\"",').encode('ascii')
+    chunks.append(tail.encode('ascii'))
+    return chunks
+
+
+def _set_etag_header(response, body):
+    # Expose the etag of etag()'d resources in the ETag header, so that
+    # clients can make conditional requests.
+    if body.startswith(ETAG_PREFIX):
+        end = len(ETAG_PREFIX) + ETAG_LENGTH
+        response.etag = '"{}"'.format(body[len(ETAG_PREFIX):end])
 
 
 @public
@@ -149,14 +208,27 @@ class CollectionMixin:
         list_end = page * count
         return list_start, total_size, collection[list_start:list_end]
 
+    def _make_entries(self, request, collection):
+        """Return the representations of a page of the collection.
+
+        Subclasses can override this to render the page more efficiently
+        than one resource at a time.
+
+        :param request: An http request.
+        :param collection: The page of the collection.
+        :type collection: collections.abc.Sequence
+        :return: The representations of the resources.
+        :rtype: iterable of dictionaries
+        """
+        return (self._resource_as_dict(resource) for resource in collection)
+
     def _make_collection(self, request):
         """Provide the collection to the REST layer."""
         start, total_size, collection = self._paginate(
             request, self._get_collection(request))
         result = dict(start=start, total_size=total_size)
         if len(collection) != 0:
-            entries = [self._resource_as_dict(resource)
-                       for resource in collection]
+            entries = list(self._make_entries(request, collection))
             assert None not in entries, entries
             # Tag the resources but use the dictionaries.
             [etag(resource) for resource in entries]
@@ -164,6 +236,21 @@ class CollectionMixin:
             result['entries'] = entries
         return result
 
+    def _send_collection(self, request, response):
+        """Send the collection to the REST layer.
+
+        This is equivalent to calling `okay()` with the `etag()` of the
+        `_make_collection()` result, but the entries are serialized one at a
+        time with `etag_collection()`.
+        """
+        start, total_size, collection = self._paginate(
+            request, self._get_collection(request))
+        chunks = etag_collection(
+            start, total_size, self._make_entries(request, collection))
+        response.status = falcon.HTTP_200
+        _set_etag_header(response, chunks[0].decode('ascii'))
+        response.set_stream(chunks, sum(len(chunk) for chunk in chunks))
+
 
 @public
 class GetterSetter:
@@ -271,6 +358,8 @@ def okay(response, body=None):
     response.status = falcon.HTTP_200
     if body is not None:
         response.body = body
+        if isinstance(body, str):
+            _set_etag_header(response, body)
 
 
 @public
@@ -17,6 +17,8 @@
 
 """REST for mailing lists."""
 
+import falcon
+
 from lazr.config import as_boolean
 from mailman.app.digests import (
     bump_digest_number_and_volume, maybe_send_digest_now)
@@ -95,19 +97,57 @@ def config_matcher(segments):
 class _ListBase(CollectionMixin):
     """Shared base class for mailing list representations."""
 
-    def _resource_as_dict(self, mlist):
+    # The keys which clients may select with the `fields` query parameter.
+    # The self_link is always included.
+    FIELDS = (
+        'description',
+        'display_name',
+        'fqdn_listname',
+        'list_id',
+        'list_name',
+        'mail_host',
+        'member_count',
+        'volume',
+        )
+
+    def _resource_as_dict(self, mlist, member_count=None, fields=None):
         """See `CollectionMixin`."""
-        return dict(
-            display_name=mlist.display_name,
-            fqdn_listname=mlist.fqdn_listname,
-            list_id=mlist.list_id,
-            list_name=mlist.list_name,
-            mail_host=mlist.mail_host,
-            member_count=mlist.members.member_count,
-            volume=mlist.volume,
-            description=mlist.description,
+        if fields is None:
+            fields = self.FIELDS
+        resource = dict(
             self_link=self.api.path_to('lists/{}'.format(mlist.list_id)),
             )
+        for field in fields:
+            if field != 'member_count':
+                resource[field] = getattr(mlist, field)
+            elif member_count is None:
+                resource[field] = mlist.members.member_count
+            else:
+                resource[field] = member_count
+        return resource
+
+    def _make_entries(self, request, collection):
+        """See `CollectionMixin`."""
+        # The member counts for all the lists on the page are calculated in a
+        # single query rather than one query per list.
+        fields = request.get_param_as_list('fields')
+        if fields is None:
+            fields = self.FIELDS
+        else:
+            unknown = sorted(set(fields) - set(self.FIELDS))
+            if len(unknown) > 0:
+                raise falcon.HTTPBadRequest(
+                    description='Unknown fields: {}'.format(
+                        ', '.join(unknown)))
+        mlists = list(collection)
+        counts = {}
+        if 'member_count' in fields and len(mlists) > 0:
+            counts = getUtility(IListManager).member_counts(
+                mlist.list_id for mlist in mlists)
+        return [
+            self._resource_as_dict(mlist, counts.get(mlist.list_id), fields)
+            for mlist in mlists
+            ]
 
     def _get_collection(self, request):
         """See `CollectionMixin`."""
@@ -316,8 +356,7 @@ class AllLists(_ListBase):
 
     def on_get(self, request, response):
         """/lists"""
-        resource = self._make_collection(request)
-        okay(response, etag(resource))
+        self._send_collection(request, response)
 
 
 @public
@@ -365,8 +404,7 @@ class ListsForDomain(_ListBase):
 
     def on_get(self, request, response):
         """/domains/<domain>/lists"""
-        resource = self._make_collection(request)
-        okay(response, etag(resource))
+        self._send_collection(request, response)
 
     def _get_collection(self, request):
         """See `CollectionMixin`."""
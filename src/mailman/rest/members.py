@@ -80,7 +80,7 @@ class _MemberBase(CollectionMixin):
 
     def _get_collection(self, request):
         """See `CollectionMixin`."""
-        return list(getUtility(ISubscriptionService))
+        return getUtility(ISubscriptionService).get_members()
 
 
 @public
@@ -97,8 +97,7 @@ class MemberCollection(_MemberBase):
 
     def on_get(self, request, response):
         """roster/[members|owners|moderators]"""
-        resource = self._make_collection(request)
-        okay(response, etag(resource))
+        self._send_collection(request, response)
 
 
 @public
@@ -340,8 +339,7 @@ class AllMembers(_MemberBase):
 
     def on_get(self, request, response):
         """/members"""
-        resource = self._make_collection(request)
-        okay(response, etag(resource))
+        self._send_collection(request, response)
 
 
 class _FoundMembers(MemberCollection):
@@ -20,13 +20,17 @@
 from contextlib import suppress
 from email.errors import MessageError
 from email.header import decode_header, make_header
-from mailman.app.moderator import handle_message
+from lazr.config import as_boolean
+from mailman.app.moderator import (
+    find_held_messages, handle_message, handle_messages,
+    held_message_summary)
 from mailman.interfaces.action import Action
 from mailman.interfaces.messages import IMessageStore
 from mailman.interfaces.requests import IListRequests, RequestType
 from mailman.rest.helpers import (
     CollectionMixin, bad_request, child, etag, no_content, not_found, okay)
-from mailman.rest.validator import Validator, enum_validator
+from mailman.rest.validator import (
+    Validator, enum_validator, list_of_integers_validator)
 from public import public
 from zope.component import getUtility
 
@@ -66,6 +70,14 @@ class _ModerationBase:
 class _HeldMessageBase(_ModerationBase):
     """Held messages are a little different."""
 
+    def _decode_subject(self, resource):
+        # Store the original header and then try decoding it.
+        resource['original_subject'] = resource['subject']
+        # If we can't decode the header, leave the subject unchanged.
+        with suppress(LookupError, MessageError, UnicodeDecodeError):
+            resource['subject'] = str(
+                make_header(decode_header(resource['subject'])))
+
     def _make_resource(self, request_id):
         resource = super()._make_resource(request_id)
         if resource is None:
@@ -85,12 +97,7 @@ class _HeldMessageBase(_ModerationBase):
                 resource[key[5:]] = resource.pop(key)
             elif key.startswith('_mod_'):
                 del resource[key]
-        # Store the original header and then try decoding it.
-        resource['original_subject'] = resource['subject']
-        # If we can't decode the header, leave the subject unchanged.
-        with suppress(LookupError, MessageError, UnicodeDecodeError):
-            resource['subject'] = str(
-                make_header(decode_header(resource['subject'])))
+        self._decode_subject(resource)
         # Also, held message resources will always be this type, so ignore
         # this key value.
         del resource['type']
@@ -147,8 +154,13 @@ class HeldMessages(_HeldMessageBase, CollectionMixin):
 
     def _resource_as_dict(self, request):
         """See `CollectionMixin`."""
-        resource = self._make_resource(request.id)
-        assert resource is not None, resource
+        summary = held_message_summary(self._mlist, request)
+        assert summary is not None, request.id
+        resource = dict(summary)
+        resource['request_id'] = request.id
+        resource['self_link'] = self.api.path_to(
+            'lists/{}/held/{}'.format(self._mlist.list_id, request.id))
+        self._decode_subject(resource)
         return resource
 
     def _get_collection(self, request):
@@ -160,6 +172,41 @@ class HeldMessages(_HeldMessageBase, CollectionMixin):
         resource = self._make_collection(request)
         okay(response, etag(resource))
 
+    def on_post(self, request, response):
+        """Moderate a number of held messages."""
+        try:
+            validator = Validator(
+                action=enum_validator(Action),
+                request_id=list_of_integers_validator,
+                sender=str,
+                reason=str,
+                all=as_boolean,
+                comment=str,
+                _optional=('request_id', 'sender', 'reason', 'all', 'comment'))
+            arguments = validator(request)
+        except ValueError as error:
+            bad_request(response, str(error))
+            return
+        request_ids = arguments.pop('request_id', None)
+        select_all = arguments.pop('all', False)
+        sender = arguments.pop('sender', None)
+        reason = arguments.pop('reason', None)
+        if request_ids is None:
+            if not select_all and sender is None and reason is None:
+                bad_request(response, 'No held messages selected')
+                return
+            request_ids = find_held_messages(self._mlist, sender, reason)
+        elif select_all or sender is not None or reason is not None:
+            bad_request(
+                response, 'request_id cannot be combined with a filter')
+            return
+        skipped = handle_messages(self._mlist, request_ids, **arguments)
+        resource = dict(
+            handled=len(request_ids) - len(skipped),
+            skipped=skipped,
+            )
+        okay(response, etag(resource))
+
     @child(r'^(?P<id>[^/]+)')
     def message(self, context, segments, **kw):
         return HeldMessage(self._mlist, kw['id'])
@@ -20,6 +20,7 @@
 from mailman.config import config
 from mailman.core.api import API30, API31
 from mailman.core.constants import system_preferences
+from mailman.core.metrics import metrics, read_snapshots, render
 from mailman.core.system import system
 from mailman.interfaces.listmanager import IListManager
 from mailman.model.uid import UID
@@ -114,6 +115,23 @@ class SystemConfiguration:
         okay(response, etag(resource))
 
 
+@public
+class SystemMetrics:
+    """The metrics of all processes, in the Prometheus text format."""
+
+    def on_get(self, request, response):
+        snapshots = read_snapshots()
+        # The REST server's own metrics are always current.
+        if metrics.enabled:
+            snapshots['rest'] = metrics.snapshot()
+        gauges = [
+            ('mailman_queue_depth', dict(queue=name), len(switchboard.files))
+            for name, switchboard in sorted(config.switchboards.items())
+            ]
+        okay(response, render(snapshots, gauges))
+        response.content_type = 'text/plain; version=0.0.4; charset=utf-8'
+
+
 @public
 class Pipelines:
     def on_get(self, request, response):
@@ -170,6 +188,10 @@ class TopLevel:
             if len(segments) <= 2:
                 return SystemConfiguration(*segments[1:]), []
             return BadRequest(), []
+        elif segments[0] == 'metrics':
+            if len(segments) > 1:
+                return BadRequest(), []
+            return SystemMetrics(), []
         elif segments[0] == 'pipelines':
             if len(segments) > 1:
                 return BadRequest(), []
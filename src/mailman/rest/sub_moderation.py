@@ -17,16 +17,17 @@
 
 """REST API for held subscription requests."""
 
-from mailman.app.moderator import send_rejection
-from mailman.core.i18n import _
+from lazr.config import as_boolean
+from mailman.app.moderator import (
+    find_subscription_requests, handle_subscription, handle_subscriptions)
 from mailman.interfaces.action import Action
 from mailman.interfaces.member import AlreadySubscribedError
 from mailman.interfaces.pending import IPendings
-from mailman.interfaces.subscriptions import ISubscriptionManager
 from mailman.rest.helpers import (
     CollectionMixin, bad_request, child, conflict, etag, no_content,
     not_found, okay)
-from mailman.rest.validator import Validator, enum_validator
+from mailman.rest.validator import (
+    Validator, enum_validator, list_of_strings_validator)
 from public import public
 from zope.component import getUtility
 
@@ -37,14 +38,17 @@ class _ModerationBase:
     def __init__(self):
         self._pendings = getUtility(IPendings)
 
+    def _make_resource(self, token, pendable):
+        resource = dict(token=token)
+        resource.update(pendable)
+        return resource
+
     def _resource_as_dict(self, token):
         pendable = self._pendings.confirm(token, expunge=False)
         if pendable is None:
             # This token isn't in the database.
             raise LookupError
-        resource = dict(token=token)
-        resource.update(pendable)
-        return resource
+        return self._make_resource(token, pendable)
 
 
 @public
@@ -54,7 +58,6 @@ class IndividualRequest(_ModerationBase):
     def __init__(self, mlist, token):
         super().__init__()
         self._mlist = mlist
-        self._registrar = ISubscriptionManager(self._mlist)
         self._token = token
 
     def on_get(self, request, response):
@@ -75,42 +78,15 @@ class IndividualRequest(_ModerationBase):
         except ValueError as error:
             bad_request(response, str(error))
             return
-        action = arguments['action']
-        if action in (Action.defer, Action.hold):
-            # At least see if the token is in the database.
-            pendable = self._pendings.confirm(self._token, expunge=False)
-            if pendable is None:
-                not_found(response)
-            else:
-                no_content(response)
-        elif action is Action.accept:
-            try:
-                self._registrar.confirm(self._token)
-            except LookupError:
-                not_found(response)
-            except AlreadySubscribedError:
-                conflict(response, 'Already subscribed')
-            else:
-                no_content(response)
-        elif action is Action.discard:
-            # At least see if the token is in the database.
-            pendable = self._pendings.confirm(self._token, expunge=True)
-            if pendable is None:
-                not_found(response)
-            else:
-                no_content(response)
+        try:
+            handle_subscription(
+                self._mlist, self._token, arguments['action'])
+        except LookupError:
+            not_found(response)
+        except AlreadySubscribedError:
+            conflict(response, 'Already subscribed')
         else:
-            assert action is Action.reject, action
-            # Like discard but sends a rejection notice to the user.
-            pendable = self._pendings.confirm(self._token, expunge=True)
-            if pendable is None:
-                not_found(response)
-            else:
-                no_content(response)
-                send_rejection(
-                    self._mlist, _('Subscription request'),
-                    pendable['email'],
-                    _('[No reason given]'))
+            no_content(response)
 
 
 @public
@@ -121,16 +97,53 @@ class SubscriptionRequests(_ModerationBase, CollectionMixin):
         super().__init__()
         self._mlist = mlist
 
+    def _resource_as_dict(self, pending):
+        """See `CollectionMixin`."""
+        return self._make_resource(*pending)
+
     def _get_collection(self, request):
-        pendings = getUtility(IPendings).find(
+        # The pendings are paged by the database, and the pendables of the
+        # page are loaded together.
+        return self._pendings.find(
             mlist=self._mlist, pend_type='subscription')
-        return [token for token, pendable in pendings]
 
     def on_get(self, request, response):
         """/lists/listname/requests"""
         resource = self._make_collection(request)
         okay(response, etag(resource))
 
+    def on_post(self, request, response):
+        """Moderate a number of membership change requests."""
+        try:
+            validator = Validator(
+                action=enum_validator(Action),
+                token=list_of_strings_validator,
+                email=str,
+                all=as_boolean,
+                comment=str,
+                _optional=('token', 'email', 'all', 'comment'))
+            arguments = validator(request)
+        except ValueError as error:
+            bad_request(response, str(error))
+            return
+        tokens = arguments.pop('token', None)
+        select_all = arguments.pop('all', False)
+        email = arguments.pop('email', None)
+        if tokens is None:
+            if not select_all and email is None:
+                bad_request(response, 'No requests selected')
+                return
+            tokens = find_subscription_requests(self._mlist, email)
+        elif select_all or email is not None:
+            bad_request(response, 'token cannot be combined with a filter')
+            return
+        skipped = handle_subscriptions(self._mlist, tokens, **arguments)
+        resource = dict(
+            handled=len(tokens) - len(skipped),
+            skipped=skipped,
+            )
+        okay(response, etag(resource))
+
     @child(r'^(?P<token>[^/]+)')
     def subscription(self, context, segments, **kw):
         return IndividualRequest(self._mlist, kw['token'])
@@ -292,7 +292,7 @@ class TestDomainTemplates(unittest.TestCase):
             resource['self_link'],
             'http://localhost:9001/3.1/domains/example.com/uris')
         self.assertEqual(resource['entries'], [
-            {'http_etag': '"e877ff896db0f2e280660ac16b9401f7925a53b9"',
+            {'http_etag': '"cabf2d9456a802ee4e8f637cbfd9f4db656c4254"',
              'name': 'list:user:notice:goodbye',
              'password': 'the password',
              'self_link': ('http://localhost:9001/3.1/domains/example.com'
@@ -300,7 +300,7 @@ class TestDomainTemplates(unittest.TestCase):
              'uri': 'http://example.com/goodbye',
              'username': 'a user',
              },
-            {'http_etag': '"8dac25601c3419e98e2c05df1d962a2252b67ce6"',
+            {'http_etag': '"625ef68840b1eb87375fb6da6adf8ae58fa59ac9"',
              'name': 'list:user:notice:welcome',
              'self_link': ('http://localhost:9001/3.1/domains/example.com'
                            '/uris/list:user:notice:welcome'),
@@ -434,7 +434,7 @@ class TestDomainTemplates(unittest.TestCase):
             '/list:user:notice:welcome')
         self.assertEqual(response.status_code, 200)
         self.assertEqual(resource, {
-            'http_etag': '"8884a0b3d675b4cb9899a7825daac9db88b70bed"',
+            'http_etag': '"c2a5a83368d1876d68662aada9387bcaa81312ee"',
             'self_link': ('http://localhost:9001/3.1/domains/example.com'
                           '/uris/list:user:notice:welcome'),
             'uri': 'http://example.com/welcome',
@@ -78,6 +78,49 @@ class TestHelpers(unittest.TestCase):
         resource = dict(interval=Unserializable())
         self.assertRaises(TypeError, helpers.etag, resource)
 
+    def test_etag_is_predictable(self):
+        # The etag doesn't depend on the order of the resource's keys.
+        one = dict(a=1, b='two', c=[3])
+        two = dict(c=[3], b='two', a=1)
+        self.assertEqual(json.loads(helpers.etag(one)),
+                         json.loads(helpers.etag(two)))
+        self.assertEqual(one['http_etag'], two['http_etag'])
+        three = dict(a=1, b='two', c=[4])
+        helpers.etag(three)
+        self.assertNotEqual(one['http_etag'], three['http_etag'])
+
+    def test_etag_empty_resource(self):
+        resource = {}
+        unjson = json.loads(helpers.etag(resource))
+        self.assertEqual(unjson, dict(http_etag=resource['http_etag']))
+
+    def test_etag_non_ascii(self):
+        resource = dict(display_name='Caf\u00e9')
+        unjson = json.loads(helpers.etag(resource))
+        self.assertEqual(unjson['display_name'], 'Caf\u00e9')
+
+    def test_etag_collection(self):
+        entries = [dict(a=1), dict(b=2)]
+        chunks = helpers.etag_collection(
+            0, 2, (dict(entry) for entry in entries))
+        unjson = json.loads(b''.join(chunks).decode('ascii'))
+        self.assertEqual(unjson['start'], 0)
+        self.assertEqual(unjson['total_size'], 2)
+        # The entries are etagged just like by etag().
+        for entry in entries:
+            helpers.etag(entry)
+        self.assertEqual(unjson['entries'], entries)
+        # The collection's etag changes when any entry changes.
+        chunks = helpers.etag_collection(0, 2, [dict(a=1), dict(b=3)])
+        other = json.loads(b''.join(chunks).decode('ascii'))
+        self.assertNotEqual(unjson['http_etag'], other['http_etag'])
+
+    def test_etag_empty_collection(self):
+        chunks = helpers.etag_collection(4, 4, iter([]))
+        unjson = json.loads(b''.join(chunks).decode('ascii'))
+        self.assertEqual(sorted(unjson), ['http_etag', 'start', 'total_size'])
+        self.assertEqual(unjson['start'], 4)
+
 
 class TestJSONEncoder(unittest.TestCase):
     """Test the JSON ExtendedEncoder."""
@@ -198,6 +198,60 @@ class TestLists(unittest.TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertEqual(json['member_count'], 2)
 
+    def test_collection_member_counts(self):
+        # The member counts of all the lists in a collection are correct.
+        with transaction():
+            ant = create_list('ant@example.com')
+            anne = self._usermanager.create_address('anne@example.com')
+            bart = self._usermanager.create_address('bart@example.com')
+            ant.subscribe(anne)
+            ant.subscribe(bart)
+            ant.subscribe(anne, MemberRole.owner)
+            self._mlist.subscribe(bart)
+        json, response = call_api('http://localhost:9001/3.0/lists')
+        self.assertEqual(response.status_code, 200)
+        counts = {entry['list_id']: entry['member_count']
+                  for entry in json['entries']}
+        self.assertEqual(counts, {
+            'ant.example.com': 2,
+            'test.example.com': 1,
+            })
+
+    def test_collection_fields(self):
+        # Clients can ask for a reduced set of fields.
+        json, response = call_api(
+            'http://localhost:9001/3.0/lists?fields=list_id,display_name')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json['total_size'], 1)
+        entry = json['entries'][0]
+        self.assertEqual(
+            sorted(entry),
+            ['display_name', 'http_etag', 'list_id', 'self_link'])
+        self.assertEqual(entry['list_id'], 'test.example.com')
+        self.assertEqual(entry['display_name'], 'Test')
+        self.assertEqual(
+            entry['self_link'],
+            'http://localhost:9001/3.0/lists/test.example.com')
+
+    def test_collection_member_count_field(self):
+        with transaction():
+            anne = self._usermanager.create_address('anne@example.com')
+            self._mlist.subscribe(anne)
+        json, response = call_api(
+            'http://localhost:9001/3.0/domains/example.com/lists'
+            '?fields=member_count')
+        self.assertEqual(response.status_code, 200)
+        entry = json['entries'][0]
+        self.assertEqual(
+            sorted(entry), ['http_etag', 'member_count', 'self_link'])
+        self.assertEqual(entry['member_count'], 1)
+
+    def test_collection_bogus_fields(self):
+        # Unknown fields are rejected.
+        with self.assertRaises(HTTPError) as cm:
+            call_api('http://localhost:9001/3.0/lists?fields=list_id,bogus')
+        self.assertEqual(cm.exception.code, 400)
+
     def test_query_for_lists_in_missing_domain(self):
         # You cannot ask all the mailing lists in a non-existent domain.
         with self.assertRaises(HTTPError) as cm:
@@ -777,7 +831,7 @@ class TestListTemplates(unittest.TestCase):
             json['self_link'],
             'http://localhost:9001/3.1/lists/ant.example.com/uris')
         self.assertEqual(json['entries'], [
-            {'http_etag': '"6612187ed6604ce54a57405fd66742557391ed4a"',
+            {'http_etag': '"6ed8067063d8448c74cb7a9f47da5f086015618e"',
              'name': 'list:user:notice:goodbye',
              'password': 'the password',
              'self_link': ('http://localhost:9001/3.1/lists/ant.example.com'
@@ -785,7 +839,7 @@ class TestListTemplates(unittest.TestCase):
              'uri': 'http://example.com/goodbye',
              'username': 'a user',
              },
-            {'http_etag': '"cb1ab5eee2242143d2984edd0487532915ad3a8e"',
+            {'http_etag': '"f8087328d7f0025935bf06ac2be7a451b5a0f942"',
              'name': 'list:user:notice:welcome',
              'self_link': ('http://localhost:9001/3.1/lists/ant.example.com'
                            '/uris/list:user:notice:welcome'),
@@ -918,7 +972,7 @@ class TestListTemplates(unittest.TestCase):
             '/list:user:notice:welcome')
         self.assertEqual(response.status_code, 200)
         self.assertEqual(json, {
-            'http_etag': '"36f8bef800cfd278f097c61c5892a34c0650f4aa"',
+            'http_etag': '"1f2282150ebef4de4d3289cd977edb8d74e0b527"',
             'self_link': ('http://localhost:9001/3.1/lists/ant.example.com'
                           '/uris/list:user:notice:welcome'),
             'uri': 'http://example.com/welcome',
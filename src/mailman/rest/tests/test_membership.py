@@ -300,6 +300,19 @@ class TestMembership(unittest.TestCase):
             entry_0['address'],
             'http://localhost:9001/3.0/addresses/aperson@example.com')
 
+    def test_members_pages(self):
+        # The pages of all members are sliced from the sorted members.
+        with transaction():
+            for name in ('dave', 'bart', 'elly', 'anne', 'cris'):
+                address = self._usermanager.create_address(
+                    '{}@example.com'.format(name))
+                self._mlist.subscribe(address)
+        json, response = call_api(
+            'http://localhost:9001/3.0/members?count=2&page=2')
+        self.assertEqual(json['total_size'], 5)
+        self.assertEqual([entry['email'] for entry in json['entries']],
+                         ['cris@example.com', 'dave@example.com'])
+
     def test_get_nonexistent_member(self):
         # /members/<bogus> returns 404
         with self.assertRaises(HTTPError) as cm:
@@ -19,11 +19,14 @@
 
 import unittest
 
+from email.utils import make_msgid
 from mailman.app.lifecycle import create_list
 from mailman.app.moderator import hold_message
 from mailman.database.transaction import transaction
 from mailman.interfaces.bans import IBanManager
 from mailman.interfaces.mailinglist import SubscriptionPolicy
+from mailman.interfaces.messages import IMessageStore
+from mailman.interfaces.pending import IPendings
 from mailman.interfaces.requests import IListRequests, RequestType
 from mailman.interfaces.subscriptions import ISubscriptionManager
 from mailman.interfaces.usermanager import IUserManager
@@ -31,6 +34,7 @@ from mailman.testing.helpers import (
     call_api, get_queue_messages, set_preferred,
     specialized_message_from_string as mfs)
 from mailman.testing.layers import RESTLayer
+from unittest.mock import patch
 from urllib.error import HTTPError
 from zope.component import getUtility
 
@@ -161,6 +165,146 @@ Something else.
         self.assertEqual(json['total_size'], 1)
         self.assertEqual(json['entries'][0]['request_id'], held_id)
 
+    def test_held_messages_summary(self):
+        # The held messages are listed from their summaries, without loading
+        # them from the message store.
+        with transaction():
+            held_id = hold_message(self._mlist, self._msg, reason='Because')
+        with patch.object(getUtility(IMessageStore), 'get_message_by_id',
+                          side_effect=AssertionError):
+            json, response = call_api(
+                'http://localhost:9001/3.0/lists/ant@example.com/held')
+        self.assertEqual(json['total_size'], 1)
+        entry = json['entries'][0]
+        self.assertEqual(entry['request_id'], held_id)
+        self.assertEqual(entry['excerpt'], 'Something else.')
+        self.assertEqual(entry['reason'], 'Because')
+        self.assertNotIn('msg', entry)
+        # The full message is still shown by the held message's resource.
+        json, response = call_api(entry['self_link'])
+        self.assertIn('Something else.', json['msg'])
+
+    def test_held_messages_without_summary(self):
+        # Messages held before summaries were recorded are still listed.
+        with transaction():
+            getUtility(IMessageStore).add(self._msg)
+            held_id = IListRequests(self._mlist).hold_request(
+                RequestType.held_message, '<alpha>', dict(
+                    _mod_message_id='<alpha>',
+                    _mod_sender='anne@example.com',
+                    _mod_subject='Something',
+                    _mod_reason='Because',
+                    _mod_hold_date='2005-08-01T07:49:23',
+                    ))
+        json, response = call_api(
+            'http://localhost:9001/3.0/lists/ant@example.com/held')
+        legacy = json['entries'][0]
+        self.assertEqual(legacy['request_id'], held_id)
+        self.assertEqual(legacy['subject'], 'Something')
+        self.assertEqual(legacy['excerpt'], 'Something else.')
+        self.assertNotIn('msg', legacy)
+        # The entry has the same keys as the entries of messages held with a
+        # summary.
+        with transaction():
+            del self._msg['message-id']
+            self._msg['Message-ID'] = '<beta>'
+            hold_message(self._mlist, self._msg)
+        json, response = call_api(
+            'http://localhost:9001/3.0/lists/ant@example.com/held')
+        self.assertEqual(json['total_size'], 2)
+        self.assertEqual(sorted(json['entries'][1]), sorted(legacy))
+
+    def test_held_messages_pages(self):
+        with transaction():
+            for index in range(5):
+                del self._msg['message-id']
+                self._msg['Message-ID'] = '<{}>'.format(index)
+                hold_message(self._mlist, self._msg)
+        json, response = call_api(
+            'http://localhost:9001/3.0/lists/ant@example.com/held'
+            '?count=2&page=2')
+        self.assertEqual(json['total_size'], 5)
+        self.assertEqual([entry['message_id'] for entry in json['entries']],
+                         ['<2>', '<3>'])
+
+    def _hold_messages(self):
+        request_ids = []
+        with transaction():
+            for sender in ('anne', 'bart', 'anne'):
+                del self._msg['message-id']
+                self._msg['Message-ID'] = make_msgid()
+                del self._msg['from']
+                self._msg['From'] = '{}@example.com'.format(sender)
+                request_ids.append(hold_message(self._mlist, self._msg))
+        return request_ids
+
+    def test_bulk_moderation_by_id(self):
+        request_ids = self._hold_messages()
+        json, response = call_api(
+            'http://localhost:9001/3.0/lists/ant@example.com/held', dict(
+                action='discard',
+                request_id=[request_ids[0], request_ids[2], 801],
+                ))
+        self.assertEqual(json['handled'], 2)
+        self.assertEqual(json['skipped'], [801])
+        self.assertEqual(
+            [request.id for request in
+             IListRequests(self._mlist).of_type(RequestType.held_message)],
+            request_ids[1:2])
+
+    def test_bulk_moderation_by_sender(self):
+        request_ids = self._hold_messages()
+        json, response = call_api(
+            'http://localhost:9001/3.0/lists/ant@example.com/held', dict(
+                action='reject',
+                sender='anne@example.com',
+                comment='Enough',
+                ))
+        self.assertEqual(json['handled'], 2)
+        self.assertEqual(json['skipped'], [])
+        items = get_queue_messages('virgin', expected_count=2)
+        self.assertIn('Enough', items[0].msg.get_payload())
+        self.assertEqual(
+            [request.id for request in
+             IListRequests(self._mlist).of_type(RequestType.held_message)],
+            request_ids[1:2])
+
+    def test_bulk_moderation_all(self):
+        self._hold_messages()
+        json, response = call_api(
+            'http://localhost:9001/3.0/lists/ant@example.com/held', dict(
+                action='discard',
+                all=True,
+                ))
+        self.assertEqual(json['handled'], 3)
+        self.assertEqual(IListRequests(self._mlist).count, 0)
+
+    def test_bulk_moderation_without_selection(self):
+        # Held messages must be selected explicitly.
+        self._hold_messages()
+        with self.assertRaises(HTTPError) as cm:
+            call_api('http://localhost:9001/3.0/lists/ant@example.com/held',
+                     dict(action='discard'))
+        self.assertEqual(cm.exception.code, 400)
+        self.assertEqual(cm.exception.reason, 'No held messages selected')
+        self.assertEqual(IListRequests(self._mlist).count, 3)
+
+    def test_bulk_moderation_ids_and_filter(self):
+        with self.assertRaises(HTTPError) as cm:
+            call_api('http://localhost:9001/3.0/lists/ant@example.com/held',
+                     dict(action='discard', request_id=1, all=True))
+        self.assertEqual(cm.exception.code, 400)
+        self.assertEqual(cm.exception.reason,
+                         'request_id cannot be combined with a filter')
+
+    def test_bulk_moderation_bad_id(self):
+        with self.assertRaises(HTTPError) as cm:
+            call_api('http://localhost:9001/3.0/lists/ant@example.com/held',
+                     dict(action='discard', request_id='bogus'))
+        self.assertEqual(cm.exception.code, 400)
+        self.assertEqual(cm.exception.reason,
+                         'Cannot convert parameters: request_id')
+
 
 class TestSubscriptionModeration(unittest.TestCase):
     layer = RESTLayer
@@ -225,6 +369,20 @@ class TestSubscriptionModeration(unittest.TestCase):
         emails = set(entry['email'] for entry in json['entries'])
         self.assertEqual(emails, {'anne@example.com', 'bart@example.com'})
 
+    def test_list_held_requests_pages(self):
+        # The held requests are paged in the order they were made.
+        with transaction():
+            token_1, token_owner, member = self._registrar.register(self._anne)
+            token_2, token_owner, member = self._registrar.register(self._bart)
+        json, response = call_api(
+            'http://localhost:9001/3.0/lists/ant@example.com/requests'
+            '?count=1&page=2')
+        self.assertEqual(json['total_size'], 2)
+        self.assertEqual(json['start'], 1)
+        self.assertEqual(len(json['entries']), 1)
+        self.assertEqual(json['entries'][0]['token'], token_2)
+        self.assertEqual(json['entries'][0]['email'], 'bart@example.com')
+
     def test_individual_request(self):
         # We can view an individual request.
         with transaction():
@@ -284,6 +442,19 @@ class TestSubscriptionModeration(unittest.TestCase):
                      dict(action='accept'))
         self.assertEqual(cm.exception.code, 404)
 
+    def test_cant_moderate_other_lists_requests(self):
+        # A subscription request can only be moderated through its own list.
+        with transaction():
+            create_list('bee@example.com')
+            token, token_owner, member = self._registrar.register(self._anne)
+        with self.assertRaises(HTTPError) as cm:
+            call_api('http://localhost:9001/3.0/lists/bee@example.com'
+                     '/requests/{}'.format(token),
+                     dict(action='discard'))
+        self.assertEqual(cm.exception.code, 404)
+        self.assertIsNotNone(
+            getUtility(IPendings).confirm(token, expunge=False))
+
     def test_accept_by_moderator_clears_request_queue(self):
         # After accepting a message held for moderator approval, there are no
         # more requests to handle.
@@ -464,3 +635,41 @@ class TestSubscriptionModeration(unittest.TestCase):
                 })
         self.assertEqual(cm.exception.code, 400)
         self.assertEqual(cm.exception.reason, 'Membership is banned')
+
+    def test_bulk_moderation(self):
+        # Many requests are handled with a single POST to the collection.
+        with transaction():
+            token_1, token_owner, member = self._registrar.register(self._anne)
+            token_2, token_owner, member = self._registrar.register(self._bart)
+        json, response = call_api(
+            'http://localhost:9001/3.0/lists/ant@example.com/requests', dict(
+                action='accept',
+                token=[token_1, token_2, 'missing'],
+                ))
+        self.assertEqual(json['handled'], 2)
+        self.assertEqual(json['skipped'], ['missing'])
+        emails = sorted(member.address.email
+                        for member in self._mlist.members.members)
+        self.assertEqual(emails, ['anne@example.com', 'bart@example.com'])
+
+    def test_bulk_moderation_by_email(self):
+        with transaction():
+            token_1, token_owner, member = self._registrar.register(self._anne)
+            token_2, token_owner, member = self._registrar.register(self._bart)
+        json, response = call_api(
+            'http://localhost:9001/3.0/lists/ant@example.com/requests', dict(
+                action='discard',
+                email='bart@example.com',
+                ))
+        self.assertEqual(json['handled'], 1)
+        json, response = call_api(
+            'http://localhost:9001/3.0/lists/ant@example.com/requests')
+        self.assertEqual([entry['token'] for entry in json['entries']],
+                         [token_1])
+
+    def test_bulk_moderation_without_selection(self):
+        with self.assertRaises(HTTPError) as cm:
+            call_api('http://localhost:9001/3.0/lists/ant@example.com/'
+                     'requests', dict(action='discard'))
+        self.assertEqual(cm.exception.code, 400)
+        self.assertEqual(cm.exception.reason, 'No requests selected')
@@ -141,6 +141,24 @@ class TestRoot(unittest.TestCase):
         json, response = call_api('http://localhost:9001/3.0/system/chains')
         self.assertEqual(json['chains'], sorted(config.chains))
 
+    def test_system_metrics(self):
+        # The metrics are in the Prometheus text format, not JSON.
+        response = requests.get(
+            'http://localhost:9001/3.0/system/metrics',
+            auth=(config.webservice.admin_user,
+                  config.webservice.admin_pass))
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(
+            response.headers['content-type'].startswith('text/plain'))
+        lines = response.text.splitlines()
+        self.assertIn('# TYPE mailman_queue_depth gauge', lines)
+        self.assertIn('mailman_queue_depth{queue="in"} 0', lines)
+
+    def test_system_metrics_bad_request(self):
+        with self.assertRaises(HTTPError) as cm:
+            call_api('http://localhost:9001/3.0/system/metrics/bogus')
+        self.assertEqual(cm.exception.code, 400)
+
     def test_system_chains_bad_request(self):
         with self.assertRaises(HTTPError) as cm:
             call_api('http://localhost:9001/3.0/system/chains/bogus')
@@ -199,7 +217,7 @@ class TestSiteTemplates(unittest.TestCase):
             json['self_link'],
             'http://localhost:9001/3.1/uris')
         self.assertEqual(json['entries'], [
-            {'http_etag': '"063fd6635a6035a4b7e939a304fcbd16571aa662"',
+            {'http_etag': '"9526babc951266ae0dba902f8347af3d892f09e8"',
              'name': 'list:user:notice:goodbye',
              'password': 'the password',
              'self_link': ('http://localhost:9001/3.1'
@@ -207,7 +225,7 @@ class TestSiteTemplates(unittest.TestCase):
              'uri': 'http://example.com/goodbye',
              'username': 'a user',
              },
-            {'http_etag': '"5c4ec63b2a0a50f96483ec85b94b80ee092af792"',
+            {'http_etag': '"fdfc399109db884f2d8db331d1718cb9674b5949"',
              'name': 'list:user:notice:welcome',
              'self_link': ('http://localhost:9001/3.1'
                            '/uris/list:user:notice:welcome'),
@@ -338,7 +356,7 @@ class TestSiteTemplates(unittest.TestCase):
             'http://localhost:9001/3.1/uris/list:user:notice:welcome')
         self.assertEqual(response.status_code, 200)
         self.assertEqual(json, {
-            'http_etag': '"86e360d83197561d50826ad6d15e9c30923b82d6"',
+            'http_etag': '"9cd96b6ac60ef42cde7496ec4e91c86a645f415e"',
             'self_link': ('http://localhost:9001/3.1'
                           '/uris/list:user:notice:welcome'),
             'uri': 'http://example.com/welcome',
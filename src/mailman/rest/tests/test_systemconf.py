@@ -40,8 +40,13 @@ class TestSystemConfiguration(unittest.TestCase):
             cache_life='7d',
             default_language='en',
             email_commands_max_lines='10',
+            eviction_batch_size='1000',
             filtered_messages_are_preservable='no',
             html_to_plain_text_command='/usr/bin/lynx -dump $filename',
+            html_to_plain_text_converter=                         # noqa: E251
+                'mailman.utilities.html.CommandConverter',
+            html_to_plain_text_worker_command='',
+            html_to_plain_text_workers='1',
             layout='testing',
             listname_chars='[-_.0-9a-z]',
             noreply_address='noreply',
@@ -173,8 +178,11 @@ class TestSystemConfiguration(unittest.TestCase):
             'logging.runner',
             'logging.smtp',
             'logging.subscribe',
+            'logging.task',
             'logging.vette',
             'mailman',
+            'messagestore',
+            'metrics',
             'mta',
             'nntp',
             'passwords',
@@ -197,9 +205,11 @@ class TestSystemConfiguration(unittest.TestCase):
             'runner.rest',
             'runner.retry',
             'runner.shunt',
+            'runner.task',
             'runner.virgin',
             'shell',
             'styles',
+            'tracing',
             'webservice',
             ])
 
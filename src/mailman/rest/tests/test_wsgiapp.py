@@ -0,0 +1,205 @@
+# Copyright (C) 2019 by the Free Software Foundation, Inc.
+#
+# This file is part of GNU Mailman.
+#
+# GNU Mailman is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free
+# Software Foundation, either version 3 of the License, or (at your option)
+# any later version.
+#
+# GNU Mailman is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General Public License for
+# more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# GNU Mailman.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Test conditional requests and the REST response cache."""
+
+import json
+import requests
+import unittest
+
+from base64 import b64encode
+from mailman.app.lifecycle import create_list
+from mailman.config import config
+from mailman.database.transaction import transaction
+from mailman.rest.cache import response_cache
+from mailman.testing.helpers import configuration
+from mailman.testing.layers import ConfigLayer, RESTLayer
+from mailman.utilities.datetime import factory
+from wsgiref.util import setup_testing_defaults
+
+
+class TestConditionalRequests(unittest.TestCase):
+    layer = RESTLayer
+
+    def setUp(self):
+        with transaction():
+            self._mlist = create_list('ant@example.com')
+        self._auth = (config.webservice.admin_user,
+                      config.webservice.admin_pass)
+
+    def _get(self, url, etag=None):
+        headers = {}
+        if etag is not None:
+            headers['If-None-Match'] = etag
+        return requests.get(url, auth=self._auth, headers=headers)
+
+    def test_etag_header(self):
+        # The ETag header of resources and collections is their http_etag.
+        for url in ('http://localhost:9001/3.0/lists',
+                    'http://localhost:9001/3.0/lists/ant.example.com',
+                    'http://localhost:9001/3.0/lists/ant.example.com/config'):
+            response = self._get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.headers['etag'],
+                             response.json()['http_etag'])
+
+    def test_not_modified(self):
+        url = 'http://localhost:9001/3.0/lists'
+        etag = self._get(url).headers['etag']
+        response = self._get(url, etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+        self.assertEqual(response.headers['etag'], etag)
+        # Any of a list of etags may match.
+        response = self._get(url, '"bogus", {}'.format(etag))
+        self.assertEqual(response.status_code, 304)
+        response = self._get(url, '*')
+        self.assertEqual(response.status_code, 304)
+
+    def test_modified(self):
+        url = 'http://localhost:9001/3.0/lists/ant.example.com'
+        etag = self._get(url).headers['etag']
+        with transaction():
+            self._mlist.display_name = 'Aardvark'
+        response = self._get(url, etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['display_name'], 'Aardvark')
+        self.assertNotEqual(response.headers['etag'], etag)
+
+
+class TestResponseCache(unittest.TestCase):
+    layer = ConfigLayer
+
+    def setUp(self):
+        # The REST resources can only be imported after Mailman has been
+        # initialized.
+        from mailman.rest.wsgiapp import make_application
+        self._app = make_application()
+        self._mlist = create_list('ant@example.com')
+        self.addCleanup(response_cache.clear)
+
+    def _call(self, path, method='GET', etag=None, password=None):
+        if password is None:
+            password = config.webservice.admin_pass
+        credentials = '{}:{}'.format(config.webservice.admin_user, password)
+        path, delimiter, query = path.partition('?')
+        environ = dict(
+            PATH_INFO=path,
+            QUERY_STRING=query,
+            REQUEST_METHOD=method,
+            HTTP_AUTHORIZATION='Basic {}'.format(
+                b64encode(credentials.encode('utf-8')).decode('ascii')),
+            )
+        if etag is not None:
+            environ['HTTP_IF_NONE_MATCH'] = etag
+        setup_testing_defaults(environ)
+        status = []
+
+        def start_response(code, headers):
+            status.append((code, {
+                name.lower(): value for name, value in headers}))
+
+        body = b''.join(self._app(environ, start_response))
+        code, headers = status[0]
+        return code, headers, body
+
+    def _display_name(self, body):
+        return json.loads(body.decode('utf-8'))['display_name']
+
+    def test_disabled_by_default(self):
+        self.assertFalse(response_cache.enabled)
+        self._call('/3.0/lists/ant.example.com')
+        self.assertEqual(len(response_cache), 0)
+
+    @configuration('webservice', response_cache_lifetime='1h')
+    def test_cached(self):
+        code, headers, body = self._call('/3.0/lists/ant.example.com')
+        self.assertEqual(code, '200 OK')
+        self.assertEqual(len(response_cache), 1)
+        # Changing the list behind the REST API's back isn't noticed.
+        self._mlist.display_name = 'Aardvark'
+        code, cached_headers, cached_body = self._call(
+            '/3.0/lists/ant.example.com')
+        self.assertEqual(code, '200 OK')
+        self.assertEqual(cached_body, body)
+        self.assertEqual(cached_headers['etag'], headers['etag'])
+        self.assertEqual(self._display_name(cached_body), 'Ant')
+        # The query string is part of the cache key.
+        code, headers, body = self._call(
+            '/3.0/lists/ant.example.com?x=1')
+        self.assertEqual(self._display_name(body), 'Aardvark')
+
+    @configuration('webservice', response_cache_lifetime='1h')
+    def test_cached_collection(self):
+        code, headers, body = self._call('/3.0/lists')
+        self.assertEqual(len(response_cache), 1)
+        code, cached_headers, cached_body = self._call('/3.0/lists')
+        self.assertEqual(cached_body, body)
+        self.assertEqual(json.loads(body.decode('utf-8'))['total_size'], 1)
+
+    @configuration('webservice', response_cache_lifetime='1h')
+    def test_cached_not_modified(self):
+        code, headers, body = self._call('/3.0/lists/ant.example.com')
+        code, headers, body = self._call(
+            '/3.0/lists/ant.example.com', etag=headers['etag'])
+        self.assertEqual(code, '304 Not Modified')
+        self.assertEqual(body, b'')
+
+    @configuration('webservice', response_cache_lifetime='1h')
+    def test_unauthorized(self):
+        self._call('/3.0/lists/ant.example.com')
+        code, headers, body = self._call(
+            '/3.0/lists/ant.example.com', password='bogus')
+        self.assertEqual(code, '401 Unauthorized')
+
+    @configuration('webservice', response_cache_lifetime='1h')
+    def test_expired(self):
+        self._call('/3.0/lists/ant.example.com')
+        self._mlist.display_name = 'Aardvark'
+        factory.fast_forward(days=1)
+        self.addCleanup(factory.reset)
+        code, headers, body = self._call('/3.0/lists/ant.example.com')
+        self.assertEqual(self._display_name(body), 'Aardvark')
+
+    @configuration('webservice', response_cache_lifetime='1h')
+    def test_invalidated_by_events(self):
+        self._call('/3.0/lists/ant.example.com')
+        self._mlist.display_name = 'Aardvark'
+        # Creating a list invalidates the cache.
+        create_list('bee@example.com')
+        self.assertEqual(len(response_cache), 0)
+        code, headers, body = self._call('/3.0/lists/ant.example.com')
+        self.assertEqual(self._display_name(body), 'Aardvark')
+
+    @configuration('webservice', response_cache_lifetime='1h')
+    def test_invalidated_by_writes(self):
+        self._call('/3.0/lists/ant.example.com')
+        self.assertEqual(len(response_cache), 1)
+        self._call('/3.0/lists/bee.example.com', method='DELETE')
+        self.assertEqual(len(response_cache), 0)
+
+    @configuration('webservice', response_cache_lifetime='1h',
+                   response_cache_size='2')
+    def test_size(self):
+        create_list('bee@example.com')
+        create_list('cat@example.com')
+        self._call('/3.0/lists/ant.example.com')
+        self._call('/3.0/lists/bee.example.com')
+        self._call('/3.0/lists/cat.example.com')
+        self.assertEqual(len(response_cache), 2)
+        self.assertIsNone(response_cache.get('/3.0/lists/ant.example.com'))
+        self.assertIsNotNone(response_cache.get('/3.0/lists/cat.example.com'))
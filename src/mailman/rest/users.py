@@ -152,8 +152,7 @@ class AllUsers(_UserBase):
 
     def on_get(self, request, response):
         """/users"""
-        resource = self._make_collection(request)
-        okay(response, etag(resource))
+        self._send_collection(request, response)
 
     def on_post(self, request, response):
         """Create a new user."""
@@ -109,6 +109,12 @@ def list_of_strings_validator(values):
     return values
 
 
+@public
+def list_of_integers_validator(values):
+    """Turn a list of things, or a single thing, into a list of integers."""
+    return [int(value) for value in list_of_strings_validator(values)]
+
+
 @public
 def list_of_emails_validator(values):
     """Turn a list of things, or a single thing, into a list of emails."""
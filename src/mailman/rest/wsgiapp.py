@@ -21,10 +21,12 @@ import re
 import logging
 
 from base64 import b64decode
-from falcon import API, HTTPUnauthorized
+from falcon import (
+    API, HTTPStatus, HTTPUnauthorized, HTTP_200, HTTP_304)
 from falcon.routing import create_http_method_map
 from mailman.config import config
 from mailman.database.transaction import transactional
+from mailman.rest.cache import response_cache
 from mailman.rest.root import Root
 from public import public
 from wsgiref.simple_server import (
@@ -81,21 +83,41 @@ class AdminWebServiceWSGIRequestHandler(WSGIRequestHandler):
 class Middleware:
     """Falcon middleware object for Mailman's REST API.
 
-    This does two things.  It sets the API version on the resource
-    object, and it verifies that the proper authentication has been
-    performed.
+    This verifies that the proper authentication has been performed.  It
+    also answers conditional GET requests for unchanged resources with a 304
+    Not Modified, and serves and populates the response cache.
     """
-    def process_resource(self, request, response, resource, params):
+    def _authorized(self, request):
         # Check the authorization credentials.
-        authorized = False
-        if request.auth is not None and request.auth.startswith('Basic '):
-            # b64decode() returns bytes, but we require a str.
-            credentials = b64decode(request.auth[6:]).decode('utf-8')
-            username, password = credentials.split(':', 1)
-            if (username == config.webservice.admin_user and
-                    password == config.webservice.admin_pass):
-                authorized = True
-        if not authorized:
+        if request.auth is None or not request.auth.startswith('Basic '):
+            return False
+        # b64decode() returns bytes, but we require a str.
+        credentials = b64decode(request.auth[6:]).decode('utf-8')
+        username, password = credentials.split(':', 1)
+        return (username == config.webservice.admin_user and
+                password == config.webservice.admin_pass)
+
+    def _not_modified(self, request, etag):
+        # Does the client already have the current version of the resource?
+        if request.if_none_match is None:
+            return False
+        tags = [tag.strip() for tag in request.if_none_match.split(',')]
+        return '*' in tags or etag in tags
+
+    def process_request(self, request, response):
+        if request.method != 'GET' or not response_cache.enabled:
+            return
+        cached = response_cache.get(request.relative_uri)
+        if cached is not None and self._authorized(request):
+            # Falcon skips process_response() when process_request() raises
+            # an exception, so conditional requests are handled here.
+            body, etag = cached
+            if self._not_modified(request, etag):
+                raise HTTPStatus(HTTP_304, headers=dict(ETag=etag))
+            raise HTTPStatus(HTTP_200, headers=dict(ETag=etag), body=body)
+
+    def process_resource(self, request, response, resource, params):
+        if not self._authorized(request):
             # Not authorized.
             realm = 'Basic realm="{}",charset="{}"'.format(REALM, UTF8)
             raise HTTPUnauthorized(
@@ -103,6 +125,27 @@ class Middleware:
                 'REST API authorization failed',
                 challenges=[realm])
 
+    def process_response(self, request, response, resource, req_succeeded):
+        if request.method not in ('GET', 'HEAD'):
+            # Anything could have changed.
+            response_cache.clear()
+            return
+        if response.status != HTTP_200 or response.etag is None:
+            return
+        if (request.method == 'GET' and req_succeeded and
+                response_cache.enabled):
+            body = response.body
+            if body is None:
+                body = b''.join(response.stream)
+                response.set_stream([body], len(body))
+            elif isinstance(body, str):
+                body = body.encode('utf-8')
+            response_cache.put(request.relative_uri, body, response.etag)
+        if self._not_modified(request, response.etag):
+            response.status = HTTP_304
+            response.body = None
+            response.stream = None
+
 
 class ObjectRouter:
     def __init__(self, root):
@@ -19,7 +19,6 @@
 
 import re
 
-from contextlib import suppress
 from email.utils import getaddresses
 from mailman.core.i18n import _
 from mailman.interfaces.mailinglist import IAcceptableAliasSet
@@ -28,6 +27,37 @@ from public import public
 from zope.interface import implementer
 
 
+class _AliasMatcher:
+    """The compiled acceptable aliases of a mailing list."""
+
+    def __init__(self, aliases):
+        # If the alias starts with a caret (i.e. ^), then it's a regular
+        # expression to match against.
+        self.aliases = set()
+        self.patterns = []
+        for alias in aliases:
+            if not alias.startswith('^'):
+                self.aliases.add(alias)
+                continue
+            try:
+                pattern = re.compile(alias, re.IGNORECASE)
+            except re.error:
+                # The pattern is a malformed regular expression.  Match it
+                # literally instead.
+                pattern = re.compile(re.escape(alias), re.IGNORECASE)
+            self.patterns.append(pattern)
+
+    def matches(self, recipients):
+        """Does any of the recipients match an acceptable alias?"""
+        if not self.aliases.isdisjoint(recipients):
+            return True
+        for pattern in self.patterns:
+            for recipient in recipients:
+                if pattern.match(recipient):
+                    return True
+        return False
+
+
 @public
 @implementer(IRule)
 class ImplicitDestination:
@@ -37,6 +67,25 @@ class ImplicitDestination:
     description = _('Catch messages with implicit destination.')
     record = True
 
+    def __init__(self):
+        # Map list ids to the key the matcher was compiled for and the
+        # matcher.  The key changes whenever the list's acceptable aliases
+        # change, or the list is deleted and created again.
+        self._matchers = {}
+
+    def _matcher(self, mlist):
+        alias_set = IAcceptableAliasSet(mlist)
+        key = (mlist.id, mlist.created_at, alias_set.serial)
+        cached_key, matcher = self._matchers.get(mlist.list_id, (None, None))
+        if cached_key != key:
+            matcher = _AliasMatcher(alias_set.aliases)
+            self._matchers[mlist.list_id] = (key, matcher)
+        return matcher
+
+    def flush(self):
+        """Forget the compiled aliases of all mailing lists."""
+        self._matchers.clear()
+
     def check(self, mlist, msg, msgdata):
         """See `IRule`."""
         # Implicit destination checking must be enabled in the mailing list.
@@ -46,47 +95,21 @@ class ImplicitDestination:
         # are never checked.
         if msgdata.get('fromusenet'):
             return False
-        # Calculate the list of acceptable aliases.  If the alias starts with
-        # a caret (i.e. ^), then it's a regular expression to match against.
-        aliases = set()
-        alias_patterns = set()
-        # Adapt the mailing list to the appropriate interface.
-        alias_set = IAcceptableAliasSet(mlist)
-        for alias in alias_set.aliases:
-            if alias.startswith('^'):
-                alias_patterns.add(alias)
-            else:
-                aliases.add(alias)
-        # Add the list's posting address, i.e. the explicit address, to the
-        # set of acceptable aliases.
-        aliases.add(mlist.posting_address)
-        # Look at all the recipients.  If the recipient is any acceptable
-        # alias (or the explicit posting address), then this rule does not
-        # match.  If not, then add it to the set of recipients we'll check
-        # against the alias patterns later.
+        # Look at all the recipients.  If the recipient is the list's posting
+        # address, i.e. the explicit address, or any acceptable alias, then
+        # this rule does not match.
+        posting_address = mlist.posting_address
         recipients = set()
         for header in ('to', 'cc', 'resent-to', 'resent-cc'):
             for fullname, address in getaddresses(msg.get_all(header, [])):
                 if isinstance(address, bytes):
                     address = address.decode('ascii')
                 address = address.lower()
-                if address in aliases:
+                if address == posting_address:
                     return False
                 recipients.add(address)
-        # Now for all alias patterns, see if any of the recipients matches a
-        # pattern.  If so, then this rule does not match.
-        for pattern in alias_patterns:
-            escaped = re.escape(pattern)
-            for recipient in recipients:
-                try:
-                    if re.match(pattern, recipient, re.IGNORECASE):
-                        return False
-                except re.error:
-                    # The pattern is a malformed regular expression.  Try
-                    # matching again with the pattern escaped.
-                    with suppress(re.error):
-                        if re.match(escaped, recipient, re.IGNORECASE):
-                            return False
+        if self._matcher(mlist).matches(recipients):
+            return False
         # Nothing matched.
         msgdata['moderation_sender'] = msg.sender
         with _.defer_translation():
@@ -20,6 +20,7 @@
 import unittest
 
 from mailman.app.lifecycle import create_list
+from mailman.interfaces.mailinglist import IAcceptableAliasSet
 from mailman.rules import implicit_dest
 from mailman.testing.helpers import specialized_message_from_string as mfs
 from mailman.testing.layers import ConfigLayer
@@ -49,3 +50,46 @@ A message body.
         self.assertTrue(result)
         self.assertEqual(msgdata['moderation_reasons'],
                          ['Message has implicit destination'])
+
+    def _check(self, rule, recipient):
+        msg = mfs("""\
+From: anne@example.com
+To: {}
+Message-ID: <ant>
+
+A message body.
+""".format(recipient))
+        return rule.check(self._mlist, msg, {})
+
+    def test_posting_address(self):
+        rule = implicit_dest.ImplicitDestination()
+        self.assertFalse(self._check(rule, 'Test@example.com'))
+
+    def test_alias_patterns(self):
+        alias_set = IAcceptableAliasSet(self._mlist)
+        alias_set.add('bee@example.com')
+        alias_set.add('^.*@example.org')
+        # This is a malformed regular expression, which is matched literally.
+        alias_set.add('^*cat@example.com')
+        rule = implicit_dest.ImplicitDestination()
+        self.assertFalse(self._check(rule, 'BEE@example.com'))
+        self.assertFalse(self._check(rule, 'anne@EXAMPLE.org'))
+        self.assertFalse(self._check(rule, '^*cat@example.com'))
+        self.assertTrue(self._check(rule, 'cat@example.com'))
+
+    def test_matcher_is_cached(self):
+        # The aliases are only compiled again when they change.
+        alias_set = IAcceptableAliasSet(self._mlist)
+        alias_set.add('bee@example.com')
+        rule = implicit_dest.ImplicitDestination()
+        self.assertFalse(self._check(rule, 'bee@example.com'))
+        matcher = rule._matcher(self._mlist)
+        self.assertFalse(self._check(rule, 'bee@example.com'))
+        self.assertIs(rule._matcher(self._mlist), matcher)
+        alias_set.remove('bee@example.com')
+        self.assertTrue(self._check(rule, 'bee@example.com'))
+        self.assertIsNot(rule._matcher(self._mlist), matcher)
+        alias_set.add('^bee@.*')
+        self.assertFalse(self._check(rule, 'bee@example.com'))
+        alias_set.clear()
+        self.assertTrue(self._check(rule, 'bee@example.com'))
@@ -20,9 +20,13 @@
 import logging
 
 from flufl.bounce import all_failures, scan_message
-from mailman.app.bounces import ProbeVERP, StandardVERP, maybe_forward
+from lazr.config import as_timedelta
+from mailman.app.bounces import (
+    ProbeVERP, StandardVERP, maybe_forward, process_bounces)
+from mailman.config import config
 from mailman.core.runner import Runner
 from mailman.interfaces.bounce import BounceContext, IBounceProcessor
+from mailman.utilities.datetime import now
 from public import public
 from zope.component import getUtility
 
@@ -40,6 +44,20 @@ class BounceRunner(Runner):
     def __init__(self, name, slice=None):
         super().__init__(name, slice)
         self._processor = getUtility(IBounceProcessor)
+        self._interval = as_timedelta(config.bounces.register_bounces_every)
+        # Score the events left over from the previous run right away.
+        self._next_processing = now()
+
+    def _do_periodic(self):
+        if now() < self._next_processing:
+            return
+        self._next_processing = now() + self._interval
+        try:
+            process_bounces()
+            config.db.commit()
+        except Exception:
+            elog.exception('Bounce processing failed')
+            config.db.abort()
 
     def _dispose(self, mlist, msg, msgdata):
         # List isn't doing bounce processing?
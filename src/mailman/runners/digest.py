@@ -32,7 +32,7 @@ from mailman.core.i18n import _
 from mailman.core.runner import Runner
 from mailman.email.message import Message, MultipartDigestMessage
 from mailman.handlers.decorate import decorate
-from mailman.interfaces.member import DeliveryMode, DeliveryStatus
+from mailman.interfaces.member import DeliveryMode
 from mailman.interfaces.template import ITemplateLoader
 from mailman.utilities.mailbox import Mailbox
 from mailman.utilities.string import expand, oneline, wrap
@@ -328,24 +328,19 @@ class DigestRunner(Runner):
         rfc1153_recipients = set()
         # When someone turns off digest delivery, they will get one last
         # digest to ensure that there will be no gaps in the messages they
-        # receive.
-        digest_members = set(mlist.digest_members.members)
-        for member in digest_members:
-            if member.delivery_status is not DeliveryStatus.enabled:
-                continue
-            # Send the digest to the case-preserved address of the digest
-            # members.
-            email_address = member.address.original_email
-            if member.delivery_mode == DeliveryMode.plaintext_digests:
+        # receive.  The digest roster resolves the case-preserved address and
+        # effective delivery mode of every enabled digest member in one query.
+        for email_address, delivery_mode in mlist.digest_members.recipients:
+            if delivery_mode == DeliveryMode.plaintext_digests:
                 rfc1153_recipients.add(email_address)
             # We currently treat summary_digests the same as mime_digests.
-            elif member.delivery_mode in (DeliveryMode.mime_digests,
-                                          DeliveryMode.summary_digests):
+            elif delivery_mode in (DeliveryMode.mime_digests,
+                                   DeliveryMode.summary_digests):
                 mime_recipients.add(email_address)
             else:
                 raise AssertionError(
                     'Digest member "{}" unexpected delivery mode: {}'.format(
-                        email_address, member.delivery_mode))
+                        email_address, delivery_mode))
         # Add also the folks who are receiving one last digest.
         for address, delivery_mode in mlist.last_digest_recipients:
             if delivery_mode == DeliveryMode.plaintext_digests:
@@ -34,7 +34,6 @@ so that the peer mail server can provide better diagnostics.
     http://www.faqs.org/rfcs/rfc2033.html
 """
 
-import email
 import asyncio
 import logging
 
@@ -42,10 +41,11 @@ from aiosmtpd.controller import Controller
 from aiosmtpd.lmtp import LMTP
 from contextlib import suppress
 from email.utils import parseaddr
+from lazr.config import as_boolean
 from mailman.config import config
 from mailman.core.runner import Runner
 from mailman.database.transaction import transactional
-from mailman.email.message import Message
+from mailman.email.message import LazyMessage
 from mailman.interfaces.domain import IDomainManager
 from mailman.interfaces.listmanager import IListManager
 from mailman.interfaces.runner import RunnerInterrupt
@@ -135,8 +135,12 @@ class LMTPHandler:
             # since the set of mailing lists could have changed.
             listnames = set(getUtility(IListManager).names)
             # Parse the message data.  If there are any defects in the
-            # message, reject it right away; it's probably spam.
-            msg = email.message_from_bytes(envelope.content, Message)
+            # message, reject it right away; it's probably spam.  The body is
+            # only parsed when it is needed, unless its defects are rejected
+            # too.
+            msg = LazyMessage.from_bytes(envelope.content)
+            if as_boolean(config.mta.lmtp_reject_mime_defects):
+                msg.parse()
         except Exception:
             elog.exception('LMTP message parsing')
             config.db.abort()
@@ -18,12 +18,15 @@
 """NNTP runner."""
 
 import re
+import time
 import email
 import socket
 import logging
 import nntplib
 
-from io import StringIO
+from contextlib import suppress
+from io import BytesIO
+from lazr.config import as_timedelta
 from mailman.config import config
 from mailman.core.runner import Runner
 from mailman.interfaces.nntp import NewsgroupModeration
@@ -49,12 +52,136 @@ mcre = re.compile(r"""
     """, re.VERBOSE)
 
 
+def _connection_lost(error):
+    # A 400 response means that the server is closing the connection, e.g.
+    # because it was idle for too long.
+    if isinstance(error, nntplib.NNTPTemporaryError):
+        return error.response.startswith('400')
+    return isinstance(error, (OSError, EOFError, nntplib.NNTPProtocolError))
+
+
 @public
-class NNTPRunner(Runner):
-    def _dispose(self, mlist, msg, msgdata):
-        # Get NNTP server connection information.
-        host = config.nntp.host.strip()
-        port = config.nntp.port.strip()
+class NNTPConnection:
+    """A reusable connection to an NNTP server."""
+
+    def __init__(self, host, port, user, password, idle_timeout,
+                 posts_per_connection):
+        """Create a connection manager.
+
+        :param host: The host name of the NNTP server.
+        :type host: str
+        :param port: The port number of the NNTP server.
+        :type port: int
+        :param user: The user name to authenticate with, or the empty string.
+        :type user: str
+        :param password: The password to authenticate with.
+        :type password: str
+        :param idle_timeout: The number of seconds a connection may be idle
+            before it is closed.  With zero, the connection is closed after
+            every post.
+        :type idle_timeout: float
+        :param posts_per_connection: The number of articles posted over a
+            connection before it is closed, or zero for no limit.
+        :type posts_per_connection: int
+        """
+        self._host = host
+        self._port = port
+        self._user = user
+        self._password = password
+        self._idle_timeout = idle_timeout
+        self._posts_per_connection = posts_per_connection
+        self._connection = None
+        self._post_count = 0
+        self._last_used = None
+
+    @property
+    def connected(self):
+        return self._connection is not None
+
+    @property
+    def idle(self):
+        """Whether the connection is open and has been idle for too long."""
+        return (self._connection is not None and
+                time.monotonic() - self._last_used >= self._idle_timeout)
+
+    def _connect(self):
+        self._connection = nntplib.NNTP(
+            self._host, self._port,
+            readermode=True, user=self._user, password=self._password)
+        self._post_count = 0
+        self._last_used = time.monotonic()
+
+    def _post(self, fp):
+        try:
+            self._connection.post(fp)
+        finally:
+            self._last_used = time.monotonic()
+        self._post_count += 1
+
+    def post(self, fp):
+        """Post an article.
+
+        The connection is opened if needed.  When a reused connection turns
+        out to be lost, it is reopened and the article is posted again.
+
+        :param fp: The article.
+        :type fp: A seekable file-like object.
+        """
+        if self.idle:
+            self.quit()
+        reused = self.connected
+        if not reused:
+            self._connect()
+        try:
+            try:
+                self._post(fp)
+            except Exception as error:
+                if not reused or not _connection_lost(error):
+                    raise
+                self.quit()
+                log.info('Reconnecting to the NNTP server: %s', error)
+                fp.seek(0)
+                self._connect()
+                self._post(fp)
+        except (nntplib.NNTPTemporaryError,
+                nntplib.NNTPPermanentError) as error:
+            # Unless the server is closing the connection, it refused the
+            # article but the connection can be used for the next one.
+            if self._idle_timeout <= 0 or _connection_lost(error):
+                self.quit()
+            raise
+        except Exception:
+            self.quit()
+            raise
+        if (self._idle_timeout <= 0 or
+                self._post_count == self._posts_per_connection):
+            self.quit()
+
+    def quit(self):
+        """Close the connection."""
+        if self._connection is None:
+            return
+        connection, self._connection = self._connection, None
+        with suppress(nntplib.NNTPError, OSError, EOFError):
+            connection.quit()
+
+
+@public
+class NNTPConnectionPool:
+    """The open NNTP connections, one per server and user."""
+
+    def __init__(self):
+        self._connections = {}
+
+    def get(self):
+        """Return the connection to the configured NNTP server.
+
+        :return: The connection.
+        :rtype: `NNTPConnection`
+        """
+        section = config.nntp
+        host = section.host.strip()
+        port = section.port.strip()
         if len(port) == 0:
             port = 119
         else:
@@ -63,18 +190,44 @@ class NNTPRunner(Runner):
             except (TypeError, ValueError):
                 log.exception('Bad [nntp]port value: {}'.format(port))
                 port = 119
+        key = (host, port, section.user)
+        connection = self._connections.get(key)
+        if connection is None:
+            connection = self._connections[key] = NNTPConnection(
+                host, port, section.user, section.password,
+                as_timedelta(section.idle_timeout).total_seconds(),
+                int(section.posts_per_connection))
+        return connection
+
+    def close_idle(self):
+        """Close the connections which have been idle for too long."""
+        for connection in self._connections.values():
+            if connection.idle:
+                connection.quit()
+
+    def close(self):
+        """Close all the connections."""
+        for connection in self._connections.values():
+            connection.quit()
+        self._connections.clear()
+
+
+@public
+class NNTPRunner(Runner):
+    def __init__(self, name, slice=None):
+        super().__init__(name, slice)
+        # The connections are kept open while there are articles to post.
+        self._pool = NNTPConnectionPool()
+
+    def _dispose(self, mlist, msg, msgdata):
         # Make sure we have the most up-to-date state
         if not msgdata.get('prepped'):
             prepare_message(mlist, msg, msgdata)
-        # Flatten the message object, sticking it in a StringIO object
-        fp = StringIO(msg.as_string())
-        conn = None
+        # Flatten the message object, sticking it in a BytesIO object, since
+        # nntplib posts the lines of the article as bytes.
+        fp = BytesIO(msg.as_bytes())
         try:
-            conn = nntplib.NNTP(host, port,
-                                readermode=True,
-                                user=config.nntp.user,
-                                password=config.nntp.password)
-            conn.post(fp)
+            self._pool.get().post(fp)
         except nntplib.NNTPTemporaryError:
             log.exception('{} NNTP error for {}'.format(
                 msg.get('message-id', 'n/a'), mlist.fqdn_listname))
@@ -87,11 +240,14 @@ class NNTPRunner(Runner):
             log.exception('{} NNTP unexpected exception for {}'.format(
                 msg.get('message-id', 'n/a'), mlist.fqdn_listname))
             return True
-        finally:
-            if conn:
-                conn.quit()
         return False
 
+    def _do_periodic(self):
+        self._pool.close_idle()
+
+    def _clean_up(self):
+        self._pool.close()
+
 
 def prepare_message(mlist, msg, msgdata):
     # If the newsgroup is moderated, we need to add this header for the Usenet
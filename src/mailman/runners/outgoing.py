@@ -17,13 +17,16 @@
 
 """Outgoing runner."""
 
+import time
 import socket
 import logging
 
 from datetime import datetime
 from lazr.config import as_boolean, as_timedelta
 from mailman.config import config
+from mailman.core.metrics import metrics
 from mailman.core.runner import Runner
+from mailman.core.switchboard import DELTA
 from mailman.interfaces.bounce import BounceContext, IBounceProcessor
 from mailman.interfaces.mailinglist import Personalization
 from mailman.interfaces.mta import SomeRecipientsFailed
@@ -58,6 +61,44 @@ class OutgoingRunner(Runner):
         # set if there was a socket.error.
         self._logged = False
         self._retryq = config.switchboards['retry']
+        self._max_recipients_per_job = int(config.mta.max_recipients_per_job)
+        interval = as_timedelta(config.mta.fanout_interval)
+        self._fanout_interval = interval.total_seconds()
+
+    def _fanout(self, mlist, msg, msgdata):
+        """Split a large recipient set into independent delivery jobs.
+
+        The jobs are requeued to the outgoing queue, where their different
+        hashes spread them across all the outgoing runner slices.  Each job
+        is queued a further `fanout_interval` after the previous one, so that
+        other lists' messages arriving in the meantime get interleaved with
+        them in the FIFO order instead of waiting for every job to finish.
+
+        :return: True if the message was split, otherwise False.
+        """
+        recipients = msgdata.get('recipients')
+        if (self._max_recipients_per_job <= 0 or recipients is None or
+                len(recipients) <= self._max_recipients_per_job):
+            return False
+        # Keep recipients at the same domain together, to give the MTA the
+        # best chance to reuse its downstream connections.
+        recipients = sorted(
+            recipients, key=lambda address: address.rpartition('@')[::-1])
+        size = self._max_recipients_per_job
+        # The queue file names are derived from the message, the list and
+        # `_when`, so every job needs a distinct time even when the interval
+        # is zero, otherwise the jobs would overwrite each other.
+        interval = max(self._fanout_interval, DELTA)
+        start = time.time()
+        for count, index in enumerate(range(0, len(recipients), size)):
+            self.switchboard.enqueue(
+                msg, msgdata,
+                recipients=recipients[index:index + size],
+                _when=start + count * interval)
+        debug_log.debug('[outgoing] %s: %s recipients in %s jobs',
+                        msg.get('message-id', 'n/a'), len(recipients),
+                        count + 1)
+        return True
 
     def _dispose(self, mlist, msg, msgdata):
         # See if we should retry delivery of this message again.
@@ -87,9 +128,18 @@ class OutgoingRunner(Runner):
         else:
             # VERP every 'interval' number of times.
             msgdata['verp'] = (mlist.post_id % interval == 0)
+        if self._fanout(mlist, msg, msgdata):
+            return False
+        received_time = msgdata.get('received_time')
+        if received_time is not None:
+            current_time = now(strip_tzinfo=(received_time.tzinfo is None))
+            metrics.observe(
+                'mailman_outgoing_queue_age_seconds',
+                (current_time - received_time).total_seconds(),
+                list_id=mlist.list_id)
         try:
-            debug_log.debug('[outgoing] {}: {}'.format(
-                self._func, msg.get('message-id', 'n/a')))
+            debug_log.debug('[outgoing] %s: %s',
+                            self._func, msg.get('message-id', 'n/a'))
             self._func(mlist, msg, msgdata)
             self._logged = False
         except socket.error:
@@ -0,0 +1,82 @@
+# Copyright (C) 2019 by the Free Software Foundation, Inc.
+#
+# This file is part of GNU Mailman.
+#
+# GNU Mailman is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free
+# Software Foundation, either version 3 of the License, or (at your option)
+# any later version.
+#
+# GNU Mailman is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General Public License for
+# more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# GNU Mailman.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Task runner for periodic database maintenance."""
+
+import time
+import logging
+
+from mailman.config import config
+from mailman.core.runner import Runner
+from mailman.interfaces.cache import ICacheManager
+from mailman.interfaces.pending import IPendings
+from mailman.interfaces.workflow import IWorkflowStateManager
+from mailman.model.uid import UID
+from public import public
+from zope.component import getUtility
+
+
+tlog = logging.getLogger('mailman.task')
+
+
+@public
+class TaskRunner(Runner):
+    """Evict expired records from the database.
+
+    Every `sleep_time`, expired pendings, the workflows abandoned along with
+    them, expired cache entries and the uids no longer used by any user or
+    member are evicted.  Each eviction is done in batches of
+    `[mailman]eviction_batch_size` rows, committing after each batch so that
+    no large transaction is held open.
+    """
+
+    is_queue_runner = False
+
+    def __init__(self, name, slice=None):
+        super().__init__(name, slice)
+        self._batch_size = int(config.mailman.eviction_batch_size)
+        # The order matters, since evicting pendings abandons workflows.
+        self._tasks = (
+            ('expired pendings', getUtility(IPendings).evict),
+            ('expired workflows', getUtility(IWorkflowStateManager).evict),
+            ('expired cache entries',
+             getUtility(ICacheManager).evict_expired),
+            ('orphaned uids', UID.cull_orphans),
+            )
+
+    def _one_iteration(self):
+        for name, evict in self._tasks:
+            self._evict(name, evict)
+        # Always snooze until the next round.
+        return 0
+
+    def _evict(self, name, evict):
+        start = time.perf_counter()
+        total = 0
+        try:
+            while True:
+                count = evict(limit=self._batch_size)
+                config.db.commit()
+                total += count
+                if count < self._batch_size:
+                    break
+        except Exception as error:
+            self._log(error)
+            config.db.abort()
+        tlog.info('Evicted %s %s in %.3f seconds',
+                  total, name, time.perf_counter() - start)
+        return total
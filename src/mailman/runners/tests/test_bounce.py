@@ -24,7 +24,7 @@ from mailman.app.lifecycle import create_list
 from mailman.config import config
 from mailman.interfaces.bounce import (
     BounceContext, IBounceProcessor, UnrecognizedBounceDisposition)
-from mailman.interfaces.member import MemberRole
+from mailman.interfaces.member import DeliveryStatus, MemberRole
 from mailman.interfaces.styles import IStyle, IStyleManager
 from mailman.interfaces.usermanager import IUserManager
 from mailman.runners.bounce import BounceRunner
@@ -217,6 +217,23 @@ Message-Id: <third>
         items = get_queue_messages('virgin', expected_count=1)
         self.assertEqual(items[0].msg['to'], 'postmaster@example.com')
 
+    def test_periodic_processing(self):
+        # The runner periodically scores the registered bounce events.
+        for i in range(5):
+            self._processor.register(
+                self._mlist, 'anne@example.com', self._msg)
+        runner = BounceRunner('bounces')
+        runner._do_periodic()
+        self.assertEqual(list(self._processor.unprocessed), [])
+        self.assertEqual(self._member.bounce_score, 5)
+        self.assertEqual(
+            self._member.delivery_status, DeliveryStatus.by_bounces)
+        # The next run is only due after the processing interval.
+        self._processor.register(self._mlist, 'anne@example.com', self._msg)
+        runner._do_periodic()
+        self.assertEqual(len(list(self._processor.unprocessed)), 1)
+        self.assertEqual(self._member.bounce_score, 5)
+
 
 # Create a style for the mailing list which sets the absolute minimum
 # attributes.  In particular, this will not set the bogus `bounce_processing`
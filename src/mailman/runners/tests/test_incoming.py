@@ -22,12 +22,15 @@ import unittest
 from mailman.app.lifecycle import create_list
 from mailman.chains.base import TerminalChainBase
 from mailman.config import config
+from mailman.email.message import LazyMessage
+from mailman.interfaces.action import Action
 from mailman.interfaces.autorespond import ResponseAction
 from mailman.runners.incoming import IncomingRunner
 from mailman.testing.helpers import (
-    get_queue_messages, make_testable_runner,
+    LogFileMark, get_queue_messages, make_testable_runner,
     specialized_message_from_string as mfs)
 from mailman.testing.layers import ConfigLayer
+from unittest import mock
 
 
 class Chain(TerminalChainBase):
@@ -135,3 +138,37 @@ To: test@example.com
         items = get_queue_messages('out', expected_count=0)
         items = get_queue_messages('virgin', expected_count=1)
         self.assertEqual(items[0].msg.get_payload(), 'Autoresponse')
+
+
+class TestLazyParsing(unittest.TestCase):
+    """Test that the posting chain only parses the bodies it needs."""
+
+    layer = ConfigLayer
+
+    def setUp(self):
+        self._mlist = create_list('test@example.com')
+        self._mlist.default_nonmember_action = Action.discard
+        self._in = make_testable_runner(IncomingRunner, 'in')
+        self._msg = LazyMessage.from_bytes(b"""\
+From: anne@example.com
+To: test@example.com
+Message-ID: <ant>
+Content-Type: multipart/mixed; boundary="BOUNDARY"
+
+--BOUNDARY
+Content-Type: application/octet-stream
+
+AAAA
+--BOUNDARY--
+""")
+
+    def test_discard_without_parsing(self):
+        # The nonmember's message is discarded without parsing its body.
+        config.switchboards['in'].enqueue(
+            self._msg, listid='test.example.com', to_list=True)
+        mark = LogFileMark('mailman.vette')
+        with mock.patch('mailman.email.message.FeedParser') as parser:
+            self._in.run()
+        parser.assert_not_called()
+        self.assertIn('DISCARD: <ant>', mark.read())
+        get_queue_messages('pipeline', expected_count=0)
@@ -18,19 +18,36 @@
 """Tests for the LMTP server."""
 
 import os
+import asyncio
 import smtplib
 import unittest
 
 from datetime import datetime
+from email.errors import NoBoundaryInMultipartDefect
 from mailman.app.lifecycle import create_list
 from mailman.config import config
 from mailman.database.transaction import transaction
 from mailman.interfaces.domain import IDomainManager
-from mailman.testing.helpers import get_lmtp_client, get_queue_messages
-from mailman.testing.layers import LMTPLayer
+from mailman.runners.lmtp import LMTPHandler
+from mailman.testing.helpers import (
+    configuration, get_lmtp_client, get_queue_messages)
+from mailman.testing.layers import ConfigLayer, LMTPLayer
+from types import SimpleNamespace
 from zope.component import getUtility
 
 
+# A multipart message without a boundary.
+DEFECTIVE = b"""\
+From: anne@example.com
+To: test@example.com
+Message-ID: <ant>
+Subject: A defective message
+Content-Type: multipart/mixed
+
+Hello
+"""
+
+
 class TestLMTP(unittest.TestCase):
     """Test various aspects of the LMTP server."""
 
@@ -295,3 +312,39 @@ Message-ID: <alpha>
 """)
         items = get_queue_messages('in', expected_count=1)
         self.assertEqual(items[0].msg['message-id'], '<alpha>')
+
+
+class TestMIMEDefects(unittest.TestCase):
+    """Test the rejection of messages with MIME defects."""
+
+    layer = ConfigLayer
+
+    def setUp(self):
+        create_list('test@example.com')
+        self._envelope = SimpleNamespace(
+            content=DEFECTIVE,
+            mail_from='anne@example.com',
+            rcpt_tos=['test@example.com'])
+
+    def _handle_data(self):
+        return asyncio.get_event_loop().run_until_complete(
+            LMTPHandler().handle_DATA(None, None, self._envelope))
+
+    def test_reject_mime_defects(self):
+        # By default, messages with defective MIME structure are rejected.
+        self.assertEqual(self._handle_data(), '501 Message has defects')
+        get_queue_messages('in', expected_count=0)
+
+    def test_body_parsed_later(self):
+        # Otherwise only the headers of the message are parsed, so its MIME
+        # defects are found when the body is used.
+        with configuration('mta', lmtp_reject_mime_defects='no'):
+            self.assertEqual(self._handle_data(), '250 Ok')
+        items = get_queue_messages('in', expected_count=1)
+        msg = items[0].msg
+        self.assertEqual(msg['subject'], 'A defective message')
+        self.assertTrue(msg._unparsed)
+        self.assertEqual(msg.defects, [])
+        self.assertEqual(msg.get_payload().strip(), 'Hello')
+        self.assertIn(NoBoundaryInMultipartDefect,
+                      [type(defect) for defect in msg.defects])
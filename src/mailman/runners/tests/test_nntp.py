@@ -21,6 +21,7 @@ import socket
 import nntplib
 import unittest
 
+from io import BytesIO
 from mailman.app.lifecycle import create_list
 from mailman.config import config
 from mailman.interfaces.nntp import NewsgroupModeration
@@ -29,6 +30,7 @@ from mailman.testing.helpers import (
     LogFileMark, configuration, get_queue_messages, make_testable_runner,
     specialized_message_from_string as mfs)
 from mailman.testing.layers import ConfigLayer
+from mailman.testing.nntp import NNTPServer
 from unittest import mock
 
 
@@ -274,7 +276,7 @@ Testing
         self.assertEqual(len(args[0]), 1)
         # No keyword arguments.
         self.assertEqual(len(args[1]), 0)
-        msg = mfs(args[0][0].read())
+        msg = mfs(args[0][0].read().decode('utf-8'))
         self.assertEqual(msg['subject'], 'A newsgroup posting')
 
     @mock.patch('nntplib.NNTP')
@@ -354,3 +356,130 @@ Testing
         # file-like object containing the message's bytes.  Read those bytes
         # and make some simple checks that the message is what we expected.
         conn_mock.quit.assert_called_once_with()
+
+
+class TestNNTPConnections(unittest.TestCase):
+    """The NNTP connections are reused."""
+
+    layer = ConfigLayer
+
+    def setUp(self):
+        self._server = NNTPServer()
+        self._server.start()
+        self.addCleanup(self._server.stop)
+        self._configuration = configuration(
+            'nntp', host='127.0.0.1', port=str(self._server.port))
+        self._configuration.__enter__()
+        self.addCleanup(self._configuration.__exit__)
+        self._mlist = create_list('test@example.com')
+        self._mlist.linked_newsgroup = 'example.test'
+        self._runner = make_testable_runner(nntp.NNTPRunner, 'nntp')
+        self._nntpq = config.switchboards['nntp']
+
+    def _enqueue(self, count):
+        for index in range(count):
+            msg = mfs("""\
+From: anne@example.com
+To: test@example.com
+Subject: Posting {}
+
+Testing
+""".format(index))
+            self._nntpq.enqueue(msg, {}, listid='test.example.com')
+
+    def _subjects(self):
+        return sorted(mfs(article.decode('utf-8'))['subject']
+                      for article in self._server.articles)
+
+    def test_connection_is_reused(self):
+        # The queued articles are posted over a single connection.
+        self._enqueue(3)
+        self._runner.run()
+        self.assertEqual(self._subjects(),
+                         ['Posting 0', 'Posting 1', 'Posting 2'])
+        self.assertEqual(self._server.connection_count, 1)
+        # The connection is closed when the runner stops.
+        self.assertFalse(self._runner._pool.get().connected)
+
+    def test_authenticate_once(self):
+        self._enqueue(2)
+        with configuration('nntp', user='alpha', password='beta'):
+            self._runner.run()
+        self.assertEqual(len(self._server.articles), 2)
+        self.assertEqual(self._server.credentials, [('alpha', 'beta')])
+
+    def test_no_reuse(self):
+        # Without an idle timeout, every article gets its own connection.
+        self._enqueue(2)
+        with configuration('nntp', idle_timeout='0s'):
+            self._runner.run()
+        self.assertEqual(len(self._server.articles), 2)
+        self.assertEqual(self._server.connection_count, 2)
+
+    def test_posts_per_connection(self):
+        self._enqueue(3)
+        with configuration('nntp', posts_per_connection='2'):
+            self._runner.run()
+        self.assertEqual(len(self._server.articles), 3)
+        self.assertEqual(self._server.connection_count, 2)
+
+    def test_refused_article_keeps_connection(self):
+        # An article refused by the server is logged, and the connection is
+        # used for the next article.
+        self._server.replies.append('441 Posting failed')
+        self._enqueue(2)
+        mark = LogFileMark('mailman.error')
+        self._runner.run()
+        self.assertIn('NNTP error for test@example.com', mark.read())
+        self.assertEqual(self._subjects(), ['Posting 1'])
+        self.assertEqual(self._server.connection_count, 1)
+
+    def test_reconnect(self):
+        # When the server drops a connection, the article is posted again
+        # over a new connection.
+        connection = nntp.NNTPConnectionPool().get()
+        connection.post(BytesIO(b'Subject: one\n\nTesting\n'))
+        self._server.drop_connections()
+        connection.post(BytesIO(b'Subject: two\n\nTesting\n'))
+        self.assertEqual(self._subjects(), ['one', 'two'])
+        self.assertEqual(self._server.connection_count, 2)
+        connection.quit()
+
+    def test_reconnect_after_timeout_response(self):
+        # A 400 response means the server is closing the connection.
+        connection = nntp.NNTPConnectionPool().get()
+        connection.post(BytesIO(b'Subject: one\n\nTesting\n'))
+        self._server.replies.append('400 Idle timeout')
+        connection.post(BytesIO(b'Subject: two\n\nTesting\n'))
+        self.assertEqual(self._subjects(), ['one', 'two'])
+        self.assertEqual(self._server.connection_count, 2)
+        connection.quit()
+
+    def test_no_reconnect_for_new_connection(self):
+        # An article is not posted again when a new connection is lost.
+        connection = nntp.NNTPConnectionPool().get()
+        self._server.replies.append('400 Service temporarily unavailable')
+        with self.assertRaises(nntplib.NNTPTemporaryError):
+            connection.post(BytesIO(b'Subject: one\n\nTesting\n'))
+        self.assertFalse(connection.connected)
+        self.assertEqual(self._server.connection_count, 1)
+        self.assertEqual(self._server.articles, [])
+
+    def test_close_idle(self):
+        pool = nntp.NNTPConnectionPool()
+        connection = pool.get()
+        with mock.patch('time.monotonic', return_value=1000):
+            connection.post(BytesIO(b'Subject: one\n\nTesting\n'))
+        with mock.patch('time.monotonic', return_value=1059):
+            pool.close_idle()
+            self.assertTrue(connection.connected)
+        with mock.patch('time.monotonic', return_value=1060):
+            pool.close_idle()
+            self.assertFalse(connection.connected)
+
+    def test_connection_per_server(self):
+        pool = nntp.NNTPConnectionPool()
+        connection = pool.get()
+        self.assertIs(pool.get(), connection)
+        with configuration('nntp', user='alpha'):
+            self.assertIsNot(pool.get(), connection)
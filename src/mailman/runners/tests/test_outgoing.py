@@ -27,6 +27,7 @@ from lazr.config import as_timedelta
 from mailman.app.bounces import send_probe
 from mailman.app.lifecycle import create_list
 from mailman.config import config
+from mailman.core.metrics import metrics
 from mailman.interfaces.bounce import BounceContext, IBounceProcessor
 from mailman.interfaces.mailinglist import Personalization
 from mailman.interfaces.member import MemberRole
@@ -476,3 +477,104 @@ Message-Id: <first>
         self.assertEqual(
             line[-63:-1],
             'Discarding message with persistent temporary failures: <first>')
+
+
+class TestFanout(unittest.TestCase):
+    """Test the splitting of large recipient sets into separate jobs."""
+
+    layer = ConfigLayer
+
+    def setUp(self):
+        global captured_mlist, captured_msg, captured_msgdata
+        config.push('fanout', """
+        [mta]
+        outgoing: mailman.runners.tests.test_outgoing.capture
+        max_recipients_per_job: 2
+        """)
+        self.addCleanup(config.pop, 'fanout')
+        captured_mlist = None
+        captured_msg = None
+        captured_msgdata = None
+        self._mlist = create_list('test@example.com')
+        self._outq = config.switchboards['out']
+        self._runner = make_testable_runner(OutgoingRunner, 'out', run_once)
+        self._msg = message_from_string("""\
+From: anne@example.com
+To: test@example.com
+Message-Id: <first>
+
+""")
+
+    def test_small_recipient_set(self):
+        # Messages with no more than max_recipients_per_job are delivered.
+        self._outq.enqueue(self._msg, {}, listid='test.example.com',
+                           recipients=['bart@example.com', 'cris@example.com'])
+        self._runner.run()
+        self.assertEqual(captured_msgdata['recipients'],
+                         ['bart@example.com', 'cris@example.com'])
+        get_queue_messages('out', expected_count=0)
+
+    def test_large_recipient_set(self):
+        # Messages with more than max_recipients_per_job are split into
+        # separate jobs, with recipients at the same domain kept together.
+        self._outq.enqueue(self._msg, {}, listid='test.example.com',
+                           recipients=['bart@example.org', 'cris@example.com',
+                                       'dave@example.org', 'elle@example.com',
+                                       'fred@example.net'])
+        self._runner.run()
+        self.assertIsNone(captured_msgdata)
+        items = get_queue_messages('out', expected_count=3)
+        self.assertEqual(
+            [item.msgdata['recipients'] for item in items],
+            [['cris@example.com', 'elle@example.com'],
+             ['fred@example.net', 'bart@example.org'],
+             ['dave@example.org'],
+             ])
+        for item in items:
+            self.assertEqual(item.msg['message-id'], '<first>')
+            self.assertEqual(item.msgdata['listid'], 'test.example.com')
+
+    def test_interleaving(self):
+        # Messages to other lists which are queued after a message is split
+        # are delivered before the split message's later jobs.
+        create_list('other@example.com')
+        self._outq.enqueue(self._msg, {}, listid='test.example.com',
+                           recipients=['bart@example.com', 'cris@example.com',
+                                       'dave@example.com', 'elle@example.com'])
+        self._runner.run()
+        self._outq.enqueue(self._msg, {}, listid='other.example.com',
+                           recipients=['fred@example.com'])
+        items = get_queue_messages('out', expected_count=3)
+        self.assertEqual(
+            [item.msgdata['listid'] for item in items],
+            ['test.example.com', 'other.example.com', 'test.example.com'])
+
+    def test_zero_fanout_interval(self):
+        # Jobs queued at the same time must not overwrite each other.
+        recipients = ['person{}@example.com'.format(i) for i in range(10)]
+        self._outq.enqueue(self._msg, {}, listid='test.example.com',
+                           recipients=recipients)
+        with configuration('mta', fanout_interval='0s'):
+            runner = make_testable_runner(OutgoingRunner, 'out', run_once)
+            runner.run()
+        items = get_queue_messages('out', expected_count=5)
+        self.assertEqual(
+            sorted(recipient
+                   for item in items
+                   for recipient in item.msgdata['recipients']),
+            sorted(recipients))
+
+    def test_queue_age(self):
+        # The age of the entries delivered for each list is recorded.
+        self.addCleanup(metrics.clear)
+        received_time = now() - timedelta(minutes=5)
+        self._outq.enqueue(self._msg, {}, listid='test.example.com',
+                           received_time=received_time,
+                           recipients=['bart@example.com'])
+        with configuration('metrics', enabled='yes'):
+            self._runner.run()
+            timers = [timer for timer in metrics.snapshot()['timers']
+                      if timer[0] == 'mailman_outgoing_queue_age_seconds']
+        self.assertEqual(
+            timers, [['mailman_outgoing_queue_age_seconds',
+                      dict(list_id='test.example.com'), 1, 300.0]])
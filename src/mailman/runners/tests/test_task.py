@@ -0,0 +1,113 @@
+# Copyright (C) 2019 by the Free Software Foundation, Inc.
+#
+# This file is part of GNU Mailman.
+#
+# GNU Mailman is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free
+# Software Foundation, either version 3 of the License, or (at your option)
+# any later version.
+#
+# GNU Mailman is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General Public License for
+# more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# GNU Mailman.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Test the task runner."""
+
+import uuid
+import unittest
+
+from datetime import timedelta
+from mailman.config import config
+from mailman.interfaces.cache import ICacheManager
+from mailman.interfaces.pending import IPendable, IPendings
+from mailman.interfaces.usermanager import IUserManager
+from mailman.interfaces.workflow import IWorkflowStateManager
+from mailman.model.uid import UID
+from mailman.runners.task import TaskRunner
+from mailman.testing.helpers import LogFileMark, configuration
+from mailman.testing.layers import ConfigLayer
+from mailman.utilities.datetime import factory
+from zope.component import getUtility
+from zope.interface import implementer
+
+
+@implementer(IPendable)
+class SimplePendable(dict):
+    PEND_TYPE = 'simple'
+
+
+class TestTaskRunner(unittest.TestCase):
+    """Test the task runner."""
+
+    layer = ConfigLayer
+
+    def setUp(self):
+        self._pendings = getUtility(IPendings)
+        self._workflows = getUtility(IWorkflowStateManager)
+        self._cache = getUtility(ICacheManager)
+        self._runner = TaskRunner('task')
+
+    @configuration('mailman', eviction_batch_size='2')
+    def test_evict(self):
+        # Expired pendings, their workflows and expired cache entries are
+        # evicted in batches.
+        for i in range(5):
+            token = self._pendings.add(SimplePendable(), timedelta(days=1))
+            self._workflows.save(token, 'step')
+        live = self._pendings.add(SimplePendable(), timedelta(days=3))
+        self._workflows.save(live, 'step')
+        self._cache.add('abc', 'xyz', lifetime=timedelta(hours=3))
+        self._cache.add('def', 'uvw', lifetime=timedelta(days=3))
+        factory.fast_forward(days=2)
+        mark = LogFileMark('mailman.task')
+        # The batch size is read when the runner is created.
+        runner = TaskRunner('task')
+        self.assertEqual(runner._one_iteration(), 0)
+        self.assertEqual(self._pendings.count, 1)
+        self.assertEqual(self._workflows.count, 1)
+        self.assertEqual(self._workflows.restore(live).step, 'step')
+        self.assertIsNone(self._cache.get('abc'))
+        self.assertEqual(self._cache.get('def'), 'uvw')
+        # The time taken by each eviction is logged.
+        log = mark.read()
+        self.assertIn('Evicted 5 expired pendings in ', log)
+        self.assertIn('Evicted 5 expired workflows in ', log)
+        self.assertIn('Evicted 1 expired cache entries in ', log)
+
+    @configuration('mailman', eviction_batch_size='2')
+    def test_cull_orphaned_uids(self):
+        # The uids of deleted users are culled in batches.
+        user_manager = getUtility(IUserManager)
+        anne = user_manager.create_user('anne@example.com')
+        UID.record(anne.user_id)
+        for i in range(100, 105):
+            UID.record(uuid.UUID(int=i))
+        mark = LogFileMark('mailman.task')
+        TaskRunner('task')._one_iteration()
+        self.assertEqual(
+            [row[0] for row in config.db.store.query(UID.uid)],
+            [anne.user_id])
+        self.assertIn('Evicted 5 orphaned uids in ', mark.read())
+
+    def test_nothing_to_evict(self):
+        mark = LogFileMark('mailman.task')
+        self._runner._one_iteration()
+        self.assertIn('Evicted 0 expired pendings', mark.read())
+
+    def test_eviction_error(self):
+        # An error in one eviction is logged, and the others still run.
+        def broken(limit):
+            raise RuntimeError('Oops')
+        self._runner._tasks = (
+            ('expired pendings', broken),
+            ('expired workflows', self._workflows.evict),
+            )
+        self._workflows.save('token', 'step')
+        mark = LogFileMark('mailman.error')
+        self._runner._one_iteration()
+        self.assertIn('Uncaught runner exception: Oops', mark.read())
+        self.assertEqual(self._workflows.count, 0)
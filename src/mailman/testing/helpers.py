@@ -250,7 +250,8 @@ def get_nntp_server(cleanups):
     class NNTPProxy:                                              # noqa: E306
         def get_message(self):
             args = nntpd.post.call_args
-            return specialized_message_from_string(args[0][0].read())
+            return specialized_message_from_string(
+                args[0][0].read().decode('utf-8'))
     return NNTPProxy()
 
 
@@ -469,6 +470,10 @@ def reset_the_world():
     getUtility(IStyleManager).populate()
     # Remove all dynamic header-match rules.
     config.chains['header-match'].flush()
+    # Forget the acceptable aliases and content filters compiled for the
+    # deleted lists.
+    config.rules['implicit-dest'].flush()
+    config.handlers['mime-delete'].flush()
     # Remove cached organizational domain suffix file.
     from mailman.rules.dmarc import LOCAL_FILE_NAME
     suffix_file = os.path.join(config.VAR_DIR, LOCAL_FILE_NAME)
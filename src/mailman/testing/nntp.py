@@ -0,0 +1,131 @@
+# Copyright (C) 2019 by the Free Software Foundation, Inc.
+#
+# This file is part of GNU Mailman.
+#
+# GNU Mailman is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free
+# Software Foundation, either version 3 of the License, or (at your option)
+# any later version.
+#
+# GNU Mailman is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General Public License for
+# more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# GNU Mailman.  If not, see <http://www.gnu.org/licenses/>.
+
+"""A stub NNTP server for testing purposes."""
+
+import socket
+import threading
+import socketserver
+
+from contextlib import suppress
+from public import public
+
+
+class _NNTPHandler(socketserver.StreamRequestHandler):
+    def _send(self, *lines):
+        self.wfile.write(''.join(
+            line + '\r\n' for line in lines).encode('utf-8'))
+
+    def _read_article(self):
+        lines = []
+        while True:
+            line = self.rfile.readline()
+            if line in (b'.\r\n', b''):
+                break
+            # Undo the dot-stuffing.
+            if line.startswith(b'..'):
+                line = line[1:]
+            lines.append(line)
+        return b''.join(lines)
+
+    def handle(self):
+        server = self.server
+        with server.lock:
+            server.connection_count += 1
+            server.sockets.append(self.connection)
+        self._send('200 Stub NNTP server ready, posting allowed')
+        user = None
+        while True:
+            line = self.rfile.readline()
+            if len(line) == 0:
+                break
+            command, space, arg = line.decode('utf-8').strip().partition(' ')
+            command = command.upper()
+            if command == 'CAPABILITIES':
+                self._send('101 Capability list:',
+                           'VERSION 2', 'READER', 'POST', 'AUTHINFO USER', '.')
+            elif command == 'MODE':
+                self._send('200 Posting allowed')
+            elif command == 'AUTHINFO':
+                kind, space, value = arg.partition(' ')
+                if kind.upper() == 'USER':
+                    user = value
+                    self._send('381 Password required')
+                else:
+                    with server.lock:
+                        server.credentials.append((user, value))
+                    self._send('281 Authentication accepted')
+            elif command == 'POST':
+                self._send('340 Send article')
+                article = self._read_article()
+                with server.lock:
+                    reply = (server.replies.pop(0) if server.replies
+                             else '240 Article received')
+                    if reply.startswith('240'):
+                        server.articles.append(article)
+                self._send(reply)
+            elif command == 'QUIT':
+                self._send('205 Bye')
+                break
+            else:
+                self._send('500 Unknown command')
+
+
+@public
+class NNTPServer(socketserver.ThreadingTCPServer):
+    """A stub NNTP server, accepting every article posted to it.
+
+    It listens on an ephemeral port of localhost until it is stopped.
+    """
+
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), _NNTPHandler)
+        self.lock = threading.Lock()
+        # The posted articles, as bytes.
+        self.articles = []
+        # The (user, password) pairs the clients authenticated with.
+        self.credentials = []
+        # The responses to the next posts, instead of accepting them.
+        self.replies = []
+        self.connection_count = 0
+        self.sockets = []
+        self._thread = None
+
+    @property
+    def port(self):
+        return self.server_address[1]
+
+    def start(self):
+        self._thread = threading.Thread(target=self.serve_forever)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def drop_connections(self):
+        """Close the open connections, like a server timing them out."""
+        with self.lock:
+            sockets, self.sockets = self.sockets, []
+        for sock in sockets:
+            with suppress(OSError):
+                sock.shutdown(socket.SHUT_RDWR)
+
+    def stop(self):
+        self.shutdown()
+        self.drop_connections()
+        self.server_close()
+        self._thread.join()
@@ -39,6 +39,28 @@ def split_email(address):
     return local_part, domain.split('.')
 
 
+@public
+def message_id_hash(message_id):
+    """Return the Message-ID-Hash of a Message-ID.
+
+    :param message_id: The Message-ID, with or without its angle brackets.
+    :type message_id: str
+    :return: The Message-ID-Hash contents.
+    :rtype: str
+    """
+    # The angle brackets are not part of the Message-ID.  See RFC 2822
+    # and http://wiki.list.org/display/DEV/Stable+URLs
+    if message_id.startswith('<') and message_id.endswith('>'):
+        message_id = message_id[1:-1]
+    else:
+        message_id = message_id.strip()
+    # Because .digest() returns bytes, b32encode() will return bytes, however
+    # we need a string for the header value.  We know the b32encoded byte
+    # string must be ascii-only.
+    digest = sha1(message_id.encode('utf-8')).digest()
+    return b32encode(digest).decode('ascii')
+
+
 @public
 def add_message_hash(msg):
     """Add a Message-ID-Hash header derived from Message-ID.
@@ -58,17 +80,7 @@ def add_message_hash(msg):
         return
     if isinstance(message_id, bytes):
         message_id = message_id.decode('ascii')
-    # The angle brackets are not part of the Message-ID.  See RFC 2822
-    # and http://wiki.list.org/display/DEV/Stable+URLs
-    if message_id.startswith('<') and message_id.endswith('>'):
-        message_id = message_id[1:-1]
-    else:
-        message_id = message_id.strip()
-    # Because .digest() returns bytes, b32encode() will return bytes, however
-    # we need a string for the header value.  We know the b32encoded byte
-    # string must be ascii-only.
-    digest = sha1(message_id.encode('utf-8')).digest()
-    hash32 = b32encode(digest).decode('ascii')
+    hash32 = message_id_hash(message_id)
     del msg['message-id-hash']
     msg['Message-ID-Hash'] = hash32
     # For backward compatibility with previous versions of the spec.
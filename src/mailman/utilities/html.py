@@ -0,0 +1,415 @@
+# Copyright (C) 2019 by the Free Software Foundation, Inc.
+#
+# This file is part of GNU Mailman.
+#
+# GNU Mailman is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free
+# Software Foundation, either version 3 of the License, or (at your option)
+# any later version.
+#
+# GNU Mailman is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General Public License for
+# more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# GNU Mailman.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Converters of text/html to text/plain.
+
+Run this module with `python -m mailman.utilities.html` to start a worker
+process for the `WorkerConverter`.  The worker converts the parts with the
+`PythonConverter`, or with the `IHTMLConverter` class given by `--converter`.
+"""
+
+import os
+import sys
+import click
+import textwrap
+import threading
+import subprocess
+
+from contextlib import suppress
+from html.parser import HTMLParser
+from mailman.config import config
+from mailman.interfaces.mime import HTMLConversionError, IHTMLConverter
+from mailman.utilities.modules import call_name
+from public import public
+from string import Template
+from tempfile import TemporaryDirectory
+from zope.interface import implementer
+
+
+# Elements which start a new line.
+BLOCK_ELEMENTS = frozenset((
+    'address', 'article', 'aside', 'blockquote', 'br', 'dd', 'div', 'dl',
+    'dt', 'figcaption', 'figure', 'footer', 'form', 'h1', 'h2', 'h3', 'h4',
+    'h5', 'h6', 'header', 'hr', 'li', 'main', 'nav', 'ol', 'p', 'pre',
+    'section', 'table', 'tr', 'ul',
+    ))
+# Elements which are set apart from the surrounding text by a blank line.
+PARAGRAPH_ELEMENTS = frozenset((
+    'blockquote', 'dl', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'ol', 'p', 'pre',
+    'table', 'ul',
+    ))
+# Elements whose content isn't rendered.
+SKIPPED_ELEMENTS = frozenset(('head', 'script', 'style', 'template', 'title'))
+# Elements which have no end tag.
+VOID_ELEMENTS = frozenset(('br', 'hr', 'img'))
+# Link schemes which are worth showing.
+LINK_SCHEMES = ('ftp:', 'http:', 'https:', 'mailto:')
+
+
+class _TextRenderer(HTMLParser):
+    """Render HTML as wrapped plain text."""
+
+    def __init__(self, width):
+        super().__init__(convert_charrefs=True)
+        self._width = width
+        self._lines = []
+        # The text of the current paragraph.
+        self._text = []
+        self._blank_line = False
+        self._skipping = []
+        self._preformatted = 0
+        # The open lists; None for unordered lists, or the number of the
+        # current item of ordered lists.
+        self._lists = []
+        self._quotes = 0
+        self._bullet = ''
+        self._links = []
+
+    @property
+    def _indent(self):
+        return '  ' * (len(self._lists) + self._quotes)
+
+    def _emit(self, line):
+        if self._blank_line and self._lines and self._lines[-1] != '':
+            self._lines.append('')
+        self._blank_line = False
+        self._lines.append(line.rstrip())
+
+    def _flush(self):
+        text = ''.join(self._text)
+        self._text = []
+        if self._preformatted:
+            for line in text.strip('\n').splitlines():
+                self._emit(self._indent + line)
+            return
+        text = ' '.join(text.split())
+        if len(text) == 0:
+            return
+        indent = self._indent
+        first_indent = indent
+        if self._bullet:
+            first_indent = indent[:-2] + self._bullet
+            indent = ' ' * len(first_indent)
+            self._bullet = ''
+        for line in textwrap.wrap(
+                text, self._width,
+                initial_indent=first_indent, subsequent_indent=indent,
+                break_long_words=False, break_on_hyphens=False):
+            self._emit(line)
+
+    def _start_block(self, tag):
+        self._flush()
+        if tag in PARAGRAPH_ELEMENTS:
+            self._blank_line = True
+
+    def handle_starttag(self, tag, attrs):
+        if self._skipping:
+            if tag in SKIPPED_ELEMENTS:
+                self._skipping.append(tag)
+            return
+        if tag in SKIPPED_ELEMENTS:
+            self._skipping.append(tag)
+            return
+        attrs = dict(attrs)
+        if tag in BLOCK_ELEMENTS:
+            self._start_block(tag)
+        if tag == 'pre':
+            self._preformatted += 1
+        elif tag == 'blockquote':
+            self._quotes += 1
+        elif tag == 'ul':
+            self._lists.append(None)
+        elif tag == 'ol':
+            self._lists.append(0)
+        elif tag == 'li':
+            if len(self._lists) == 0:
+                self._lists.append(None)
+            if self._lists[-1] is None:
+                self._bullet = '* '
+            else:
+                self._lists[-1] += 1
+                self._bullet = '{}. '.format(self._lists[-1])
+        elif tag == 'hr':
+            self._emit(self._indent + '-' * (self._width - len(self._indent)))
+        elif tag in ('td', 'th'):
+            self._text.append(' ')
+        elif tag == 'img':
+            alt = attrs.get('alt')
+            if alt:
+                self._text.append('[{}]'.format(alt))
+        elif tag == 'a':
+            self._links.append((attrs.get('href') or '', len(self._text)))
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_ELEMENTS:
+            self.handle_endtag(tag)
+
+    def handle_endtag(self, tag):
+        if self._skipping:
+            if tag == self._skipping[-1]:
+                self._skipping.pop()
+            return
+        if tag == 'a':
+            if len(self._links) == 0:
+                return
+            href, start = self._links.pop()
+            text = ''.join(self._text[start:])
+            address = href[7:] if href.startswith('mailto:') else href
+            if href.startswith(LINK_SCHEMES) and address not in text:
+                self._text.append(' <{}>'.format(address))
+            return
+        if tag not in BLOCK_ELEMENTS or tag in VOID_ELEMENTS:
+            return
+        self._start_block(tag)
+        if tag == 'pre':
+            self._preformatted = max(self._preformatted - 1, 0)
+        elif tag == 'blockquote':
+            self._quotes = max(self._quotes - 1, 0)
+        elif tag in ('ul', 'ol') and self._lists:
+            self._lists.pop()
+
+    def handle_data(self, data):
+        if not self._skipping:
+            self._text.append(data)
+
+    def render(self, html):
+        self.feed(html)
+        self.close()
+        self._flush()
+        return '\n'.join(self._lines).strip('\n') + '\n'
+
+
+@public
+@implementer(IHTMLConverter)
+class PythonConverter:
+    """Convert HTML to plain text in process.
+
+    Only the structure of the text is kept: paragraphs, line breaks, lists,
+    quotes and preformatted text.  Link targets are shown after the link
+    text, and the paragraphs are wrapped.
+    """
+
+    width = 72
+
+    def convert(self, html):
+        """See `IHTMLConverter`."""
+        return _TextRenderer(self.width).render(html)
+
+    def close(self):
+        """See `IHTMLConverter`."""
+        pass
+
+
+@public
+@implementer(IHTMLConverter)
+class CommandConverter:
+    """Convert HTML to plain text by running a command for every part.
+
+    The command is `[mailman]html_to_plain_text_command`.
+    """
+
+    def convert(self, html):
+        """See `IHTMLConverter`."""
+        with TemporaryDirectory() as tempdir:
+            filename = os.path.join(tempdir, 'part.html')
+            with open(filename, 'w', encoding='utf-8') as fp:
+                fp.write(html)
+            template = Template(config.mailman.html_to_plain_text_command)
+            command = template.safe_substitute(filename=filename).split()
+            try:
+                return subprocess.check_output(
+                    command, universal_newlines=True)
+            except (subprocess.CalledProcessError,
+                    FileNotFoundError, PermissionError) as error:
+                raise HTMLConversionError(str(error)) from error
+
+    def close(self):
+        """See `IHTMLConverter`."""
+        pass
+
+
+class _WorkerError(HTMLConversionError):
+    """The worker process failed."""
+
+
+class _Worker:
+    """A worker process converting HTML streamed over its stdin."""
+
+    def __init__(self, command):
+        try:
+            self._process = subprocess.Popen(
+                command, stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+        except OSError as error:
+            raise _WorkerError(str(error)) from error
+
+    def convert(self, html):
+        data = html.encode('utf-8')
+        try:
+            self._process.stdin.write(b'%d\n' % len(data) + data)
+            self._process.stdin.flush()
+            header = self._process.stdout.readline()
+            status, space, size = header.decode('ascii').partition(' ')
+            size = int(size)
+            payload = self._process.stdout.read(size)
+        except (OSError, ValueError) as error:
+            # The worker died or doesn't talk the protocol.
+            raise _WorkerError(
+                'Bad HTML worker response: {}'.format(error)) from error
+        if len(payload) != size:
+            # The worker died while it was replying.
+            raise _WorkerError('Truncated HTML worker response: {} of {} '
+                               'bytes'.format(len(payload), size))
+        text = payload.decode('utf-8', 'replace')
+        if status != 'ok':
+            raise HTMLConversionError(text)
+        return text
+
+    def close(self):
+        # The worker exits when its stdin is closed.
+        for pipe in (self._process.stdin, self._process.stdout):
+            with suppress(OSError):
+                pipe.close()
+        try:
+            self._process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            self._process.kill()
+            self._process.wait()
+
+
+@public
+@implementer(IHTMLConverter)
+class WorkerConverter:
+    """Convert HTML to plain text with a pool of long running workers.
+
+    Every worker runs `[mailman]html_to_plain_text_worker_command`, or this
+    module when it is empty, and converts any number of parts.  At most
+    `[mailman]html_to_plain_text_workers` workers run at the same time.  A
+    worker which dies or breaks the protocol is replaced by a new one.
+    """
+
+    def __init__(self):
+        command = config.mailman.html_to_plain_text_worker_command.split()
+        if len(command) == 0:
+            command = [sys.executable, '-m', 'mailman.utilities.html']
+            if config.filename is not None:
+                command.extend(['-C', config.filename])
+        self._command = command
+        self._slots = threading.BoundedSemaphore(
+            int(config.mailman.html_to_plain_text_workers))
+        self._lock = threading.Lock()
+        self._idle = []
+
+    def convert(self, html):
+        """See `IHTMLConverter`."""
+        with self._slots:
+            with self._lock:
+                worker = self._idle.pop() if self._idle else None
+            if worker is None:
+                worker = _Worker(self._command)
+            try:
+                return worker.convert(html)
+            except _WorkerError:
+                # The worker may be dead or out of sync, so don't reuse it.
+                worker.close()
+                worker = None
+                raise
+            finally:
+                if worker is not None:
+                    with self._lock:
+                        self._idle.append(worker)
+
+    def close(self):
+        """See `IHTMLConverter`."""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for worker in idle:
+            worker.close()
+
+
+_converter = None
+_converter_key = None
+
+
+@public
+def get_converter():
+    """Return the process's HTML converter.
+
+    The converter is created the first time it is needed, and again when its
+    configuration changes.
+
+    :return: The converter.
+    :rtype: `IHTMLConverter`
+    """
+    global _converter, _converter_key
+    section = config.mailman
+    key = (
+        section.html_to_plain_text_converter,
+        section.html_to_plain_text_worker_command,
+        section.html_to_plain_text_workers,
+        )
+    if key != _converter_key:
+        if _converter is not None:
+            _converter.close()
+        _converter = call_name(section.html_to_plain_text_converter)
+        _converter_key = key
+    return _converter
+
+
+@public
+def serve(infp, outfp, converter):
+    """Convert the HTML read from a stream until it is closed.
+
+    :param infp: The binary stream to read the HTML from.
+    :param outfp: The binary stream to write the text to.
+    :param converter: The converter.
+    :type converter: `IHTMLConverter`
+    """
+    while True:
+        header = infp.readline()
+        if len(header) == 0:
+            break
+        html = infp.read(int(header)).decode('utf-8', 'replace')
+        try:
+            text = converter.convert(html)
+        except Exception as error:
+            status, text = b'error', str(error)
+        else:
+            status = b'ok'
+        data = text.encode('utf-8')
+        outfp.write(b'%s %d\n' % (status, len(data)) + data)
+        outfp.flush()
+
+
+@click.command(
+    help='Convert the HTML streamed over stdin for the WorkerConverter.')
+@click.option(
+    '-C', '--config', 'config_file',
+    type=click.Path(exists=True, dir_okay=False, resolve_path=True),
+    help='The Mailman configuration file.')
+@click.option(
+    '--converter', default='mailman.utilities.html.PythonConverter',
+    help='The IHTMLConverter class converting the HTML.')
+def main(config_file, converter):
+    # Imported here to avoid a circular import.
+    from mailman.core.initialize import initialize_1
+    initialize_1(config_file)
+    serve(sys.stdin.buffer, sys.stdout.buffer, call_name(converter))
+
+
+if __name__ == '__main__':                          # pragma: nocover
+    main()
@@ -0,0 +1,191 @@
+# Copyright (C) 2019 by the Free Software Foundation, Inc.
+#
+# This file is part of GNU Mailman.
+#
+# GNU Mailman is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free
+# Software Foundation, either version 3 of the License, or (at your option)
+# any later version.
+#
+# GNU Mailman is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General Public License for
+# more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# GNU Mailman.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Test the HTML to plain text converters."""
+
+import os
+import sys
+import unittest
+
+from io import BytesIO
+from mailman.interfaces.mime import HTMLConversionError
+from mailman.testing.helpers import configuration
+from mailman.testing.layers import ConfigLayer
+from mailman.utilities.html import (
+    CommandConverter, PythonConverter, WorkerConverter, get_converter, serve)
+
+
+HTML = """\
+<html><head><title>A title</title><style>p { color: red; }</style></head>
+<body>
+<h1>Hello &amp; welcome</h1>
+<p>This paragraph is long enough that it has to be wrapped, because it goes
+on and on well past the width of a line.</p>
+<p>See <a href="https://example.com/">our site</a>
+or write to <a href="mailto:anne@example.com">anne@example.com</a>.<br>
+A new line.</p>
+<ul><li>One</li><li>Two<ol><li>Two a</li><li>Two b</li></ol></li></ul>
+<blockquote><p>Quoted</p></blockquote>
+<pre>  keep
+    this</pre>
+<p><img src="logo.png" alt="logo"/></p>
+</body></html>
+"""
+
+
+class FailingConverter:
+    def convert(self, html):
+        raise HTMLConversionError('Cannot convert {}'.format(html))
+
+
+class DyingConverter:
+    def convert(self, html):
+        # Die in the middle of the reply.
+        sys.stdout.buffer.write(b'ok 100\nTruncated')
+        sys.stdout.buffer.flush()
+        os._exit(1)
+
+
+class TestPythonConverter(unittest.TestCase):
+    def test_convert(self):
+        self.assertEqual(PythonConverter().convert(HTML), """\
+Hello & welcome
+
+This paragraph is long enough that it has to be wrapped, because it goes
+on and on well past the width of a line.
+
+See our site <https://example.com/> or write to anne@example.com.
+A new line.
+
+* One
+* Two
+
+  1. Two a
+  2. Two b
+
+  Quoted
+
+  keep
+    this
+
+[logo]
+""")
+
+    def test_plain_text(self):
+        self.assertEqual(PythonConverter().convert('Just text'), 'Just text\n')
+
+
+class TestCommandConverter(unittest.TestCase):
+    layer = ConfigLayer
+
+    @configuration('mailman', html_to_plain_text_command='cat $filename')
+    def test_convert(self):
+        self.assertEqual(CommandConverter().convert('<p>Hi</p>'), '<p>Hi</p>')
+
+    @configuration('mailman', html_to_plain_text_command='false $filename')
+    def test_command_fails(self):
+        with self.assertRaises(HTMLConversionError):
+            CommandConverter().convert('<p>Hi</p>')
+
+    @configuration('mailman', html_to_plain_text_command='/nonexistent/lynx')
+    def test_missing_command(self):
+        with self.assertRaises(HTMLConversionError):
+            CommandConverter().convert('<p>Hi</p>')
+
+
+class TestWorkerConverter(unittest.TestCase):
+    layer = ConfigLayer
+
+    def setUp(self):
+        self._converter = WorkerConverter()
+        self.addCleanup(self._converter.close)
+
+    def test_convert(self):
+        # The same worker converts all the parts.
+        self.assertEqual(self._converter.convert('<p>Hi</p>'), 'Hi\n')
+        worker = self._converter._idle[0]
+        self.assertEqual(
+            self._converter.convert(HTML), PythonConverter().convert(HTML))
+        self.assertEqual(self._converter._idle, [worker])
+
+    def test_worker_died(self):
+        # A dead worker is replaced by a new one.
+        self._converter.convert('<p>Hi</p>')
+        worker = self._converter._idle[0]
+        worker._process.kill()
+        worker._process.wait()
+        with self.assertRaises(HTMLConversionError):
+            self._converter.convert('<p>Hi</p>')
+        self.assertEqual(self._converter._idle, [])
+        self.assertEqual(self._converter.convert('<p>Hi</p>'), 'Hi\n')
+
+    @configuration('mailman', html_to_plain_text_worker_command='cat')
+    def test_bad_worker(self):
+        # The worker doesn't talk the protocol.
+        converter = WorkerConverter()
+        self.addCleanup(converter.close)
+        with self.assertRaises(HTMLConversionError):
+            converter.convert('<p>Hi</p>')
+
+    def test_conversion_error(self):
+        # Errors of the worker's converter are passed on, and the worker
+        # keeps on working.
+        command = ('{} -m mailman.utilities.html --converter '
+                   'mailman.utilities.tests.test_html.FailingConverter')
+        with configuration('mailman', html_to_plain_text_worker_command=(
+                command.format(sys.executable))):
+            converter = WorkerConverter()
+        self.addCleanup(converter.close)
+        with self.assertRaises(HTMLConversionError) as cm:
+            converter.convert('<p>Hi</p>')
+        self.assertEqual(str(cm.exception), 'Cannot convert <p>Hi</p>')
+        self.assertEqual(len(converter._idle), 1)
+
+    def test_truncated_response(self):
+        # A worker which dies while replying is not reused.
+        command = ('{} -m mailman.utilities.html --converter '
+                   'mailman.utilities.tests.test_html.DyingConverter')
+        with configuration('mailman', html_to_plain_text_worker_command=(
+                command.format(sys.executable))):
+            converter = WorkerConverter()
+        self.addCleanup(converter.close)
+        with self.assertRaises(HTMLConversionError) as cm:
+            converter.convert('<p>Hi</p>')
+        self.assertEqual(str(cm.exception),
+                         'Truncated HTML worker response: 9 of 100 bytes')
+        self.assertEqual(converter._idle, [])
+
+
+class TestServe(unittest.TestCase):
+    def test_serve(self):
+        infp = BytesIO(b'9\n<p>Hi</p>3\n<p>')
+        outfp = BytesIO()
+        serve(infp, outfp, PythonConverter())
+        self.assertEqual(outfp.getvalue(), b'ok 3\nHi\nok 1\n\n')
+
+
+class TestGetConverter(unittest.TestCase):
+    layer = ConfigLayer
+
+    def test_default(self):
+        self.assertIsInstance(get_converter(), CommandConverter)
+        self.assertIs(get_converter(), get_converter())
+
+    @configuration('mailman', html_to_plain_text_converter=(
+        'mailman.utilities.html.PythonConverter'))
+    def test_configured(self):
+        self.assertIsInstance(get_converter(), PythonConverter)
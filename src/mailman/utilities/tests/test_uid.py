@@ -23,6 +23,7 @@ import unittest
 
 from contextlib import ExitStack
 from mailman.config import config
+from mailman.model.uid import UID
 from mailman.testing.layers import ConfigLayer
 from mailman.utilities import uid
 from unittest.mock import patch
@@ -71,6 +72,39 @@ class TestUID(unittest.TestCase):
             uid.UIDFactory().new()
             self.assertEqual(mock.call_count, 2)
 
+    def test_reserved(self):
+        # The uids reserved in bulk are used by the new ids created in the
+        # block, and are recorded before they are used.
+        factory = uid.UIDFactory()
+        with ExitStack() as resources:
+            resources.enter_context(
+                patch('mailman.utilities.uid.layers.is_testing',
+                      return_value=False))
+            record = resources.enter_context(
+                patch('mailman.utilities.uid.UID.record'))
+            resources.enter_context(
+                patch('mailman.utilities.uid.RESERVE_BATCH', 2))
+            with factory.reserved(3):
+                uids = [factory.new() for i in range(4)]
+                self.assertEqual(factory._reserved, [])
+            self.assertEqual(UID.get_total_uid_count(), 3)
+            self.assertEqual(len(set(uids)), 4)
+            # Only the id created after the reserved ones ran out was
+            # recorded on its own.
+            self.assertEqual(record.call_count, 1)
+            # Unused reservations are forgotten after the block.
+            with factory.reserved(2):
+                factory.new()
+            self.assertEqual(factory._reserved, [])
+            self.assertEqual(UID.get_total_uid_count(), 5)
+
+    def test_reserved_testing(self):
+        # In testing mode, the ids stay predictable.
+        factory = uid.UIDFactory()
+        with factory.reserved(3):
+            self.assertEqual(factory.new().int, 1)
+        self.assertEqual(UID.get_total_uid_count(), 0)
+
     def test_unpredictable_token_factory(self):
         with patch('mailman.utilities.uid.layers.is_testing',
                    return_value=False):
@@ -27,7 +27,7 @@ import uuid
 import random
 import hashlib
 
-from contextlib import suppress
+from contextlib import contextmanager, suppress
 from flufl.lock import Lock
 from mailman.config import config
 from mailman.model.uid import UID
@@ -35,6 +35,10 @@ from mailman.testing import layers
 from public import public
 
 
+# The most uids reserved with a single insert.
+RESERVE_BATCH = 500
+
+
 class _PredictableIDGenerator:
     """Base class factory.
 
@@ -118,12 +122,44 @@ class _PredictableIDGenerator:
 class UIDFactory(_PredictableIDGenerator):
     """A factory for unique ids."""
 
+    def __init__(self, context=None):
+        super().__init__(context)
+        # The uids recorded in advance by reserved().
+        self._reserved = []
+
+    @contextmanager
+    def reserved(self, count):
+        """Record uids in bulk for the new ids created in the block.
+
+        Use this when creating many objects, so that their uids are recorded
+        with a few inserts instead of one for each object.  Reserved uids
+        which are not used in the block are left for `UID.cull_orphans()`.
+        In testing mode, the ids stay predictable and nothing is reserved.
+
+        :param count: The number of uids to reserve.
+        :type count: int
+        """
+        while count > 0 and not layers.is_testing():
+            # Keep each insert within the bind parameter limits of the
+            # databases.
+            uids = [uuid.uuid4() for i in range(min(count, RESERVE_BATCH))]
+            with suppress(ValueError):
+                UID.record_many(uids)
+                self._reserved.extend(uids)
+                count -= len(uids)
+        try:
+            yield
+        finally:
+            self._reserved.clear()
+
     def _next_unpredictable_id(self):
         """Return a new UID.
 
         :return: The new uid
         :rtype: uuid.UUID
         """
+        if len(self._reserved) > 0:
+            return self._reserved.pop()
         while True:
             uid = uuid.uuid4()
             with suppress(ValueError):